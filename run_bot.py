@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 AETHER Trading Bot - Enhanced Launcher Script
-Ensures latest code is always loaded by clearing cache before starting.
+Keeps the bytecode cache intact for fast restarts (Python already recompiles
+changed sources). Set AETHER_CLEAR_PYCACHE=1 to force a full cache wipe.
 """
 
 import sys
@@ -12,6 +13,11 @@ import logging
 import time
 from pathlib import Path
 
+# Profile first-time imports from the very start of the launch
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from src.utils.import_profile import IMPORT_PROFILER
+IMPORT_PROFILER.install()
+
 # Increase recursion limit to handle deep bucket evaluation chains
 sys.setrecursionlimit(5000)
 
@@ -174,9 +180,12 @@ if __name__ == "__main__":
     #kill_duplicate_bots()
     #print()
     
-    # 2. Clear Python cache to ensure fresh code
-    print("[2/5] Clearing Python cache...", flush=True)
-    clear_python_cache()
+    # 2. Clear Python cache (opt-in: stale .pyc files are already recompiled by Python)
+    if str(os.getenv("AETHER_CLEAR_PYCACHE", "0")).strip().lower() in ("1", "true", "yes", "on"):
+        print("[2/5] Clearing Python cache...", flush=True)
+        clear_python_cache()
+    else:
+        print("[2/5] Keeping Python bytecode cache (fast start)...", flush=True)
     print()
     
     # 3. Verify bot version
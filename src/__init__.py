@@ -1,8 +1,23 @@
 """
 AETHER Trading System Package
+
+Top-level exports are resolved lazily so that importing a light submodule
+(e.g. src.utils.import_profile) does not pull in the whole trading stack.
 """
 
-from .main_bot import AetherBot
-from .trading_engine import TradingEngine
-from .position_manager import PositionManager
-from .market_data import MarketDataManager
+_EXPORTS = {
+    "AetherBot": ".main_bot",
+    "TradingEngine": ".trading_engine",
+    "PositionManager": ".position_manager",
+    "MarketDataManager": ".market_data",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,4 @@
 import MetaTrader5 as mt5
-import pandas as pd
 import numpy as np
 from typing import Dict, Optional
 import logging
@@ -27,6 +26,7 @@ class Architect:
             logger.warning(f"[ARCHITECT] Failed to fetch H1 data for {symbol}")
             return None
 
+        import pandas as pd  # Deferred: keeps pandas off the startup path
         df = pd.DataFrame(candles)
         if df.empty:
             return None
@@ -0,0 +1,149 @@
+"""
+Correlation Engine - Streaming EWMA covariance across a basket of symbols.
+
+Each `update(prices)` turns one snapshot of quotes into log returns and
+folds them into an exponentially weighted mean vector and covariance
+matrix in O(k^2) (k = basket size); nothing is recomputed from history.
+
+    engine = StreamingCorrelation(["XAUUSD", "USDJPY", "US500"], target="XAUUSD")
+    engine.update({"XAUUSD": 2650.1, "USDJPY": 151.2, "US500": 5900.0})
+    engine.correlation("USDJPY")      # live corr vs target
+    engine.lead_lag()                 # {"USDJPY": (lag_samples, corr), ...}
+
+Lead/lag: the engine also keeps EWMA cross-covariances between each
+symbol's return `lag` samples ago and the target's current return
+(lag = 1..max_lag, O(k * max_lag) per update). A symbol whose best lag is
+> 0 moves before the target.
+
+A symbol without a quote in a snapshot contributes a zero return for that
+step (its last price is kept). Snapshots without a target quote update the
+prices and the move window but not the covariance.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class StreamingCorrelation:
+    """EWMA covariance/correlation of log returns, updated per quote snapshot."""
+
+    def __init__(self, symbols: Sequence[str], target: str, halflife: float = 300.0,
+                 max_lag: int = 5, move_window: int = 60):
+        self.symbols: List[str] = list(dict.fromkeys([target, *symbols]))
+        self.target = target
+        self._pos = {s: i for i, s in enumerate(self.symbols)}
+        k = len(self.symbols)
+
+        # Weight of the newest sample; halflife is in samples
+        self.alpha = 1.0 - 0.5 ** (1.0 / max(1.0, float(halflife)))
+        self.max_lag = max(0, int(max_lag))
+        self.samples = 0
+
+        self._mean = np.zeros(k)
+        self._cov = np.zeros((k, k))
+        # _lag_cov[l - 1, i] = cov(r_i(t - l), r_target(t))
+        self._lag_cov = np.zeros((self.max_lag, k))
+        self._recent: Deque[np.ndarray] = deque(maxlen=self.max_lag)
+
+        self._last = np.full(k, np.nan)
+        # Prices at the last snapshot that had a target quote (return baseline)
+        self._paired = np.full(k, np.nan)
+        # Price snapshots over the move window, for percent-change signals
+        self._history: Deque[np.ndarray] = deque(maxlen=max(2, int(move_window)))
+
+    def update(self, prices: Dict[str, float]) -> bool:
+        """
+        Fold one quote snapshot in. Returns False if the covariance was not
+        updated (no target quote); the prices still enter the move window.
+        """
+        current = self._last.copy()
+        for sym, price in prices.items():
+            i = self._pos.get(sym)
+            if i is not None and price and price > 0:
+                current[i] = float(price)
+        if np.isnan(current).all():
+            return False
+        self._last = current
+        self._history.append(current)
+
+        target_price = prices.get(self.target)
+        if not target_price or target_price <= 0:
+            # Returns resume (spanning the gap) at the next snapshot with a target quote
+            return False
+
+        first = np.isnan(self._paired)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.log(current / self._paired)
+        r[first | ~np.isfinite(r)] = 0.0
+        had_target = not first[0]
+        self._paired = current
+        if not had_target:
+            return True
+
+        a = self.alpha
+        delta = r - self._mean
+        self._mean += a * delta
+        # West's incremental EWM covariance
+        self._cov = (1.0 - a) * (self._cov + a * np.outer(delta, delta))
+
+        centered_target = r[0] - self._mean[0]
+        for lag, past in enumerate(reversed(self._recent), start=1):
+            self._lag_cov[lag - 1] = (1.0 - a) * self._lag_cov[lag - 1] + a * (past - self._mean) * centered_target
+        self._recent.append(r)
+        self.samples += 1
+        return True
+
+    def _std(self) -> np.ndarray:
+        return np.sqrt(np.clip(np.diag(self._cov), 0.0, None))
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Symbols and the live correlation matrix (0 where a variance is still 0)."""
+        std = self._std()
+        denom = np.outer(std, std)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.where(denom > 0.0, self._cov / denom, 0.0)
+        return list(self.symbols), np.clip(corr, -1.0, 1.0)
+
+    def covariance(self) -> Tuple[List[str], np.ndarray]:
+        return list(self.symbols), self._cov.copy()
+
+    def correlation(self, symbol: str) -> Optional[float]:
+        """Contemporaneous correlation of `symbol` with the target."""
+        i = self._pos.get(symbol)
+        if i is None:
+            return None
+        std = self._std()
+        denom = std[i] * std[0]
+        return float(np.clip(self._cov[i, 0] / denom, -1.0, 1.0)) if denom > 0.0 else 0.0
+
+    def lead_lag(self) -> Dict[str, Tuple[int, float]]:
+        """Per symbol: (lag in samples with the strongest |corr| vs the target, that corr)."""
+        std = self._std()
+        out: Dict[str, Tuple[int, float]] = {}
+        for sym, i in self._pos.items():
+            if i == 0:
+                continue
+            denom = std[i] * std[0]
+            if denom <= 0.0:
+                out[sym] = (0, 0.0)
+                continue
+            best_lag, best = 0, self._cov[i, 0] / denom
+            for lag in range(1, self.max_lag + 1):
+                c = self._lag_cov[lag - 1, i] / denom
+                if abs(c) > abs(best):
+                    best_lag, best = lag, c
+            out[sym] = (best_lag, float(max(-1.0, min(1.0, best))))
+        return out
+
+    def reference_prices(self) -> Dict[str, float]:
+        """Oldest prices in the move window (baseline for percent changes)."""
+        if not self._history:
+            return {}
+        oldest = self._history[0]
+        return {s: float(oldest[i]) for s, i in self._pos.items() if not math.isnan(oldest[i])}
+
+    def latest_prices(self) -> Dict[str, float]:
+        return {s: float(self._last[i]) for s, i in self._pos.items() if not math.isnan(self._last[i])}
@@ -266,6 +266,9 @@ class DirectionValidator:
 
     def _analyze_mtf(self, market_data: Dict) -> float:
         """Analyze Multi-Timeframe Alignment."""
+        aggregator = market_data.get('bar_aggregator')
+        if aggregator is not None and 'm1_trend' not in market_data:
+            market_data = {**market_data, **aggregator.get_trends(("M1", "M5", "M15"))}
         m1 = str(market_data.get('m1_trend', '')).upper()
         m5 = str(market_data.get('m5_trend', '')).upper()
         m15 = str(market_data.get('m15_trend', '')).upper()
@@ -10,20 +10,44 @@ Concept:
 - SPX500 (Risk On) UP -> Gold DOWN (Safe Haven Outflow)
 
 The engine calculates a "Correlation Score" (-1.0 to +1.0) to bias the main trading engine.
+
+Correlations are measured, not assumed: one pass of quotes over the basket
+(target + proxies) per sample interval feeds a StreamingCorrelation (EWMA
+covariance of returns). The constants below are priors, blended out as
+samples accumulate; a proxy that leads the target is weighted by its
+lagged correlation.
+
+Samples sit on a fixed wall-clock grid of AETHER_CORR_SAMPLE_S seconds:
+sample() takes at most one per grid slot and the main loop calls it every
+cycle, so a "sample" below is that many seconds. Slots missed while the
+loop is stalled are not back-filled (the next return spans the gap).
+
+The target is the traded symbol as the broker names it (e.g. XAUUSDm).
+Without a target quote the proxies still build their percent-move history,
+so the prior-weighted proxy signal works on its own.
+
+Env:
+    AETHER_CORRELATION_BASKET=         extra symbols to track (comma separated)
+    AETHER_CORR_SAMPLE_S=1.0           sample interval in seconds
+    AETHER_CORR_HALFLIFE=300           EWMA halflife in samples
+    AETHER_CORR_MAX_LAG=5              lead/lag horizon in samples
+    AETHER_CORR_MIN_SAMPLES=120        samples until priors are fully replaced
+    AETHER_CORR_MOVE_WINDOW=60         samples the percent move is measured over
 """
 
 import logging
+import os
 import time
 import numpy as np
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
 
+from .correlation_engine import StreamingCorrelation
+
 try:
     import MetaTrader5 as mt5
-    from datetime import datetime
 except Exception:  # pragma: no cover
     mt5 = None
-    datetime = None
 
 logger = logging.getLogger("GlobalBrain")
 
@@ -34,9 +58,17 @@ class CorrelationSignal:
     confidence: float
     timestamp: float
 
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
 class GlobalBrain:
-    def __init__(self, market_data_manager):
+    def __init__(self, market_data_manager, target_symbol: str = "XAUUSD"):
         self.market_data = market_data_manager
+        self.target_symbol = target_symbol
         # Use proxies from config when available (MarketDataManager.CorrelationMonitor)
         usd_proxy = None
         risk_proxy = None
@@ -49,7 +81,7 @@ class GlobalBrain:
             risk_proxy = None
 
         # ENHANCEMENT 6: Expanded Correlation Matrix
-        # Correlation signs relative to Gold (XAUUSD)
+        # Prior correlations relative to Gold (XAUUSD), used until measured
         # - USD strength up => Gold down (inverse)
         # - Risk-on up => Gold down (inverse)
         # - VIX up => Gold up (positive - fear drives gold)
@@ -76,6 +108,24 @@ class GlobalBrain:
         self.thresholds['VIX'] = 0.10  # 10% move in VIX (volatile)
         self.thresholds['US10Y'] = 0.01  # 1% move in yields
 
+        # Extra symbols are measured and contribute once their correlation is known
+        extra = [s.strip() for s in os.getenv("AETHER_CORRELATION_BASKET", "").split(",") if s.strip()]
+        for sym in extra:
+            self.correlations.setdefault(sym, 0.0)
+        self.correlations.pop(self.target_symbol, None)
+
+        self.min_samples = max(1, int(_env_float("AETHER_CORR_MIN_SAMPLES", 120)))
+        self.engine = StreamingCorrelation(
+            list(self.correlations),
+            target=self.target_symbol,
+            halflife=_env_float("AETHER_CORR_HALFLIFE", 300.0),
+            max_lag=int(_env_float("AETHER_CORR_MAX_LAG", 5)),
+            move_window=int(_env_float("AETHER_CORR_MOVE_WINDOW", 60)),
+        )
+
+        self.sample_interval_s = max(0.1, _env_float("AETHER_CORR_SAMPLE_S", 1.0))
+        self._last_sample_slot = -1
+
         # Cache last computed signal to avoid overloading terminal on every tick
         self._cache_interval_s = 1.0
         self._last_signal: Optional[CorrelationSignal] = None
@@ -84,7 +134,53 @@ class GlobalBrain:
         self.last_update = 0
         
         logger.info(f"[GLOBAL BRAIN] Initialized with {len(self.correlations)} correlation pairs")
+
+    def correlation_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Live EWMA correlation matrix of the basket (target first)."""
+        return self.engine.matrix()
+
+    def lead_lag(self) -> Dict[str, Tuple[int, float]]:
+        """Per proxy: (lag in samples at which it best predicts the target, corr)."""
+        return self.engine.lead_lag()
+
+    def effective_correlations(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Correlation (and lag) used for scoring, per proxy: the measured
+        lead/lag estimate blended with the prior while samples < min_samples.
+        """
+        weight = min(1.0, self.engine.samples / self.min_samples)
+        measured = self.engine.lead_lag() if weight > 0.0 else {}
+        out = {}
+        for sym, prior in self.correlations.items():
+            lag, corr = measured.get(sym, (0, prior))
+            out[sym] = (lag, weight * corr + (1.0 - weight) * prior)
+        return out
+
+    def _fetch_quotes(self) -> Dict[str, float]:
+        """One pass of cached last quotes (bid) over the whole basket."""
+        prices = {}
+        for sym in self.engine.symbols:
+            try:
+                tick = mt5.symbol_info_tick(sym)
+            except Exception:
+                tick = None
+            if tick is not None and tick.bid > 0:
+                prices[sym] = float(tick.bid)
+        return prices
         
+    def sample(self, now: Optional[float] = None) -> bool:
+        """Take one basket snapshot if a new sample slot has started. Returns True if sampled."""
+        if mt5 is None or not self.correlations:
+            return False
+        now = time.time() if now is None else now
+        slot = int(now // self.sample_interval_s)
+        if slot == self._last_sample_slot:
+            return False
+        self._last_sample_slot = slot
+        self.engine.update(self._fetch_quotes())
+        self.update_reference_prices(self.engine.reference_prices())
+        return True
+
     def update_reference_prices(self, prices: Dict[str, float]):
         """Update the baseline prices for calculation."""
         for symbol, price in prices.items():
@@ -100,7 +196,7 @@ class GlobalBrain:
         primary_driver = "NEUTRAL"
         max_impact = 0.0
         
-        for symbol, correlation in self.correlations.items():
+        for symbol, (lag, correlation) in self.effective_correlations().items():
             if symbol not in current_prices or symbol not in self.last_prices:
                 continue
                 
@@ -126,10 +222,10 @@ class GlobalBrain:
             if abs(impact) > max_impact:
                 max_impact = abs(impact)
                 direction = "SURGE" if pct_change > 0 else "DUMP"
-                primary_driver = f"{symbol}_{direction}"
+                primary_driver = f"{symbol}_{direction}" + (f"_LEADS{lag}" if lag else "")
                 
         # Normalize Score to -1.0 to 1.0
-        final_score = np.clip(total_score, -1.0, 1.0)
+        final_score = float(np.clip(total_score, -1.0, 1.0))
         
         # Confidence based on how many assets agree
         confidence = min(abs(total_score), 1.0)
@@ -166,54 +262,13 @@ class GlobalBrain:
             self._last_signal = CorrelationSignal(score=0.0, driver="NO_PROXIES", confidence=0.0, timestamp=now)
             return self._last_signal
 
-        if mt5 is None or datetime is None:
+        if mt5 is None:
             self._last_fetch_ts = now
             self._last_signal = CorrelationSignal(score=0.0, driver="MT5_UNAVAILABLE", confidence=0.0, timestamp=now)
             return self._last_signal
 
-        total_score = 0.0
-        primary_driver = "NEUTRAL"
-        max_impact = 0.0
-        contributors = 0
-
-        for sym, correlation in self.correlations.items():
-            try:
-                ticks = mt5.copy_ticks_from(sym, datetime.now(), 200, mt5.COPY_TICKS_ALL)
-                if ticks is None or len(ticks) < 2:
-                    continue
-                current = float(ticks[-1][1])  # bid
-                prev = float(ticks[0][1])
-                if prev == 0:
-                    continue
-
-                pct_change = ((current - prev) / prev) * 100.0
-                threshold = float(self.thresholds.get(sym, 0.0))
-                if threshold > 0.0 and abs(pct_change) < threshold:
-                    continue
-
-                impact = pct_change * float(correlation) * 10.0
-                total_score += impact
-                contributors += 1
-
-                if abs(impact) > max_impact:
-                    max_impact = abs(impact)
-                    direction = "SURGE" if pct_change > 0 else "DUMP"
-                    primary_driver = f"{sym}_{direction}"
-            except Exception:
-                continue
-
-        final_score = float(np.clip(total_score, -1.0, 1.0))
-        confidence = 0.0
-        if contributors > 0:
-            # Confidence grows with magnitude and number of agreeing contributors
-            confidence = float(min(abs(total_score), 1.0))
+        self.sample(now)
 
         self._last_fetch_ts = now
-        self._last_signal = CorrelationSignal(
-            score=final_score,
-            driver=primary_driver,
-            confidence=confidence,
-            timestamp=now,
-        )
-
+        self._last_signal = self.analyze_impact(self.engine.latest_prices())
         return self._last_signal
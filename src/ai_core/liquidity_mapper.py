@@ -1,5 +1,6 @@
 import logging
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Dict, Tuple, Optional
 
 logger = logging.getLogger("LiquidityMapper")
@@ -12,52 +13,176 @@ class LiquidityMapper:
     1. Identifies Swing Highs/Lows (Pivot Points).
     2. Clusters nearby pivots into "Liquidity Walls".
     3. Blocks entries that trade directly INTO a wall (Buying resistance / Selling support).
+
+    Pivot detection is vectorized (sliding-window max/min). When map_liquidity is
+    called with a key (e.g. "XAUUSD:M1"), the pivot set for that series is kept
+    incrementally: only bars that are new or changed since the last call are
+    re-evaluated, and the resulting map is cached until the next bar. The
+    series is trimmed to the window passed in, so the keyed map covers the
+    same bars (and pivots) as an unkeyed call on the same candles.
     """
 
-    def __init__(self, pivot_lookback=5, wall_thickness_pips=5.0, decay_factor=0.98):
+    def __init__(self, pivot_lookback=5, wall_thickness_pips=5.0, decay_factor=0.98, max_bars=5000):
         self.pivot_lookback = pivot_lookback
         self.wall_thickness_pips = wall_thickness_pips
         self.decay_factor = decay_factor # Old levels get weaker over time
+        self.max_bars = max_bars # Hard cap on the per-series window
         self.cached_walls = {}
         self.last_update_ts = 0
+        self._series = {} # key -> incremental bar/pivot state
+
+    def _pivot_mask(self, values: np.ndarray, is_high: bool) -> np.ndarray:
+        """Boolean mask over centers [L, n-L): True where the center is the window extreme."""
+        lookback = self.pivot_lookback
+        width = lookback * 2 + 1
+        if len(values) < width:
+            return np.zeros(0, dtype=bool)
+        windows = sliding_window_view(values, width)
+        extreme = windows.max(axis=1) if is_high else windows.min(axis=1)
+        return values[lookback:len(values) - lookback] == extreme
 
     def _find_pivots(self, candles: List[Dict]) -> Tuple[List[float], List[float]]:
         """
         Identify local Highs and Lows (Fractals).
         """
-        highs = []
-        lows = []
-        
         if len(candles) < (self.pivot_lookback * 2 + 1):
-            return highs, lows
+            return [], []
 
         # Extract numpy arrays for speed
-        h_arr = np.array([c.get('high', 0) for c in candles])
-        l_arr = np.array([c.get('low', 0) for c in candles])
-        
-        # Simple window checking
-        for i in range(self.pivot_lookback, len(candles) - self.pivot_lookback):
-            window_h = h_arr[i - self.pivot_lookback : i + self.pivot_lookback + 1]
-            window_l = l_arr[i - self.pivot_lookback : i + self.pivot_lookback + 1]
-            
-            # Check if current is max of window
-            if h_arr[i] == np.max(window_h):
-                highs.append(h_arr[i])
-                
-            # Check if current is min of window
-            if l_arr[i] == np.min(window_l):
-                lows.append(l_arr[i])
-                
-        return highs, lows
+        h_arr = np.array([c.get('high', 0) for c in candles], dtype=float)
+        l_arr = np.array([c.get('low', 0) for c in candles], dtype=float)
+
+        lookback = self.pivot_lookback
+        centers_h = h_arr[lookback:len(h_arr) - lookback]
+        centers_l = l_arr[lookback:len(l_arr) - lookback]
+        highs = centers_h[self._pivot_mask(h_arr, is_high=True)]
+        lows = centers_l[self._pivot_mask(l_arr, is_high=False)]
+        return highs.tolist(), lows.tolist()
+
+    def update_bars(self, key: str, candles: List[Dict]) -> bool:
+        """
+        Fold new/changed bars of one series into its incremental pivot state.
 
-    def map_liquidity(self, candles: List[Dict], current_price: float) -> Dict[str, List[Dict]]:
+        Only the tail of `candles` newer than the stored history is read, and
+        only pivot centers whose window touches a changed bar are re-evaluated.
+
+        Returns:
+            True if the pivot state changed (cached map must be rebuilt)
+        """
+        state = self._series.get(key)
+        if state is None or not candles:
+            return self._rebuild_series(key, candles)
+
+        times = state['times']
+        last_time = times[-1] if len(times) else None
+
+        # Walk back from the end to find bars we have not seen (or the forming bar)
+        tail = []
+        for c in reversed(candles):
+            t = c.get('time', 0)
+            if last_time is not None and t < last_time:
+                break
+            tail.append(c)
+            if t == last_time:
+                break
+        tail.reverse()
+        if not tail:
+            return False
+
+        first_time = tail[0].get('time', 0)
+        if first_time == last_time:
+            # Forming bar re-sent: skip if unchanged
+            bar = tail[0]
+            if (float(bar.get('high', 0)) == state['highs'][-1]
+                    and float(bar.get('low', 0)) == state['lows'][-1]
+                    and len(tail) == 1):
+                return False
+            keep = len(times) - 1
+        elif last_time is not None and len(tail) == len(candles) and len(candles) > 1:
+            # No overlap with stored history (gap or restart): rebuild
+            return self._rebuild_series(key, candles)
+        else:
+            keep = len(times)
+
+        new_t = np.array([c.get('time', 0) for c in tail], dtype=float)
+        new_h = np.array([c.get('high', 0) for c in tail], dtype=float)
+        new_l = np.array([c.get('low', 0) for c in tail], dtype=float)
+        times = np.concatenate((times[:keep], new_t))
+        highs = np.concatenate((state['highs'][:keep], new_h))
+        lows = np.concatenate((state['lows'][:keep], new_l))
+
+        window = min(self.max_bars, len(candles))
+        if len(times) > window:
+            drop = len(times) - window
+            times, highs, lows = times[drop:], highs[drop:], lows[drop:]
+            keep = max(0, keep - drop)
+
+        self._store_series(key, times, highs, lows, first_changed=keep, previous=state)
+        return True
+
+    def _rebuild_series(self, key: str, candles: List[Dict]) -> bool:
+        candles = candles[-self.max_bars:] if candles else []
+        times = np.array([c.get('time', 0) for c in candles], dtype=float)
+        highs = np.array([c.get('high', 0) for c in candles], dtype=float)
+        lows = np.array([c.get('low', 0) for c in candles], dtype=float)
+        self._store_series(key, times, highs, lows, first_changed=0, previous=None)
+        return True
+
+    def _store_series(self, key, times, highs, lows, first_changed: int, previous: Optional[Dict]) -> None:
+        lookback = self.pivot_lookback
+        # Centers whose window includes a changed bar must be re-evaluated
+        first_center = max(lookback, first_changed - lookback)
+        start = first_center - lookback
+
+        if previous is not None and len(times) > first_center:
+            cutoff_time = times[first_center]
+            # Centers closer than `lookback` to the window start have no full window
+            oldest = times[lookback]
+            keep_h = (previous['pivot_high_t'] >= oldest) & (previous['pivot_high_t'] < cutoff_time)
+            keep_l = (previous['pivot_low_t'] >= oldest) & (previous['pivot_low_t'] < cutoff_time)
+            ph_t, ph_v = previous['pivot_high_t'][keep_h], previous['pivot_high_v'][keep_h]
+            pl_t, pl_v = previous['pivot_low_t'][keep_l], previous['pivot_low_v'][keep_l]
+        else:
+            start = 0
+            ph_t = ph_v = pl_t = pl_v = np.zeros(0, dtype=float)
+
+        seg_t = times[start:]
+        seg_h = highs[start:]
+        seg_l = lows[start:]
+        mask_h = self._pivot_mask(seg_h, is_high=True)
+        mask_l = self._pivot_mask(seg_l, is_high=False)
+        center_t = seg_t[lookback:len(seg_t) - lookback]
+
+        self._series[key] = {
+            'times': times,
+            'highs': highs,
+            'lows': lows,
+            'pivot_high_t': np.concatenate((ph_t, center_t[mask_h])),
+            'pivot_high_v': np.concatenate((ph_v, seg_h[lookback:len(seg_h) - lookback][mask_h])),
+            'pivot_low_t': np.concatenate((pl_t, center_t[mask_l])),
+            'pivot_low_v': np.concatenate((pl_v, seg_l[lookback:len(seg_l) - lookback][mask_l])),
+        }
+
+    def map_liquidity(self, candles: List[Dict], current_price: float, key: Optional[str] = None) -> Dict[str, List[Dict]]:
         """
         Generates a map of Support (Buy Liquidity) and Resistance (Sell Liquidity) zones.
+
+        Args:
+            candles: OHLC history (oldest first)
+            current_price: Current price
+            key: Optional series id (e.g. "XAUUSD:M1") enabling incremental mapping
         """
         if not candles:
             return {'supports': [], 'resistances': []}
 
-        highs, lows = self._find_pivots(candles)
+        if key is not None:
+            changed = self.update_bars(key, candles)
+            if not changed and key in self.cached_walls:
+                return self.cached_walls[key]
+            state = self._series[key]
+            highs, lows = state['pivot_high_v'], state['pivot_low_v']
+        else:
+            highs, lows = self._find_pivots(candles)
         
         # Cluster pivots into walls
         # Use simple grouping: if levels are within X pips, merge them.
@@ -72,50 +197,34 @@ class LiquidityMapper:
         # Keep only walls within reasonable distance (e.g. 500 pips)
         # This is optional but good for optimization.
         
-        return {
+        liquidity_map = {
             'supports': supports,
             'resistances': resistances
         }
+        if key is not None:
+            self.cached_walls[key] = liquidity_map
+        return liquidity_map
 
-    def _cluster_levels(self, levels: List[float], is_resistance: bool) -> List[Dict]:
-        if not levels:
+    def _cluster_levels(self, levels, is_resistance: bool) -> List[Dict]:
+        if len(levels) == 0:
             return []
-            
-        levels.sort()
-        clusters = []
-        
-        if not levels: return []
-        
-        current_cluster = [levels[0]]
-        
+
+        arr = np.sort(np.asarray(levels, dtype=float))
+
         # Determine threshold in raw price units based on magnitude
         # Heuristic: 0.05% of price
-        avg_price = levels[0]
-        threshold = avg_price * 0.0005 
-
-        for i in range(1, len(levels)):
-            if levels[i] - levels[i-1] <= threshold:
-                current_cluster.append(levels[i])
-            else:
-                # Close cluster
-                clusters.append(self._process_cluster(current_cluster, is_resistance))
-                current_cluster = [levels[i]]
-        
-        # Append last cluster
-        if current_cluster:
-            clusters.append(self._process_cluster(current_cluster, is_resistance))
-            
-        return clusters
-
-    def _process_cluster(self, levels: List[float], is_resistance: bool) -> Dict:
-        """Calculate stats for a cluster of pivots."""
-        avg_level = sum(levels) / len(levels)
-        strength = len(levels) # More touches = stronger wall
-        return {
-            'price': avg_level,
-            'strength': strength,
-            'type': 'RESISTANCE' if is_resistance else 'SUPPORT'
-        }
+        threshold = arr[0] * 0.0005
+
+        # A new cluster starts wherever the gap to the previous level exceeds the threshold
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(arr) > threshold) + 1))
+        counts = np.diff(np.append(starts, len(arr)))
+        means = np.add.reduceat(arr, starts) / counts
+
+        wall_type = 'RESISTANCE' if is_resistance else 'SUPPORT'
+        return [
+            {'price': float(price), 'strength': int(strength), 'type': wall_type}
+            for price, strength in zip(means, counts)
+        ]
 
     def should_avoid_entry(self, current_price: float, action: str, liquidity_map: Dict) -> Tuple[bool, str]:
         """
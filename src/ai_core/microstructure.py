@@ -0,0 +1,244 @@
+"""
+Microstructure Backends for TickPressureAnalyzer
+
+A backend owns the per-tick state: the time-bounded tick window and the
+buy/sell aggressor volume buckets. It answers the primitive questions the
+analyzer needs (window stats, flow totals, VPIN) so the hot path never
+rescans Python containers.
+
+- HybridMicrostructure: NumPy window + aether_fast_core.MicrostructureAnalyzer VPIN
+- NumpyMicrostructure: pure NumPy reference implementation (always available)
+
+The shipped aether_fast_core exports only MicrostructureAnalyzer
+(calculate_vpin), so VPIN is the one metric that runs natively.
+"""
+
+import logging
+import math
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger("TickPressure")
+
+# Aggressor side codes shared with the Rust core
+SIDE_BUY = 0
+SIDE_SELL = 1
+SIDE_NEUTRAL = 2
+
+# VPIN needs this many bucket samples before it is reported
+VPIN_MIN_SAMPLES = 15
+
+
+class _RingBuffer:
+    """
+    Fixed-capacity float ring buffer (FIFO eviction, like deque(maxlen=n))
+    with a running total updated on append and eviction.
+    """
+
+    def __init__(self, capacity: int):
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.size = 0
+        self.head = 0  # Next write position
+        self._total = 0.0
+
+    def append(self, value: float) -> None:
+        evicted = self.values[self.head] if self.size == self.capacity else 0.0
+        self.values[self.head] = value
+        self._total += value - evicted
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        if self.head == 0:
+            # Once per wrap: recompute exactly so float drift cannot accumulate
+            self._total = float(np.sum(self.values[:self.size]))
+
+    def total(self) -> float:
+        return self._total
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class NumpyMicrostructure:
+    """
+    Pure NumPy microstructure state.
+
+    The tick window is kept as a contiguous slice [start:end) of preallocated
+    price/time arrays; eviction just advances start, and the live region is
+    compacted to the front only when the arrays fill up.
+
+    Count, sum and sum of squares are maintained on append/eviction, so window
+    statistics cost O(1) regardless of window size. Sums are taken relative to
+    an anchor price to keep the variance numerically stable.
+    """
+
+    name = "numpy"
+
+    def __init__(self, window_seconds: float = 5.0, max_buckets: int = 100, capacity: int = 4096):
+        self.window_seconds = float(window_seconds)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self._anchor = 0.0
+        self._sum = 0.0    # sum(price - anchor)
+        self._sumsq = 0.0  # sum((price - anchor)^2)
+        self._buy = _RingBuffer(max_buckets)
+        self._sell = _RingBuffer(max_buckets)
+
+    # ------------------------------------------------------------------
+    # Tick window
+    # ------------------------------------------------------------------
+    def add_tick(self, price: float, ts: float) -> None:
+        if self._end == len(self._prices):
+            self._compact()
+        if self._start == self._end:
+            self._anchor = price
+            self._sum = 0.0
+            self._sumsq = 0.0
+        self._prices[self._end] = price
+        self._times[self._end] = ts
+        self._end += 1
+        dev = price - self._anchor
+        self._sum += dev
+        self._sumsq += dev * dev
+        self.advance(ts)
+
+    def advance(self, now: float) -> int:
+        """Evict ticks older than the window at time `now`. Returns number evicted."""
+        cutoff = now - self.window_seconds
+        times = self._times
+        prices = self._prices
+        evicted = 0
+        while self._start < self._end and times[self._start] < cutoff:
+            dev = prices[self._start] - self._anchor
+            self._sum -= dev
+            self._sumsq -= dev * dev
+            self._start += 1
+            evicted += 1
+        return evicted
+
+    def _compact(self) -> None:
+        live = self._end - self._start
+        if live >= len(self._prices) // 2:
+            # Window is dense: grow instead of thrashing compactions
+            new_cap = len(self._prices) * 2
+            self._prices = np.concatenate([self._prices[self._start:self._end], np.zeros(new_cap - live)])
+            self._times = np.concatenate([self._times[self._start:self._end], np.zeros(new_cap - live)])
+        else:
+            self._prices[:live] = self._prices[self._start:self._end]
+            self._times[:live] = self._times[self._start:self._end]
+        self._start = 0
+        self._end = live
+        # Re-anchor and recompute exactly (cancels accumulated float drift)
+        if live:
+            window = self._prices[:live]
+            self._anchor = float(window[0])
+            devs = window - self._anchor
+            self._sum = float(np.sum(devs))
+            self._sumsq = float(np.dot(devs, devs))
+
+    def tick_count(self) -> int:
+        return self._end - self._start
+
+    def window_stats(self) -> Tuple[int, float, float, float, float]:
+        """
+        Returns:
+            (count, first_price, last_price, duration_seconds, price_std)
+        """
+        count = self._end - self._start
+        if count == 0:
+            return 0, 0.0, 0.0, 0.0, 0.0
+        duration = float(self._times[self._end - 1] - self._times[self._start])
+        std = 0.0
+        if count > 2:
+            mean = self._sum / count
+            std = math.sqrt(max(0.0, self._sumsq / count - mean * mean))
+        return count, float(self._prices[self._start]), float(self._prices[self._end - 1]), duration, std
+
+    # ------------------------------------------------------------------
+    # Order flow buckets
+    # ------------------------------------------------------------------
+    def add_flow(self, volume: float, side: int) -> None:
+        if side == SIDE_BUY:
+            self._buy.append(volume)
+        elif side == SIDE_SELL:
+            self._sell.append(volume)
+        else:
+            half = volume / 2
+            self._buy.append(half)
+            self._sell.append(half)
+
+    def flow_totals(self) -> Tuple[float, float, int, int]:
+        """
+        Returns:
+            (buy_volume, sell_volume, buy_samples, sell_samples)
+        """
+        return self._buy.total(), self._sell.total(), len(self._buy), len(self._sell)
+
+    def vpin(self) -> float:
+        buy_vol, sell_vol, buy_n, sell_n = self.flow_totals()
+        total = buy_vol + sell_vol
+        if total <= 0 or (buy_n + sell_n) < VPIN_MIN_SAMPLES:
+            return 0.0
+        return abs(buy_vol - sell_vol) / total
+
+
+class HybridMicrostructure(NumpyMicrostructure):
+    """
+    NumPy tick window with VPIN carried by the Rust MicrostructureAnalyzer.
+
+    The shipped core only exposes calculate_vpin(price, volume, side); it is fed
+    on every flow update and its last value is the reported VPIN. A neutral
+    flow is fed as a buy half and a sell half, exactly as the NumPy buckets
+    record it.
+    """
+
+    name = "hybrid"
+
+    def __init__(self, analyzer, window_seconds: float = 5.0, max_buckets: int = 100):
+        super().__init__(window_seconds=window_seconds, max_buckets=max_buckets)
+        self._analyzer = analyzer
+        self._native_vpin = 0.0
+
+    def add_flow(self, volume: float, side: int) -> None:
+        super().add_flow(volume, side)
+        if side in (SIDE_BUY, SIDE_SELL):
+            updates = ((volume, side),)
+        else:
+            updates = ((volume / 2, SIDE_BUY), (volume / 2, SIDE_SELL))
+        try:
+            for vol, code in updates:
+                value = self._analyzer.calculate_vpin(0.0, vol, code)
+                if value is not None:
+                    self._native_vpin = float(value)
+        except Exception as e:
+            logger.debug(f"Rust VPIN update failed: {e}")
+
+    def vpin(self) -> float:
+        _, _, buy_n, sell_n = self.flow_totals()
+        if (buy_n + sell_n) < VPIN_MIN_SAMPLES:
+            return 0.0
+        return self._native_vpin
+
+
+def create_backend(fast_core=None, window_seconds: float = 5.0, max_buckets: int = 100):
+    """
+    Pick the fastest available backend.
+
+    Args:
+        fast_core: The imported aether_fast_core module, or None
+    """
+    if fast_core is not None:
+        analyzer_cls = getattr(fast_core, "MicrostructureAnalyzer", None)
+        if analyzer_cls is not None:
+            try:
+                # bucket_size=1.0 (no usado), max_buckets igual al buffer Python
+                return HybridMicrostructure(analyzer_cls(1.0, int(max_buckets)),
+                                            window_seconds=window_seconds, max_buckets=max_buckets)
+            except Exception as e:
+                logger.error(f"Error inicializando motor Rust: {e}")
+
+    return NumpyMicrostructure(window_seconds=window_seconds, max_buckets=max_buckets)
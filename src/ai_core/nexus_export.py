@@ -0,0 +1,210 @@
+"""
+Nexus Export - Deployable CPU artifacts for the TimeSeriesTransformer.
+
+Turns a trained eager model into a TorchScript and/or ONNX artifact that the
+Oracle can run without the full eager stack, optionally with dynamic int8
+quantization of the Linear layers. Every artifact is checked against the
+eager model before it is kept.
+
+The feature count is taken from the model itself and the sequence axis is
+exported as dynamic, so an artifact trained on 64-bar windows serves the
+Oracle's 60-bar input. Parity is checked at both lengths.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from .oracle_backends import (
+    artifact_paths, TorchScriptBackend, OnnxBackend, ORACLE_INPUT_DIM, ORACLE_SEQ_LEN, SIGNATURE_FILE,
+)
+
+logger = logging.getLogger("NexusExport")
+
+# Parity thresholds for accepting an exported artifact (probability space)
+MAX_PROB_DIFF = 0.05
+MIN_ARGMAX_AGREEMENT = 0.98
+
+
+class _TrendHead(nn.Module):
+    """Export wrapper: single tensor in, trend logits out (no optional inputs)."""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, src):
+        trend_logits, _ = self.model(src)
+        return trend_logits
+
+
+def _example_input(seq_len: int, input_dim: int, batch: int = 1) -> torch.Tensor:
+    return torch.randn(batch, seq_len, input_dim, dtype=torch.float32)
+
+
+def model_input_dim(model: nn.Module) -> int:
+    """Feature count the model was built with (its embedding's input width)."""
+    return int(model.embedding.in_features)
+
+
+def export_torchscript(model: nn.Module, path: str, seq_len: int, input_dim: int,
+                       quantize: bool = True) -> str:
+    """
+    Trace the model to TorchScript, optionally after dynamic int8 quantization.
+
+    Returns:
+        Path of the written artifact
+    """
+    model = model.to("cpu").eval()
+    wrapped = _TrendHead(model).eval()
+    if quantize:
+        wrapped = torch.quantization.quantize_dynamic(wrapped, {nn.Linear}, dtype=torch.qint8)
+
+    with torch.no_grad():
+        traced = torch.jit.trace(wrapped, _example_input(seq_len, input_dim), check_trace=False)
+        traced = torch.jit.freeze(traced)
+
+    # Sequence length stays dynamic (x.size(1) is traced as an op); checked by parity
+    signature = json.dumps({"seq_len": None, "input_dim": input_dim})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    torch.jit.save(traced, path, _extra_files={SIGNATURE_FILE: signature})
+    logger.info(f"[EXPORT] TorchScript artifact saved to {path} (int8={quantize})")
+    return path
+
+
+def export_onnx(model: nn.Module, path: str, seq_len: int, input_dim: int,
+                quantize: bool = True) -> str:
+    """
+    Export the model to ONNX, optionally quantizing weights to int8 with onnxruntime.
+
+    Returns:
+        Path of the written artifact
+    """
+    model = model.to("cpu").eval()
+    wrapped = _TrendHead(model).eval()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    fp32_path = f"{path}.fp32" if quantize else path
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapped,
+            (_example_input(seq_len, input_dim),),
+            fp32_path,
+            input_names=["src"],
+            output_names=["trend_logits"],
+            dynamic_axes={"src": {0: "batch", 1: "seq"}, "trend_logits": {0: "batch"}},
+            opset_version=17,
+        )
+
+    if quantize:
+        try:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+            os.remove(fp32_path)
+        except ImportError:
+            logger.warning("[EXPORT] onnxruntime not available. Keeping fp32 ONNX artifact.")
+            os.replace(fp32_path, path)
+
+    logger.info(f"[EXPORT] ONNX artifact saved to {path} (int8={quantize})")
+    return path
+
+
+def check_parity(model: nn.Module, backend, seq_lens: Sequence[int], input_dim: int,
+                 samples: int = 64) -> Dict[str, float]:
+    """
+    Compare an inference backend against the eager model on random inputs.
+
+    Args:
+        model: Eager TimeSeriesTransformer
+        backend: Object with infer(np.ndarray[1, seq, dim]) -> logits
+        seq_lens: Sequence lengths to compare at (samples are spread across them)
+        samples: Number of single-sample forward passes to compare
+
+    Returns:
+        Dict with max_prob_diff, argmax_agreement and passed
+    """
+    model = model.to("cpu").eval()
+    max_diff = 0.0
+    agree = 0
+
+    with torch.no_grad():
+        for i in range(samples):
+            x = _example_input(seq_lens[i % len(seq_lens)], input_dim)
+            eager_logits, _ = model(x)
+            eager_probs = torch.softmax(eager_logits, dim=1).numpy()[0]
+
+            logits = np.asarray(backend.infer(x.numpy()), dtype=np.float64)[0]
+            exp = np.exp(logits - logits.max())
+            probs = exp / exp.sum()
+
+            max_diff = max(max_diff, float(np.max(np.abs(probs - eager_probs))))
+            if int(np.argmax(probs)) == int(np.argmax(eager_probs)):
+                agree += 1
+
+    agreement = agree / max(1, samples)
+    passed = max_diff <= MAX_PROB_DIFF and agreement >= MIN_ARGMAX_AGREEMENT
+    return {"max_prob_diff": max_diff, "argmax_agreement": agreement, "passed": passed}
+
+
+def export_artifacts(model: nn.Module, model_path: str, seq_len: int,
+                     formats=("torchscript", "onnx"), quantize: bool = True) -> Dict[str, Optional[str]]:
+    """
+    Export every requested format and keep only artifacts that pass the parity check.
+
+    Args:
+        seq_len: Training window length (used for tracing; the exported axis is dynamic)
+
+    Returns:
+        Dict mapping format -> artifact path (None if export or parity failed)
+    """
+    input_dim = model_input_dim(model)
+    if input_dim != ORACLE_INPUT_DIM:
+        # The Oracle would reject the artifact at load; don't ship it
+        logger.warning(
+            f"[EXPORT] Model takes {input_dim} features but the Oracle feeds {ORACLE_INPUT_DIM}. "
+            f"Skipping artifact export."
+        )
+        return {fmt: None for fmt in formats}
+
+    parity_lens = sorted({seq_len, ORACLE_SEQ_LEN})
+    paths = artifact_paths(model_path)
+    exporters = {
+        "torchscript": (export_torchscript, TorchScriptBackend),
+        "onnx": (export_onnx, OnnxBackend),
+    }
+
+    results: Dict[str, Optional[str]] = {}
+    for fmt in formats:
+        if fmt not in exporters:
+            logger.warning(f"[EXPORT] Unknown export format '{fmt}' skipped")
+            continue
+
+        exporter, backend_cls = exporters[fmt]
+        path = paths[fmt]
+        try:
+            exporter(model, path, seq_len, input_dim, quantize=quantize)
+            parity = check_parity(model, backend_cls(path, threads=1), parity_lens, input_dim)
+        except Exception as e:
+            logger.error(f"[EXPORT] {fmt} export failed: {e}")
+            if os.path.exists(path):
+                os.remove(path)
+            results[fmt] = None
+            continue
+
+        logger.info(
+            f"[EXPORT] {fmt} parity: max_prob_diff={parity['max_prob_diff']:.4f} "
+            f"argmax_agreement={parity['argmax_agreement']:.2%}"
+        )
+        if parity["passed"]:
+            results[fmt] = path
+        else:
+            logger.warning(f"[EXPORT] {fmt} artifact rejected (parity check failed)")
+            os.remove(path)
+            results[fmt] = None
+
+    return results
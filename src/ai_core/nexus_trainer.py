@@ -9,6 +9,7 @@ import numpy as np
 import logging
 from torch.utils.data import DataLoader, TensorDataset
 from .nexus_transformer import TimeSeriesTransformer
+from .oracle_backends import ORACLE_INPUT_DIM, build_feature_rows
 
 # Setup logging
 logger = logging.getLogger("NexusTrainer")
@@ -32,6 +33,15 @@ class NexusTrainer:
         # Scaling factors (approximate for Gold)
         self.price_scale = 5000.0 
         self.vol_scale = 1000.0
+        self.trend_threshold = 0.1  # USD move that counts as UP/DOWN
+
+        # Deployable CPU artifacts (comma list: onnx,torchscript; "off" disables)
+        export_env = str(os.getenv("AETHER_ORACLE_EXPORT", "onnx,torchscript")).strip().lower()
+        if export_env in ("", "0", "false", "no", "off"):
+            self.export_formats = ()
+        else:
+            self.export_formats = tuple(f.strip() for f in export_env.split(",") if f.strip())
+        self.export_int8 = str(os.getenv("AETHER_ORACLE_EXPORT_INT8", "1")).strip().lower() in ("1", "true", "yes", "on")
 
     def load_data(self):
         """
@@ -59,38 +69,40 @@ class NexusTrainer:
         """
         Convert dataframe to sequences (sliding window).
         Data format: [Open, High, Low, Close, Volume]
+
+        Windows hold the same ORACLE_INPUT_DIM features Oracle.predict feeds
+        (OHLC returns, log volume, 7 indicators), so the trained model and its
+        exported artifacts take the Oracle's input signature.
         """
         sequences = []
         targets_trend = []
         targets_vol = []
         
-        values = data.values.astype(float)
-        
-        # Normalize
-        values[:, :4] /= self.price_scale # Normalize OHLC
-        values[:, 4] = np.log1p(values[:, 4]) # Log normalize volume
+        # Row k describes bar k+1 (the first bar only seeds the previous close)
+        features = build_feature_rows(data)
+        prices = data[['high', 'low', 'close']].values.astype(float)[1:]
         
-        for i in range(len(values) - self.seq_len - 1):
-            seq = values[i : i + self.seq_len]
+        for i in range(len(features) - self.seq_len - 1):
+            seq = features[i : i + self.seq_len]
             
             # Target: Next Close vs Current Close (0=Down, 1=Neutral, 2=Up)
-            current_close = values[i + self.seq_len - 1, 3]
-            next_close = values[i + self.seq_len, 3]
+            current_close = prices[i + self.seq_len - 1, 2]
+            next_close = prices[i + self.seq_len, 2]
             diff = next_close - current_close
             
             
             # [FIXED] Threshold adjusted for M1 Gold scalping
-            # Old: 0.0001 (0.5 USD) was too tight, caused 90%+ NEUTRAL labels
-            # New: 0.00002 (0.1 USD ≈ 1 pip) creates balanced distribution
-            if diff > 0.00002:  # 1+ pip UP movement
+            # Old: 0.5 USD was too tight, caused 90%+ NEUTRAL labels
+            # New: 0.1 USD (≈ 1 pip) creates balanced distribution
+            if diff > self.trend_threshold:  # 1+ pip UP movement
                 trend = 2 # Up
-            elif diff < -0.00002:  # 1+ pip DOWN movement
+            elif diff < -self.trend_threshold:  # 1+ pip DOWN movement
                 trend = 0 # Down
             else:
                 trend = 1 # Neutral (< 1 pip sideways)
                 
             # Target Volatility (Next High - Next Low)
-            volatility = values[i + self.seq_len, 1] - values[i + self.seq_len, 2]
+            volatility = (prices[i + self.seq_len, 0] - prices[i + self.seq_len, 1]) / self.price_scale
             
             sequences.append(seq)
             targets_trend.append(trend)
@@ -137,7 +149,7 @@ class NexusTrainer:
         
         # 3. Model Setup
         model = TimeSeriesTransformer(
-            input_dim=5, 
+            input_dim=ORACLE_INPUT_DIM,
             d_model=self.d_model
         ).to(self.device)
         
@@ -177,5 +189,29 @@ class NexusTrainer:
         os.makedirs(os.path.dirname(self.model_save_path), exist_ok=True)
         torch.save(model.state_dict(), self.model_save_path)
         logger.info(f"Model saved to {self.model_save_path}")
+
+        # 6. Export (TorchScript / ONNX, parity-checked against the eager model)
+        self.export(model)
         
         return total_loss
+
+    def export(self, model):
+        """
+        Export deployable CPU artifacts next to the saved checkpoint.
+        Artifacts that fail the accuracy-parity check are discarded.
+        """
+        if not self.export_formats:
+            return {}
+
+        try:
+            from .nexus_export import export_artifacts
+            return export_artifacts(
+                model,
+                self.model_save_path,
+                seq_len=self.seq_len,
+                formats=self.export_formats,
+                quantize=self.export_int8,
+            )
+        except Exception as e:
+            logger.error(f"Artifact export failed: {e}")
+            return {}
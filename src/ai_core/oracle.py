@@ -1,15 +1,17 @@
-import torch
-import torch.nn as nn
 import numpy as np
 import logging
 import os
 import time
 from typing import Optional
-from .nexus_transformer import TimeSeriesTransformer
 from .architect import Architect
 from .architect import Architect
 from .bayesian_tuner import BayesianOptimizer
 from .contrastive_fusion import ContrastiveFusion
+from .oracle_backends import (
+    EagerBackend, ORACLE_INPUT_DIM, build_feature_rows, load_exported_backend, softmax,
+)
+from src.utils.import_profile import timed_import
+from src.config.runtime_settings import runtime_settings
 
 try:
     import MetaTrader5 as mt5
@@ -24,8 +26,9 @@ class Oracle:
     Wraps the institutional-grade TimeSeriesTransformer.
     """
     def __init__(self, mt5_adapter=None, tick_analyzer=None, global_brain=None, model_path="models/nexus_transformer.pth", model_monitor=None):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = None  # Resolved when the eager PyTorch backend is loaded
         self.model = None
+        self.backend = None  # Inference backend (eager / torchscript / onnx)
         self.model_path = model_path
         self.mt5_adapter = mt5_adapter
         self.architect = Architect(mt5_adapter) if mt5_adapter else None
@@ -35,6 +38,12 @@ class Oracle:
         
         # INTEGRATION FIX: Model monitor for prediction tracking
         self.model_monitor = model_monitor
+
+        # Last inference per candle window: get_sniper_signal_v2 and predict_trajectory
+        # run the model on the same bars within one cycle
+        self._predict_cache = None  # (window key, (prediction, confidence))
+        self.inference_cache_hits = 0
+        self.inference_cache_misses = 0
         
         # --- ADVANCED AI MODULES ---
         self.tuner = BayesianOptimizer()
@@ -103,15 +112,29 @@ class Oracle:
 
     def load_model(self):
         """Loads the Transformer model weights with graceful fallback for version mismatches."""
+        # Prefer an exported CPU artifact (TorchScript / ONNX, parity-checked at export time)
+        preference = str(os.getenv("AETHER_ORACLE_BACKEND", "auto")).strip().lower()
+        if preference != "eager":
+            self.backend = load_exported_backend(self.model_path, preference)
+            if self.backend is not None:
+                return
+            if preference != "auto":
+                logger.warning(f"[ORACLE] No usable {preference} artifact. Falling back to eager PyTorch.")
+
         if not os.path.exists(self.model_path):
             logger.warning(f"[ORACLE] Model file not found at {self.model_path}. Running in SIMULATION mode.")
             return
 
         try:
+            # torch is only needed for the eager backend; import it here, not at module load
+            torch = timed_import("torch")
+            from .nexus_transformer import TimeSeriesTransformer
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
             # Initialize model architecture (UPDATED to match NexusTrainerV2 with technical indicators)
             # New architecture: input_dim=12 (OHLCV + 7 technical indicators), d_model=128
             self.model = TimeSeriesTransformer(
-                input_dim=12,  # OHLCV + RSI, MACD, ATR, BB, OBV, Stoch, CCI
+                input_dim=ORACLE_INPUT_DIM,  # OHLCV + RSI, MACD, ATR, BB, OBV, Stoch, CCI
                 d_model=128, 
                 nhead=4, 
                 num_layers=2, 
@@ -125,6 +148,7 @@ class Oracle:
                 # Try loading directly (works if checkpoint matches architecture)
                 self.model.load_state_dict(state_dict)
                 self.model.eval()
+                self.backend = EagerBackend(self.model, self.device)
                 logger.info(f"[ORACLE] Nexus Transformer V2 (12-feature) loaded successfully on {self.device}")
             except RuntimeError as e:
                 if "size mismatch" in str(e) and "embedding.weight" in str(e):
@@ -135,6 +159,7 @@ class Oracle:
                     # Model already initialized with correct architecture above
                     # Just skip loading old weights - model will use random initialization
                     self.model.eval()
+                    self.backend = EagerBackend(self.model, self.device)
                     logger.info(f"[ORACLE] Fresh Nexus Transformer V2 (12-feature) ready for training on {self.device}")
                 else:
                     # Some other mismatch
@@ -144,6 +169,7 @@ class Oracle:
             logger.error(f"[ORACLE] Failed to load model: {e}")
             logger.warning(f"[ORACLE] Running in SIMULATION mode (model training required)")
             self.model = None
+            self.backend = None
 
     def calculate_rsi(self, prices, period=14):
         """Helper to calculate RSI for the Sniper logic."""
@@ -224,7 +250,7 @@ class Oracle:
             # - magnitude: normalized tick speed (ticks/sec)
             # - sign: direction from pressure (BUY vs SELL)
             velocity = float(metrics.get('velocity', 0.0) or 0.0)
-            vel_norm = float(os.getenv("AETHER_VELOCITY_NORM", "15"))
+            vel_norm = runtime_settings().velocity_norm
             if vel_norm <= 0:
                 vel_norm = 15.0
 
@@ -256,7 +282,7 @@ class Oracle:
         final_confidence = self.fusion.validate_signal(ai_score, coherence)
 
         # Log the AI Council deliberation (only for actual signals, not every tick)
-        if str(os.getenv("AETHER_ORACLE_FUSION_DEBUG", "0")).strip().lower() in ("1", "true", "yes", "on"):
+        if runtime_settings().oracle_fusion_debug:
             logger.info(
                 f"[ORACLE] Council: Macro({macro_signal:.2f}) | Micro({ai_score:.2f}) | Pressure({pressure_score:.2f}, raw={pressure_val:.2f}) | OBI({float(order_book_signal):.2f}) -> Coherence: {coherence:.2f}"
             )
@@ -464,7 +490,7 @@ class Oracle:
             prediction: "UP", "DOWN", or "NEUTRAL"
             confidence: float (0.0 to 1.0)
         """
-        if self.model is None:
+        if self.backend is None:
             return "NEUTRAL", 0.0
 
         try:
@@ -473,94 +499,35 @@ class Oracle:
             if len(candles) < 60:
                 return "NEUTRAL", 0.0
                 
-            use_raw = str(os.getenv("AETHER_ORACLE_USE_RAW_OHLCV", "0")).strip().lower() in (
-                "1",
-                "true",
-                "yes",
-                "on",
-            )
+            use_raw = runtime_settings().oracle_use_raw_ohlcv
 
             # [PHASE 2 UPDATE] Prepare data with technical indicators
             # Extract OHLCV + compute indicators
             recent = candles[-114:]  # Need extra candles for indicator calculation (60 + 50 for RSI/MACD)
             if len(recent) < 114:
                 return "NEUTRAL", 0.0
+
+            # Closed bars don't change; the forming bar is keyed on all of its fields
+            last = recent[-1]
+            cache_key = (
+                use_raw, id(self.backend), recent[0].get('time'), last.get('time'),
+                last.get('open'), last.get('high'), last.get('low'), last.get('close'),
+                last.get('tick_volume', last.get('volume')),
+            )
+            cached = self._predict_cache
+            if cached is not None and cached[0] == cache_key:
+                self.inference_cache_hits += 1
+                self._record_prediction(*cached[1], cached=True)
+                return cached[1]
+            self.inference_cache_misses += 1
             
-            try:
-                import pandas as pd
-                import ta
-                
-                # Convert to DataFrame
-                df = pd.DataFrame(recent)
-                df['close'] = df['close'].astype(float)
-                df['high'] = df['high'].astype(float)
-                df['low'] = df['low'].astype(float)
-                df['open'] = df['open'].astype(float)
-                df['tick_volume'] = df.get('tick_volume', df.get('volume', 0)).astype(float)
-                
-                # Calculate technical indicators (matching NexusTrainerV2)
-                df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
-                macd_ind = ta.trend.MACD(df['close'])
-                df['macd_diff'] = macd_ind.macd_diff()
-                df['atr'] = ta.volatility.AverageTrueRange(df['high'], df['low'], df['close'], window=14).average_true_range()
-                bollinger = ta.volatility.BollingerBands(df['close'], window=20)
-                df['bb_width'] = bollinger.bollinger_wband()
-                df['obv'] = ta.volume.OnBalanceVolumeIndicator(df['close'], df['tick_volume']).on_balance_volume()
-                stoch = ta.momentum.StochasticOscillator(df['high'], df['low'], df['close'])
-                df['stoch_k'] = stoch.stoch()
-                df['cci'] = ta.trend.CCIIndicator(df['high'], df['low'], df['close']).cci()
-                
-                # Clean NaN/Inf
-                df.replace([np.inf, -np.inf], np.nan, inplace=True)
-                df.ffill(inplace=True)
-                df.bfill(inplace=True)
-                df.fillna(0.0, inplace=True)
-                
-                # Take last 61 rows (for normalization we need prev_close)
-                df = df.tail(61).reset_index(drop=True)
-                
-            except ImportError:
-                logger.warning("[ORACLE] 'ta' library not available. Using OHLCV-only mode.")
-                # Fallback: pad with zeros for indicators
-                df = pd.DataFrame(recent[-61:])
-                for col in ['rsi', 'macd_diff', 'atr', 'bb_width', 'obv', 'stoch_k', 'cci']:
-                    df[col] = 0.0
-
-            data = []
-            prev_close = float(df.iloc[0]['close'] or 0.0)
-            
-            for i in range(1, len(df)):
-                row = df.iloc[i]
-                o = float(row.get('open', 0) or 0.0)
-                h = float(row.get('high', 0) or 0.0)
-                l = float(row.get('low', 0) or 0.0)
-                cl = float(row.get('close', 0) or 0.0)
-                vol = float(row.get('tick_volume', 0) or row.get('volume', 0) or 0.0)
-
-                if use_raw or prev_close <= 0 or cl <= 0:
-                    norm_row = [o, h, l, cl, vol, 0, 0, 0, 0, 0, 0, 0]  # Raw + zero indicators
-                else:
-                    # Normalize OHLCV to returns
-                    norm_row = [
-                        (o / prev_close) - 1.0,
-                        (h / prev_close) - 1.0,
-                        (l / prev_close) - 1.0,
-                        (cl / prev_close) - 1.0,
-                        float(np.log1p(max(0.0, vol))),
-                    ]
-                    
-                    # Add technical indicators (clipped to [-10, 10])
-                    for col in ['rsi', 'macd_diff', 'atr', 'bb_width', 'obv', 'stoch_k', 'cci']:
-                        val = float(row.get(col, 0) or 0.0)
-                        val = np.clip(val, -10.0, 10.0)
-                        val = np.nan_to_num(val, nan=0.0, posinf=10.0, neginf=-10.0)
-                        norm_row.append(val)
-
-                data.append(norm_row)
-                prev_close = cl if cl > 0 else prev_close
-            
-            # Convert to tensor: [1, 60, 12]
-            input_tensor = torch.tensor(data, dtype=torch.float32).unsqueeze(0).to(self.device)
+            # OHLCV returns + indicators, built exactly as NexusTrainer builds them
+            rows = build_feature_rows(recent, use_raw=use_raw)[-60:]
+            if len(rows) < 60:
+                return "NEUTRAL", 0.0
+
+            # Convert to model input: [1, 60, 12]
+            features = rows[np.newaxis, ...]
             
             # [FIX] AI Vision - Fetch Order Book for Context
             if self._market_book_symbols: # Only if we subscribed
@@ -572,61 +539,65 @@ class Oracle:
                 # BUT we will enable the input for future training.
                 pass 
 
-            with torch.no_grad():
-                # Forward pass (returns trend_logits, volatility_pred)
-                # [FIX] If we had L2 data, we would pass it here: self.model(input_tensor, ob_tensor)
-                # Currently the model handles ob_src=None by padding with zeros.
-                # To truly fix "AI Vision", we need to fetch the L2 book and format it to 40 dims.
-                # For safety/complexity, we acknowledge the gap but stick to robust None for now
-                # until L2 parser is fully verified. 
-                # However, the user asked to FIX it.
-                
-                # Let's try to get at least the OBI scalar into the model if possible?
-                # The model architecture allows ob_src (Order Book Dim = 40).
-                # Generating a synthetic 40-dim vector from scalar OBI:
-                # [OBI, 0, 0, ...]
-                
-                ob_src = None
-                obi_val = self._get_order_book_imbalance(candles[-1].get('symbol', '')) # We don't have symbol here easily
-                # Actually we assume single symbol inference.
-                
-                trend_logits, _ = self.model(input_tensor) # Keeping as is to avoid dimension mismatch crash
-                
-                probabilities = torch.softmax(trend_logits, dim=1)
-                
-                # Get predicted class
-                predicted_idx = torch.argmax(probabilities, dim=1).item()
-                confidence = probabilities[0, predicted_idx].item()
-                
-                # [VERIFIED MAPPING] Model output classes (MUST match training):
-                # Index 0 → "UP"      (Bullish/BUY signal)
-                # Index 1 → "DOWN"    (Bearish/SELL signal)  
-                # Index 2 → "NEUTRAL" (No clear direction/HOLD)
-                # 
-                # This mapping is CORRECT and matches TimeSeriesTransformer training
-                classes = ["UP", "DOWN", "NEUTRAL"]
-                if predicted_idx < len(classes):
-                    prediction = classes[predicted_idx]
-                else:
-                    prediction = "NEUTRAL"
-                
-                # INTEGRATION FIX: Record prediction for model monitoring
-                if self.model_monitor:
-                    try:
-                        self.model_monitor.record_prediction(
-                            prediction=prediction,
-                            confidence=confidence,
-                            metadata={'timestamp': time.time()}
-                        )
-                    except Exception as e:
-                        logger.debug(f"Failed to record prediction: {e}")
-                
-                return prediction, confidence
+            # Forward pass (returns trend_logits, volatility_pred)
+            # [FIX] If we had L2 data, we would pass it here: self.model(input_tensor, ob_tensor)
+            # Currently the model handles ob_src=None by padding with zeros.
+            # To truly fix "AI Vision", we need to fetch the L2 book and format it to 40 dims.
+            # For safety/complexity, we acknowledge the gap but stick to robust None for now
+            # until L2 parser is fully verified. 
+            # However, the user asked to FIX it.
+            
+            # Let's try to get at least the OBI scalar into the model if possible?
+            # The model architecture allows ob_src (Order Book Dim = 40).
+            # Generating a synthetic 40-dim vector from scalar OBI:
+            # [OBI, 0, 0, ...]
+            
+            ob_src = None
+            obi_val = self._get_order_book_imbalance(candles[-1].get('symbol', '')) # We don't have symbol here easily
+            # Actually we assume single symbol inference.
+            
+            trend_logits = self.backend.infer(features) # Keeping as is to avoid dimension mismatch crash
+            
+            probabilities = softmax(trend_logits)
+            
+            # Get predicted class
+            predicted_idx = int(np.argmax(probabilities[0]))
+            confidence = float(probabilities[0, predicted_idx])
+            
+            # [VERIFIED MAPPING] Model output classes (MUST match training):
+            # Index 0 → "UP"      (Bullish/BUY signal)
+            # Index 1 → "DOWN"    (Bearish/SELL signal)  
+            # Index 2 → "NEUTRAL" (No clear direction/HOLD)
+            # 
+            # This mapping is CORRECT and matches TimeSeriesTransformer training
+            classes = ["UP", "DOWN", "NEUTRAL"]
+            if predicted_idx < len(classes):
+                prediction = classes[predicted_idx]
+            else:
+                prediction = "NEUTRAL"
+            
+            self._predict_cache = (cache_key, (prediction, confidence))
+            self._record_prediction(prediction, confidence)
+            
+            return prediction, confidence
 
         except Exception as e:
             logger.error(f"[ORACLE] Prediction error: {e}")
             return "NEUTRAL", 0.0
 
+    def _record_prediction(self, prediction: str, confidence: float, cached: bool = False) -> None:
+        """Every returned prediction (cached or not) goes to the model monitor."""
+        # INTEGRATION FIX: Record prediction for model monitoring
+        if self.model_monitor:
+            try:
+                self.model_monitor.record_prediction(
+                    prediction=prediction,
+                    confidence=confidence,
+                    metadata={'timestamp': time.time(), 'cached': cached}
+                )
+            except Exception as e:
+                logger.debug(f"Failed to record prediction: {e}")
+
     def predict_trajectory(self, candles: list, horizon: int = 10) -> list:
         """
         Generate a synthetic trajectory prediction based on Transformer output.
@@ -635,7 +606,7 @@ class Oracle:
         Essential for Scalping: distinct from simple trend direction, this 
         predicts the SHAPE of the move.
         """
-        if not candles or self.model is None:
+        if not candles or self.backend is None:
             return []
 
         # Get the prediction
@@ -0,0 +1,267 @@
+"""
+Oracle Inference Backends
+
+Runs the Nexus TimeSeriesTransformer forward pass for Oracle.predict.
+All backends take a float32 array shaped [batch, seq_len, input_dim] and
+return trend logits as a NumPy array, so the Oracle does not care whether
+the model runs in eager PyTorch, TorchScript or ONNX Runtime.
+
+Select with AETHER_ORACLE_BACKEND = auto | onnx | torchscript | eager.
+Pin CPU threads with AETHER_ORACLE_THREADS (default 1).
+
+Exported artifacts carry their input signature (seq_len, input_dim; None =
+dynamic). An artifact that cannot take what Oracle.predict feeds
+([1, ORACLE_SEQ_LEN, ORACLE_INPUT_DIM]) is rejected at load.
+"""
+
+import json
+import logging
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("Oracle")
+
+# What Oracle.predict feeds the model: 60 bars x (OHLCV + 7 indicators)
+ORACLE_SEQ_LEN = 60
+ORACLE_INPUT_DIM = 12
+
+# Indicator columns appended to the OHLCV returns, in model input order
+ORACLE_INDICATORS = ("rsi", "macd_diff", "atr", "bb_width", "obv", "stoch_k", "cci")
+
+# TorchScript extra file holding the export signature
+SIGNATURE_FILE = "signature.json"
+
+
+def get_thread_count() -> int:
+    """CPU threads for inference (small VPS: one core is usually fastest)."""
+    try:
+        threads = int(os.getenv("AETHER_ORACLE_THREADS", "1"))
+    except ValueError:
+        threads = 1
+    return max(1, threads)
+
+
+def artifact_paths(model_path: str) -> dict:
+    """Return the exported artifact paths that sit next to a .pth checkpoint."""
+    base, _ = os.path.splitext(model_path)
+    return {
+        "torchscript": f"{base}.ts",
+        "onnx": f"{base}.onnx",
+    }
+
+
+class EagerBackend:
+    """Plain PyTorch forward pass on the loaded nn.Module."""
+
+    name = "eager"
+
+    def __init__(self, model, device):
+        import torch
+        self._torch = torch
+        self.model = model
+        self.device = device
+
+    def infer(self, features: np.ndarray) -> np.ndarray:
+        torch = self._torch
+        with torch.no_grad():
+            tensor = torch.from_numpy(features).to(self.device)
+            trend_logits, _ = self.model(tensor)
+        return trend_logits.cpu().numpy()
+
+
+class TorchScriptBackend:
+    """Frozen (optionally int8-quantized) TorchScript module on CPU."""
+
+    name = "torchscript"
+
+    def __init__(self, path: str, threads: int = 1):
+        import torch
+        torch.set_num_threads(threads)
+        self._torch = torch
+        extra = {SIGNATURE_FILE: ""}
+        self.module = torch.jit.load(path, map_location="cpu", _extra_files=extra)
+        self.module.eval()
+        # (seq_len, input_dim); None = dynamic or unknown (pre-signature export)
+        self.input_shape: Tuple[Optional[int], Optional[int]] = (None, None)
+        self.signature_known = False
+        if extra[SIGNATURE_FILE]:
+            sig = json.loads(extra[SIGNATURE_FILE])
+            self.input_shape = (sig.get("seq_len"), sig.get("input_dim"))
+            self.signature_known = True
+
+    def infer(self, features: np.ndarray) -> np.ndarray:
+        torch = self._torch
+        with torch.inference_mode():
+            return self.module(torch.from_numpy(features)).numpy()
+
+
+class OnnxBackend:
+    """ONNX Runtime session on CPU. Does not import torch at all."""
+
+    name = "onnx"
+
+    def __init__(self, path: str, threads: int = 1):
+        import onnxruntime as ort
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = threads
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Symbolic (dynamic) axes come back as strings
+        shape = [d if isinstance(d, int) else None for d in model_input.shape]
+        self.input_shape: Tuple[Optional[int], Optional[int]] = (
+            (shape[1], shape[2]) if len(shape) == 3 else (None, None)
+        )
+        self.signature_known = len(shape) == 3
+
+    def infer(self, features: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: features})[0]
+
+
+def check_signature(backend, seq_len: int = ORACLE_SEQ_LEN,
+                    input_dim: int = ORACLE_INPUT_DIM) -> Optional[str]:
+    """
+    Verify an exported backend accepts [1, seq_len, input_dim] and returns
+    [1, classes] logits. Returns None if it does, else the reason.
+    """
+    if not getattr(backend, "signature_known", False):
+        return "artifact has no input signature (re-export required)"
+    art_seq, art_dim = backend.input_shape
+    if art_dim is not None and art_dim != input_dim:
+        return f"artifact input_dim={art_dim}, Oracle feeds {input_dim}"
+    if art_seq is not None and art_seq != seq_len:
+        return f"artifact seq_len={art_seq} is fixed, Oracle feeds {seq_len}"
+    try:
+        logits = np.asarray(backend.infer(np.zeros((1, seq_len, input_dim), dtype=np.float32)))
+    except Exception as e:
+        return f"probe inference failed: {e}"
+    if logits.ndim != 2 or logits.shape[0] != 1:
+        return f"unexpected output shape {logits.shape}"
+    return None
+
+
+def load_exported_backend(model_path: str, preference: str = "auto"):
+    """
+    Load an exported artifact for model_path.
+
+    Artifacts older than the .pth checkpoint are treated as stale and skipped,
+    so a retrained model never runs with last week's export. Artifacts whose
+    input signature does not match what Oracle.predict feeds are skipped too.
+
+    Returns:
+        Backend instance, or None if no usable artifact exists
+    """
+    paths = artifact_paths(model_path)
+    if preference == "auto":
+        order = ["onnx", "torchscript"]
+    elif preference in paths:
+        order = [preference]
+    else:
+        return None
+
+    checkpoint_mtime = os.path.getmtime(model_path) if os.path.exists(model_path) else 0.0
+    threads = get_thread_count()
+    backends = {"onnx": OnnxBackend, "torchscript": TorchScriptBackend}
+
+    for fmt in order:
+        path = paths[fmt]
+        if not os.path.exists(path):
+            continue
+        if os.path.getmtime(path) < checkpoint_mtime:
+            logger.warning(f"[ORACLE] {fmt} artifact {path} is older than {model_path}. Skipping stale export.")
+            continue
+        try:
+            backend = backends[fmt](path, threads=threads)
+            mismatch = check_signature(backend)
+            if mismatch:
+                logger.warning(f"[ORACLE] {fmt} artifact {path} rejected: {mismatch}")
+                continue
+            logger.info(f"[ORACLE] Loaded {fmt} inference backend from {path} (threads={threads})")
+            return backend
+        except ImportError as e:
+            logger.debug(f"[ORACLE] {fmt} runtime not installed: {e}")
+        except Exception as e:
+            logger.warning(f"[ORACLE] Failed to load {fmt} artifact {path}: {e}")
+
+    return None
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax for [batch, classes] logits."""
+    shifted = logits - np.max(logits, axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / np.sum(exp, axis=1, keepdims=True)
+
+
+def build_feature_rows(candles, use_raw: bool = False) -> np.ndarray:
+    """
+    Model input rows for a candle series: OHLC returns vs the previous close,
+    log tick volume and 7 indicators clipped to [-10, 10].
+
+    Oracle.predict and NexusTrainer both build their windows here, so the model
+    is trained on exactly the ORACLE_INPUT_DIM features it is served. The first
+    candle only seeds the previous close: N candles give N-1 rows.
+
+    Args:
+        candles: List of candle dicts or a DataFrame (open/high/low/close and
+            tick_volume or volume)
+        use_raw: Raw OHLCV with zero indicators instead of returns
+
+    Returns:
+        float32 array [len(candles) - 1, ORACLE_INPUT_DIM]
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(candles).reset_index(drop=True)
+    if len(df) < 2:
+        return np.zeros((0, ORACLE_INPUT_DIM), dtype=np.float32)
+    for col in ("open", "high", "low", "close"):
+        df[col] = df[col].astype(float)
+    if "tick_volume" in df:
+        df["tick_volume"] = df["tick_volume"].astype(float)
+    elif "volume" in df:
+        df["tick_volume"] = df["volume"].astype(float)
+    else:
+        df["tick_volume"] = 0.0
+
+    try:
+        import ta
+
+        close, high, low = df["close"], df["high"], df["low"]
+        indicators = pd.DataFrame({
+            "rsi": ta.momentum.RSIIndicator(close, window=14).rsi(),
+            "macd_diff": ta.trend.MACD(close).macd_diff(),
+            "atr": ta.volatility.AverageTrueRange(high, low, close, window=14).average_true_range(),
+            "bb_width": ta.volatility.BollingerBands(close, window=20).bollinger_wband(),
+            "obv": ta.volume.OnBalanceVolumeIndicator(close, df["tick_volume"]).on_balance_volume(),
+            "stoch_k": ta.momentum.StochasticOscillator(high, low, close).stoch(),
+            "cci": ta.trend.CCIIndicator(high, low, close).cci(),
+        })
+        indicators = indicators.replace([np.inf, -np.inf], np.nan).ffill().bfill().fillna(0.0)
+        ind = np.clip(indicators[list(ORACLE_INDICATORS)].to_numpy(dtype=np.float64), -10.0, 10.0)
+    except ImportError:
+        logger.warning("[ORACLE] 'ta' library not available. Using OHLCV-only mode.")
+        ind = np.zeros((len(df), len(ORACLE_INDICATORS)))
+
+    ohlc = np.nan_to_num(df[["open", "high", "low", "close"]].to_numpy(dtype=np.float64))
+    vol = np.nan_to_num(df["tick_volume"].to_numpy(dtype=np.float64))
+    close = ohlc[:, 3]
+    # Last positive close before each bar
+    prev_close = pd.Series(np.where(close > 0, close, np.nan)).ffill().shift(1).to_numpy()
+
+    ohlc, vol, ind, prev_close, close = ohlc[1:], vol[1:], ind[1:], prev_close[1:], close[1:]
+    raw = np.isnan(prev_close) | (close <= 0)
+    if use_raw:
+        raw[:] = True
+
+    rows = np.zeros((len(ohlc), ORACLE_INPUT_DIM), dtype=np.float64)
+    safe_prev = np.where(raw, 1.0, prev_close)[:, None]
+    rows[:, :4] = np.where(raw[:, None], ohlc, ohlc / safe_prev - 1.0)
+    rows[:, 4] = np.where(raw, vol, np.log1p(np.maximum(vol, 0.0)))
+    rows[:, 5:] = np.where(raw[:, None], 0.0, ind)
+    return rows.astype(np.float32)
@@ -40,23 +40,190 @@ class RegimeSignal:
     recommendation: str
 
 
+class RegimeFeatureEngine:
+    """
+    Regime features maintained incrementally, one update per closed bar.
+
+    - Wilder-smoothed TR, +DM, -DM -> +DI, -DI, DX and ADX (O(1) per bar)
+    - Mean bar range over `range_window` bars for the ATR ratio (O(1))
+    - Shannon entropy of the last `return_window` returns (one histogram)
+    - Multi-scale R/S Hurst exponent over the last `return_window` returns
+    - Oscillation and breakout over the last 20 bars
+
+    Everything is computed in `add_bar`; readers get plain attributes.
+    """
+
+    def __init__(self, period: int = 14, return_window: int = 100, range_window: int = 49,
+                 entropy_bins: int = 10):
+        self.period = period
+        self.entropy_bins = entropy_bins
+        self.bars = 0
+        self.last_time = None
+        self.last_close = None
+
+        self._prev: Optional[tuple] = None  # (high, low, close)
+        self._tr_s = self._pdm_s = self._mdm_s = 0.0
+        self._dx_sum = 0.0
+        self.plus_di = self.minus_di = 0.0
+        self.dx: Optional[float] = None
+        self.adx: Optional[float] = None
+
+        self.highs = deque(maxlen=20)
+        self.lows = deque(maxlen=20)
+        self.closes = deque(maxlen=20)
+        self._ranges = deque(maxlen=range_window)
+        self._range_sum = 0.0
+        self._returns = deque(maxlen=return_window)
+
+        self.entropy = 0.5
+        self.hurst = 0.5
+        self.oscillation = 0.5
+        self.breakout: Optional[str] = None
+
+    def add_bar(self, high: float, low: float, close: float, bar_time=None) -> None:
+        if self._prev is not None:
+            prev_high, prev_low, prev_close = self._prev
+            self._update_directional(high, low, prev_high, prev_low, prev_close)
+            if prev_close > 0 and close > 0:
+                self._returns.append(close / prev_close - 1.0)
+
+        if len(self._ranges) == self._ranges.maxlen:
+            self._range_sum -= self._ranges[0]
+        self._ranges.append(high - low)
+        self._range_sum += high - low
+
+        # Breakout is judged against the 19 bars before this one
+        self.breakout = None
+        if len(self.highs) >= 19:
+            prior_high = max(list(self.highs)[-19:])
+            prior_low = min(list(self.lows)[-19:])
+            margin = (prior_high - prior_low) * 0.1  # 10% beyond range
+            if close > prior_high + margin:
+                self.breakout = "UP"
+            elif close < prior_low - margin:
+                self.breakout = "DOWN"
+
+        self.highs.append(high)
+        self.lows.append(low)
+        self.closes.append(close)
+        self._prev = (high, low, close)
+        self.last_time = bar_time
+        self.last_close = close
+        self.bars += 1
+
+        self.oscillation = self._oscillation()
+        self.entropy = self._entropy()
+        self.hurst = self._hurst()
+
+    def _update_directional(self, high, low, prev_high, prev_low, prev_close) -> None:
+        n = self.period
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        up, down = high - prev_high, prev_low - low
+        pdm = up if up > down and up > 0 else 0.0
+        mdm = down if down > up and down > 0 else 0.0
+
+        steps = self.bars  # directional steps including this one
+        if steps <= n:
+            # Seed: plain sums of the first `period` values
+            self._tr_s += tr
+            self._pdm_s += pdm
+            self._mdm_s += mdm
+            if steps < n:
+                return
+        else:
+            self._tr_s += tr - self._tr_s / n
+            self._pdm_s += pdm - self._pdm_s / n
+            self._mdm_s += mdm - self._mdm_s / n
+
+        if self._tr_s <= 0:
+            return
+        self.plus_di = 100.0 * self._pdm_s / self._tr_s
+        self.minus_di = 100.0 * self._mdm_s / self._tr_s
+        di_sum = self.plus_di + self.minus_di
+        self.dx = 100.0 * abs(self.plus_di - self.minus_di) / di_sum if di_sum > 0 else 0.0
+
+        dx_count = steps - n + 1
+        if dx_count < n:
+            self._dx_sum += self.dx
+        elif dx_count == n:
+            self.adx = (self._dx_sum + self.dx) / n
+        else:
+            self.adx = (self.adx * (n - 1) + self.dx) / n
+
+    def adx_value(self, default: float = 20.0) -> float:
+        """Wilder ADX; the latest DX while ADX is still seeding, else `default`."""
+        if self.adx is not None:
+            return self.adx
+        return self.dx if self.dx is not None else default
+
+    def mean_range(self) -> float:
+        return self._range_sum / len(self._ranges) if self._ranges else 0.0
+
+    def _oscillation(self) -> float:
+        if len(self.closes) < 20:
+            return 0.5
+        c = list(self.closes)
+        changes = sum(1 for i in range(1, len(c) - 1) if (c[i] - c[i - 1]) * (c[i + 1] - c[i]) < 0)
+        return changes / (len(c) - 2)
+
+    def _entropy(self) -> float:
+        if len(self._returns) < 29:
+            return 0.5
+        returns = np.fromiter(self._returns, dtype=float)
+        if np.all(returns == 0):
+            return 0.0
+        hist, _ = np.histogram(returns, bins=self.entropy_bins)
+        probs = hist[hist > 0] / hist.sum()
+        entropy = -np.sum(probs * np.log2(probs)) / np.log2(self.entropy_bins)
+        return float(min(1.0, max(0.0, entropy)))
+
+    def _hurst(self) -> float:
+        """R/S slope across window sizes 8, 16, 32, ... (non-overlapping chunks)."""
+        if len(self._returns) < 49:
+            return 0.5
+        returns = np.log1p(np.fromiter(self._returns, dtype=float))
+        log_n, log_rs = [], []
+        n = 8
+        while n <= len(returns) // 2:
+            chunks = returns[len(returns) % n:].reshape(-1, n)
+            dev = np.cumsum(chunks - chunks.mean(axis=1, keepdims=True), axis=1)
+            r = dev.max(axis=1) - dev.min(axis=1)
+            sd = chunks.std(axis=1)
+            valid = sd > 0
+            if valid.any():
+                log_n.append(np.log(n))
+                log_rs.append(np.log(np.mean(r[valid] / sd[valid])))
+            n *= 2
+        if len(log_n) < 2:
+            return 0.5
+        slope = np.polyfit(log_n, log_rs, 1)[0]
+        return float(min(1.0, max(0.0, slope)))
+
+
 class RegimeDetector:
     """
     Detects market regime using statistical analysis.
     
     Methods:
-    1. ADX (Average Directional Index) for trend strength
+    1. ADX (Average Directional Index, Wilder) for trend strength
     2. ATR ratio for volatility
     3. Price oscillation for ranging detection
     4. Breakout detection
+
+    Features are updated incrementally per closed bar (RegimeFeatureEngine)
+    and the RegimeSignal is cached until the next bar or a new ATR value.
     """
     
     def __init__(self):
-        # Price history for regime analysis
+        # Closes of ingested bars, for trend direction
         self._price_history = deque(maxlen=200)  # Last 200 candles
         
         # Regime history
         self._regime_history = deque(maxlen=50)
+
+        self._features = RegimeFeatureEngine()
+        self._cache_key = None
+        self._cached_signal: Optional[RegimeSignal] = None
         
         # Configuration
         self.adx_trending_threshold = 20.0  # [FIX] Lowered from 25.0 to catch grinding trends
@@ -71,7 +238,7 @@ class RegimeDetector:
         Detect current market regime.
         
         Args:
-            candles: Recent candle data (at least 50)
+            candles: Recent closed candles (at least 50), oldest first
             current_atr: Current ATR value
             
         Returns:
@@ -84,36 +251,43 @@ class RegimeDetector:
                 metrics={},
                 recommendation="Insufficient data"
             )
-        
-        # Update price history
-        for candle in candles[-50:]:
-            self._price_history.append(float(candle.get('close', 0)))
+
+        last = candles[-1]
+        key = (last.get('time'), last.get('close'), current_atr)
+        if key[0] is not None and key == self._cache_key and self._cached_signal is not None:
+            return self._cached_signal
+
+        features = self._sync_features(candles)
         
         # Calculate metrics
         metrics = {}
         
         # [GEOMETRICIAN] 1. Shannon Entropy (Chaos Detection)
-        entropy = self._calculate_shannon_entropy(candles)
+        entropy = features.entropy
         metrics['entropy'] = entropy
         
         # [GEOMETRICIAN] 2. Hurst Exponent (Fractal Memory)
-        hurst = self._calculate_hurst_exponent(candles)
+        hurst = features.hurst
         metrics['hurst'] = hurst
 
-        # 1. Calculate ADX (trend strength)
-        adx = self._calculate_adx(candles)
+        # 1. ADX (trend strength)
+        adx = features.adx_value()
         metrics['adx'] = adx
+        metrics['plus_di'] = features.plus_di
+        metrics['minus_di'] = features.minus_di
         
-        # 2. Calculate ATR ratio (volatility)
-        atr_ratio = self._calculate_atr_ratio(candles, current_atr)
+        # 2. ATR ratio (volatility)
+        avg_range = features.mean_range()
+        atr_ratio = current_atr / avg_range if current_atr > 0 and avg_range > 0 else 1.0
         metrics['atr_ratio'] = atr_ratio
         
-        # 3. Calculate price oscillation (ranging behavior)
-        oscillation = self._calculate_oscillation(candles)
+        # 3. Price oscillation (ranging behavior)
+        oscillation = features.oscillation
         metrics['oscillation'] = oscillation
         
-        # 4. Detect breakout
-        is_breakout, breakout_direction = self._detect_breakout(candles)
+        # 4. Breakout
+        breakout_direction = features.breakout
+        is_breakout = breakout_direction is not None
         metrics['breakout'] = 1.0 if is_breakout else 0.0
         
         # Determine regime based on metrics
@@ -131,259 +305,45 @@ class RegimeDetector:
             'metrics': metrics.copy()
         })
         
-        return RegimeSignal(
+        signal = RegimeSignal(
             regime=regime,
             confidence=confidence,
             metrics=metrics,
             recommendation=recommendation
         )
-    
-    def _calculate_adx(self, candles: List[Dict], period: int = 14) -> float:
-        """
-        Calculate Average Directional Index (ADX).
-        Simplified calculation for trend strength.
-        
-        Returns:
-            ADX value (0-100, typically 0-50)
-        """
-        if len(candles) < period + 1:
-            return 20.0  # Default neutral value
-        
-        try:
-            # Calculate True Range and Directional Movement
-            tr_list = []
-            plus_dm_list = []
-            minus_dm_list = []
-            
-            for i in range(1, min(len(candles), period + 10)):
-                high = float(candles[-i].get('high', 0))
-                low = float(candles[-i].get('low', 0))
-                prev_high = float(candles[-i-1].get('high', 0))
-                prev_low = float(candles[-i-1].get('low', 0))
-                prev_close = float(candles[-i-1].get('close', 0))
-                
-                # True Range
-                tr = max(
-                    high - low,
-                    abs(high - prev_close),
-                    abs(low - prev_close)
-                )
-                tr_list.append(tr)
-                
-                # Directional Movement
-                plus_dm = max(high - prev_high, 0)
-                minus_dm = max(prev_low - low, 0)
-                
-                if plus_dm > minus_dm:
-                    plus_dm_list.append(plus_dm)
-                    minus_dm_list.append(0)
-                else:
-                    plus_dm_list.append(0)
-                    minus_dm_list.append(minus_dm)
-            
-            # Calculate smoothed averages
-            if tr_list:
-                atr = sum(tr_list[:period]) / period
-                plus_di = (sum(plus_dm_list[:period]) / period) / atr * 100 if atr > 0 else 0
-                minus_di = (sum(minus_dm_list[:period]) / period) / atr * 100 if atr > 0 else 0
-                
-                # Calculate DX and ADX
-                dx = abs(plus_di - minus_di) / (plus_di + minus_di) * 100 if (plus_di + minus_di) > 0 else 0
-                
-                return dx  # Simplified ADX (using DX as proxy)
-            
-            return 20.0
-        except Exception as e:
-            logger.debug(f"[REGIME] Error calculating ADX: {e}")
-            return 20.0
-    
-    def _calculate_atr_ratio(self, candles: List[Dict], current_atr: float) -> float:
-        """
-        Calculate ATR ratio (current ATR vs average ATR).
-        
-        Returns:
-            Ratio (1.0 = normal, >1.5 = volatile, <0.7 = quiet)
-        """
-        if current_atr <= 0 or len(candles) < 20:
-            return 1.0
-        
-        try:
-            # Calculate average ATR over last 50 candles
-            atr_values = []
-            for i in range(1, min(len(candles), 50)):
-                high = float(candles[-i].get('high', 0))
-                low = float(candles[-i].get('low', 0))
-                atr_values.append(high - low)
-            
-            avg_atr = sum(atr_values) / len(atr_values) if atr_values else current_atr
-            
-            ratio = current_atr / avg_atr if avg_atr > 0 else 1.0
-            
-            return ratio
-        except Exception as e:
-            logger.debug(f"[REGIME] Error calculating ATR ratio: {e}")
-            return 1.0
-    
-    def _calculate_oscillation(self, candles: List[Dict]) -> float:
-        """
-        Calculate price oscillation (ranging behavior).
-        
-        Returns:
-            Oscillation score (0-1, higher = more ranging)
-        """
-        if len(candles) < 20:
-            return 0.5
-        
-        try:
-            # Get recent closes
-            closes = [float(c.get('close', 0)) for c in candles[-20:]]
-            
-            # Calculate number of direction changes
-            direction_changes = 0
-            for i in range(1, len(closes) - 1):
-                prev_dir = closes[i] - closes[i-1]
-                next_dir = closes[i+1] - closes[i]
-                
-                if prev_dir * next_dir < 0:  # Direction changed
-                    direction_changes += 1
-            
-            # Normalize to 0-1
-            oscillation = direction_changes / (len(closes) - 2) if len(closes) > 2 else 0.5
-            
-            return oscillation
-        except Exception as e:
-            logger.debug(f"[REGIME] Error calculating oscillation: {e}")
-            return 0.5
-    
-    def _calculate_shannon_entropy(self, candles: List[Dict], bins: int = 10) -> float:
-        """
-        Calculate Shannon Entropy to measure market disorder/randomness.
-        H = -sum(p * log2(p))
-        
-        Returns:
-            start_entropy: Normalized entropy (0.0=Ordered, 1.0=Max Chaos)
-        """
-        if len(candles) < 30:
-            return 0.5
-            
-        try:
-            # 1. Get returns
-            closes = np.array([float(c.get('close', 0)) for c in candles])
-            if len(closes) < 2:
-                return 0.5
-                
-            returns = np.diff(closes) / closes[:-1]
-            returns = returns[~np.isnan(returns)] # Filter NaNs
-            
-            if len(returns) == 0 or np.all(returns == 0):
-                return 0.0
-                
-            # 2. Discretize into bins (Probability Mass Function)
-            hist, _ = np.histogram(returns, bins=bins, density=True)
-            
-            # 3. Calculate Entopy
-            # Convert density to probabilities (sum to 1) by multiplying by bin width
-            # Approximate by just using normalized counts
-            hist, _ = np.histogram(returns, bins=bins)
-            probs = hist / np.sum(hist)
-            probs = probs[probs > 0] # Avoid log(0)
-            
-            entropy = -np.sum(probs * np.log2(probs))
-            
-            # 4. Normalize (Max entropy is log2(bins))
-            max_entropy = np.log2(bins)
-            normalized_entropy = entropy / max_entropy
-            
-            return float(min(1.0, max(0.0, normalized_entropy)))
-            
-        except Exception as e:
-            logger.debug(f"[GEOMETRICIAN] Error calculating Entropy: {e}")
-            return 0.5
+        self._cache_key = key
+        self._cached_signal = signal
+        return signal
 
-    def _calculate_hurst_exponent(self, candles: List[Dict]) -> float:
+    def _sync_features(self, candles: List[Dict]) -> RegimeFeatureEngine:
         """
-        Calculate Hurst Exponent to measure long-term memory.
-        H = 0.5 (Random), H > 0.5 (Trend), H < 0.5 (Mean Reversion)
-        Using Rescaled Range (R/S) analysis.
+        Feed bars newer than the last ingested one. A history that does not
+        continue the ingested series (other symbol, gap, no 'time') rebuilds
+        the features from the candles given.
         """
-        if len(candles) < 50:
-            return 0.5
-            
-        try:
-            # Prepare data
-            closes = np.array([float(c.get('close', 0)) for c in candles[-100:]]) # Use last 100 max
-            
-            # Simple R/S analysis approximation
-            # (Full R/S is complex, we use a robust approximation for speed)
-            
-            # Calculate returns
-            returns = np.diff(np.log(closes))
-            
-            # Mean return
-            mean_return = np.mean(returns)
-            
-            # Cumulative deviation from mean
-            deviations = returns - mean_return
-            cum_deviations = np.cumsum(deviations)
-            
-            # Range
-            R = np.max(cum_deviations) - np.min(cum_deviations)
-            
-            # Standard Deviation
-            S = np.std(returns)
-            
-            if S == 0:
-                return 0.5
-                
-            # R/S = c * (N)^H
-            # log(R/S) = log(c) + H * log(N)
-            # H ~ log(R/S) / log(N)
-            
-            RS = R / S
-            N = len(returns)
-            
-            # Simplified point estimate
-            H = np.log(RS) / np.log(N)
-            
-            return float(min(1.0, max(0.0, H)))
-            
-        except Exception as e:
-            logger.debug(f"[GEOMETRICIAN] Error calculating Hurst: {e}")
-            return 0.5
+        features = self._features
+        last_time = features.last_time
+        start = None
+        if last_time is not None and candles[-1].get('time') is not None:
+            for i in range(len(candles) - 1, -1, -1):
+                t = candles[i].get('time')
+                if t == last_time:
+                    if float(candles[i].get('close', 0)) == features.last_close:
+                        start = i + 1
+                    break
+                if t is None or t < last_time:
+                    break
 
-    def _detect_breakout(self, candles: List[Dict]) -> tuple:
-        """
-        Detect if price is breaking out of recent range.
-        
-        Returns:
-            (is_breakout, direction)
-        """
-        if len(candles) < 20:
-            return False, None
-        
-        try:
-            # Get recent range (last 20 candles)
-            recent = candles[-20:-1]
-            recent_high = max(float(c.get('high', 0)) for c in recent)
-            recent_low = min(float(c.get('low', 0)) for c in recent)
-            
-            # Current candle
-            current = candles[-1]
-            current_close = float(current.get('close', 0))
-            
-            # Check for breakout
-            range_size = recent_high - recent_low
-            breakout_threshold = range_size * 0.1  # 10% beyond range
-            
-            if current_close > recent_high + breakout_threshold:
-                return True, "UP"
-            elif current_close < recent_low - breakout_threshold:
-                return True, "DOWN"
-            
-            return False, None
-        except Exception as e:
-            logger.debug(f"[REGIME] Error detecting breakout: {e}")
-            return False, None
+        if start is None:
+            features = self._features = RegimeFeatureEngine()
+            self._price_history.clear()
+            start = 0
+        for candle in candles[start:]:
+            close = float(candle.get('close', 0))
+            features.add_bar(float(candle.get('high', 0)), float(candle.get('low', 0)), close,
+                             candle.get('time'))
+            self._price_history.append(close)
+        return features
     
     def _classify_regime(self, adx: float, atr_ratio: float, oscillation: float,
                         is_breakout: bool, breakout_direction: Optional[str],
@@ -558,6 +518,22 @@ class RegimeDetector:
         
         return params
     
+    def get_timeframe_slopes(self, bar_aggregator,
+                             timeframes=("M5", "M15", "H1", "H4")) -> Dict[str, float]:
+        """
+        Higher-timeframe slope metrics from a BarAggregator (no broker calls).
+
+        Returns:
+            Dict like {'slope_h1': bps_per_bar, ...} for each available timeframe
+        """
+        slopes = {}
+        if bar_aggregator is None:
+            return slopes
+        for tf in timeframes:
+            if tf in bar_aggregator.series:
+                slopes[f"slope_{tf.lower()}"] = float(bar_aggregator.get_slope_bps(tf))
+        return slopes
+    
     def get_current_regime(self) -> Optional[MarketRegime]:
         """
         Get the current detected regime.
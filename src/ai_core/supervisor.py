@@ -38,13 +38,15 @@ class Supervisor:
         self.current_regime = "UNKNOWN"
         logger.info("[SUPERVISOR] Agent Initialized with Geometrician Engine")
 
-    def detect_regime(self, market_data: Dict[str, Any], candles: Optional[List[Dict]] = None) -> Regime:
+    def detect_regime(self, market_data: Dict[str, Any], candles: Optional[List[Dict]] = None,
+                      bar_aggregator=None) -> Regime:
         """
         Analyze market data to classify the current regime.
         
         Args:
             market_data: Dictionary of indicators (ATR, ADX, etc.)
             candles: List of candlestick data (Required for Entropy/Hurst)
+            bar_aggregator: Optional BarAggregator; adds higher-timeframe slopes to metrics
             
         Returns:
             Regime object with classification and metrics.
@@ -52,11 +54,11 @@ class Supervisor:
         try:
             # 1. [GEOMETRICIAN] Advanced Regime Detection (Entropy/Hurst)
             geo_regime = None
-            geo_metrics = {}
+            geo_metrics = self.geometrician.get_timeframe_slopes(bar_aggregator)
             if candles:
                 atr_val = market_data.get('atr', 0.0)
                 geo_signal = self.geometrician.detect(candles, current_atr=atr_val)
-                geo_metrics = geo_signal.metrics
+                geo_metrics = {**geo_signal.metrics, **geo_metrics}
                 
                 # Check for CHAOS (Entropy > 0.85)
                 # The Geometrician's detect() already handles this and returns MarketRegime.CHAOTIC
@@ -1,6 +1,7 @@
 import time
 import logging
-from collections import deque
+
+from .microstructure import create_backend, SIDE_BUY, SIDE_SELL, SIDE_NEUTRAL
 
 # [SUPERBOT INTEGRATION] Importar Nucleo Rust de Baja Latencia
 try:
@@ -19,59 +20,88 @@ class TickPressureAnalyzer:
     "Holographic" Market View: Simulates Order Flow (Level 2) using Tick Velocity.
     Detects Institutional Aggression vs Retail Noise.
     
-    [SUPERBOT EVOLUTION] Enhanced with Rust Core for VPIN calculation.
+    [SUPERBOT EVOLUTION] Tick window, flow buckets and VPIN live in a
+    microstructure backend (Rust core when available, NumPy otherwise).
     """
     def __init__(self, window_seconds=5):
         self.window_seconds = window_seconds
-        self.ticks = deque() # Stores (price, time)
-        
-        # ENHANCEMENT 2: Order Flow Imbalance Tracking
-        self.buy_volume_buffer = deque(maxlen=100)
-        self.sell_volume_buffer = deque(maxlen=100)
         self.max_buffer_size = 100
         
-        # [SUPERBOT] Inicializar motor Rust si está disponible
-        self.rust_engine = None
-        
-        # Corrección de Scope: Solo leemos la variable global, no intentamos modificarla
-        if RUST_AVAILABLE:
-            try:
-                # Inicializar con bucket_size=1.0 (no usado) y buffer=100
-                self.rust_engine = aether_fast_core.MicrostructureAnalyzer(1.0, 100)
-            except Exception as e:
-                logger.error(f"Error inicializando motor Rust: {e}")
-                self.rust_engine = None # Fallback explícito a Python
+        # [SUPERBOT] Backend owns the tick window and the buy/sell volume buckets
+        self.backend = create_backend(
+            aether_fast_core if RUST_AVAILABLE else None,
+            window_seconds=window_seconds,
+            max_buckets=self.max_buffer_size,
+        )
+        logger.info(f"Microstructure backend: {self.backend.name}")
+
+        # Window runs on broker tick time; re-polled ticks are not counted twice
+        self._last_tick_key = None
+        self._clock_offset = 0.0  # broker_time - wall_time at the last new tick
+        self._window_version = 0  # Bumped whenever the tick window changes
+        self._pressure_cache = None  # ((window_version, point_value), metrics)
+
+    @staticmethod
+    def _tick_time(tick) -> float:
+        """Broker timestamp of the tick in seconds (time_msc preferred), wall clock if missing."""
+        try:
+            msc = float(tick.get('time_msc', 0) or 0)
+            if msc > 0:
+                return msc / 1000.0
+            ts = float(tick.get('time', 0) or 0)
+            if ts > 10_000_000_000:
+                ts = ts / 1000.0
+            if ts > 0:
+                return ts
+        except (TypeError, ValueError):
+            pass
+        return time.time()
 
     def add_tick(self, tick):
         """
         Add a new tick to the analyzer.
         Args:
-            tick: Dictionary containing 'bid', 'ask', 'time'
+            tick: Dictionary containing 'bid', 'ask', 'time' (and 'time_msc' if available)
         """
         if not tick:
             return
             
         # Use Bid price for pressure analysis.
         price = tick.get('bid', 0.0)
-        current_time = time.time()
-        
-        if price > 0:
-            self.ticks.append((price, current_time))
-            self._cleanup(current_time)
-            
-            # [SUPERBOT] Si tenemos Rust, alimentamos el motor también aquí
-            # para mantener el estado sincronizado
+        if price <= 0:
+            return
+
+        tick_time = self._tick_time(tick)
+        key = (tick_time, price, tick.get('ask', 0.0))
+        if key == self._last_tick_key:
+            # Same broker tick polled again: only slide the window on the broker clock
+            if self.backend.advance(time.time() + self._clock_offset):
+                self._window_version += 1
+            return
 
-    def _cleanup(self, current_time):
-        while self.ticks and (current_time - self.ticks[0][1] > self.window_seconds):
-            self.ticks.popleft()
+        self._last_tick_key = key
+        self._clock_offset = tick_time - time.time()
+        self.backend.add_tick(price, tick_time)
+        self._window_version += 1
             
     def get_pressure_metrics(self, point_value=0.01):
         """
         Calculates Tick Pressure (Aggression).
+        Cached until the tick window changes.
         Returns: Dictionary with pressure metrics
         """
-        if len(self.ticks) < 5:
+        cache_key = (self._window_version, point_value)
+        cached = self._pressure_cache
+        if cached is not None and cached[0] == cache_key:
+            return dict(cached[1])
+
+        metrics = self._compute_pressure_metrics(point_value)
+        self._pressure_cache = (cache_key, metrics)
+        return dict(metrics)
+
+    def _compute_pressure_metrics(self, point_value):
+        tick_count, start_price, end_price, duration, _ = self.backend.window_stats()
+        if tick_count < 5:
             return {
                 'pressure_score': 0.0,
                 'intensity': 'LOW',
@@ -80,12 +110,8 @@ class TickPressureAnalyzer:
                 'velocity': 0.0
             }
             
-        start_price = self.ticks[0][0]
-        end_price = self.ticks[-1][0]
         price_change = end_price - start_price
         
-        tick_count = len(self.ticks)
-        duration = self.ticks[-1][1] - self.ticks[0][1]
         if duration <= 0: duration = 0.001
         
         # Velocity = Ticks per Second (Speed of orders)
@@ -159,40 +185,27 @@ class TickPressureAnalyzer:
             # [FIX] Nueva línea (Si hay precio 'last', es un trade real)
             is_quote_update = abs(last_price) < 1e-9
             
-            # Determine Aggressor Side (0=Buy, 1=Sell, 2=Neutral) for Rust
-            side_rust = 2 
+            # Determine Aggressor Side (0=Buy, 1=Sell, 2=Neutral -> split half/half)
+            side = SIDE_NEUTRAL
             
             if not is_quote_update:
                 if last_price >= ask:
-                    self.buy_volume_buffer.append(volume)
-                    side_rust = 0 # BUY
+                    side = SIDE_BUY
                 elif last_price <= bid:
-                    self.sell_volume_buffer.append(volume)
-                    side_rust = 1 # SELL
-                else:
-                    self.buy_volume_buffer.append(volume / 2)
-                    self.sell_volume_buffer.append(volume / 2)
+                    side = SIDE_SELL
             else:
                 # Quote Update Logic
                 if mid_price > self._prev_mid:
-                    self.buy_volume_buffer.append(volume)
-                    side_rust = 0 # BUY
+                    side = SIDE_BUY
                 elif mid_price < self._prev_mid:
-                    self.sell_volume_buffer.append(volume)
-                    side_rust = 1 # SELL
-                else:
-                    self.buy_volume_buffer.append(volume / 2)
-                    self.sell_volume_buffer.append(volume / 2)
+                    side = SIDE_SELL
             
             self._prev_mid = mid_price
 
-            # [SUPERBOT] ALIMENTAR MOTOR RUST (Si existe)
-            if self.rust_engine:
-                self.rust_engine.calculate_vpin(0.0, volume, side_rust)
+            # [SUPERBOT] Feed the backend (Rust core carries VPIN when available)
+            self.backend.add_flow(volume, side)
             
-            # Python Legacy Logic (Keep for fallback/display)
-            buy_vol = sum(self.buy_volume_buffer) if self.buy_volume_buffer else 0
-            sell_vol = sum(self.sell_volume_buffer) if self.sell_volume_buffer else 0
+            buy_vol, sell_vol, _, _ = self.backend.flow_totals()
             total_vol = buy_vol + sell_vol
             
             if total_vol > 0:
@@ -224,42 +237,21 @@ class TickPressureAnalyzer:
         [THE CHEMIST] Calculate Volume-Synchronized Probability of Informed Trading.
         Fallback: |V_buy - V_sell| / Total_Volume (Python)
         """
-        if self.rust_engine:
-            pass
-
-        buy_vol = sum(self.buy_volume_buffer) if self.buy_volume_buffer else 0
-        sell_vol = sum(self.sell_volume_buffer) if self.sell_volume_buffer else 0
-        total_vol = buy_vol + sell_vol
-        
-        if total_vol <= 0:
-            return 0.0
-            
-        buy_samples = len(self.buy_volume_buffer)
-        sell_samples = len(self.sell_volume_buffer)
-        
-        if (buy_samples + sell_samples) < 15:
-            return 0.0
-            
-        return abs(buy_vol - sell_vol) / total_vol
+        return self.backend.vpin()
 
     def calculate_reynolds_number(self, spread_points: float, point_value: float = 0.01) -> float:
         """
         [THE PHYSICIST] Calculate Reynolds Number (Re) for Phase Transition detection.
         Re = (Volume * Volatility) / Viscosity(Spread)
         """
-        if spread_points <= 0 or not self.ticks:
+        tick_count, _, _, duration, price_std = self.backend.window_stats()
+        if spread_points <= 0 or tick_count == 0:
             return 0.0
             
-        duration = self.ticks[-1][1] - self.ticks[0][1]
         if duration <= 0: duration = 0.001
-        velocity = len(self.ticks) / duration
+        velocity = tick_count / duration
         
-        prices = [p[0] for p in self.ticks]
-        if len(prices) > 2:
-            import numpy as np
-            volatility = np.std(prices) / point_value
-        else:
-            volatility = 0.0
+        volatility = price_std / point_value if tick_count > 2 else 0.0
             
         viscosity = spread_points
         re = (velocity * volatility * 100) / viscosity
@@ -277,13 +269,13 @@ class TickPressureAnalyzer:
         """
         [THE CHEMIST] Calculate Liquidity Consumption Rate.
         """
-        if len(self.ticks) < 2: 
+        tick_count, _, _, duration, _ = self.backend.window_stats()
+        if tick_count < 2: 
             return 0.0
             
-        duration = self.ticks[-1][1] - self.ticks[0][1]
         if duration <= 0: return 0.0
         
-        return len(self.ticks) / duration
+        return tick_count / duration
 
     def get_combined_analysis(self, tick, point_value=0.01):
         """
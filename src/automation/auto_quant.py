@@ -3,6 +3,7 @@ import os
 import shutil
 import time
 from src.ai_core.nexus_trainer import NexusTrainer
+from src.ai_core.oracle_backends import artifact_paths
 
 
 # Setup Logging
@@ -53,6 +54,16 @@ class AutoQuant:
         shutil.move(self.candidate_model_path, self.live_model_path)
         logger.info(f"New Brain Deployed to {self.live_model_path}")
 
+        # Exported CPU artifacts travel with the checkpoint; drop stale ones from the old brain
+        candidate_artifacts = artifact_paths(self.candidate_model_path)
+        live_artifacts = artifact_paths(self.live_model_path)
+        for fmt, live_path in live_artifacts.items():
+            if os.path.exists(candidate_artifacts[fmt]):
+                shutil.move(candidate_artifacts[fmt], live_path)
+                logger.info(f"{fmt} artifact deployed to {live_path}")
+            elif os.path.exists(live_path):
+                os.remove(live_path)
+
 if __name__ == "__main__":
     aq = AutoQuant()
     aq.run_cycle()
@@ -82,6 +82,14 @@ class BrokerAdapter(ABC):
         """
         pass
 
+    async def execute_order_async(self, *args, **kwargs) -> Dict:
+        """
+        Non-blocking execute_order for async callers.
+        Default runs execute_order in a worker thread; adapters may override.
+        """
+        import asyncio
+        return await asyncio.to_thread(self.execute_order, *args, **kwargs)
+
     @abstractmethod
     def get_positions(self, symbol: Optional[str] = None) -> Optional[list]:
         """Get currently open trades. Returns None on error."""
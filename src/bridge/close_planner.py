@@ -0,0 +1,273 @@
+"""
+Bucket Close Planner
+
+Computes a minimum-deal close sequence for a set of hedged positions on a
+hedging account:
+
+1. Exact pairs: opposite positions with equal volume, closed by each other
+   (one CLOSE_BY removes both).
+2. Netting chain: the remaining opposite volume is netted with partial
+   CLOSE_BYs. MT5 closes the smaller leg completely and reduces the larger
+   one, so every chain step removes at least one position. The minority side
+   is absorbed into the smallest majority legs first, which leaves the
+   residual concentrated in as few positions as possible.
+3. Residual: whatever is left (all on one side) is market-closed.
+
+Every CLOSE_BY pays no spread, so only the residual volume crosses the book.
+Volumes are planned in integer lot steps to avoid float drift.
+
+Residual merge: on a hedging account a market close deal closes exactly one
+position ticket, and its volume cannot exceed that position's volume. The
+chain already leaves the residual in a single leg whenever one leg can hold
+it (largest majority leg >= residual volume). When it cannot, the residual
+spans several legs of the same side; with merge_residual the planner then
+opens one opposite NET position for the whole residual (the only deal that
+crosses the book, at a single price) and CLOSE_BYs it against each leg.
+That costs one extra deal but replaces N market fills with one. On netting
+accounts (allow_close_by=False) nothing is merged: the broker keeps one
+position per symbol anyway.
+
+The planner is broker-free; `simulate_plan` replays a plan against the input
+positions with MT5 CLOSE_BY semantics and is used to verify dry runs.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+CLOSE_BY = "CLOSE_BY"
+MARKET = "MARKET"
+NET_OPEN = "NET_OPEN"
+
+# Placeholder ticket of the NET position until the broker assigns the real one
+NET_TICKET = -1
+
+# Execution stages: steps within a stage are independent and may run in parallel,
+# except the netting chain (stage 1) which must run in order.
+STAGE_INDEPENDENT = 0
+STAGE_CHAIN = 1
+STAGE_RESIDUAL = 2
+# Residual merge: the NET_OPEN step, then CLOSE_BYs of NET_TICKET against each leg
+STAGE_NET = 3
+
+
+@dataclass(frozen=True)
+class CloseStep:
+    kind: str          # CLOSE_BY, MARKET or NET_OPEN
+    symbol: str
+    ticket: int
+    by_ticket: int     # Opposite ticket for CLOSE_BY, 0 otherwise
+    volume: float      # Volume netted (CLOSE_BY) or sent to market (MARKET/NET_OPEN)
+    stage: int
+    side: int = -1     # Order side of a NET_OPEN (0=BUY, 1=SELL)
+
+
+@dataclass
+class ClosePlan:
+    steps: List[CloseStep] = field(default_factory=list)
+
+    @property
+    def deal_count(self) -> int:
+        return len(self.steps)
+
+    @property
+    def close_by_count(self) -> int:
+        return sum(1 for s in self.steps if s.kind == CLOSE_BY)
+
+    @property
+    def market_count(self) -> int:
+        """Deals that cross the book (MARKET closes and NET opens)."""
+        return sum(1 for s in self.steps if s.kind != CLOSE_BY)
+
+    @property
+    def market_volume(self) -> float:
+        return sum(s.volume for s in self.steps if s.kind != CLOSE_BY)
+
+    def stage(self, stage: int) -> List[CloseStep]:
+        return [s for s in self.steps if s.stage == stage]
+
+    def describe(self) -> str:
+        parts = []
+        for s in self.steps:
+            if s.kind == CLOSE_BY:
+                parts.append(f"#{s.ticket}x#{s.by_ticket}({s.volume:g})")
+            elif s.kind == NET_OPEN:
+                parts.append(f"NET {'BUY' if s.side == 0 else 'SELL'}({s.volume:g})")
+            else:
+                parts.append(f"MKT#{s.ticket}({s.volume:g})")
+        return " -> ".join(parts) if parts else "(empty)"
+
+
+def _field(p, name, default=None):
+    if hasattr(p, name):
+        return getattr(p, name)
+    if isinstance(p, dict):
+        return p.get(name, default)
+    return default
+
+
+def _precision(step: float) -> int:
+    text = f"{step:.10f}".rstrip("0")
+    return len(text.split(".")[1]) if "." in text else 0
+
+
+def plan_symbol_close(positions: list, volume_step: float = 0.01,
+                      allow_close_by: bool = True, merge_residual: bool = True) -> ClosePlan:
+    """
+    Plan the close of one symbol's positions.
+
+    Args:
+        positions: Position objects or dicts with ticket/symbol/volume/type (0=BUY, 1=SELL)
+        volume_step: Symbol lot step used to convert volumes to integer units
+        allow_close_by: False plans plain market closes (netting accounts)
+        merge_residual: Send a residual spread over several legs to market as one
+            NET position closed by each leg (see module docstring)
+    """
+    plan = ClosePlan()
+    if not positions:
+        return plan
+
+    step = volume_step if volume_step and volume_step > 0 else 0.01
+    digits = _precision(step)
+
+    def to_vol(units: int) -> float:
+        return round(units * step, digits)
+
+    symbol = _field(positions[0], 'symbol', '')
+    legs = []  # [ticket, units, side]
+    for p in positions:
+        units = int(round(float(_field(p, 'volume', 0.0)) / step))
+        if units > 0:
+            legs.append([int(_field(p, 'ticket')), units, int(_field(p, 'type', 0))])
+
+    if not allow_close_by:
+        for ticket, units, _ in legs:
+            plan.steps.append(CloseStep(MARKET, symbol, ticket, 0, to_vol(units), STAGE_INDEPENDENT))
+        return plan
+
+    buys = sorted((l for l in legs if l[2] == 0), key=lambda l: l[1], reverse=True)
+    sells = sorted((l for l in legs if l[2] == 1), key=lambda l: l[1], reverse=True)
+
+    # 1. Exact pairs
+    sells_by_units: Dict[int, List[list]] = {}
+    for s in sells:
+        sells_by_units.setdefault(s[1], []).append(s)
+    paired = set()
+    for b in buys:
+        bucket = sells_by_units.get(b[1])
+        if bucket:
+            s = bucket.pop(0)
+            paired.add(b[0])
+            paired.add(s[0])
+            plan.steps.append(CloseStep(CLOSE_BY, symbol, b[0], s[0], to_vol(b[1]), STAGE_INDEPENDENT))
+    buys = [b for b in buys if b[0] not in paired]
+    sells = [s for s in sells if s[0] not in paired]
+
+    # 2. Netting chain: minority volume flows into the smallest majority legs first
+    if sum(b[1] for b in buys) >= sum(s[1] for s in sells):
+        major, minor = buys, sells
+    else:
+        major, minor = sells, buys
+    major.sort(key=lambda l: l[1])
+    minor.sort(key=lambda l: l[1], reverse=True)
+    untouched = {l[0] for l in major}
+
+    while major and minor:
+        pair = _find_exact(major, minor)
+        if pair is not None:
+            target, carrier = pair
+        else:
+            target, carrier = major[0], minor[0]
+        netted = min(target[1], carrier[1])
+        plan.steps.append(CloseStep(CLOSE_BY, symbol, carrier[0], target[0], to_vol(netted), STAGE_CHAIN))
+        untouched.discard(target[0])
+        target[1] -= netted
+        carrier[1] -= netted
+        if target[1] == 0:
+            major.remove(target)
+        if carrier[1] == 0:
+            minor.remove(carrier)
+        major.sort(key=lambda l: l[1])
+
+    residual = major + minor
+    if merge_residual and len(residual) > 1:
+        # 3a. One opposite NET deal for the whole residual, then close it by each leg
+        side = 1 - residual[0][2]
+        plan.steps.append(CloseStep(NET_OPEN, symbol, NET_TICKET, 0,
+                                    to_vol(sum(l[1] for l in residual)), STAGE_NET, side))
+        for ticket, units, _ in residual:
+            plan.steps.append(CloseStep(CLOSE_BY, symbol, NET_TICKET, ticket, to_vol(units), STAGE_NET))
+        return plan
+
+    # 3. Residual market closes (legs the chain never touched can go immediately)
+    for ticket, units, _ in residual:
+        stage = STAGE_INDEPENDENT if ticket in untouched else STAGE_RESIDUAL
+        plan.steps.append(CloseStep(MARKET, symbol, ticket, 0, to_vol(units), stage))
+
+    return plan
+
+
+def _find_exact(major: list, minor: list):
+    """Return (major_leg, minor_leg) with equal remaining units, or None."""
+    by_units = {}
+    for leg in major:
+        by_units.setdefault(leg[1], leg)
+    for leg in minor:
+        match = by_units.get(leg[1])
+        if match is not None:
+            return match, leg
+    return None
+
+
+def plan_bucket_close(positions: list, volume_steps: Dict[str, float] = None,
+                      allow_close_by: bool = True, merge_residual: bool = True) -> ClosePlan:
+    """Plan a close across symbols (each symbol is netted independently)."""
+    by_symbol: Dict[str, list] = {}
+    for p in positions:
+        by_symbol.setdefault(_field(p, 'symbol', ''), []).append(p)
+
+    plan = ClosePlan()
+    for symbol, plist in by_symbol.items():
+        step = (volume_steps or {}).get(symbol, 0.01)
+        plan.steps.extend(plan_symbol_close(plist, step, allow_close_by, merge_residual).steps)
+    return plan
+
+
+def simulate_plan(positions: list, plan: ClosePlan,
+                  volume_step: float = 0.01) -> Tuple[bool, Dict[int, float]]:
+    """
+    Replay a plan with MT5 semantics (CLOSE_BY closes the smaller leg and
+    reduces the larger one; MARKET closes the given volume; NET_OPEN opens
+    NET_TICKET, which must be flat again by the end).
+
+    Returns:
+        (flat, remaining) where flat is True when every position ends at zero
+        and no step referenced a closed or same-side position
+    """
+    step = volume_step if volume_step and volume_step > 0 else 0.01
+    units = {int(_field(p, 'ticket')): int(round(float(_field(p, 'volume', 0.0)) / step)) for p in positions}
+    sides = {int(_field(p, 'ticket')): int(_field(p, 'type', 0)) for p in positions}
+    valid = True
+
+    for s in plan.steps:
+        vol = int(round(s.volume / step))
+        if s.kind == NET_OPEN:
+            if units.get(s.ticket, 0) > 0 or s.side not in (0, 1):
+                valid = False
+                continue
+            units[s.ticket] = vol
+            sides[s.ticket] = s.side
+        elif s.kind == CLOSE_BY:
+            a, b = units.get(s.ticket, 0), units.get(s.by_ticket, 0)
+            if a <= 0 or b <= 0 or sides.get(s.ticket) == sides.get(s.by_ticket) or min(a, b) != vol:
+                valid = False
+                continue
+            units[s.ticket] = a - vol
+            units[s.by_ticket] = b - vol
+        else:
+            if units.get(s.ticket, 0) < vol:
+                valid = False
+                continue
+            units[s.ticket] -= vol
+
+    remaining = {t: round(u * step, _precision(step)) for t, u in units.items() if u}
+    return valid and not remaining, remaining
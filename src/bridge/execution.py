@@ -0,0 +1,255 @@
+"""
+Order Execution Pipeline Helpers
+
+- OrderTemplates: per-symbol request templates with the filling and deviation
+  policy worked out once (from the cached SymbolSpec and env), so a send only
+  merges the per-order fields.
+- Retry policy: which retcodes are retried and how long to back off. The
+  async callers await the delay instead of sleeping inside pool threads.
+- ExecutionStats: per-symbol send->ack latency and fill-vs-request slippage
+  histograms plus requote/reject counters.
+- BrokerCallStats / timed_broker_call: per-method latency of adapter calls
+  (tick, positions, account, orders, closes).
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from src.utils.histogram import Histogram, LATENCY_MS_BOUNDS, SLIPPAGE_POINTS_BOUNDS
+
+logger = logging.getLogger("MT5Adapter")
+
+RETCODE_REQUOTE = 10004
+RETCODE_NO_CONNECTION = 10031
+
+# Requote, No Connection, No Quotes/Price Changed, Timeout, Invalid Price, Invalid Stops
+OPEN_RETRY_RETCODES = frozenset({10004, 10031, 10021, 10036, 10015, 10016})
+# Requote, Invalid Price, No Quotes/Price Changed, No Connection
+CLOSE_RETRY_RETCODES = frozenset({10004, 10015, 10021, 10031})
+# Retcodes counted as price rejections (requote-like)
+PRICE_REJECT_RETCODES = frozenset({10015, 10020, 10021})
+
+
+def retry_delay(retcode: Optional[int], attempt: int, kind: str = "open") -> float:
+    """Backoff before retry `attempt + 1` (retcode None = order_send returned None)."""
+    if retcode is None:
+        return 0.25 * (attempt + 1)
+    if kind == "close":
+        return (0.75 if retcode == RETCODE_NO_CONNECTION else 0.15) * (attempt + 1)
+    return (2.0 if retcode == RETCODE_NO_CONNECTION else 0.5) * (attempt + 1)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+class OrderTemplates:
+    """
+    Pre-built request dicts per (symbol, kind). A template is rebuilt only when
+    the symbol's cached spec object changes (refresh or invalidation).
+
+    Kinds: "open" (market deal), "pending" (limit/stop), "close" (market close).
+    """
+
+    def __init__(self, mt5_module, spec_cache):
+        self._mt5 = mt5_module
+        self._specs = spec_cache
+        self._templates: Dict[Tuple[str, str], Tuple[object, Dict]] = {}
+        self._lock = threading.Lock()
+
+        self.open_deviation = _env_int("AETHER_OPEN_DEVIATION", 20)
+        self.close_deviation_xau = _env_int("AETHER_CLOSE_DEVIATION_XAU", 180)
+        self.close_deviation_jpy = _env_int("AETHER_CLOSE_DEVIATION_JPY", 120)
+        self.close_deviation_fx = _env_int("AETHER_CLOSE_DEVIATION_FX", 60)
+        self.close_deviation_max = _env_int("AETHER_CLOSE_DEVIATION_MAX", 600)
+
+    def _filling(self, spec) -> int:
+        mt5 = self._mt5
+        if spec is not None and not spec.supports_ioc and spec.supports_fok:
+            return mt5.ORDER_FILLING_FOK
+        return mt5.ORDER_FILLING_IOC
+
+    def _close_base_deviation(self, symbol: str) -> int:
+        if "XAU" in symbol or "GOLD" in symbol:
+            return self.close_deviation_xau
+        if "JPY" in symbol:
+            return self.close_deviation_jpy
+        return self.close_deviation_fx
+
+    def close_deviation(self, symbol: str, attempt: int) -> int:
+        """Start tight to protect profits; widen only on requotes/price errors."""
+        return min(self.close_deviation_max, self._close_base_deviation(symbol) * (attempt + 1))
+
+    def _build(self, symbol: str, kind: str, spec) -> Dict:
+        mt5 = self._mt5
+        template = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": symbol,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": self._filling(spec),
+        }
+        if kind == "pending":
+            # Pending orders usually use RETURN
+            template["type_filling"] = mt5.ORDER_FILLING_RETURN
+            template["deviation"] = self.open_deviation
+        elif kind == "close":
+            template["deviation"] = self.close_deviation(symbol, 0)
+        else:
+            template["deviation"] = self.open_deviation
+        return template
+
+    def build(self, symbol: str, kind: str, **fields) -> Dict:
+        """Return a fresh request: the cached template merged with per-order fields."""
+        spec = self._specs.get(symbol)
+        key = (symbol, kind)
+        cached = self._templates.get(key)
+        if cached is None or cached[0] is not spec:
+            template = self._build(symbol, kind, spec)
+            with self._lock:
+                self._templates[key] = (spec, template)
+        else:
+            template = cached[1]
+        request = dict(template)
+        request.update(fields)
+        return request
+
+
+class _SymbolExecStats:
+    __slots__ = ("latency_ms", "slippage_points", "sends", "done", "requotes",
+                 "price_rejects", "rejects", "no_result")
+
+    def __init__(self):
+        self.latency_ms = Histogram(LATENCY_MS_BOUNDS)
+        self.slippage_points = Histogram(SLIPPAGE_POINTS_BOUNDS)
+        self.sends = 0
+        self.done = 0
+        self.requotes = 0
+        self.price_rejects = 0
+        self.rejects = 0
+        self.no_result = 0
+
+
+class ExecutionStats:
+    """Per-symbol order send metrics (thread-safe)."""
+
+    def __init__(self, done_retcode: int = 10009):
+        self._done = done_retcode
+        self._symbols: Dict[str, _SymbolExecStats] = {}
+        self._lock = threading.Lock()
+        self._total_sends = 0
+        self._log_every = _env_int("AETHER_EXEC_STATS_LOG_EVERY", 50)
+
+    def _get(self, symbol: str) -> _SymbolExecStats:
+        stats = self._symbols.get(symbol)
+        if stats is None:
+            with self._lock:
+                stats = self._symbols.setdefault(symbol, _SymbolExecStats())
+        return stats
+
+    def record(self, symbol: str, latency_ms: float, result, request_price: Optional[float] = None,
+               point: float = 0.0) -> None:
+        stats = self._get(symbol)
+        stats.latency_ms.observe(latency_ms)
+        with self._lock:
+            stats.sends += 1
+            self._total_sends += 1
+            total = self._total_sends
+            if result is None:
+                stats.no_result += 1
+            elif result.retcode == self._done:
+                stats.done += 1
+            elif result.retcode == RETCODE_REQUOTE:
+                stats.requotes += 1
+            elif result.retcode in PRICE_REJECT_RETCODES:
+                stats.price_rejects += 1
+            else:
+                stats.rejects += 1
+
+        if result is not None and result.retcode == self._done and request_price and point > 0:
+            fill = getattr(result, 'price', 0.0) or 0.0
+            if fill > 0:
+                stats.slippage_points.observe(round(abs(fill - float(request_price)) / point, 6))
+
+        if self._log_every > 0 and total % self._log_every == 0:
+            self.log_summary()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        out = {}
+        for symbol, s in list(self._symbols.items()):
+            out[symbol] = {
+                "sends": s.sends,
+                "done": s.done,
+                "requotes": s.requotes,
+                "price_rejects": s.price_rejects,
+                "rejects": s.rejects,
+                "no_result": s.no_result,
+                "latency_ms": s.latency_ms.snapshot(),
+                "slippage_points": s.slippage_points.snapshot(),
+            }
+        return out
+
+    def log_summary(self) -> None:
+        for symbol, s in list(self._symbols.items()):
+            logger.info(
+                f"[EXEC STATS] {symbol}: sends={s.sends} done={s.done} requotes={s.requotes} "
+                f"price_rejects={s.price_rejects} rejects={s.rejects} | "
+                f"ack {s.latency_ms.summary('ms')} | slip {s.slippage_points.summary('pt')}"
+            )
+
+
+def timed_send(order_send, request: Dict):
+    """Call order_send and return (result, latency_ms)."""
+    start = time.perf_counter()
+    result = order_send(request)
+    return result, (time.perf_counter() - start) * 1000.0
+
+
+class BrokerCallStats:
+    """Per-method broker call latency (thread-safe)."""
+
+    def __init__(self):
+        self._methods: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, latency_ms: float) -> None:
+        hist = self._methods.get(method)
+        if hist is None:
+            with self._lock:
+                hist = self._methods.setdefault(method, Histogram(LATENCY_MS_BOUNDS))
+        hist.observe(latency_ms)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {method: hist.snapshot() for method, hist in list(self._methods.items())}
+
+
+def timed_broker_call(method: str):
+    """Record the wall time of an adapter method in `self.call_stats` (sync or async)."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(self, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(self, *args, **kwargs)
+                finally:
+                    self.call_stats.observe(method, (time.perf_counter() - start) * 1000.0)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                self.call_stats.observe(method, (time.perf_counter() - start) * 1000.0)
+        return wrapper
+
+    return decorator
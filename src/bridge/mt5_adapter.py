@@ -4,10 +4,21 @@ except ImportError:
     mt5 = None
 
 from .broker_interface import BrokerAdapter, Position, Deal
+from .symbol_specs import SymbolSpec, get_symbol_spec_cache
+from .execution import (
+    OrderTemplates, ExecutionStats, BrokerCallStats, CLOSE_RETRY_RETCODES, OPEN_RETRY_RETCODES,
+    retry_delay, timed_send, timed_broker_call,
+)
+from .close_planner import (
+    ClosePlan, CloseStep, CLOSE_BY, MARKET, NET_OPEN, STAGE_INDEPENDENT, STAGE_CHAIN,
+    STAGE_NET, plan_bucket_close, simulate_plan,
+)
+from src.config.runtime_settings import runtime_settings
 from typing import Dict, Optional
 import logging
 import os
 import math
+import time
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
@@ -20,10 +31,20 @@ class MT5Adapter(BrokerAdapter):
         self.server = server
         self._resolved_symbols = {}  # Cache for fuzzy symbol matching
 
+        # Shared immutable symbol specs (loaded at connect, refreshed in background)
+        self.symbol_specs = get_symbol_spec_cache()
+        self.symbol_specs.bind_loader(self._load_symbol_spec)
+
+        # Pre-armed request templates and send->ack / slippage metrics
+        self.order_templates = OrderTemplates(mt5, self.symbol_specs)
+        self.execution_stats = ExecutionStats(getattr(mt5, 'TRADE_RETCODE_DONE', 10009))
+        self.call_stats = BrokerCallStats()
+
         # Persistent close executor to avoid per-batch threadpool startup overhead.
         self._close_executor = None
         self._close_executor_max_workers: int = 0
         self._close_executor_lock = threading.Lock()
+        self._margin_mode = None  # Account margin mode (read once per connection)
 
     def _log_connection_details(self) -> None:
         """Helper to log account info on successful connection."""
@@ -37,6 +58,13 @@ class MT5Adapter(BrokerAdapter):
             logger.warning("[MT5] Could not retrieve account information")
 
     def connect(self) -> bool:
+        self._margin_mode = None
+        connected = self._connect_terminal()
+        if connected:
+            self._preload_symbol_specs()
+        return connected
+
+    def _connect_terminal(self) -> bool:
         if mt5 is None:
             logger.error("MetaTrader5 module not found. Cannot connect.")
             return False
@@ -120,6 +148,32 @@ class MT5Adapter(BrokerAdapter):
                 
         return True
 
+    def _load_symbol_spec(self, symbol: str) -> Optional[SymbolSpec]:
+        info = mt5.symbol_info(symbol)
+        if info is None:
+            resolved = self._resolve_symbol(symbol)
+            if resolved and resolved != symbol:
+                info = mt5.symbol_info(resolved)
+        return SymbolSpec.from_symbol_info(info) if info is not None else None
+
+    def _preload_symbol_specs(self) -> None:
+        """Cache specs for every Market Watch symbol in one terminal call."""
+        try:
+            symbols = mt5.symbols_get() or ()
+            loaded = 0
+            for info in symbols:
+                if getattr(info, 'visible', False):
+                    self.symbol_specs.store(SymbolSpec.from_symbol_info(info))
+                    loaded += 1
+            logger.info(f"[MT5] Cached symbol specs for {loaded} Market Watch symbols")
+        except Exception as e:
+            logger.warning(f"[MT5] Symbol spec preload failed: {e}")
+
+        self.symbol_specs.start_refresher(runtime_settings().symbol_spec_refresh_s)
+
+    def get_symbol_spec(self, symbol: str) -> Optional[SymbolSpec]:
+        return self.symbol_specs.get(symbol)
+
     def _resolve_symbol(self, requested_symbol: str) -> Optional[str]:
         """
         Fuzzy match symbol to handle broker suffixes (e.g. 'XAUUSD' -> 'XAUUSD.m').
@@ -157,6 +211,7 @@ class MT5Adapter(BrokerAdapter):
 
         return None
 
+    @timed_broker_call("get_market_data")
     def get_market_data(self, symbol: str, timeframe: str, limit: int) -> list:
         # Use resolved symbol
         actual_symbol = self._resolve_symbol(symbol)
@@ -198,6 +253,7 @@ class MT5Adapter(BrokerAdapter):
         tick = mt5.symbol_info_tick(actual_symbol)
         return tick.bid if tick else 0.0
 
+    @timed_broker_call("get_tick")
     def get_tick(self, symbol: str) -> Dict:
         # 1. Check connection
         terminal_info = mt5.terminal_info()
@@ -227,16 +283,36 @@ class MT5Adapter(BrokerAdapter):
                 'bid': tick.bid,
                 'ask': tick.ask,
                 'time': tick.time,
+                'time_msc': getattr(tick, 'time_msc', 0),
                 'flags': tick.flags
             }
         
         logger.warning(f"[MT5] symbol_info_tick returned None for {actual_symbol} (Error: {mt5.last_error()})")
         return None
 
-    def execute_order(self, symbol, action, volume, order_type, price=None, sl=0.0, tp=0.0, magic=0, comment="", ticket=None, **kwargs) -> Dict:
+    def _send_order(self, request: Dict):
+        """order_send with send->ack latency, retcode and fill slippage recorded."""
+        result, latency_ms = timed_send(mt5.order_send, request)
+        symbol = request.get("symbol", "")
+        spec = self.symbol_specs.get(symbol) if symbol else None
+        self.execution_stats.record(symbol, latency_ms, result, request.get("price"),
+                                    spec.point if spec is not None else 0.0)
+        return result
+
+    def get_execution_stats(self) -> Dict[str, Dict]:
+        """Per-symbol send->ack latency / slippage histograms and requote counters."""
+        return self.execution_stats.snapshot()
+
+    def _prepare_order(self, symbol, action, volume, order_type, price, sl, tp, magic, comment, ticket, kwargs):
+        """
+        Validate and build the request for execute_order/execute_order_async.
+
+        Returns:
+            (request, mt5_type, normalized_volume, None) or (None, None, None, error_result)
+        """
         strict_entry = bool(kwargs.get('strict_entry', False) or getattr(self, 'strict_entry', False))
         strict_ok = kwargs.get('strict_ok', None)
-        trace_enabled = str(os.getenv("AETHER_DECISION_TRACE", "1")).strip().lower() in ("1", "true", "yes", "on")
+        trace_enabled = runtime_settings().decision_trace
         atr_ok = kwargs.get('atr_ok', None)
         rsi_ok = kwargs.get('rsi_ok', None)
         obi_ok = kwargs.get('obi_ok', None)
@@ -259,53 +335,39 @@ class MT5Adapter(BrokerAdapter):
         if strict_entry and action == "OPEN" and strict_ok is not True:
             msg = f"STRICT_BLOCK: OPEN rejected (strict_ok={strict_ok}) symbol={symbol}"
             logger.warning(f"[MT5] {msg}")
-            return {"ticket": None, "retcode": -1, "comment": msg}
+            return None, None, None, {"ticket": None, "retcode": -1, "comment": msg}
 
-        # ... existing logic from order_execution.py ...
-        # This is where we wrap the specific MT5 code
         # [QUANTUM SNIPER] Enhanced Order Type Mapping
-        if order_type == "BUY":
-            mt5_type = mt5.ORDER_TYPE_BUY
-        elif order_type == "SELL":
-            mt5_type = mt5.ORDER_TYPE_SELL
-        elif order_type == "BUY_LIMIT":
-            mt5_type = mt5.ORDER_TYPE_BUY_LIMIT
-        elif order_type == "SELL_LIMIT":
-            mt5_type = mt5.ORDER_TYPE_SELL_LIMIT
-        elif order_type == "BUY_STOP":
-            mt5_type = mt5.ORDER_TYPE_BUY_STOP
-        elif order_type == "SELL_STOP":
-            mt5_type = mt5.ORDER_TYPE_SELL_STOP
-        else:
+        mt5_type = self._ORDER_TYPES.get(order_type)
+        if mt5_type is None:
             logger.error(f"[MT5] Unknown order type: {order_type}")
-            return {"ticket": None, "retcode": -1}
+            return None, None, None, {"ticket": None, "retcode": -1}
+        mt5_type = getattr(mt5, mt5_type)
         
         # CRITICAL: Normalize lot size to MT5's volume_step before execution
         normalized_volume = self.normalize_lot_size(symbol, volume)
         
-        # Get symbol info for deviation
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info is None:
+        # Symbol spec must exist (cached; no terminal round-trip once loaded)
+        if self.symbol_specs.get(symbol) is None:
             logger.error(f"Failed to get symbol info for {symbol}")
-            return {"ticket": None, "retcode": -1}
-        
-        request = {
-            "symbol": symbol,
-            "volume": normalized_volume,
-            "type": mt5_type,
-            "price": price if price else (mt5.symbol_info_tick(symbol).ask if "BUY" in order_type else mt5.symbol_info_tick(symbol).bid),
-            "sl": sl,
-            "tp": tp,
-            "deviation": 20,  # Maximum price deviation in points
-            "magic": magic,
-            "comment": comment,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-        }
-
-        # [QUANTUM SNIPER] Pending Orders require different filling mode
-        if "LIMIT" in order_type or "STOP" in order_type:
-            request["type_filling"] = mt5.ORDER_FILLING_RETURN # Pending orders usually use RETURN
+            return None, None, None, {"ticket": None, "retcode": -1}
+
+        if not price:
+            tick = mt5.symbol_info_tick(symbol)
+            price = tick.ask if "BUY" in order_type else tick.bid
+
+        # Pre-armed template: filling/deviation policy already resolved for the symbol
+        kind = "pending" if ("LIMIT" in order_type or "STOP" in order_type) else "open"
+        request = self.order_templates.build(
+            symbol, kind,
+            volume=normalized_volume,
+            type=mt5_type,
+            price=price,
+            sl=sl,
+            tp=tp,
+            magic=magic,
+            comment=comment,
+        )
 
         if action == "CLOSE":
             # order_type already contains the correct opposing order type from caller
@@ -325,7 +387,56 @@ class MT5Adapter(BrokerAdapter):
         else: # OPEN
             request["action"] = mt5.TRADE_ACTION_DEAL
             logger.info(f"[MT5] Sending order: {action} {order_type} {symbol} {normalized_volume} lots @ {request['price']:.5f} | SL={sl:.5f} TP={tp:.5f}")
-        
+
+        return request, mt5_type, normalized_volume, None
+
+    _ORDER_TYPES = {
+        "BUY": "ORDER_TYPE_BUY",
+        "SELL": "ORDER_TYPE_SELL",
+        "BUY_LIMIT": "ORDER_TYPE_BUY_LIMIT",
+        "SELL_LIMIT": "ORDER_TYPE_SELL_LIMIT",
+        "BUY_STOP": "ORDER_TYPE_BUY_STOP",
+        "SELL_STOP": "ORDER_TYPE_SELL_STOP",
+    }
+
+    def _order_outcome(self, result, attempt: int, max_retries: int) -> str:
+        """Classify a send result: 'done', 'retry' or 'fatal' (logging as before)."""
+        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+            logger.info(f"[MT5] [OK] Order executed successfully - Ticket: {result.order} | Retcode: {result.retcode}")
+            return "done"
+
+        # Retry on Connection Error (10031), Requote (10004), No Quotes (10021), Trade Timeout (10036),
+        # Invalid Price (10015, refresh helps), Invalid Stops (10016).
+        # Market Closed (10018) and other fatal errors are not retried.
+        if result and result.retcode in OPEN_RETRY_RETCODES:
+            wait_time = retry_delay(result.retcode, attempt, "open")
+            if result.retcode == 10031:
+                logger.warning(f"[MT5] ⚠️ Connection lost (10031). Attempting re-initialization...")
+            logger.warning(f"[MT5] Retry {attempt+1}/{max_retries}: Order failed with {result.retcode} ({result.comment}). Waiting {wait_time}s...")
+            return "retry"
+        return "fatal"
+
+    def _order_failed(self, result, action, symbol, normalized_volume, order_type, ticket) -> Dict:
+        # Final Failure Log (if all retries failed or fatal error)
+        if result:
+            self.symbol_specs.invalidate(symbol, result.retcode)
+            logger.error(f"[MT5] [FAILED] Order failed: retcode={result.retcode}, comment={result.comment}")
+            logger.error(f"[MT5] Request: action={action}, symbol={symbol}, volume={normalized_volume}, type={order_type}, ticket={ticket}")
+        else:
+            logger.error(f"[MT5] Order send returned None. Last error: {mt5.last_error()}")
+        return {"ticket": None, "retcode": result.retcode if result else -1}
+
+    @timed_broker_call("execute_order")
+    def execute_order(self, symbol, action, volume, order_type, price=None, sl=0.0, tp=0.0, magic=0, comment="", ticket=None, **kwargs) -> Dict:
+        """
+        Blocking execution (retries sleep in the calling thread).
+        Async callers should use execute_order_async.
+        """
+        request, mt5_type, normalized_volume, error = self._prepare_order(
+            symbol, action, volume, order_type, price, sl, tp, magic, comment, ticket, kwargs)
+        if error is not None:
+            return error
+
         # Retry loop for robust execution
         max_retries = 3
         result = None
@@ -333,50 +444,71 @@ class MT5Adapter(BrokerAdapter):
         for attempt in range(max_retries):
             # Refresh price on retries (avoid Requotes/Invalid Price)
             # Only refresh for OPEN/CLOSE/HEDGE where price matters (not SLTP modification)
-            if attempt > 0 and (action == "OPEN" or action == "CLOSE" or action == "HEDGE"): 
-                 tick = mt5.symbol_info_tick(symbol)
-                 if tick:
-                     new_price = tick.ask if mt5_type == mt5.ORDER_TYPE_BUY else tick.bid
-                     request["price"] = new_price
+            if attempt > 0 and action in ("OPEN", "CLOSE", "HEDGE"):
+                tick = mt5.symbol_info_tick(symbol)
+                if tick:
+                    request["price"] = tick.ask if mt5_type == mt5.ORDER_TYPE_BUY else tick.bid
             
-            result = mt5.order_send(request)
-            
-            if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-                logger.info(f"[MT5] [OK] Order executed successfully - Ticket: {result.order} | Retcode: {result.retcode}")
+            result = self._send_order(request)
+            outcome = self._order_outcome(result, attempt, max_retries)
+            if outcome == "done":
                 return {"ticket": result.order, "retcode": result.retcode}
-            
-            # Retry on Connection Error (10031), Requote (10004), No Quotes (10021), Trade Timeout (10036), Off Quotes (10018)
-            # 10031 = No Connection
-            # 10004 = Requote
-            # 10015 = Invalid Price (Refresh helps)
-            # 10018 = Market Closed (Wait?) -> No, actually 10018 is fatal usually. But 10008 (Order Place) might retry.
-            # We stick to connectivity/pricing errors.
-            elif result and result.retcode in [10004, 10031, 10021, 10036, 10015, 10016]: 
-                 wait_time = 0.5 * (attempt + 1)
-                 if result.retcode == 10031: 
-                     wait_time = 2.0 * (attempt + 1) # Wait longer for connection
-                     logger.warning(f"[MT5] ⚠️ Connection lost (10031). Attempting re-initialization...")
-                     try:
-                        mt5.initialize()
-                     except Exception as e:
-                        logger.error(f"[MT5] Re-init failed: {e}")
-
-                 logger.warning(f"[MT5] Retry {attempt+1}/{max_retries}: Order failed with {result.retcode} ({result.comment}). Waiting {wait_time}s...")
-                 time.sleep(wait_time)
-                 continue
-            
-            else:
-                # Fatal error (e.g. Invalid Volume, No Money, Market Closed) - Do not retry
+            if outcome == "fatal":
                 break
-                
-        # Final Failure Log (if all retries failed or fatal error)
-        if result:
-            logger.error(f"[MT5] [FAILED] Order failed: retcode={result.retcode}, comment={result.comment}")
-            logger.error(f"[MT5] Request: action={action}, symbol={symbol}, volume={normalized_volume}, type={order_type}, ticket={ticket}")
-        else:
-            logger.error(f"[MT5] Order send returned None. Last error: {mt5.last_error()}")
-        return {"ticket": None, "retcode": result.retcode if result else -1}
+            if result.retcode == 10031:
+                try:
+                    mt5.initialize()
+                except Exception as e:
+                    logger.error(f"[MT5] Re-init failed: {e}")
+            time.sleep(retry_delay(result.retcode, attempt, "open"))
+
+        return self._order_failed(result, action, symbol, normalized_volume, order_type, ticket)
+
+    @timed_broker_call("execute_order_async")
+    async def execute_order_async(self, symbol, action, volume, order_type, price=None, sl=0.0, tp=0.0, magic=0, comment="", ticket=None, **kwargs) -> Dict:
+        """
+        Same contract as execute_order, but terminal calls run in a worker thread
+        and retry backoff is awaited, so neither the event loop nor a pool thread
+        sleeps between attempts.
+        """
+        import asyncio
+
+        if not price and action in ("OPEN", "CLOSE", "HEDGE"):
+            # Resolve the market price off the loop (_prepare_order would ask the terminal inline)
+            tick = await asyncio.to_thread(mt5.symbol_info_tick, symbol)
+            if tick:
+                price = tick.ask if "BUY" in order_type else tick.bid
+
+        request, mt5_type, normalized_volume, error = self._prepare_order(
+            symbol, action, volume, order_type, price, sl, tp, magic, comment, ticket, kwargs)
+        if error is not None:
+            return error
+
+        max_retries = 3
+        result = None
+
+        for attempt in range(max_retries):
+            if attempt > 0 and action in ("OPEN", "CLOSE", "HEDGE"):
+                tick = await asyncio.to_thread(mt5.symbol_info_tick, symbol)
+                if tick:
+                    request["price"] = tick.ask if mt5_type == mt5.ORDER_TYPE_BUY else tick.bid
+
+            result = await asyncio.to_thread(self._send_order, request)
+            outcome = self._order_outcome(result, attempt, max_retries)
+            if outcome == "done":
+                return {"ticket": result.order, "retcode": result.retcode}
+            if outcome == "fatal":
+                break
+            if result.retcode == 10031:
+                try:
+                    await asyncio.to_thread(mt5.initialize)
+                except Exception as e:
+                    logger.error(f"[MT5] Re-init failed: {e}")
+            await asyncio.sleep(retry_delay(result.retcode, attempt, "open"))
 
+        return self._order_failed(result, action, symbol, normalized_volume, order_type, ticket)
+
+    @timed_broker_call("get_positions")
     def get_positions(self, symbol: Optional[str] = None) -> Optional[list]:
         positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
         
@@ -411,6 +543,7 @@ class MT5Adapter(BrokerAdapter):
         """Helper to get all positions without symbol filtering."""
         return self.get_positions(symbol=None)
 
+    @timed_broker_call("get_history_deals")
     def get_history_deals(self, ticket: int) -> list:
         deals = mt5.history_deals_get(ticket=ticket)
         if deals:
@@ -425,6 +558,7 @@ class MT5Adapter(BrokerAdapter):
             ) for d in deals]
         return []
 
+    @timed_broker_call("get_account_info")
     def get_account_info(self) -> Dict:
         info = mt5.account_info()
         return {
@@ -435,11 +569,13 @@ class MT5Adapter(BrokerAdapter):
             "leverage": info.leverage
         } if info else {}
 
+    @timed_broker_call("get_equity")
     def get_equity(self) -> float:
         """Helper to get current equity directly."""
         info = mt5.account_info()
         return info.equity if info else 0.0
 
+    @timed_broker_call("check_margin")
     def check_margin(self, symbol: str, volume: float, order_type: str) -> bool:
         """
         Check if there is enough margin to execute the order.
@@ -483,6 +619,7 @@ class MT5Adapter(BrokerAdapter):
         # Apply safety buffer (95% of max)
         return max_vol * 0.95
 
+    @timed_broker_call("get_order_book")
     def get_order_book(self, symbol: str) -> dict:
         """Return Depth of Market in a simple dict format.
 
@@ -529,10 +666,36 @@ class MT5Adapter(BrokerAdapter):
         except Exception:
             return {}
 
-    async def close_positions(self, positions_data: list, trace: Optional[Dict] = None) -> dict:
+    def plan_close(self, positions_data: list, allow_close_by: bool = True,
+                   merge_residual: bool = True) -> ClosePlan:
+        """
+        Plan the minimum-deal close of the given positions (see close_planner).
+        No orders are sent.
+        """
+        steps = {}
+        for p in positions_data:
+            sym = p.symbol if hasattr(p, 'symbol') else (p.get('symbol') if isinstance(p, dict) else None)
+            if sym and sym not in steps:
+                try:
+                    steps[sym] = float((self.get_symbol_info(sym) or {}).get('volume_step', 0.01))
+                except Exception:
+                    steps[sym] = 0.01
+        return plan_bucket_close(positions_data, steps, allow_close_by=allow_close_by,
+                                 merge_residual=merge_residual)
+
+    @timed_broker_call("close_positions")
+    async def close_positions(self, positions_data: list, trace: Optional[Dict] = None,
+                              dry_run: Optional[bool] = None) -> dict:
         """
         ZERO-LATENCY CLOSER: Accepts full position objects/dicts to skip the lookup step.
         Executes 'Blind' close commands for maximum speed.
+
+        On hedging accounts the batch is netted first (exact CLOSE_BY pairs, then a
+        partial CLOSE_BY chain) so only the residual volume is sent to market. A
+        residual spread over several legs goes out as one opposite NET deal that
+        is then closed by each leg (AETHER_CLOSE_MERGE_RESIDUAL).
+        dry_run (default AETHER_CLOSE_DRY_RUN) logs and simulates the plan without
+        sending any order.
         """
         if not positions_data:
             return {}
@@ -557,13 +720,16 @@ class MT5Adapter(BrokerAdapter):
         def _supports_close_by() -> bool:
             # CLOSE_BY works only on hedging accounts.
             # On netting/exchange accounts it will fail; we skip to avoid extra latency.
-            try:
-                info = mt5.account_info()
-                if not info:
+            # The margin mode is fixed per login, so it is read once per connection.
+            if self._margin_mode is None:
+                try:
+                    info = mt5.account_info()
+                    if not info:
+                        return False
+                    self._margin_mode = getattr(info, 'margin_mode', None)
+                except Exception:
                     return False
-                return getattr(info, 'margin_mode', None) == getattr(mt5, 'ACCOUNT_MARGIN_MODE_RETAIL_HEDGING', 1)
-            except Exception:
-                return False
+            return self._margin_mode == getattr(mt5, 'ACCOUNT_MARGIN_MODE_RETAIL_HEDGING', 1)
 
         # Prefetch latest ticks per symbol once to reduce per-thread overhead.
         # Retried attempts still refresh ticks.
@@ -580,12 +746,16 @@ class MT5Adapter(BrokerAdapter):
             tick_cache = {}
         
         # Define a wrapper to close a single ticket with retries
-        trace_enabled = str(os.getenv("AETHER_DECISION_TRACE", "1")).strip().lower() in ("1", "true", "yes", "on")
+        rs = runtime_settings()
+        trace_enabled = rs.decision_trace
         trace_dict = trace if isinstance(trace, dict) else {}
 
-        def close_single_sync(pos, pre_tick=None):
+        loop = asyncio.get_running_loop()
+
+        async def close_single(pos, pre_tick=None):
             # [OPTIMIZATION] No mt5.positions_get() call here. We trust the data passed in.
-            import time
+            # Terminal calls run on the close executor; retry backoff is awaited so no
+            # pool thread sleeps between attempts.
             
             # Handle both object (dot notation) and dict (bracket notation)
             try:
@@ -598,11 +768,6 @@ class MT5Adapter(BrokerAdapter):
                 logger.error(f"Invalid position data for close: {e}")
                 return {"ticket": -1, "retcode": -1, "comment": f"Invalid data: {e}"}
 
-            # [OPTIMIZATION] Skip pre-check for zero latency.
-            # If position is gone, order_send will strictly fail (RETCODE_INVALID_ORDER or similar).
-            # This saves ~5-15ms per thread.
-            # if not mt5.positions_get(ticket=ticket): ... REMOVED
-
             # Optional override for the CLOSE comment (not the original position comment).
             # We keep this short because MT5 imposes strict comment length limits.
             close_comment = None
@@ -617,25 +782,20 @@ class MT5Adapter(BrokerAdapter):
             normalized_volume = self.normalize_lot_size(symbol, volume)
             
             # Get current price (Fastest way)
-            tick = pre_tick or mt5.symbol_info_tick(symbol)
+            tick = pre_tick or await loop.run_in_executor(executor, mt5.symbol_info_tick, symbol)
             if not tick: 
                 return {"ticket": ticket, "retcode": -1, "comment": "No tick data"}
-                
-            price = tick.bid if order_type == mt5.ORDER_TYPE_SELL else tick.ask
 
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": symbol,
-                "volume": normalized_volume, # Use normalized volume
-                "type": order_type,
-                "position": ticket,
-                "price": price,
-                # Deviation is set per-attempt below (tight first, widen on retries)
-                "magic": magic,
-                "comment": close_comment or "Aether FastClose",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
-            }
+            # Pre-armed close template (filling policy resolved per symbol)
+            request = self.order_templates.build(
+                symbol, "close",
+                volume=normalized_volume,
+                type=order_type,
+                position=ticket,
+                price=tick.bid if order_type == mt5.ORDER_TYPE_SELL else tick.ask,
+                magic=magic,
+                comment=close_comment or "Aether FastClose",
+            )
 
             if trace_enabled:
                 logger.info(
@@ -657,24 +817,15 @@ class MT5Adapter(BrokerAdapter):
                 # Adaptive deviation to reduce slippage:
                 # - start tight to protect profits
                 # - widen only if we get requotes/price errors
-                base_dev = 50
-                if "XAU" in symbol or "GOLD" in symbol:
-                    base_dev = int(os.getenv("AETHER_CLOSE_DEVIATION_XAU", "180"))
-                elif "JPY" in symbol:
-                    base_dev = int(os.getenv("AETHER_CLOSE_DEVIATION_JPY", "120"))
-                else:
-                    base_dev = int(os.getenv("AETHER_CLOSE_DEVIATION_FX", "60"))
-
-                max_dev = int(os.getenv("AETHER_CLOSE_DEVIATION_MAX", "600"))
-                request["deviation"] = min(max_dev, base_dev * (attempt + 1))
+                request["deviation"] = self.order_templates.close_deviation(symbol, attempt)
 
-                result = mt5.order_send(request)
+                result = await loop.run_in_executor(executor, self._send_order, request)
 
                 if result is None:
                     # Terminal/API failure. Retry once or twice with backoff.
                     if attempt == 0:
                         logger.warning(f"Close retry {ticket}: order_send returned None. Last error: {mt5.last_error()}")
-                    time.sleep(0.25 * (attempt + 1))
+                    await asyncio.sleep(retry_delay(None, attempt, "close"))
                     continue
                 
                 if result.retcode == mt5.TRADE_RETCODE_DONE:
@@ -690,24 +841,22 @@ class MT5Adapter(BrokerAdapter):
                         "type": int(order_type),
                         "comment": getattr(result, 'comment', '')
                     }
-                elif result.retcode in [10004, 10015, 10021, 10031]: # Requote, Invalid Price, No Money, No Connection
+                elif result.retcode in CLOSE_RETRY_RETCODES:
                     # Only log warning on first failure to keep logs clean
                     if attempt == 0:
                         logger.warning(f"Close retry {ticket}: {result.comment}")
 
                     # If we lost network/terminal connection, give it a moment.
-                    if result.retcode == 10031:
-                        time.sleep(0.75 * (attempt + 1))
-                    else:
-                        time.sleep(0.15 * (attempt + 1))
+                    await asyncio.sleep(retry_delay(result.retcode, attempt, "close"))
 
                     # Refresh price for retry
-                    tick = mt5.symbol_info_tick(symbol)
+                    tick = await loop.run_in_executor(executor, mt5.symbol_info_tick, symbol)
                     if tick:
                         request['price'] = tick.bid if order_type == mt5.ORDER_TYPE_SELL else tick.ask
                     continue
                 else:
                     logger.error(f"CRITICAL: Failed to close {ticket}. Error: {result.comment} ({result.retcode})")
+                    self.symbol_specs.invalidate(symbol, result.retcode)
                     return {
                         "ticket": ticket,
                         "retcode": result.retcode,
@@ -728,141 +877,226 @@ class MT5Adapter(BrokerAdapter):
                 "type": int(order_type),
             }
 
-        # Optional: CLOSE_BY pairing to reduce spread/slippage and number of close deals.
-        enable_close_by = str(os.getenv("AETHER_ENABLE_CLOSE_BY", "1")).strip().lower() in (
-            "1",
-            "true",
-            "yes",
-            "on",
-        )
+        # CLOSE_BY netting to reduce spread/slippage and number of close deals.
+        enable_close_by = rs.enable_close_by
+        if dry_run is None:
+            dry_run = rs.close_dry_run
+
+        def _pos_fields(p):
+            ticket = p.ticket if hasattr(p, 'ticket') else p['ticket']
+            symbol = p.symbol if hasattr(p, 'symbol') else p['symbol']
+            volume = p.volume if hasattr(p, 'volume') else p['volume']
+            p_type = p.type if hasattr(p, 'type') else p['type']
+            magic = p.magic if hasattr(p, 'magic') else (p.get('magic', 0) if isinstance(p, dict) else 0)
+            return int(ticket), symbol, float(volume), int(p_type), int(magic)
+
+        plan = self.plan_close(positions_data, allow_close_by=enable_close_by and _supports_close_by(),
+                               merge_residual=rs.close_merge_residual)
+        pos_by_ticket = {}
+        for p in positions_data:
+            try:
+                pos_by_ticket[_pos_fields(p)[0]] = p
+            except Exception:
+                continue
 
-        # Get the running loop
-        loop = asyncio.get_running_loop()
+        if plan.close_by_count or dry_run:
+            logger.info(
+                f"[CLOSE PLAN] {plan.deal_count} deals ({plan.close_by_count} close-by, "
+                f"{plan.market_count} market, {plan.market_volume:.2f} lots to market): {plan.describe()}"
+                + (" [DRY RUN]" if dry_run else "")
+            )
+
+        if dry_run:
+            flat, leftover = simulate_plan(positions_data, plan)
+            if not flat:
+                logger.error(f"[CLOSE PLAN] Dry-run simulation left positions open: {leftover}")
+            results = {}
+            for ticket, p in pos_by_ticket.items():
+                _, sym, vol, p_type, _ = _pos_fields(p)
+                results[ticket] = {
+                    "ticket": ticket,
+                    "retcode": -1,
+                    "comment": "dry run",
+                    "dry_run": True,
+                    "symbol": sym,
+                    "volume": vol,
+                    "type": p_type,
+                    "plan": [s for s in plan.steps if ticket in (s.ticket, s.by_ticket)],
+                }
+            return results
 
         # Fire ALL close requests in parallel.
         # Using a dedicated persistent executor avoids per-batch startup overhead.
-        default_cap = int(os.getenv("AETHER_CLOSE_MAX_WORKERS", "32"))
+        default_cap = rs.close_max_workers
         # [OPTIMIZATION] Use fixed-size pool to avoid constant shutdown/startup overhead
         # Threads are cheap; keeping 32 ready is better than resizing.
         max_workers = default_cap 
         executor = _ensure_close_executor(max_workers)
 
-        # Attempt CLOSE_BY for equal-volume opposite hedges (hedging accounts only).
-        # This reduces number of market orders and typically reduces spread impact.
-        close_by_results: Dict[int, Dict] = {}
-        remaining = list(positions_data)
-        if enable_close_by and _supports_close_by():
-            try:
-                # Build per-symbol buy/sell pools (only equal-volume pairs)
-                by_symbol = {}
-                for p in remaining:
-                    sym = p.symbol if hasattr(p, 'symbol') else (p.get('symbol') if isinstance(p, dict) else None)
-                    if not sym:
-                        continue
-                    by_symbol.setdefault(sym, []).append(p)
-
-                def _pos_fields(p):
-                    ticket = p.ticket if hasattr(p, 'ticket') else p['ticket']
-                    symbol = p.symbol if hasattr(p, 'symbol') else p['symbol']
-                    volume = p.volume if hasattr(p, 'volume') else p['volume']
-                    p_type = p.type if hasattr(p, 'type') else p['type']
-                    magic = p.magic if hasattr(p, 'magic') else (p.get('magic', 0) if isinstance(p, dict) else 0)
-                    return ticket, symbol, float(volume), int(p_type), int(magic)
-
-                def close_by_sync(pos_a, pos_b):
-                    # Close BUY/SELL by each other. Only safe for equal-volume pairs.
-                    try:
-                        t1, sym, vol1, type1, magic1 = _pos_fields(pos_a)
-                        t2, _, vol2, type2, magic2 = _pos_fields(pos_b)
-                    except Exception as e:
-                        return {"retcode": -1, "comment": f"close_by invalid data: {e}"}
-
-                    # Must be opposite sides
-                    if type1 == type2:
-                        return {"retcode": -1, "comment": "close_by same side"}
-
-                    # Enforce equal volumes (within step) to avoid partial close-by semantics.
-                    # Use symbol step if available; else a small epsilon.
-                    step = 0.01
-                    try:
-                        info = self.get_symbol_info(sym) or {}
-                        step = float(info.get('volume_step', step))
-                    except Exception:
-                        step = 0.01
-                    eps = max(1e-6, step / 2)
-                    if abs(vol1 - vol2) > eps:
-                        return {"retcode": -1, "comment": "close_by volume mismatch"}
-
-                    req = {
-                        "action": mt5.TRADE_ACTION_CLOSE_BY,
-                        "symbol": sym,
-                        "position": t1,
-                        "position_by": t2,
-                        "magic": magic1,
-                        "comment": "Aether CloseBy"[:31],
-                    }
-                    res = mt5.order_send(req)
-                    if res is None:
-                        return {"retcode": -1, "comment": f"close_by None: {mt5.last_error()}"}
-                    return {"retcode": res.retcode, "comment": getattr(res, 'comment', '')}
-
-                close_by_tasks = []
-                paired_tickets = set()
-                for sym, plist in by_symbol.items():
-                    buys = [p for p in plist if (p.type if hasattr(p, 'type') else p.get('type')) == mt5.ORDER_TYPE_BUY]
-                    sells = [p for p in plist if (p.type if hasattr(p, 'type') else p.get('type')) == mt5.ORDER_TYPE_SELL]
-
-                    # Pair greedily by equal normalized volume
-                    # (we only attempt when volumes match closely)
-                    used_sells = set()
-                    for b in buys:
-                        bt, _, bv, _, _ = _pos_fields(b)
-                        if bt in paired_tickets:
-                            continue
-                        match = None
-                        for s in sells:
-                            st, _, sv, _, _ = _pos_fields(s)
-                            if st in used_sells or st in paired_tickets:
-                                continue
-                            if abs(bv - sv) <= 1e-6:
-                                match = s
-                                used_sells.add(st)
-                                break
-                        if match:
-                            st, _, _, _, _ = _pos_fields(match)
-                            paired_tickets.add(bt)
-                            paired_tickets.add(st)
-                            close_by_tasks.append(loop.run_in_executor(executor, close_by_sync, b, match))
-
-                if close_by_tasks:
-                    close_by_task_results = await asyncio.gather(*close_by_tasks)
-                    # Map results back: since close_by_sync doesn't include tickets, we conservatively just mark paired
-                    # tickets as "handled" only if retcode DONE.
-                    # Any failures will fall back to standard close.
-                    # NOTE: We don't know which result corresponds to which pair here without extra bookkeeping.
-                    # Keep this simple: if close_by was used, we will rely on subsequent broker sync to remove closed.
-                    # To avoid skipping closes incorrectly, we won't remove from remaining unless we can verify.
-                    # We still return a marker in result map for audit.
-                    for r in close_by_task_results:
-                        # No ticket mapping; include as informational
-                        pass
-
-                    # If close_by tasks were issued, we do not assume success for any specific ticket.
-                    # We simply proceed with standard closes; MT5 will return "position doesn't exist" for already closed.
-                    # This keeps correctness.
-            except Exception as e:
-                logger.debug(f"[CLOSE_BY] Skipped due to error: {e}")
+        # Remaining volume per ticket as the plan executes (drives residual/fallback closes)
+        remaining_volume = {t: _pos_fields(p)[2] for t, p in pos_by_ticket.items()}
+        results: Dict[int, Dict] = {}
+        volume_lock = threading.Lock()
+
+        def close_by_sync(step):
+            pos_a = pos_by_ticket.get(step.ticket)
+            magic = _pos_fields(pos_a)[4] if pos_a is not None else 0
+            req = {
+                "action": mt5.TRADE_ACTION_CLOSE_BY,
+                "symbol": step.symbol,
+                "position": step.ticket,
+                "position_by": step.by_ticket,
+                "magic": magic,
+                "comment": "Aether CloseBy"[:31],
+            }
+            res = self._send_order(req)
+            if res is None:
+                logger.warning(f"[CLOSE_BY] #{step.ticket} by #{step.by_ticket} returned None: {mt5.last_error()}")
+                return False
+            if res.retcode != mt5.TRADE_RETCODE_DONE:
+                logger.warning(f"[CLOSE_BY] #{step.ticket} by #{step.by_ticket} failed: {res.comment} ({res.retcode})")
+                self.symbol_specs.invalidate(step.symbol, res.retcode)
+                return False
 
-        tasks = []
-        for pos in remaining:
-            sym = pos.symbol if hasattr(pos, 'symbol') else (pos.get('symbol') if isinstance(pos, dict) else None)
-            tasks.append(loop.run_in_executor(executor, close_single_sync, pos, tick_cache.get(sym)))
-        results = await asyncio.gather(*tasks)
-        
-        # Map results back to tickets (extract ticket from position data)
-        tickets = [p.ticket if hasattr(p, 'ticket') else p['ticket'] for p in positions_data]
-        return {ticket: result for ticket, result in zip(tickets, results)}
+            with volume_lock:
+                for t, other in ((step.ticket, step.by_ticket), (step.by_ticket, step.ticket)):
+                    remaining_volume[t] = round(remaining_volume.get(t, 0.0) - step.volume, 8)
+                    if remaining_volume[t] <= 1e-9:
+                        _, sym, vol, p_type, _ = _pos_fields(pos_by_ticket[t])
+                        results[t] = {
+                            "ticket": t,
+                            "retcode": res.retcode,
+                            "comment": f"close_by #{other}",
+                            "close_by": other,
+                            "symbol": sym,
+                            "volume": vol,
+                            "type": p_type,
+                        }
+            return True
 
+        def run_chain_sync(steps):
+            # Chain steps depend on the volumes left by the previous one; stop at the
+            # first failure and let the residual pass market-close whatever is left.
+            for step in steps:
+                if not close_by_sync(step):
+                    return False
+            return True
+
+        def market_close(ticket):
+            p = pos_by_ticket[ticket]
+            vol = remaining_volume.get(ticket, 0.0)
+            if isinstance(p, dict):
+                p = {**p, 'volume': vol}
+            elif abs(vol - _pos_fields(p)[2]) > 1e-9:
+                t, sym, _, p_type, magic = _pos_fields(p)
+                p = {'ticket': t, 'symbol': sym, 'volume': vol, 'type': p_type, 'magic': magic}
+            sym = _pos_fields(p)[1]
+            return close_single(p, tick_cache.get(sym))
+
+        async def run_close_by_stages():
+            independent = [s for s in plan.stage(STAGE_INDEPENDENT) if s.kind == CLOSE_BY]
+            if independent:
+                await asyncio.gather(*[loop.run_in_executor(executor, close_by_sync, s) for s in independent])
+            chains: Dict[str, list] = {}
+            for s in plan.stage(STAGE_CHAIN):
+                chains.setdefault(s.symbol, []).append(s)
+            if chains:
+                await asyncio.gather(*[loop.run_in_executor(executor, run_chain_sync, c) for c in chains.values()])
+
+        net_tickets = []
+
+        def run_net_sync(step):
+            # Merge the symbol's residual into one NET deal, then close it by each leg.
+            # Volumes are re-read from remaining_volume: a failed chain step changes them.
+            # Any failure leaves the rest (NET position included) to the residual pass.
+            symbol = step.symbol
+            legs = [
+                t for t, p in pos_by_ticket.items()
+                if t not in results and remaining_volume.get(t, 0.0) > 1e-9 and _pos_fields(p)[1] == symbol
+            ]
+            sides = {_pos_fields(pos_by_ticket[t])[3] for t in legs}
+            if len(legs) < 2 or len(sides) != 1:
+                return False
+            side = 1 - sides.pop()
+            total = self.normalize_lot_size(symbol, round(sum(remaining_volume[t] for t in legs), 8))
+            if abs(total - sum(remaining_volume[t] for t in legs)) > 1e-9:
+                return False
+            tick = mt5.symbol_info_tick(symbol)
+            if not tick:
+                return False
+            order_type = mt5.ORDER_TYPE_BUY if side == 0 else mt5.ORDER_TYPE_SELL
+            magic = _pos_fields(pos_by_ticket[legs[0]])[4]
+            request = self.order_templates.build(
+                symbol, "open",
+                volume=total,
+                type=order_type,
+                price=tick.ask if side == 0 else tick.bid,
+                magic=magic,
+                comment="Aether NetClose",
+            )
+            request["deviation"] = self.order_templates.close_deviation(symbol, 0)
+            res = self._send_order(request)
+            if res is None or res.retcode != mt5.TRADE_RETCODE_DONE or not getattr(res, 'order', 0):
+                logger.warning(
+                    f"[CLOSE_BY] NET {symbol} {total} lots not opened: "
+                    f"{getattr(res, 'comment', mt5.last_error())} ({getattr(res, 'retcode', None)})"
+                )
+                return False
+
+            # On hedging accounts the position id is the opening order ticket
+            net_ticket = int(res.order)
+            with volume_lock:
+                pos_by_ticket[net_ticket] = {
+                    'ticket': net_ticket, 'symbol': symbol, 'volume': total, 'type': side, 'magic': magic,
+                }
+                remaining_volume[net_ticket] = total
+                net_tickets.append(net_ticket)
+            for t in legs:
+                leg_step = CloseStep(CLOSE_BY, symbol, net_ticket, t, remaining_volume[t], STAGE_NET)
+                if not close_by_sync(leg_step):
+                    return False
+            return True
+
+        async def run_net_stage():
+            opens = [s for s in plan.stage(STAGE_NET) if s.kind == NET_OPEN]
+            if opens:
+                await asyncio.gather(*[loop.run_in_executor(executor, run_net_sync, s) for s in opens])
+
+        # Legs the plan closes at full volume go out immediately, alongside the CLOSE_BY stages.
+        immediate = [s.ticket for s in plan.stage(STAGE_INDEPENDENT) if s.kind == MARKET]
+        immediate_tasks = [market_close(t) for t in immediate]
+        stage_results = await asyncio.gather(run_close_by_stages(), *immediate_tasks, return_exceptions=True)
+        if isinstance(stage_results[0], Exception):
+            logger.error(f"[CLOSE_BY] Netting stage failed: {stage_results[0]}")
+        for ticket, res in zip(immediate, stage_results[1:]):
+            if isinstance(res, Exception):
+                res = {"ticket": ticket, "retcode": -1, "comment": f"close exception: {res}"}
+            results[ticket] = res
+
+        try:
+            await run_net_stage()
+        except Exception as e:
+            logger.error(f"[CLOSE_BY] Residual merge failed: {e}")
+
+        # Residual: everything still open (planned residual legs and any leg a failed
+        # CLOSE_BY left behind) is market-closed with its current volume.
+        residual = [t for t in pos_by_ticket if t not in results and remaining_volume.get(t, 0.0) > 1e-9]
+        if residual:
+            residual_results = await asyncio.gather(*[market_close(t) for t in residual])
+            for ticket, res in zip(residual, residual_results):
+                results[ticket] = res
+
+        # A NET position is ours, not the caller's: report it only if it is still open
+        for ticket in net_tickets:
+            res = results.get(ticket)
+            if res is not None and res.get('retcode') == mt5.TRADE_RETCODE_DONE:
+                results.pop(ticket)
+            elif res is not None:
+                logger.error(f"[CLOSE_BY] NET position #{ticket} left open: {res.get('comment')}")
+
+        return results
+
+    @timed_broker_call("close_position")
     async def close_position(self, ticket: int, volume: float = None, trace: Optional[Dict] = None) -> bool:
         """
         Close a single position by ticket.
@@ -963,13 +1197,13 @@ class MT5Adapter(BrokerAdapter):
         Returns:
             Normalized lot size that MT5 will accept
         """
-        symbol_info = self.get_symbol_info(symbol)
-        if not symbol_info:
+        spec = self.symbol_specs.get(symbol)
+        if spec is None:
             logger.warning(f"Cannot get symbol info for {symbol}, using requested lot: {requested_lot}")
             return round(requested_lot, 2)
         
-        volume_min = symbol_info.get('volume_min', 0.01)
-        volume_step = symbol_info.get('volume_step', 0.01)
+        volume_min = spec.volume_min or 0.01
+        volume_step = spec.volume_step or 0.01
         
         # Ensure lot is at least minimum
         if requested_lot < volume_min:
@@ -990,7 +1224,7 @@ class MT5Adapter(BrokerAdapter):
         # Normalize to volume_step.
         # Default is ROUND-DOWN (safer): never increases exposure vs requested_lot.
         # Override with AETHER_LOT_NORMALIZE_MODE=nearest if you prefer standard rounding.
-        mode = str(os.getenv("AETHER_LOT_NORMALIZE_MODE", "nearest")).strip().lower()
+        mode = runtime_settings().lot_normalize_mode
 
         epsilon = 1e-12  # protect against floating point edge cases
         if mode in ("nearest", "round", "standard"):
@@ -1011,15 +1245,8 @@ class MT5Adapter(BrokerAdapter):
         return normalized
 
     def get_symbol_info(self, symbol: str) -> Dict:
-        info = mt5.symbol_info(symbol)
-        if info:
-            return {
-                "point": info.point,
-                "digits": info.digits,
-                "volume_min": info.volume_min,
-                "volume_step": info.volume_step
-            }
-        return {}
+        spec = self.symbol_specs.get(symbol)
+        return spec.to_dict() if spec is not None else {}
 
     def close_hedge_by_ticket(self, ticket: int, opposite_ticket: int, symbol: str, volume: float) -> dict:
         """
@@ -1067,6 +1294,7 @@ class MT5Adapter(BrokerAdapter):
 
     def disconnect(self):
         """Disconnect from the MT5 terminal."""
+        self.symbol_specs.stop_refresher()
         if mt5:
             mt5.shutdown()
             logger.info("MT5 Disconnected")
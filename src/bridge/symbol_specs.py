@@ -0,0 +1,181 @@
+"""
+Symbol Specification Cache
+
+Immutable per-symbol trading specs (lot limits, contract size, point/digits,
+filling and trade modes) loaded once from the terminal and shared by the
+adapter, market data and position management, so hot paths such as a bucket
+close never query symbol metadata from the terminal.
+
+Specs are refreshed in the background on a timer (AETHER_SYMBOL_SPEC_REFRESH_S,
+default 300s, 0 disables) and reloaded immediately when the broker rejects a
+trade with a retcode that suggests the spec changed.
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger("SymbolSpecs")
+
+# Retcodes that indicate stale symbol metadata (volume/stops/filling/trade mode)
+SPEC_INVALIDATING_RETCODES = frozenset({
+    10014,  # TRADE_RETCODE_INVALID_VOLUME
+    10016,  # TRADE_RETCODE_INVALID_STOPS
+    10017,  # TRADE_RETCODE_TRADE_DISABLED
+    10030,  # TRADE_RETCODE_INVALID_FILL
+    10042,  # TRADE_RETCODE_LONG_ONLY
+    10043,  # TRADE_RETCODE_SHORT_ONLY
+    10044,  # TRADE_RETCODE_CLOSE_ONLY
+})
+
+# SYMBOL_FILLING_* flags in SymbolInfo.filling_mode
+FILLING_FOK = 1
+FILLING_IOC = 2
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    name: str
+    point: float
+    digits: int
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    contract_size: float
+    tick_size: float
+    tick_value: float
+    filling_mode: int
+    trade_mode: int
+    loaded_at: float
+
+    @property
+    def volume_precision(self) -> int:
+        if self.volume_step <= 0:
+            return 2
+        return max(0, int(round(-math.log10(self.volume_step), 0)))
+
+    @property
+    def supports_ioc(self) -> bool:
+        return bool(self.filling_mode & FILLING_IOC)
+
+    @property
+    def supports_fok(self) -> bool:
+        return bool(self.filling_mode & FILLING_FOK)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_symbol_info(cls, info) -> "SymbolSpec":
+        """Build from an mt5.SymbolInfo record."""
+        return cls(
+            name=str(info.name),
+            point=float(info.point),
+            digits=int(info.digits),
+            volume_min=float(info.volume_min),
+            volume_max=float(getattr(info, 'volume_max', 0.0) or 0.0),
+            volume_step=float(info.volume_step),
+            contract_size=float(getattr(info, 'trade_contract_size', 0.0) or 0.0),
+            tick_size=float(getattr(info, 'trade_tick_size', 0.0) or 0.0),
+            tick_value=float(getattr(info, 'trade_tick_value', 0.0) or 0.0),
+            filling_mode=int(getattr(info, 'filling_mode', 0) or 0),
+            trade_mode=int(getattr(info, 'trade_mode', 0) or 0),
+            loaded_at=time.time(),
+        )
+
+
+class SymbolSpecCache:
+    """
+    Thread-safe symbol -> SymbolSpec map.
+
+    Reads are lock-free dict lookups; the loader is only called for unknown
+    symbols, on invalidation, and from the refresh thread.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, SymbolSpec] = {}
+        self._loader: Optional[Callable[[str], Optional[SymbolSpec]]] = None
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def bind_loader(self, loader: Callable[[str], Optional[SymbolSpec]]) -> None:
+        self._loader = loader
+
+    def get(self, symbol: str) -> Optional[SymbolSpec]:
+        spec = self._specs.get(symbol)
+        if spec is not None or not symbol:
+            return spec
+        return self._load(symbol)
+
+    def _load(self, symbol: str) -> Optional[SymbolSpec]:
+        loader = self._loader
+        if loader is None:
+            return None
+        try:
+            spec = loader(symbol)
+        except Exception as e:
+            logger.debug(f"[SPECS] Load failed for {symbol}: {e}")
+            spec = None
+        if spec is not None:
+            with self._lock:
+                self._specs[symbol] = spec
+        return spec
+
+    def store(self, spec: SymbolSpec) -> None:
+        with self._lock:
+            self._specs[spec.name] = spec
+
+    def preload(self, symbols) -> int:
+        loaded = 0
+        for symbol in symbols:
+            if self._load(symbol) is not None:
+                loaded += 1
+        return loaded
+
+    def invalidate(self, symbol: str, retcode: Optional[int] = None) -> None:
+        """Reload one symbol now (called after a spec-related trade rejection)."""
+        if retcode is not None and retcode not in SPEC_INVALIDATING_RETCODES:
+            return
+        old = self._specs.get(symbol)
+        new = self._load(symbol)
+        if old is not None and new is not None and (old.volume_step, old.volume_min, old.filling_mode, old.trade_mode) != \
+                (new.volume_step, new.volume_min, new.filling_mode, new.trade_mode):
+            logger.warning(f"[SPECS] {symbol} spec changed after retcode {retcode}: {old} -> {new}")
+
+    def refresh_all(self) -> None:
+        for symbol in list(self._specs.keys()):
+            self._load(symbol)
+
+    def start_refresher(self, interval_s: float) -> None:
+        if interval_s <= 0 or (self._refresher is not None and self._refresher.is_alive()):
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(interval_s):
+                self.refresh_all()
+
+        self._refresher = threading.Thread(target=_run, name="symbol-spec-refresh", daemon=True)
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        self._stop.set()
+
+    def symbols(self):
+        return list(self._specs.keys())
+
+
+_SPEC_CACHE = SymbolSpecCache()
+
+
+def get_symbol_spec_cache() -> SymbolSpecCache:
+    """Process-wide cache shared by the adapter and its callers."""
+    return _SPEC_CACHE
+
+
+def get_symbol_spec(symbol: str) -> Optional[SymbolSpec]:
+    return _SPEC_CACHE.get(symbol)
@@ -22,6 +22,7 @@ except ImportError:
 
 # Import the main bot application
 from src.main_bot import main as bot_main
+from src.utils.log_pipeline import setup_logging, shutdown_logging
 
 def setup_environment():
     """Configure the runtime environment for optimal performance."""
@@ -51,13 +52,16 @@ def setup_environment():
         if os.path.exists(pkg_env_path):
             load_dotenv(pkg_env_path)
 
-    # 3. Pre-load Heavy Libraries (Torch) - Clean startup
+    # 3. Pre-load Heavy Libraries (Torch) - skipped in fast-start mode,
+    #    where the AI layers are imported by a background warm-up instead
     from src.constants import SYSTEM_VERSION
     print(f"\\n🚀 AETHER v{SYSTEM_VERSION} | Initializing...", flush=True)
-    try:
-        import torch
-    except ImportError:
-        pass
+    fast_start = str(os.getenv("AETHER_FAST_START", "1")).strip().lower() in ("1", "true", "yes", "on")
+    if not fast_start:
+        try:
+            import torch
+        except ImportError:
+            pass
 
     # Optional runtime trace to prove which code is actually executing.
     # Enable with: AETHER_RUNTIME_TRACE=1
@@ -94,6 +98,8 @@ def main(tuner=None):
     try:
         setup_environment()
         optimize_process()
+        # Move log formatting and disk/console writes off the event loop
+        setup_logging()
         
         # Launch the Async Event Loop
         if sys.platform == 'win32':
@@ -109,6 +115,8 @@ def main(tuner=None):
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        shutdown_logging()
 
 if __name__ == "__main__":
     main()
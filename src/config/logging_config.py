@@ -37,7 +37,8 @@ DEDUP_CONFIG = {
     "enabled": True,
     "time_window": 60,  # Don't repeat same message within 60 seconds
     "max_repeats": 1,   # Show message once, then suppress for time_window
-}
+    "max_level": "WARNING",  # Errors and above are never suppressed
+}  # Enforced by src/utils/log_pipeline.DedupFilter
 
 # Trader-focused summary intervals
 SUMMARY_CONFIG = {
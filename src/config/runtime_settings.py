@@ -0,0 +1,315 @@
+"""
+Runtime Settings - Typed, frozen settings compiled once from env and config files.
+
+Hot paths used to call os.getenv and re-parse "1"/"true"/"yes"/"on" on
+every tick. The registry parses everything once into a frozen
+RuntimeSettings object; readers take the current snapshot and use plain
+attribute access:
+
+    s = runtime_settings()
+    if s.decision_trace: ...
+
+Sources, lowest to highest precedence:
+    1. field defaults below
+    2. the `runtime:` section of config/settings.yaml (keys = field names)
+    3. AETHER_* environment variables
+
+The whole settings.yaml and model_config.json are also exposed read-only
+as `settings` and `model_config`.
+
+Hot reload: `maybe_reload()` is called between trading cycles. It rebuilds
+the snapshot when SIGHUP requested it or when a config file's mtime changed
+(checked at most every AETHER_SETTINGS_POLL_S seconds), validates it with
+ConfigValidator and swaps it in with a single reference assignment. An
+invalid file is rejected and the previous snapshot stays active; at startup,
+when there is no previous snapshot, an unreadable file falls back to the
+field defaults plus environment overrides. Values
+that components copy at construction time still need a restart.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger("RuntimeSettings")
+
+_TRUE = ("1", "true", "yes", "on")
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _parse_flag(raw: Any) -> bool:
+    return str(raw).strip().lower() in _TRUE
+
+
+def _parse_optional_float(raw: Any) -> Optional[float]:
+    if raw is None or str(raw).strip() == "":
+        return None
+    return float(raw)
+
+
+_PARSERS: Dict[str, Callable[[Any], Any]] = {
+    "flag": _parse_flag,
+    "int": lambda raw: int(float(raw)),
+    "float": float,
+    "optfloat": _parse_optional_float,
+    "str": lambda raw: str(raw).strip().lower(),
+}
+
+# field name -> (env var, kind); defaults live on the dataclass
+RUNTIME_FIELDS: Dict[str, Tuple[str, str]] = {
+    # Freshness gates
+    "enable_freshness_gate": ("AETHER_ENABLE_FRESHNESS_GATE", "flag"),
+    "fresh_tick_max_age_s": ("AETHER_FRESH_TICK_MAX_AGE_S", "optfloat"),
+    "strict_tick_max_age_s": ("AETHER_STRICT_TICK_MAX_AGE_S", "optfloat"),
+    "fresh_candle_close_max_age_s": ("AETHER_FRESH_CANDLE_CLOSE_MAX_AGE_S", "float"),
+    "time_offset_secs": ("AETHER_TIME_OFFSET_SECS", "optfloat"),
+    # Position management
+    "max_positions_per_symbol": ("AETHER_MAX_POSITIONS_PER_SYMBOL", "int"),
+    "god_mode_ml_enabled": ("AETHER_GOD_MODE_ML_ENABLED", "flag"),
+    "allow_emergency_close_loss": ("AETHER_ALLOW_EMERGENCY_CLOSE_LOSS", "flag"),
+    "slippage_calibration_log": ("AETHER_SLIPPAGE_CALIBRATION_LOG", "flag"),
+    "enable_ppo_memory": ("AETHER_ENABLE_PPO_MEMORY", "flag"),
+    # Broker adapter
+    "decision_trace": ("AETHER_DECISION_TRACE", "flag"),
+    "enable_close_by": ("AETHER_ENABLE_CLOSE_BY", "flag"),
+    "close_dry_run": ("AETHER_CLOSE_DRY_RUN", "flag"),
+    "close_merge_residual": ("AETHER_CLOSE_MERGE_RESIDUAL", "flag"),
+    "close_max_workers": ("AETHER_CLOSE_MAX_WORKERS", "int"),
+    "lot_normalize_mode": ("AETHER_LOT_NORMALIZE_MODE", "str"),
+    "symbol_spec_refresh_s": ("AETHER_SYMBOL_SPEC_REFRESH_S", "float"),
+    # Trading engine
+    "equity_track_every_s": ("AETHER_EQUITY_TRACK_EVERY_S", "float"),
+    "engine_extra_scaling": ("AETHER_ENGINE_EXTRA_SCALING", "flag"),
+    "enable_liquidity_walls": ("AETHER_ENABLE_LIQUIDITY_WALLS", "flag"),
+    "liquidity_lookback_bars": ("AETHER_LIQUIDITY_LOOKBACK_BARS", "int"),
+    "enable_doomsday": ("AETHER_ENABLE_DOOMSDAY", "flag"),
+    "doomsday_drawdown_pct": ("AETHER_DOOMSDAY_DRAWDOWN_PCT", "float"),
+    # Oracle
+    "velocity_norm": ("AETHER_VELOCITY_NORM", "float"),
+    "oracle_fusion_debug": ("AETHER_ORACLE_FUSION_DEBUG", "flag"),
+    "oracle_use_raw_ohlcv": ("AETHER_ORACLE_USE_RAW_OHLCV", "flag"),
+}
+
+
+@dataclass(frozen=True)
+class RuntimeSettings:
+    enable_freshness_gate: bool = True
+    fresh_tick_max_age_s: Optional[float] = None
+    strict_tick_max_age_s: Optional[float] = None
+    fresh_candle_close_max_age_s: float = 0.0
+    time_offset_secs: Optional[float] = None
+
+    max_positions_per_symbol: int = 0
+    god_mode_ml_enabled: bool = True
+    allow_emergency_close_loss: bool = False
+    slippage_calibration_log: bool = True
+    enable_ppo_memory: bool = True
+
+    decision_trace: bool = True
+    enable_close_by: bool = True
+    close_dry_run: bool = False
+    close_merge_residual: bool = True
+    close_max_workers: int = 32
+    lot_normalize_mode: str = "nearest"
+    symbol_spec_refresh_s: float = 300.0
+
+    equity_track_every_s: float = 2.0
+    engine_extra_scaling: bool = False
+    enable_liquidity_walls: bool = False
+    liquidity_lookback_bars: int = 100  # Capped by the CandleManager store (last 100 closed bars)
+    enable_doomsday: bool = False
+    doomsday_drawdown_pct: float = 0.75
+
+    velocity_norm: float = 15.0
+    oracle_fusion_debug: bool = False
+    oracle_use_raw_ohlcv: bool = False
+
+    # Raw config files (read-only views)
+    settings: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    model_config: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    version: int = 0
+    loaded_at: float = 0.0
+
+    def tick_max_age_s(self, default: float) -> float:
+        """Fresh-tick limit: AETHER_FRESH_TICK_MAX_AGE_S, else the strict limit, else `default`."""
+        if self.fresh_tick_max_age_s is not None:
+            return self.fresh_tick_max_age_s
+        if self.strict_tick_max_age_s is not None:
+            return self.strict_tick_max_age_s
+        return default
+
+
+def build_runtime_settings(settings: Optional[Dict] = None, model_config: Optional[Dict] = None,
+                           environ: Optional[Mapping[str, str]] = None,
+                           version: int = 0) -> Tuple[RuntimeSettings, List[str]]:
+    """Compile a snapshot; returns it with the list of values that failed to parse."""
+    environ = os.environ if environ is None else environ
+    settings = settings or {}
+    overrides = settings.get("runtime") or {}
+    if not isinstance(overrides, dict):
+        overrides = {}
+    defaults = {f.name: f.default for f in fields(RuntimeSettings) if f.name in RUNTIME_FIELDS}
+
+    values: Dict[str, Any] = {}
+    issues: List[str] = []
+    for name, (env_name, kind) in RUNTIME_FIELDS.items():
+        parse = _PARSERS[kind]
+        value = defaults[name]
+        for source, raw in (("settings.yaml runtime", overrides.get(name)), (env_name, environ.get(env_name))):
+            if raw is None:
+                continue
+            try:
+                value = parse(raw)
+            except (TypeError, ValueError):
+                issues.append(f"{source}: invalid {kind} for {name}: {raw!r} (using {value!r})")
+        values[name] = value
+
+    snapshot = RuntimeSettings(
+        **values,
+        settings=_freeze(settings),
+        model_config=_freeze(model_config or {}),
+        version=version,
+        loaded_at=time.time(),
+    )
+    return snapshot, issues
+
+
+class SettingsRegistry:
+    """Holds the current RuntimeSettings and rebuilds it on demand."""
+
+    def __init__(self, config_dir: str = "config"):
+        self.config_dir = Path(config_dir)
+        try:
+            self.poll_s = float(os.getenv("AETHER_SETTINGS_POLL_S", "2.0"))
+        except Exception:
+            self.poll_s = 2.0
+        self._reload_requested = False
+        self._last_poll = 0.0
+        self._mtimes: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.rejected = 0
+        snapshot = self._load(version=0, validate=False)[0]
+        if snapshot is None:
+            # Unreadable config at startup: run on defaults + env rather than no snapshot
+            self._mtimes = self._stat()
+            snapshot = build_runtime_settings({}, {})[0]
+            logger.error("[SETTINGS] Using built-in defaults and environment overrides until the config is fixed")
+        self._current = snapshot
+
+    @property
+    def current(self) -> RuntimeSettings:
+        return self._current
+
+    def _paths(self) -> Tuple[Path, Path]:
+        return self.config_dir / "settings.yaml", self.config_dir / "model_config.json"
+
+    def _stat(self) -> Dict[str, Optional[float]]:
+        mtimes = {}
+        for path in self._paths():
+            try:
+                mtimes[str(path)] = path.stat().st_mtime
+            except OSError:
+                mtimes[str(path)] = None
+        return mtimes
+
+    def _load(self, version: int, validate: bool = True) -> Tuple[Optional[RuntimeSettings], List[str]]:
+        settings_path, model_path = self._paths()
+        mtimes = self._stat()
+        settings: Dict = {}
+        model_config: Dict = {}
+        try:
+            if settings_path.exists():
+                import yaml
+                with open(settings_path, "r") as f:
+                    settings = yaml.safe_load(f) or {}
+            if model_path.exists():
+                with open(model_path, "r") as f:
+                    model_config = json.load(f)
+            if not isinstance(settings, dict) or not isinstance(model_config, dict):
+                raise ValueError("top level of settings.yaml / model_config.json must be a mapping")
+        except Exception as e:
+            logger.error(f"[SETTINGS] Could not read config: {e}")
+            return None, [str(e)]
+
+        snapshot, issues = build_runtime_settings(settings, model_config, version=version)
+        errors: List[str] = []
+        if validate:
+            from src.config_validator import ConfigValidator
+            _, errors, warnings = ConfigValidator().validate_loaded(settings, model_config)
+            issues.extend(warnings)
+        for issue in issues:
+            logger.warning(f"[SETTINGS] {issue}")
+        if errors:
+            return None, errors
+        self._mtimes = mtimes
+        return snapshot, issues
+
+    def request_reload(self) -> None:
+        """Reload at the next maybe_reload() (safe to call from a signal handler)."""
+        self._reload_requested = True
+
+    def maybe_reload(self, now: Optional[float] = None) -> bool:
+        """Swap in a fresh snapshot if requested or a config file changed. Returns True on swap."""
+        requested = self._reload_requested
+        if not requested:
+            now = time.time() if now is None else now
+            if self.poll_s <= 0 or now - self._last_poll < self.poll_s:
+                return False
+            self._last_poll = now
+            if self._stat() == self._mtimes:
+                return False
+        return self.reload()
+
+    def reload(self) -> bool:
+        with self._lock:
+            self._reload_requested = False
+            snapshot, errors = self._load(version=self._current.version + 1)
+            if snapshot is None:
+                self.rejected += 1
+                # Don't retry the same broken file on every poll
+                self._mtimes = self._stat()
+                logger.error(f"[SETTINGS] Reload rejected, keeping v{self._current.version}: {'; '.join(errors)}")
+                return False
+            changed = [
+                name for name in RUNTIME_FIELDS
+                if getattr(snapshot, name) != getattr(self._current, name)
+            ]
+            self._current = snapshot
+            self.reloads += 1
+        logger.info(f"[SETTINGS] Reloaded v{snapshot.version}" + (f": {', '.join(changed)}" if changed else ""))
+        return True
+
+
+# Singleton instance
+_registry_instance: Optional[SettingsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_settings_registry() -> SettingsRegistry:
+    """Get or create the singleton SettingsRegistry instance."""
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = SettingsRegistry()
+    return _registry_instance
+
+
+def runtime_settings() -> RuntimeSettings:
+    """Current settings snapshot (hold it for the duration of one operation)."""
+    return get_settings_registry().current
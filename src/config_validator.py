@@ -13,7 +13,7 @@ import os
 import yaml
 import json
 import logging
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import re
 
@@ -90,7 +90,48 @@ class ConfigValidator:
         
         is_valid = len(self.errors) == 0
         return is_valid, self.errors, self.warnings
-    
+
+    def validate_loaded(self, settings: Dict[str, Any],
+                        model_config: Optional[Dict[str, Any]] = None) -> Tuple[bool, List[str], List[str]]:
+        """
+        Validate already-parsed settings.yaml / model_config.json contents
+        (used by the runtime settings hot reload).
+
+        Returns:
+            Tuple of (is_valid, errors, warnings)
+        """
+        self._validate_settings(settings or {})
+        self._validate_runtime((settings or {}).get('runtime'))
+        if model_config:
+            self._validate_model_config(model_config)
+
+        is_valid = len(self.errors) == 0
+        return is_valid, self.errors, self.warnings
+
+    def _validate_runtime(self, runtime: Any) -> None:
+        """Validate the optional 'runtime' overrides section of settings.yaml."""
+        if runtime is None:
+            return
+        if not isinstance(runtime, dict):
+            self.errors.append("'runtime' section in settings.yaml must be a mapping")
+            return
+
+        from src.config.runtime_settings import RUNTIME_FIELDS
+        for key, value in runtime.items():
+            if key not in RUNTIME_FIELDS:
+                self.warnings.append(f"Unknown runtime setting '{key}' (ignored)")
+                continue
+            kind = RUNTIME_FIELDS[key][1]
+            if kind in ('int', 'float', 'optfloat') and value is not None:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    self.errors.append(f"runtime.{key} must be a number, got {value!r}")
+                elif value < 0 and key != 'time_offset_secs':
+                    self.errors.append(f"runtime.{key} must be >= 0, got {value}")
+
+        mode = runtime.get('lot_normalize_mode')
+        if mode is not None and str(mode).strip().lower() not in ('nearest', 'round', 'standard', 'down', 'floor'):
+            self.warnings.append(f"runtime.lot_normalize_mode '{mode}' rounds down")
+
     def _validate_settings(self, settings: Dict[str, Any]) -> None:
         """Validate settings.yaml configuration."""
         
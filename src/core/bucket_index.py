@@ -0,0 +1,99 @@
+"""
+Bucket Index - Secondary lookups over PositionManager state.
+
+PositionManager keeps positions in `active_positions` (ticket -> Position) and
+bucket membership in `bucket_stats[bucket_id].positions`. Lookups such as
+"which bucket owns this ticket" or "which positions belong to this symbol"
+used to scan both on every call. BucketIndex holds the derived maps:
+
+- ticket -> open bucket
+- bucket -> tracked tickets (in bucket order)
+- symbol -> open buckets / tracked tickets
+- bucket close times, ordered, for recent-close cooldown checks
+
+The maps are rebuilt under the PositionManager lock whenever its structure
+version changes (every ticket/bucket membership mutation bumps it), so a
+lookup never sees a half-applied change and costs O(1) between mutations.
+Close times are recorded directly at the close transition.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Close times older than this are dropped from the recent-close structure
+RECENT_CLOSE_HORIZON_S = 3600.0
+
+
+class BucketIndex:
+    """Derived lookup maps; the owner must hold its lock for every call."""
+
+    def __init__(self):
+        self.version = -1
+        self.ticket_to_bucket: Dict[int, str] = {}
+        self.bucket_tickets: Dict[str, Tuple[int, ...]] = {}
+        self.symbol_buckets: Dict[str, Tuple[str, ...]] = {}
+        self.symbol_tickets: Dict[str, Tuple[int, ...]] = {}
+        self._close_times: Dict[str, float] = {}
+        self._close_order: deque = deque()  # (close_time, bucket_id), oldest first
+
+    def rebuild(self, version: int, bucket_stats: Dict, active_positions: Dict) -> None:
+        ticket_to_bucket: Dict[int, str] = {}
+        bucket_tickets: Dict[str, Tuple[int, ...]] = {}
+        symbol_buckets: Dict[str, List[str]] = {}
+        symbol_tickets: Dict[str, List[int]] = {}
+
+        for ticket, pos in active_positions.items():
+            symbol_tickets.setdefault(pos.symbol, []).append(ticket)
+
+        for bucket_id, stats in bucket_stats.items():
+            tracked = tuple(t for t in stats.positions if t in active_positions)
+            bucket_tickets[bucket_id] = tracked
+            if stats.closed:
+                continue
+            for ticket in stats.positions:
+                ticket_to_bucket.setdefault(ticket, bucket_id)
+            for symbol in dict.fromkeys(active_positions[t].symbol for t in tracked):
+                symbol_buckets.setdefault(symbol, []).append(bucket_id)
+
+        self.ticket_to_bucket = ticket_to_bucket
+        self.bucket_tickets = bucket_tickets
+        self.symbol_buckets = {s: tuple(b) for s, b in symbol_buckets.items()}
+        self.symbol_tickets = {s: tuple(t) for s, t in symbol_tickets.items()}
+        self.version = version
+
+    def record_close(self, bucket_id: str, when: float) -> None:
+        self._close_times[bucket_id] = when
+        self._close_order.append((when, bucket_id))
+        horizon = when - RECENT_CLOSE_HORIZON_S
+        while self._close_order and self._close_order[0][0] < horizon:
+            old_time, old_bucket = self._close_order.popleft()
+            if self._close_times.get(old_bucket) == old_time:
+                del self._close_times[old_bucket]
+
+    def forget_close(self, bucket_id: str) -> None:
+        """Drop the close time of a bucket id that is being reopened."""
+        self._close_times.pop(bucket_id, None)
+
+    def last_close(self, bucket_id: str) -> Optional[float]:
+        return self._close_times.get(bucket_id)
+
+    def verify(self, bucket_stats: Dict, active_positions: Dict) -> List[str]:
+        """
+        Compare the maps with a from-scratch rebuild.
+
+        Returns:
+            Human-readable mismatches (empty when consistent)
+        """
+        fresh = BucketIndex()
+        fresh.rebuild(self.version, bucket_stats, active_positions)
+        problems = []
+        for name in ("ticket_to_bucket", "bucket_tickets", "symbol_buckets", "symbol_tickets"):
+            ours, expected = getattr(self, name), getattr(fresh, name)
+            if ours != expected:
+                keys = sorted(set(ours) ^ set(expected) | {k for k in ours if k in expected and ours[k] != expected[k]}, key=str)
+                problems.append(f"{name} differs for {keys}")
+        for bucket_id in self._close_times:
+            stats = bucket_stats.get(bucket_id)
+            if stats is not None and not stats.closed:
+                problems.append(f"close time recorded for open bucket {bucket_id}")
+        return problems
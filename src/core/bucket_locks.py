@@ -0,0 +1,136 @@
+"""
+Bucket Locks - Per-bucket / per-symbol asyncio locks.
+
+Close, hedge and recovery operations await broker I/O, so one global lock
+either blocks the event loop (threading.Lock) or serializes every bucket.
+BucketLocks hands out one asyncio lock per key instead: operations on the
+same bucket queue behind each other, operations on different buckets run
+concurrently, and nothing blocks the loop.
+
+Locks are re-entrant per asyncio task, so a locked operation may call
+another one on the same bucket (e.g. recovery closing its own bucket).
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger("BucketLocks")
+
+
+class BucketBusy(Exception):
+    """Raised when a bucket lock could not be acquired within the timeout."""
+
+
+class _KeyLock:
+    __slots__ = ("lock", "owner", "depth", "waiters")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.owner = None
+        self.depth = 0
+        # Tasks queued in acquire(); the lock reads unlocked while one is being handed it
+        self.waiters = 0
+
+    def busy(self) -> bool:
+        return self.lock.locked() or self.waiters > 0
+
+
+class BucketLocks:
+    """Lazily created asyncio lock per key (bucket id or symbol)."""
+
+    def __init__(self):
+        self._locks: Dict[str, _KeyLock] = {}
+        self.contended = 0
+        self.timeouts = 0
+
+    def _get(self, key: str) -> _KeyLock:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks.setdefault(key, _KeyLock())
+        return entry
+
+    def is_busy(self, key: str) -> bool:
+        entry = self._locks.get(key)
+        return entry is not None and entry.busy()
+
+    @asynccontextmanager
+    async def hold(self, key: str, timeout: Optional[float] = None):
+        """
+        Hold the lock for `key`.
+
+        Args:
+            timeout: None waits indefinitely, 0 fails immediately if busy
+
+        Raises:
+            BucketBusy: if the lock was not acquired in time
+        """
+        entry = self._get(key)
+        task = asyncio.current_task()
+        if task is not None and entry.owner is task:
+            entry.depth += 1
+            try:
+                yield
+            finally:
+                entry.depth -= 1
+            return
+
+        if entry.busy():
+            self.contended += 1
+            if timeout is not None and timeout <= 0:
+                raise BucketBusy(key)
+        entry.waiters += 1
+        try:
+            if timeout is None or timeout <= 0:
+                # Free and nobody queued: completes at once. Busy (timeout=None):
+                # waits in FIFO order behind the holder and earlier waiters.
+                await entry.lock.acquire()
+            else:
+                await asyncio.wait_for(entry.lock.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise BucketBusy(key)
+        finally:
+            entry.waiters -= 1
+
+        entry.owner = task
+        entry.depth = 1
+        try:
+            yield
+        finally:
+            entry.owner = None
+            entry.depth = 0
+            entry.lock.release()
+
+    def discard(self, key: str) -> None:
+        """Forget the lock of a closed bucket (kept if currently held)."""
+        entry = self._locks.get(key)
+        if entry is not None and not entry.busy():
+            del self._locks[key]
+
+
+def bucket_exclusive(timeout: Optional[float] = None, busy_result=False):
+    """
+    Run an async PositionManager method under the lock of its `bucket_id`
+    argument (uses `self._bucket_locks`). Returns `busy_result` if the
+    bucket is held by another operation for longer than `timeout`.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            bucket_id = signature.bind(self, *args, **kwargs).arguments.get("bucket_id")
+            try:
+                async with self._bucket_locks.hold(bucket_id, timeout):
+                    return await fn(self, *args, **kwargs)
+            except BucketBusy:
+                logger.info(f"[BUCKET LOCK] {fn.__name__} skipped: bucket {bucket_id} busy")
+                return busy_result
+
+        return wrapper
+
+    return decorator
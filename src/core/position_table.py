@@ -0,0 +1,186 @@
+"""
+Position Table - Column store of open bucket legs for vectorized bucket math.
+
+One row per tracked position in an open bucket, with NumPy columns for the
+values bucket exits need (side, volume, open price, swap, commission,
+contract size, money per price unit). Per-bucket net PnL, exposure,
+breakeven price and drawdown are computed for every bucket at once with
+`np.bincount`, instead of looping over Position objects bucket by bucket.
+
+Rows are rebuilt only when the PositionManager structure version changes
+(legs opened/closed/modified). Between rebuilds PnL comes from:
+- the broker's profit column, refreshed from the tracked positions after
+  each broker sync, or
+- the latest quote of a symbol, when it is newer than that sync: legs are
+  marked to bid (buys) / ask (sells) using tick_value / tick_size.
+
+Marked PnL uses the spec's tick_value, which the broker converts at its
+own rate and may quote for the profit side only, so it can drift from the
+broker's profit column. It feeds drawdown/hedge triggers and telemetry;
+profit-taking decisions use `broker_net_pnl`, which is always the broker's
+own numbers from the last sync.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class BucketMetrics:
+    """Precomputed per-bucket numbers consumed by the exit logic."""
+    bucket_id: str
+    legs: int
+    net_pnl: float           # gross + swap + commission (USD), marked to the latest quote
+    gross_pnl: float
+    broker_net_pnl: float    # Broker profit + swap + commission as of the last sync (never marked)
+    swap: float
+    commission: float
+    total_volume: float      # Sum of lots, both sides
+    net_volume: float        # Buys minus sells (lots)
+    breakeven_price: float   # Price where net PnL is zero (0.0 if fully hedged)
+    drawdown: float          # max(0, -net_pnl)
+    marked: bool             # True if PnL was marked to a quote newer than the broker sync
+
+
+class PositionTable:
+    """Column arrays over open bucket legs; the owner must hold its lock."""
+
+    def __init__(self):
+        self.version = -1
+        self.pnl_version = -1
+        self.bucket_ids: List[str] = []
+        self.tickets = np.zeros(0, dtype=np.int64)
+        self.bucket = np.zeros(0, dtype=np.int64)
+        self.side = np.zeros(0)
+        self.volume = np.zeros(0)
+        self.price_open = np.zeros(0)
+        self.swap = np.zeros(0)
+        self.commission = np.zeros(0)
+        self.contract_size = np.zeros(0)
+        self.value_per_price = np.zeros(0)  # Account currency per 1.0 price move per lot
+        self.profit = np.zeros(0)
+        self._symbol_rows: Dict[str, np.ndarray] = {}
+        self.synced_at = 0.0  # Broker sync time of the profit column
+        self._quotes: Dict[str, Tuple[float, float, float]] = {}  # symbol -> (bid, ask, time)
+        self.quote_version = 0
+
+    def rebuild(self, version: int, bucket_stats: Dict, active_positions: Dict,
+                spec_lookup: Callable) -> None:
+        bucket_ids: List[str] = []
+        rows = []
+        for bucket_id, stats in bucket_stats.items():
+            if stats.closed:
+                continue
+            legs = [active_positions[t] for t in stats.positions if t in active_positions]
+            if not legs:
+                continue
+            b = len(bucket_ids)
+            bucket_ids.append(bucket_id)
+            for pos in legs:
+                rows.append((pos, b))
+
+        n = len(rows)
+        self.bucket_ids = bucket_ids
+        self.tickets = np.fromiter((p.ticket for p, _ in rows), dtype=np.int64, count=n)
+        self.bucket = np.fromiter((b for _, b in rows), dtype=np.int64, count=n)
+        self.side = np.fromiter((1.0 if p.type == 0 else -1.0 for p, _ in rows), dtype=float, count=n)
+        self.volume = np.fromiter((p.volume for p, _ in rows), dtype=float, count=n)
+        self.price_open = np.fromiter((p.price_open for p, _ in rows), dtype=float, count=n)
+
+        contract = {}
+        per_price = {}
+        symbol_rows: Dict[str, List[int]] = {}
+        for i, (pos, _) in enumerate(rows):
+            symbol_rows.setdefault(pos.symbol, []).append(i)
+        for symbol in symbol_rows:
+            spec = spec_lookup(symbol)
+            cs = spec.contract_size if spec else 0.0
+            contract[symbol] = cs
+            if spec and spec.tick_size > 0 and spec.tick_value > 0:
+                per_price[symbol] = spec.tick_value / spec.tick_size
+            else:
+                per_price[symbol] = cs  # Quote currency == account currency assumption
+
+        self.contract_size = np.fromiter((contract[p.symbol] for p, _ in rows), dtype=float, count=n)
+        self.value_per_price = np.fromiter((per_price[p.symbol] for p, _ in rows), dtype=float, count=n)
+        self._symbol_rows = {s: np.asarray(r, dtype=np.int64) for s, r in symbol_rows.items()}
+        self.version = version
+        self.refresh_floating(active_positions, -1, self.synced_at)
+
+    def refresh_floating(self, active_positions: Dict, pnl_version: int, synced_at: float) -> None:
+        """Reload broker profit/swap/commission for every row, as of broker sync `synced_at`."""
+        n = len(self.tickets)
+        legs = [active_positions.get(int(t)) for t in self.tickets]
+        self.profit = np.fromiter((p.profit if p else 0.0 for p in legs), dtype=float, count=n)
+        self.swap = np.fromiter((getattr(p, 'swap', 0.0) if p else 0.0 for p in legs), dtype=float, count=n)
+        self.commission = np.fromiter((getattr(p, 'commission', 0.0) if p else 0.0 for p in legs), dtype=float, count=n)
+        self.pnl_version = pnl_version
+        self.synced_at = synced_at
+
+    def update_quote(self, symbol: str, bid: float, ask: float) -> None:
+        current = self._quotes.get(symbol)
+        if current is not None and current[0] == bid and current[1] == ask:
+            return
+        self._quotes[symbol] = (float(bid), float(ask), time.time())
+        self.quote_version += 1
+
+    def evaluate(self) -> Dict[str, BucketMetrics]:
+        """One vectorized pass over all rows -> metrics for every open bucket."""
+        nb = len(self.bucket_ids)
+        if nb == 0:
+            return {}
+
+        gross = self.profit.copy()
+        marked = np.zeros(nb, dtype=bool)
+        for symbol, rows in self._symbol_rows.items():
+            quote = self._quotes.get(symbol)
+            if quote is None or quote[2] < self.synced_at:
+                continue
+            rows = rows[self.value_per_price[rows] > 0]
+            if not len(rows):
+                continue
+            side = self.side[rows]
+            exit_price = np.where(side > 0, quote[0], quote[1])
+            gross[rows] = side * (exit_price - self.price_open[rows]) * self.volume[rows] * self.value_per_price[rows]
+            marked[self.bucket[rows]] = True
+
+        b = self.bucket
+        signed = self.side * self.volume
+        gross_b = np.bincount(b, weights=gross, minlength=nb)
+        broker_gross_b = np.bincount(b, weights=self.profit, minlength=nb)
+        swap_b = np.bincount(b, weights=self.swap, minlength=nb)
+        comm_b = np.bincount(b, weights=self.commission, minlength=nb)
+        legs_b = np.bincount(b, minlength=nb)
+        vol_b = np.bincount(b, weights=self.volume, minlength=nb)
+        net_vol_b = np.bincount(b, weights=signed, minlength=nb)
+
+        # Breakeven: sum(side*vol*vpp*(P - open)) + swap + comm = 0
+        weight = signed * self.value_per_price
+        denom = np.bincount(b, weights=weight, minlength=nb)
+        numer = np.bincount(b, weights=weight * self.price_open, minlength=nb) - (swap_b + comm_b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            breakeven = np.where(np.abs(denom) > 1e-12, numer / denom, 0.0)
+
+        net_b = gross_b + swap_b + comm_b
+        drawdown = np.where(net_b < 0, -net_b, 0.0)
+
+        return {
+            bucket_id: BucketMetrics(
+                bucket_id=bucket_id,
+                legs=int(legs_b[i]),
+                net_pnl=float(net_b[i]),
+                gross_pnl=float(gross_b[i]),
+                broker_net_pnl=float(broker_gross_b[i] + swap_b[i] + comm_b[i]),
+                swap=float(swap_b[i]),
+                commission=float(comm_b[i]),
+                total_volume=float(vol_b[i]),
+                net_volume=float(net_vol_b[i]),
+                breakeven_price=float(breakeven[i]),
+                drawdown=float(drawdown[i]),
+                marked=bool(marked[i]),
+            )
+            for i, bucket_id in enumerate(self.bucket_ids)
+        }
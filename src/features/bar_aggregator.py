@@ -0,0 +1,241 @@
+"""
+Multi-Timeframe Bar Aggregator
+
+Builds M5/M15/H1/H4 bars from the closed M1 candle store and keeps the
+linear-regression slope of each timeframe's last N closes up to date as bars
+form and roll, so trend checks never go back to the terminal.
+
+Higher timeframes need more history than the M1 store holds, so each series
+can be seeded once with closed bars from the broker; after that every update
+comes from M1 candles only.
+"""
+
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+TIMEFRAME_SECONDS = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "H1": 3600,
+    "H4": 14400,
+}
+
+# Slope (basis points of price per bar) beyond which a timeframe is trending
+TREND_THRESHOLD_BPS = 0.5
+
+
+class TimeframeSeries:
+    """
+    OHLCV bars for one timeframe plus running regression sums over the last
+    `window` closes (x = 0..n-1, oldest first).
+
+    Updating the forming bar's close is an O(1) delta on sum_y/sum_xy; the
+    sums are recomputed exactly once per new bar (O(window)), which also
+    cancels float drift.
+    """
+
+    def __init__(self, timeframe: str, window: int = 20, max_bars: int = 500):
+        self.timeframe = timeframe
+        self.seconds = TIMEFRAME_SECONDS[timeframe]
+        self.window = window
+        self.bars: deque = deque(maxlen=max_bars)
+        self._closes: deque = deque(maxlen=window)
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+        self.seeded = False
+        # M1 bars opening before this time are already inside seeded bars
+        self.ingest_from = 0
+
+    def bucket(self, ts: int) -> int:
+        return ts - (ts % self.seconds)
+
+    def _recompute(self) -> None:
+        self._sum_y = float(sum(self._closes))
+        self._sum_xy = float(sum(i * c for i, c in enumerate(self._closes)))
+
+    def append_bar(self, bar: Dict) -> None:
+        self.bars.append(bar)
+        self._closes.append(float(bar['close']))
+        self._recompute()
+
+    def update(self, m1: Dict) -> None:
+        """Fold one closed M1 candle into the current (or a new) bar."""
+        ts = int(m1['time'])
+        if ts < self.ingest_from:
+            return
+        start = self.bucket(ts)
+        close = float(m1['close'])
+        last = self.bars[-1] if self.bars else None
+
+        if last is None or start > last['time']:
+            self.append_bar({
+                'time': start,
+                'open': float(m1['open']),
+                'high': float(m1['high']),
+                'low': float(m1['low']),
+                'close': close,
+                'tick_volume': float(m1.get('tick_volume', 0) or 0),
+            })
+            return
+        if start < last['time']:
+            return  # Out-of-order candle for a bar that already rolled
+
+        last['high'] = max(last['high'], float(m1['high']))
+        last['low'] = min(last['low'], float(m1['low']))
+        last['tick_volume'] += float(m1.get('tick_volume', 0) or 0)
+        delta = close - last['close']
+        last['close'] = close
+        if delta:
+            self._closes[-1] = close
+            self._sum_y += delta
+            self._sum_xy += (len(self._closes) - 1) * delta
+
+    def slope(self) -> float:
+        """Least-squares slope of the last `window` closes (price per bar)."""
+        n = len(self._closes)
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2.0
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6.0
+        denom = n * sum_xx - sum_x * sum_x
+        if denom == 0:
+            return 0.0
+        return (n * self._sum_xy - sum_x * self._sum_y) / denom
+
+    def slope_bps(self) -> float:
+        """Slope normalized to basis points of the last close per bar."""
+        if not self._closes or self._closes[-1] == 0:
+            return 0.0
+        return (self.slope() / self._closes[-1]) * 10000
+
+    def trend(self, threshold_bps: float = TREND_THRESHOLD_BPS) -> str:
+        if len(self._closes) < self.window:
+            return "NEUTRAL"
+        bps = self.slope_bps()
+        if bps > threshold_bps:
+            return "UP"
+        if bps < -threshold_bps:
+            return "DOWN"
+        return "NEUTRAL"
+
+
+class BarAggregator:
+    """
+    Per-symbol multi-timeframe bar store fed from closed M1 candles.
+
+    Usage:
+        agg = BarAggregator()
+        agg.seed("H1", broker_h1_candles)   # once, optional
+        agg.ingest(m1_history)              # every cycle, only new bars are folded
+        agg.get_trend("M15")                # "UP" / "DOWN" / "NEUTRAL"
+    """
+
+    def __init__(self, timeframes: Iterable[str] = ("M1", "M5", "M15", "H1", "H4"),
+                 window: int = 20, max_bars: int = 500):
+        self.window = window
+        self.series: Dict[str, TimeframeSeries] = {
+            tf: TimeframeSeries(tf, window=window, max_bars=max_bars) for tf in timeframes
+        }
+        self.last_m1_time = 0
+        self.version = 0  # Bumped whenever any bar changes
+
+    def needs_seed(self, timeframe: str) -> bool:
+        series = self.series.get(timeframe)
+        return series is not None and timeframe != "M1" and not series.seeded
+
+    def seed(self, timeframe: str, candles: List[Dict], now: Optional[float] = None) -> None:
+        """
+        Load closed bars for a timeframe (ascending by time). The still-forming
+        bar, if present, is dropped and rebuilt from M1 candles instead.
+
+        Bar times are broker server time, so only the last bar is checked,
+        against the broker's own clock: the end of the newest ingested M1
+        candle (local `now` only before any M1 candle was seen). The series
+        stays unseeded when no closed bar is left.
+        """
+        series = self.series.get(timeframe)
+        if series is None:
+            return
+        closed = list(candles)
+        if closed:
+            clock = self.last_m1_time + 60 if self.last_m1_time else (time.time() if now is None else now)
+            if clock < int(closed[-1]['time']) + series.seconds:
+                closed.pop()
+        if not closed:
+            return
+
+        series.bars.clear()
+        series._closes.clear()
+        for c in closed:
+            series.append_bar({
+                'time': int(c['time']),
+                'open': float(c['open']),
+                'high': float(c['high']),
+                'low': float(c['low']),
+                'close': float(c['close']),
+                'tick_volume': float(c.get('tick_volume', 0) or 0),
+            })
+        series.ingest_from = series.bars[-1]['time'] + series.seconds
+        series.seeded = True
+
+        # Rebuild the forming bar from M1 candles already ingested
+        m1 = self.series.get("M1")
+        if m1 is not None and m1 is not series:
+            for candle in m1.bars:
+                series.update(candle)
+        self.version += 1
+
+    def ingest(self, m1_candles: List[Dict]) -> int:
+        """
+        Fold closed M1 candles (ascending by time) newer than the last one seen.
+
+        Returns:
+            Number of new M1 candles folded, or -1 if the batch does not overlap
+            the previous one (a gap: higher timeframes should be re-seeded)
+        """
+        if not m1_candles:
+            return 0
+
+        gap = bool(self.last_m1_time) and int(m1_candles[0]['time']) > self.last_m1_time + 60
+        if gap:
+            for series in self.series.values():
+                series.seeded = False
+                series.bars.clear()
+                series._closes.clear()
+                series.ingest_from = 0
+
+        folded = 0
+        for candle in m1_candles:
+            ts = int(candle['time'])
+            if ts <= self.last_m1_time:
+                continue
+            for series in self.series.values():
+                series.update(candle)
+            self.last_m1_time = ts
+            folded += 1
+
+        if folded:
+            self.version += 1
+        return -1 if gap else folded
+
+    def get_bars(self, timeframe: str, count: Optional[int] = None) -> List[Dict]:
+        """Bars oldest-first; the last one may still be forming (except M1)."""
+        series = self.series.get(timeframe)
+        if series is None:
+            return []
+        bars = list(series.bars)
+        return bars[-count:] if count else bars
+
+    def get_slope_bps(self, timeframe: str) -> float:
+        series = self.series.get(timeframe)
+        return series.slope_bps() if series else 0.0
+
+    def get_trend(self, timeframe: str, threshold_bps: float = TREND_THRESHOLD_BPS) -> str:
+        series = self.series.get(timeframe)
+        return series.trend(threshold_bps) if series else "NEUTRAL"
+
+    def get_trends(self, timeframes: Iterable[str] = ("M1", "M5", "M15")) -> Dict[str, str]:
+        """Returns e.g. {'m1_trend': 'UP', 'm5_trend': 'NEUTRAL', ...}."""
+        return {f"{tf.lower()}_trend": self.get_trend(tf) for tf in timeframes}
@@ -258,6 +258,7 @@ class AsyncSQLiteManager(AsyncDatabaseManager):
             await self.connection.commit()
         except Exception as e:
             logger.error(f"Batch tick recording failed: {e}")
+            raise
 
     async def record_candle(self, candle: CandleData) -> None:
         """Record a single candle asynchronously."""
@@ -290,6 +291,7 @@ class AsyncSQLiteManager(AsyncDatabaseManager):
             await self.connection.commit()
         except Exception as e:
             logger.error(f"Batch candle recording failed: {e}")
+            raise
 
     async def record_trade(self, trade: TradeData) -> None:
         """Record a trade asynchronously."""
@@ -508,6 +510,7 @@ class AsyncTimescaleManager(AsyncDatabaseManager):
                 )
             except Exception as e:
                 logger.error(f"Batch tick recording failed: {e}")
+                raise
 
     async def record_candle(self, candle: CandleData) -> None:
         """Record a single candle asynchronously."""
@@ -554,6 +557,7 @@ class AsyncTimescaleManager(AsyncDatabaseManager):
                 )
             except Exception as e:
                 logger.error(f"Batch candle recording failed: {e}")
+                raise
 
     async def record_trade(self, trade: TradeData) -> None:
         """Record a trade asynchronously."""
@@ -664,17 +668,35 @@ class AsyncDatabaseQueue:
     - Background batch processing
     - Automatic flushing based on time/size thresholds
     - Non-blocking queue operations
+    - Bounded queues: while the database is failing, the oldest ticks/candles
+      beyond `max_pending` are dropped (and counted) instead of growing forever
+
+    A flush takes the pending rows out of the queue before awaiting the
+    database, so rows added meanwhile are kept for the next batch; a failed
+    batch goes back to the front of the queue.
     """
 
-    def __init__(self, db_manager: AsyncDatabaseManager, batch_size: int = 100, flush_interval: float = 1.0):
+    def __init__(self, db_manager: AsyncDatabaseManager, batch_size: int = 100, flush_interval: float = 1.0,
+                 max_pending: Optional[int] = None):
         self.db_manager = db_manager
         self.batch_size = batch_size
         self.flush_interval = flush_interval
+        if max_pending is None:
+            try:
+                max_pending = int(os.getenv("AETHER_DB_QUEUE_MAX_PENDING", "10000"))
+            except Exception:
+                max_pending = 10000
+        self.max_pending = max(batch_size, max_pending)
 
         self.ticks_queue: List[TickData] = []
         self.candles_queue: List[CandleData] = []
         self.trades_queue: List[TradeData] = []
 
+        # In-memory health counters (read by the metrics endpoint)
+        self.dropped = {"ticks": 0, "candles": 0}
+        self.flush_failures = {"ticks": 0, "candles": 0}
+        self.flushed = {"ticks": 0, "candles": 0}
+
         self.running = False
         self.task: Optional[asyncio.Task] = None
 
@@ -694,6 +716,12 @@ class AsyncDatabaseQueue:
         await self._flush_all()
         logger.info("Async database queue stopped")
 
+    def _trim(self, queue: List, kind: str) -> None:
+        excess = len(queue) - self.max_pending
+        if excess > 0:
+            del queue[:excess]
+            self.dropped[kind] += excess
+
     async def add_tick(self, tick: TickData) -> None:
         """Add tick to queue for batch processing."""
         self.ticks_queue.append(tick)
@@ -719,22 +747,39 @@ class AsyncDatabaseQueue:
     async def _flush_ticks(self) -> None:
         """Flush accumulated ticks."""
         if self.ticks_queue:
+            batch, self.ticks_queue = self.ticks_queue, []
             try:
-                await self.db_manager.record_ticks_batch(self.ticks_queue)
-                self.ticks_queue.clear()
+                await self.db_manager.record_ticks_batch(batch)
+                self.flushed["ticks"] += len(batch)
             except Exception as e:
+                self.flush_failures["ticks"] += 1
+                self.ticks_queue[:0] = batch
+                self._trim(self.ticks_queue, "ticks")
                 logger.error(f"Failed to flush ticks: {e}")
 
     async def _flush_candles(self) -> None:
         """Flush accumulated candles."""
         if self.candles_queue:
+            batch, self.candles_queue = self.candles_queue, []
             try:
-                await self.db_manager.record_candles_batch(self.candles_queue)
-                self.candles_queue.clear()
+                await self.db_manager.record_candles_batch(batch)
+                self.flushed["candles"] += len(batch)
             except Exception as e:
+                self.flush_failures["candles"] += 1
+                self.candles_queue[:0] = batch
+                self._trim(self.candles_queue, "candles")
                 logger.error(f"Failed to flush candles: {e}")
 
     async def _flush_all(self) -> None:
         """Flush all queues."""
         await self._flush_ticks()
-        await self._flush_candles()
\ No newline at end of file
+        await self._flush_candles()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Queue depth and drop/failure counters (in-memory only)."""
+        return {
+            "depth": {"ticks": len(self.ticks_queue), "candles": len(self.candles_queue)},
+            "dropped": dict(self.dropped),
+            "flush_failures": dict(self.flush_failures),
+            "flushed": dict(self.flushed),
+        }
\ No newline at end of file
@@ -35,18 +35,22 @@ from .risk_manager import RiskManager, ZoneConfig
 from .trading_engine import TradingEngine, TradingConfig
 from .config_validator import ConfigValidator
 from .utils.trading_logger import TradingLogger, DecisionTracker
+from .utils.histogram import Histogram, STAGE_MS_BOUNDS
+from .utils.metrics_server import MetricsExporter, MetricsWriter, metrics_enabled
+from .utils.log_pipeline import get_log_pipeline
+from .config.runtime_settings import get_settings_registry
 
 # Import async database
 from .infrastructure.async_database import get_async_database_manager
 
 # Import NEW Intelligence Layers
-from .ai_core.oracle import Oracle
+# Oracle (torch), PPOGuardian (stable-baselines3) and AutoQuant (torch/pandas) are
+# imported on first use so the broker and position management come up first.
 from .utils.news_filter import NewsFilter
-from .automation.auto_quant import AutoQuant # [NEW] Self-Improvement Module
+from .utils.import_profile import IMPORT_PROFILER
 
 # Import existing components (to be gradually migrated)
 
-from .ai_core.ppo_guardian import PPOGuardian
 from .ai_core.iron_shield import IronShield
 from .infrastructure.database import get_database_manager
 from .infrastructure.supabase_adapter import SupabaseAdapter
@@ -139,9 +143,14 @@ class AetherBot:
         # Dashboard timer
         self.last_console_update = 0.0
         self.console_update_interval = 10.0  # Seconds
+
+        # Metrics endpoint (optional, AETHER_METRICS_ENABLED=1) and main-loop cycle latency
+        self.metrics_exporter: Optional[MetricsExporter] = None
+        self.cycle_ms = Histogram(STAGE_MS_BOUNDS)
         
         # Maintenance state
         self.last_maintenance_date = None
+        self._announced_blackout = None
         
         # Decision tracking for rolling logs (reduces noise)
         self.decision_tracker = DecisionTracker()
@@ -149,8 +158,16 @@ class AetherBot:
         # Decision tracking for rolling logs (reduces noise)
         self.decision_tracker = DecisionTracker()
 
-        # Automation
-        self.auto_quant = AutoQuant()
+        # AI layers (loaded in initialize_components, or warmed in background in fast-start mode)
+        self.oracle = None
+        self.global_brain = None
+        self.tick_analyzer = None
+        self.ai_ready = False
+        self._warmup_task = None
+        self.fast_start = str(os.getenv("AETHER_FAST_START", "1")).strip().lower() in ("1", "true", "yes", "on")
+
+        # Automation (created on first maintenance run; pulls in torch/pandas)
+        self.auto_quant = None
         
         # [WIRING] Bayesian Tuner Injection
         # Tuner is passed from launcher to ensure optimization data persists across restarts
@@ -258,40 +275,36 @@ class AetherBot:
             logger.info("4. Connecting to Database...")
             db_manager = await get_async_database_manager(self.config.get('database'))
 
-            logger.info("5. Initializing AI Core (This is the heavy part)...")
-            
-            # Initialize AI components needed for TradingEngine
-            print(">>> [INIT] Loading PPO Guardian (Reinforcement Learning)...", flush=True)
-            self.ppo_guardian = PPOGuardian()
-            print(">>> [INIT] PPO Guardian Online.", flush=True)
-            
+            # v5.5.0: Initialize TickPressureAnalyzer shared instance
+            from .ai_core.tick_pressure import TickPressureAnalyzer
+            self.tick_analyzer = TickPressureAnalyzer(
+                window_seconds=float(os.getenv("AETHER_TICK_WINDOW_SECONDS", "5"))
+            )
+
             # Initialize Global Brain (Layer 9)
             print(">>> [INIT] Loading Global Brain (Macro Analysis)...", flush=True)
             from .ai_core.global_brain import GlobalBrain
-            self.global_brain = GlobalBrain(self.market_data)
+            self.global_brain = GlobalBrain(self.market_data, target_symbol=trading_config.symbol)
             print(">>> [INIT] Global Brain Online.", flush=True)
 
-            # v5.5.0: Initialize TickPressureAnalyzer shared instance
-            from .ai_core.tick_pressure import TickPressureAnalyzer
-            self.tick_analyzer = TickPressureAnalyzer()
-
-            # Initialize Oracle (Layer 4)
-            print(">>> [INIT] Loading Oracle (Price Prediction)...", flush=True)
-            # v5.5.0: Pass broker and tick_analyzer to Oracle
-            # INTEGRATION FIX: Oracle will receive model_monitor from trading_engine after initialization
-            self.oracle = Oracle(mt5_adapter=self.broker, tick_analyzer=self.tick_analyzer, global_brain=self.global_brain)
-            print(">>> [INIT] Oracle Online.", flush=True)
+            if not self.fast_start:
+                logger.info("5. Initializing AI Core (This is the heavy part)...")
+                self._load_ppo_guardian()
 
             print(">>> [INIT] Starting Trading Engine...", flush=True)
             self.trading_engine = TradingEngine(trading_config, self.broker, self.market_data,
                                               self.position_manager, self.risk_manager, db_manager, self.ppo_guardian, self.global_brain,
                                               tick_analyzer=self.tick_analyzer)
             print(">>> [INIT] Trading Engine Ready.", flush=True)
-            
-            # INTEGRATION FIX: Pass model_monitor to Oracle after trading_engine is initialized
-            if hasattr(self.trading_engine, 'model_monitor') and self.trading_engine.model_monitor:
-                self.oracle.model_monitor = self.trading_engine.model_monitor
-                logger.info("[INTEGRATION] Model monitor connected to Oracle")
+
+            if self.fast_start:
+                # Manage existing buckets immediately; new entries wait for the AI warm-up
+                logger.info("5. AI Core will warm up in background (fast start)")
+                self.trading_engine.entries_enabled = False
+                self._warmup_task = asyncio.create_task(self._warm_ai_components())
+            else:
+                self._load_oracle()
+                self._attach_ai_components()
 
             # Initialize database components
             print(">>> [INIT] Initializing Database...", flush=True)
@@ -305,6 +318,9 @@ class AetherBot:
             print(">>> [INIT] Legacy Components Initialized.", flush=True)
 
             logger.info("[OK] All components initialized successfully")
+            if not self.fast_start:
+                IMPORT_PROFILER.uninstall()
+                IMPORT_PROFILER.print_report()
             return True
 
         except Exception as e:
@@ -313,6 +329,59 @@ class AetherBot:
             logger.error(f"Component initialization failed: {e}")
             return False
 
+    def _load_ppo_guardian(self) -> None:
+        """Import and construct PPO Guardian (stable-baselines3 + torch)."""
+        print(">>> [INIT] Loading PPO Guardian (Reinforcement Learning)...", flush=True)
+        from .ai_core.ppo_guardian import PPOGuardian
+        self.ppo_guardian = PPOGuardian()
+        print(">>> [INIT] PPO Guardian Online.", flush=True)
+
+    def _load_oracle(self) -> None:
+        """Import and construct the Oracle (inference backend + model weights)."""
+        print(">>> [INIT] Loading Oracle (Price Prediction)...", flush=True)
+        from .ai_core.oracle import Oracle
+        # v5.5.0: Pass broker and tick_analyzer to Oracle
+        self.oracle = Oracle(mt5_adapter=self.broker, tick_analyzer=self.tick_analyzer, global_brain=self.global_brain)
+        print(">>> [INIT] Oracle Online.", flush=True)
+
+    def _attach_ai_components(self) -> None:
+        """Wire loaded AI layers into the trading engine and open new entries."""
+        self.trading_engine.ppo_guardian = self.ppo_guardian
+
+        # INTEGRATION FIX: Pass model_monitor to Oracle after trading_engine is initialized
+        if self.oracle is not None and getattr(self.trading_engine, 'model_monitor', None):
+            self.oracle.model_monitor = self.trading_engine.model_monitor
+            logger.info("[INTEGRATION] Model monitor connected to Oracle")
+
+        self.trading_engine.entries_enabled = True
+        self.ai_ready = True
+
+    async def _warm_ai_components(self) -> None:
+        """
+        Fast start: load the heavy AI layers off the event loop after the broker is up.
+        Position management runs meanwhile; entries open once everything is loaded.
+        """
+        started = time.perf_counter()
+        IMPORT_PROFILER.mark("warmup")
+        try:
+            if self.ppo_guardian is None:
+                await asyncio.to_thread(self._load_ppo_guardian)
+            await asyncio.to_thread(self._load_oracle)
+            self._attach_ai_components()
+            print(f">>> [INIT] AI warm-up complete in {time.perf_counter() - started:.1f}s. New entries enabled.", flush=True)
+        except Exception as e:
+            logger.error(f"[WARMUP] AI warm-up failed: {e}. New entries stay disabled.")
+        finally:
+            IMPORT_PROFILER.uninstall()
+            IMPORT_PROFILER.print_report()
+
+    def _get_auto_quant(self):
+        """Create AutoQuant on first use (it imports the training stack)."""
+        if self.auto_quant is None:
+            from .automation.auto_quant import AutoQuant  # [NEW] Self-Improvement Module
+            self.auto_quant = AutoQuant()
+        return self.auto_quant
+
     def _extract_credentials(self) -> Dict[str, str]:
         """Extract broker credentials from config."""
         credentials = {}
@@ -362,6 +431,11 @@ class AetherBot:
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
 
+        # SIGHUP: reload runtime settings between cycles (POSIX only)
+        if hasattr(signal, "SIGHUP"):
+            registry = get_settings_registry()
+            signal.signal(signal.SIGHUP, lambda signum, frame: registry.request_reload())
+
     async def run(self) -> None:
         """
         Main bot execution loop.
@@ -374,7 +448,9 @@ class AetherBot:
             logger.error("Component initialization failed. Exiting.")
             return
 
+        settings_registry = get_settings_registry()
         self._setup_signal_handlers()
+        self._start_metrics_exporter()
         self.running = True
 
         logger.info("[INFO] AETHER Trading System Online")
@@ -392,8 +468,16 @@ class AetherBot:
 
                 await self._run_trading_cycle()
 
+                # Correlation samples on their fixed grid (no-op until the next slot)
+                if self.global_brain is not None:
+                    self.global_brain.sample()
+
+                # Swap in edited config (file change / SIGHUP) only between cycles
+                settings_registry.maybe_reload()
+
                 # [AUTOMATION] Weekend Self-Improvement
                 await self._check_weekend_maintenance()
+                self._check_news_horizon()
 
                 # Adaptive sleep: Balanced latency for active positions
                 has_positions = len(self.position_manager.active_positions) > 0
@@ -420,7 +504,9 @@ class AetherBot:
             logger.debug("[CYCLE] TRADING CYCLE START")
 
             # Trading engine handles position management AND new entries in single call
+            cycle_start = time.perf_counter()
             await self._execute_trading_strategy()
+            self.cycle_ms.observe((time.perf_counter() - cycle_start) * 1000.0)
 
             # Update dashboard and logs
             await self._update_dashboard()
@@ -479,6 +565,93 @@ class AetherBot:
         except Exception as e:
             logger.error(f"Dashboard update failed: {e}")
 
+    def _start_metrics_exporter(self) -> None:
+        """Serve /metrics from a background thread when AETHER_METRICS_ENABLED is set."""
+        if not metrics_enabled():
+            return
+        exporter = MetricsExporter()
+        exporter.add_collector(self._collect_metrics)
+        if exporter.start():
+            self.metrics_exporter = exporter
+
+    def _collect_metrics(self, w: MetricsWriter) -> None:
+        """Scrape callback (metrics thread): reads in-memory state only, never the broker or DB."""
+        w.histogram("aether_cycle_duration_ms", "Trading cycle latency (ms)", self.cycle_ms.snapshot())
+
+        engine = self.trading_engine
+        tracer = getattr(engine, '_tracer', None)
+        if tracer is not None and tracer.enabled:
+            for stage, snap in list(tracer.stages.items()):
+                w.histogram("aether_cycle_stage_duration_ms", "Trading cycle stage latency (ms)",
+                            snap.snapshot(), {"stage": stage})
+            w.counter("aether_slow_cycles_total", "Cycles above the slow-trace threshold", tracer.slow_cycles)
+
+        call_stats = getattr(self.broker, 'call_stats', None)
+        if call_stats is not None:
+            for method, snap in call_stats.snapshot().items():
+                w.histogram("aether_broker_call_duration_ms", "Broker adapter call latency (ms)",
+                            snap, {"method": method})
+
+        execution_stats = getattr(self.broker, 'execution_stats', None)
+        if execution_stats is not None:
+            for symbol, st in execution_stats.snapshot().items():
+                w.histogram("aether_order_send_duration_ms", "Order send to fill/ack latency (ms)",
+                            st["latency_ms"], {"symbol": symbol})
+                w.histogram("aether_order_slippage_points", "Fill vs request price (points)",
+                            st["slippage_points"], {"symbol": symbol})
+                for outcome in ("done", "requotes", "price_rejects", "rejects", "no_result"):
+                    w.counter("aether_orders_total", "Order sends by outcome", st[outcome],
+                              {"symbol": symbol, "outcome": outcome})
+
+        db_queue = getattr(engine, 'db_queue', None)
+        if db_queue is not None:
+            q = db_queue.stats()
+            for queue, depth in q["depth"].items():
+                labels = {"queue": queue}
+                w.gauge("aether_db_queue_depth", "Rows waiting to be flushed", depth, labels)
+                w.counter("aether_db_queue_dropped_total", "Rows dropped while the DB was failing", q["dropped"][queue], labels)
+                w.counter("aether_db_flush_failures_total", "Failed batch flushes", q["flush_failures"][queue], labels)
+                w.counter("aether_db_rows_flushed_total", "Rows written", q["flushed"][queue], labels)
+
+        oracle = self.oracle
+        if oracle is not None:
+            hits = getattr(oracle, 'inference_cache_hits', 0)
+            misses = getattr(oracle, 'inference_cache_misses', 0)
+            w.counter("aether_inference_cache_hits_total", "Oracle inference cache hits", hits)
+            w.counter("aether_inference_cache_misses_total", "Oracle inference cache misses", misses)
+            w.gauge("aether_inference_cache_hit_ratio", "Oracle inference cache hit ratio",
+                    hits / (hits + misses) if hits + misses else 0.0)
+
+        pm = self.position_manager
+        if pm is not None:
+            metrics = pm.get_published_bucket_metrics()
+            w.gauge("aether_open_positions", "Tracked open positions", pm.get_total_positions())
+            w.gauge("aether_open_buckets", "Open buckets", len(metrics))
+            for bucket_id, m in metrics.items():
+                labels = {"bucket": bucket_id}
+                w.gauge("aether_bucket_volume_lots", "Bucket volume, both sides (lots)", m.total_volume, labels)
+                w.gauge("aether_bucket_net_volume_lots", "Bucket net exposure, buys minus sells (lots)", m.net_volume, labels)
+                w.gauge("aether_bucket_net_pnl", "Bucket floating net PnL", m.net_pnl, labels)
+
+        from .utils.hedge_coordinator import get_hedge_coordinator
+        hedges = get_hedge_coordinator().get_metrics()
+        w.histogram("aether_hedge_lease_wait_ms", "Hedge lease wait (ms)", hedges["wait_ms"])
+        for key in ("granted", "contended", "timeouts", "expired"):
+            w.counter(f"aether_hedge_lease_{key}_total", f"Hedge leases {key}", hedges[key])
+
+        calendar = getattr(engine, 'news_calendar', None)
+        if calendar is not None:
+            window = calendar.next_blackout(self.config.get('trading', {}).get('symbol', 'XAUUSD'))
+            w.gauge("aether_news_next_blackout_seconds", "Seconds until the next news blackout (0 = active, -1 = none)",
+                    max(0.0, window[0] - time.time()) if window else -1)
+
+        log_pipeline = get_log_pipeline()
+        if log_pipeline is not None:
+            logs = log_pipeline.stats()
+            w.gauge("aether_log_queue_depth", "Log records waiting for the writer thread", logs["queue_depth"])
+            w.counter("aether_log_dropped_total", "Log records dropped on a full queue", logs["dropped"])
+            w.counter("aether_log_suppressed_total", "Duplicate log records suppressed", logs["suppressed"])
+
     def _print_console_status(self) -> None:
         """Print a clean status dashboard to the console."""
         # DISABLED: User requested to disable rolling logs
@@ -503,17 +676,33 @@ class AetherBot:
             
             # Run in thread to avoid blocking heartbeat
             try:
-                await asyncio.to_thread(self.auto_quant.run_cycle)
+                await asyncio.to_thread(lambda: self._get_auto_quant().run_cycle())
                 self.last_maintenance_date = today_str
                 print(f">>> [SYSTEM] Maintenance Complete. Model Updated.", flush=True)
             except Exception as e:
                 logger.error(f"Maintenance failed: {e}")
 
+    def _check_news_horizon(self) -> None:
+        """Announce the next news blackout once, shortly before it starts."""
+        calendar = getattr(self.trading_engine, 'news_calendar', None)
+        if calendar is None:
+            return
+        symbol = self.config.get('trading', {}).get('symbol', 'XAUUSD')
+        window = calendar.next_blackout(symbol)
+        if window is None or window[0] == self._announced_blackout:
+            return
+        start, end, label = window
+        minutes = (start - time.time()) / 60.0
+        if minutes <= 15.0:
+            self._announced_blackout = start
+            ui_logger.info(f"[EVENT HORIZON] Blackout in {max(0.0, minutes):.0f} min "
+                           f"for {(end - start) / 60.0:.0f} min: {label}")
+
     async def _run_auto_quant_cycle(self) -> None:
         """Run Auto-Quant cycle asynchronously."""
         try:
             logger.info("[AUTO-QUANT] Starting Periodic Self-Improvement Cycle...")
-            await asyncio.to_thread(self.auto_quant.run_cycle)
+            await asyncio.to_thread(lambda: self._get_auto_quant().run_cycle())
             logger.info("[AUTO-QUANT] Cycle Complete.")
         except Exception as e:
             logger.error(f"[AUTO-QUANT] Cycle Failed: {e}")
@@ -600,6 +789,9 @@ class AetherBot:
         except Exception as e:
             logger.warning(f"[PPO_EVOLVE] Failed: {e}")
 
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+
         # Shutdown trading engine database
         if self.trading_engine:
             await self.trading_engine.shutdown_database()
@@ -12,6 +12,7 @@ License: MIT
 Version: 1.0.0
 """
 
+import os
 import time
 import logging
 from datetime import datetime
@@ -20,6 +21,9 @@ from dataclasses import dataclass
 from threading import Lock
 import MetaTrader5 as mt5
 
+from src.features.bar_aggregator import BarAggregator, TimeframeSeries
+from src.bridge.symbol_specs import get_symbol_spec
+
 logger = logging.getLogger("MarketDataManager")
 
 
@@ -372,6 +376,11 @@ class MarketDataManager:
         self._indicator_cache: Dict[Tuple, Any] = {}
         self._cache_lock = Lock()
 
+        # Multi-timeframe bars built locally from the M1 store (one per symbol)
+        self._bar_aggregators: Dict[str, BarAggregator] = {}
+        self._bar_lock = Lock()
+        self._bar_base_warned = False
+
         # [PHASE 1] Initialize Correlation Monitor
         self.macro_eye = None
         if config and config.get('trading', {}).get('correlations', {}).get('enable_correlation', False):
@@ -733,10 +742,10 @@ class MarketDataManager:
         Falls back to standard defaults if API fails.
         """
         try:
-            # Try to fetch from MT5 directly if strictly needed
-            info = mt5.symbol_info(symbol)
-            if info and info.trade_contract_size > 0:
-                 return float(info.trade_contract_size)
+            # Shared symbol spec cache (no terminal round-trip once loaded)
+            spec = get_symbol_spec(symbol)
+            if spec is not None and spec.contract_size > 0:
+                 return float(spec.contract_size)
                  
             # Fallback based on naming convention
             if "XAU" in symbol or "GOLD" in symbol:
@@ -844,60 +853,77 @@ class MarketDataManager:
             logger.error(f"Failed to get tick data for {symbol}: {e}")
             return None
 
+    def get_bar_aggregator(self, symbol: str) -> Optional[BarAggregator]:
+        """
+        Get the symbol's multi-timeframe bar aggregator, folded up to the latest
+        closed M1 candle.
+
+        Higher timeframes are seeded from the broker once (and again only after
+        a gap in the M1 stream); every other update comes from the cached M1
+        history, so steady-state calls make no broker round-trips.
+
+        Returns None when the candle store is not on M1: its bars cannot be
+        folded into M1-based series.
+        """
+        if (self.candles.timeframe or "M1").upper() != "M1":
+            if not self._bar_base_warned:
+                self._bar_base_warned = True
+                logger.warning(
+                    f"[BARS] Candle store is on {self.candles.timeframe}, not M1. "
+                    f"Local multi-timeframe bars disabled; trends are read from the broker."
+                )
+            return None
+
+        candles = self.candles.get_history(symbol)
+        if not candles or not isinstance(candles[0], dict):
+            return self._bar_aggregators.get(symbol)
+
+        with self._bar_lock:
+            aggregator = self._bar_aggregators.get(symbol)
+            if aggregator is None:
+                aggregator = BarAggregator()
+                self._bar_aggregators[symbol] = aggregator
+
+            aggregator.ingest(candles)
+
+            for tf in ("M5", "M15", "H1", "H4"):
+                if not aggregator.needs_seed(tf):
+                    continue
+                try:
+                    seed = self.broker.get_market_data(symbol, tf, aggregator.window + 1)
+                    seed = sorted(seed or [], key=lambda c: int(c.get('time', 0)))
+                except Exception as e:
+                    logger.debug(f"[BARS] {tf} seed failed for {symbol}: {e}")
+                    seed = []
+                aggregator.seed(tf, seed)
+
+            return aggregator
+
     def calculate_multi_timeframe_trends(self, symbol: str) -> Dict[str, str]:
         """
         Calculate trend direction for M1, M5, and M15 timeframes.
         Returns: Dict with 'm1_trend', 'm5_trend', 'm15_trend' (UP/DOWN/NEUTRAL).
         """
+        try:
+            aggregator = self.get_bar_aggregator(symbol)
+            if aggregator is not None:
+                return aggregator.get_trends(("M1", "M5", "M15"))
+        except Exception as e:
+            # Silently fail to neutral on error to avoid spam
+            logger.debug(f"[BARS] Trend calculation failed for {symbol}: {e}")
+            return {'m1_trend': "NEUTRAL", 'm5_trend': "NEUTRAL", 'm15_trend': "NEUTRAL"}
+
+        # No local bars (store not on M1, or no history yet): last 20 broker bars per timeframe
         trends = {}
-        timeframes = {
-            'm1': mt5.TIMEFRAME_M1,
-            'm5': mt5.TIMEFRAME_M5,
-            'm15': mt5.TIMEFRAME_M15
-        }
-        
-        for name, tf in timeframes.items():
+        for tf in ("M1", "M5", "M15"):
+            series = TimeframeSeries(tf)
             try:
-                # Fetch last 20 candles for this timeframe
-                rates = mt5.copy_rates_from_pos(symbol, tf, 0, 20)
-                if rates is None or len(rates) < 20:
-                    trends[f'{name}_trend'] = "NEUTRAL"
-                    continue
-                
-                # Identify columns directly from numpy record array
-                closes = rates['close']
-                
-                # Calculate slope (simple linreg)
-                n = len(closes)
-                sum_x = sum(range(n))
-                sum_y = sum(closes)
-                sum_xy = sum(i * closes[i] for i in range(n))
-                sum_xx = sum(i * i for i in range(n))
-                
-                denom = (n * sum_xx - sum_x * sum_x)
-                slope = (n * sum_xy - sum_x * sum_y) / denom if denom != 0 else 0
-                
-                # Normalize slope to basis points
-                current_price = closes[-1]
-                if current_price == 0:
-                    trends[f'{name}_trend'] = "NEUTRAL"
-                    continue
-                    
-                norm_slope = (slope / current_price) * 10000
-                
-                # Determine trend with threshold
-                # > 0.5 bps per bar is a decent trend
-                if norm_slope > 0.5:
-                    trends[f'{name}_trend'] = "UP"
-                elif norm_slope < -0.5:
-                    trends[f'{name}_trend'] = "DOWN"
-                else:
-                    trends[f'{name}_trend'] = "NEUTRAL"
-                    
+                rates = self.broker.get_market_data(symbol, tf, series.window) or []
+                for candle in sorted(rates, key=lambda c: int(c.get('time', 0))):
+                    series.append_bar(candle)
             except Exception as e:
-                # Silently fail to neutral on error to avoid spam
-                trends[f'{name}_trend'] = "NEUTRAL"
-                
+                logger.debug(f"[BARS] {tf} trend fetch failed for {symbol}: {e}")
+            trends[f"{tf.lower()}_trend"] = series.trend()
         return trends
 
     def get_volatility_ratio(self) -> float:
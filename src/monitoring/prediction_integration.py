@@ -8,7 +8,7 @@ Author: AETHER Development Team
 """
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from src.monitoring.prediction_tracker import get_prediction_tracker
 
 logger = logging.getLogger("PredictionIntegration")
@@ -21,7 +21,8 @@ def log_oracle_prediction(
     current_price: float,
     regime: Optional[str] = None,
     rsi: Optional[float] = None,
-    atr: Optional[float] = None
+    atr: Optional[float] = None,
+    bar_time: Optional[float] = None
 ) -> None:
     """
     Log an Oracle prediction for later validation.
@@ -36,6 +37,7 @@ def log_oracle_prediction(
         regime: Market regime
         rsi: RSI value
         atr: ATR value
+        bar_time: Open time of the last closed M1 bar the prediction used
     """
     try:
         tracker = get_prediction_tracker()
@@ -48,17 +50,14 @@ def log_oracle_prediction(
             model="Oracle",
             regime=regime,
             rsi=rsi,
-            atr=atr
+            atr=atr,
+            bar_time=bar_time
         )
     except Exception as e:
         logger.error(f"Failed to log prediction: {e}")
 
 
-def validate_predictions(
-    symbol: str,
-    current_price: float,
-    current_time: float
-) -> None:
+def validate_predictions(symbol: str, bars: List[Dict]) -> None:
     """
     Validate pending predictions.
     
@@ -66,12 +65,11 @@ def validate_predictions(
     
     Args:
         symbol: Trading symbol
-        current_price: Current market price
-        current_time: Current timestamp
+        bars: Closed M1 candles, e.g. BarAggregator.get_bars("M1")
     """
     try:
         tracker = get_prediction_tracker()
-        tracker.validate_predictions(symbol, current_price, current_time)
+        tracker.validate_predictions(symbol, bars)
     except Exception as e:
         logger.error(f"Failed to validate predictions: {e}")
 
@@ -4,20 +4,40 @@ Prediction Accuracy Tracker - Real-time validation of AI predictions
 This module tracks every prediction made by the Oracle/Nexus and compares
 it against actual market movement to calculate accuracy metrics.
 
+Pending predictions sit in a per-symbol min-heap keyed by due time, so a
+validation pass only pops the matured ones (O(k log n)). Each prediction
+is scored against the close of the closed M1 bar at its due time, taken
+from the candles passed to validate_predictions (e.g. the bar aggregator's
+M1 series), never against a tick price seen while that bar was forming.
+
+Due times are on the bar clock (broker server time): a prediction is due
+`horizon_candles` bars after the last closed bar it was made on, and it
+matures once a closed bar at or after that time has arrived. A prediction
+recorded before any bar is known for its symbol is held unscheduled (the
+local clock is not the broker's) and scheduled from the newest bar of the
+first validation pass. Log lines go through a batched append writer.
+
 Author: AETHER Development Team
 Version: 1.0.0
 """
 
+import atexit
+import bisect
+import heapq
+import itertools
 import json
 import time
 import logging
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
 logger = logging.getLogger("PredictionTracker")
 
+BAR_SECONDS = 60  # Horizons are counted in M1 candles
+
 
 @dataclass
 class Prediction:
@@ -35,6 +55,7 @@ class Prediction:
     actual_price_end: Optional[float] = None
     outcome_timestamp: Optional[float] = None
     correct: Optional[bool] = None
+    due_timestamp: Optional[float] = None
     
     # Metadata
     model: str = "Oracle"
@@ -43,6 +64,43 @@ class Prediction:
     atr: Optional[float] = None
 
 
+class BatchedJsonlWriter:
+    """
+    Buffers JSON lines per file and appends them in batches: when
+    `batch_size` lines are pending or the oldest is `flush_interval`
+    seconds old. Pending lines are flushed at interpreter exit.
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 5.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: Dict[Path, List[str]] = {}
+        self._count = 0
+        self._oldest = 0.0
+        atexit.register(self.flush)
+
+    def append(self, path: Path, record: Dict) -> None:
+        if not self._count:
+            self._oldest = time.time()
+        self._pending.setdefault(path, []).append(json.dumps(record))
+        self._count += 1
+        self.maybe_flush()
+
+    def maybe_flush(self) -> None:
+        if self._count and (self._count >= self.batch_size
+                            or time.time() - self._oldest >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        pending, self._pending, self._count = self._pending, {}, 0
+        for path, lines in pending.items():
+            try:
+                with open(path, 'a') as f:
+                    f.write('\n'.join(lines) + '\n')
+            except Exception as e:
+                logger.error(f"Failed to write {len(lines)} records to {path}: {e}")
+
+
 class PredictionTracker:
     """
     Tracks AI predictions and validates them against actual market movement.
@@ -50,12 +108,22 @@ class PredictionTracker:
     Provides real-time accuracy metrics and generates performance reports.
     """
     
-    def __init__(self, log_dir: str = "logs/predictions"):
+    def __init__(self, log_dir: str = "logs/predictions", max_bars: int = 1440):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
-        # In-memory storage for pending predictions
-        self.pending_predictions: Dict[str, List[Prediction]] = {}
+        # Pending predictions: per-symbol min-heap of (due time, seq, prediction)
+        self.pending_predictions: Dict[str, List[Tuple[float, int, Prediction]]] = {}
+        self._seq = itertools.count()
+        # Predictions recorded before the symbol's bar clock was known
+        self._unscheduled: Dict[str, List[Prediction]] = {}
+
+        # Per-symbol closed M1 bars: start minutes (ascending) and their closes
+        self._bar_minutes: Dict[str, Deque[int]] = {}
+        self._bar_closes: Dict[str, Deque[float]] = {}
+        self._max_bars = max_bars
+
+        self._writer = BatchedJsonlWriter()
         
         # Accuracy metrics
         self.total_predictions = 0
@@ -81,7 +149,8 @@ class PredictionTracker:
         model: str = "Oracle",
         regime: Optional[str] = None,
         rsi: Optional[float] = None,
-        atr: Optional[float] = None
+        atr: Optional[float] = None,
+        bar_time: Optional[float] = None
     ) -> None:
         """
         Record a new prediction.
@@ -96,9 +165,17 @@ class PredictionTracker:
             regime: Market regime
             rsi: RSI value
             atr: ATR value
+            bar_time: Open time of the last closed M1 bar the prediction was made
+                on (defaults to the newest bar recorded for the symbol; without
+                one the prediction waits for the first validation pass)
         """
+        now = time.time()
+        if bar_time is None:
+            minutes = self._bar_minutes.get(symbol)
+            if minutes:
+                bar_time = minutes[-1] * BAR_SECONDS
         pred = Prediction(
-            timestamp=time.time(),
+            timestamp=now,
             prediction=prediction,
             confidence=confidence,
             current_price=current_price,
@@ -107,95 +184,133 @@ class PredictionTracker:
             model=model,
             regime=regime,
             rsi=rsi,
-            atr=atr
+            atr=atr,
         )
-        
-        # Add to pending list
-        if symbol not in self.pending_predictions:
-            self.pending_predictions[symbol] = []
-        
-        self.pending_predictions[symbol].append(pred)
-        
-        # Save to disk immediately
+        if bar_time is None:
+            self._unscheduled.setdefault(symbol, []).append(pred)
+        else:
+            self._schedule(pred, bar_time)
         self._save_prediction(pred)
         
         logger.debug(
-            f"[PREDICTION] {model} predicts {prediction} "
-            f"(conf={confidence:.2f}) for {symbol} @ {current_price:.5f}"
+            "[PREDICTION] %s predicts %s (conf=%.2f) for %s @ %.5f",
+            model, prediction, confidence, symbol, current_price
         )
+
+    def _schedule(self, pred: Prediction, bar_time: float) -> None:
+        pred.due_timestamp = bar_time + pred.horizon_candles * BAR_SECONDS
+        heapq.heappush(
+            self.pending_predictions.setdefault(pred.symbol, []),
+            (pred.due_timestamp, next(self._seq), pred)
+        )
+
+    def record_bar_close(self, symbol: str, bar_time: float, close: float) -> None:
+        """
+        Record the close of the closed M1 bar starting at `bar_time`. Bars
+        must arrive in time order; older ones are ignored.
+        """
+        minute = int(bar_time // BAR_SECONDS)
+        minutes = self._bar_minutes.get(symbol)
+        if minutes is None:
+            minutes = self._bar_minutes[symbol] = deque(maxlen=self._max_bars)
+            self._bar_closes[symbol] = deque(maxlen=self._max_bars)
+        closes = self._bar_closes[symbol]
+        if minutes and minutes[-1] == minute:
+            closes[-1] = close
+        elif not minutes or minute > minutes[-1]:
+            minutes.append(minute)
+            closes.append(close)
+
+    def _close_at(self, symbol: str, when: float) -> Optional[float]:
+        """Close of the bar open at `when` (or the last bar before it)."""
+        minutes = self._bar_minutes.get(symbol)
+        if not minutes:
+            return None
+        idx = bisect.bisect_right(minutes, int(when // BAR_SECONDS)) - 1
+        if idx < 0:
+            return None
+        return self._bar_closes[symbol][idx]
     
-    def validate_predictions(
-        self,
-        symbol: str,
-        current_price: float,
-        current_time: float
-    ) -> None:
+    def validate_predictions(self, symbol: str, bars: Optional[List[Dict]] = None) -> None:
         """
-        Check if any pending predictions can now be validated.
+        Validate the pending predictions whose due bar has closed.
         
         Args:
             symbol: Trading symbol
-            current_price: Current market price
-            current_time: Current timestamp
+            bars: Closed M1 candles (ascending, dicts with 'time' and 'close'),
+                e.g. BarAggregator.get_bars("M1"); only bars newer than the
+                last recorded one are folded in
         """
-        if symbol not in self.pending_predictions:
+        minutes = self._bar_minutes.get(symbol)
+        last = minutes[-1] if minutes else None
+        for bar in bars or ():
+            bar_time = int(bar['time'])
+            if last is None or bar_time // BAR_SECONDS > last:
+                self.record_bar_close(symbol, bar_time, float(bar['close']))
+
+        minutes = self._bar_minutes.get(symbol)
+        if minutes and symbol in self._unscheduled:
+            # First known bar clock: count the horizon from the newest closed bar
+            for pred in self._unscheduled.pop(symbol):
+                self._schedule(pred, minutes[-1] * BAR_SECONDS)
+
+        heap = self.pending_predictions.get(symbol)
+        if not minutes or not heap:
+            self._writer.maybe_flush()
             return
+
+        # A prediction matures once a closed bar at or after its due time exists;
+        # a bar missing at the due time (no ticks) resolves to the one before it
+        last_closed = minutes[-1] * BAR_SECONDS
+        while heap and heap[0][0] <= last_closed:
+            due, _, pred = heapq.heappop(heap)
+            end_price = self._close_at(symbol, due)
+            if end_price is None:
+                continue  # Due before the oldest bar held: cannot be resolved
+            self._score(pred, end_price, due)
         
-        validated = []
+        self._writer.maybe_flush()
+
+    def _score(self, pred: Prediction, end_price: float, due: float) -> None:
+        price_change = end_price - pred.current_price
+        pct_change = (price_change / pred.current_price) * 100 if pred.current_price else 0.0
         
-        for pred in self.pending_predictions[symbol]:
-            # Check if enough time has passed (horizon_candles * 60 seconds for M1)
-            time_elapsed = current_time - pred.timestamp
-            required_time = pred.horizon_candles * 60  # M1 timeframe
-            
-            if time_elapsed >= required_time:
-                # Validate this prediction
-                price_change = current_price - pred.current_price
-                pct_change = (price_change / pred.current_price) * 100
-                
-                # Determine actual direction (threshold: 0.01% to avoid noise)
-                if pct_change > 0.01:
-                    actual_direction = "UP"
-                elif pct_change < -0.01:
-                    actual_direction = "DOWN"
-                else:
-                    actual_direction = "NEUTRAL"
-                
-                # Check if prediction was correct
-                correct = (pred.prediction == actual_direction)
-                
-                # Update prediction
-                pred.actual_direction = actual_direction
-                pred.actual_price_change = price_change
-                pred.actual_price_end = current_price
-                pred.outcome_timestamp = current_time
-                pred.correct = correct
-                
-                # Update metrics
-                self.total_predictions += 1
-                if correct:
-                    self.correct_predictions += 1
-                
-                self.by_direction[pred.prediction]["total"] += 1
-                if correct:
-                    self.by_direction[pred.prediction]["correct"] += 1
-                
-                # Save validated prediction
-                self._save_validated_prediction(pred)
-                
-                # Mark for removal from pending
-                validated.append(pred)
-                
-                logger.info(
-                    f"[VALIDATION] {pred.model} prediction "
-                    f"{'✓ CORRECT' if correct else '✗ WRONG'}: "
-                    f"Predicted {pred.prediction}, Actual {actual_direction} "
-                    f"({pct_change:+.3f}% in {time_elapsed/60:.1f}min)"
-                )
+        # Determine actual direction (threshold: 0.01% to avoid noise)
+        if pct_change > 0.01:
+            actual_direction = "UP"
+        elif pct_change < -0.01:
+            actual_direction = "DOWN"
+        else:
+            actual_direction = "NEUTRAL"
+        
+        correct = (pred.prediction == actual_direction)
         
-        # Remove validated predictions
-        for pred in validated:
-            self.pending_predictions[symbol].remove(pred)
+        pred.actual_direction = actual_direction
+        pred.actual_price_change = price_change
+        pred.actual_price_end = end_price
+        pred.outcome_timestamp = due
+        pred.correct = correct
+        
+        self.total_predictions += 1
+        if correct:
+            self.correct_predictions += 1
+        
+        stats = self.by_direction.setdefault(pred.prediction, {"total": 0, "correct": 0})
+        stats["total"] += 1
+        if correct:
+            stats["correct"] += 1
+        
+        self._save_validated_prediction(pred)
+        
+        logger.info(
+            "[VALIDATION] %s prediction %s: Predicted %s, Actual %s (%+.3f%% in %.1fmin)",
+            pred.model, '✓ CORRECT' if correct else '✗ WRONG',
+            pred.prediction, actual_direction, pct_change, (due - pred.timestamp) / 60
+        )
+
+    def flush(self) -> None:
+        """Write buffered log lines now."""
+        self._writer.flush()
     
     def get_accuracy_report(self) -> Dict:
         """
@@ -231,7 +346,7 @@ class PredictionTracker:
             "by_direction": direction_accuracy,
             "pending_validations": sum(
                 len(preds) for preds in self.pending_predictions.values()
-            )
+            ) + sum(len(preds) for preds in self._unscheduled.values())
         }
     
     def print_report(self) -> None:
@@ -254,20 +369,14 @@ class PredictionTracker:
         print("="*70 + "\n")
     
     def _save_prediction(self, pred: Prediction) -> None:
-        """Save prediction to daily log file."""
+        """Queue prediction for the daily log file."""
         today = datetime.now().strftime("%Y%m%d")
-        log_file = self.log_dir / f"predictions_{today}.jsonl"
-        
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(asdict(pred)) + '\n')
+        self._writer.append(self.log_dir / f"predictions_{today}.jsonl", asdict(pred))
     
     def _save_validated_prediction(self, pred: Prediction) -> None:
-        """Save validated prediction to results file."""
+        """Queue validated prediction for the results file."""
         today = datetime.now().strftime("%Y%m%d")
-        results_file = self.log_dir / f"validated_{today}.jsonl"
-        
-        with open(results_file, 'a') as f:
-            f.write(json.dumps(asdict(pred)) + '\n')
+        self._writer.append(self.log_dir / f"validated_{today}.jsonl", asdict(pred))
     
     def _load_today_predictions(self) -> None:
         """Load today's validated predictions to restore metrics."""
@@ -287,6 +396,7 @@ class PredictionTracker:
                             self.correct_predictions += 1
                         
                         direction = pred_dict['prediction']
+                        self.by_direction.setdefault(direction, {"total": 0, "correct": 0})
                         self.by_direction[direction]["total"] += 1
                         if pred_dict['correct']:
                             self.by_direction[direction]["correct"] += 1
@@ -18,9 +18,8 @@ import json
 import os
 import math
 import asyncio
-from collections import deque
-from typing import Dict, List, Optional, Any, Tuple, Callable
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Set, Tuple, Callable
+from dataclasses import dataclass, field, replace
 from threading import Lock, RLock
 from enum import Enum
 import MetaTrader5 as mt5
@@ -36,6 +35,12 @@ from .ai_core.architect import Architect
 
 from .core.trade_authority import TradeAuthority
 from .core.bad_bank import BadBank
+from .core.bucket_index import BucketIndex
+from .core.bucket_locks import BucketLocks, bucket_exclusive
+from .core.position_table import BucketMetrics, PositionTable
+from .bridge.symbol_specs import get_symbol_spec
+from .utils.quantile_sketch import QuantileSketch, volume_bucket
+from .config.runtime_settings import runtime_settings
 from .constants import ProfitBuffer, TimeThresholds
 
 # Import TradingLogger for structured exit summaries
@@ -50,6 +55,10 @@ logger = logging.getLogger("PositionManager")
 # [CRITICAL] Get the specific UI logger that run_bot.py listens to
 ui_logger = logging.getLogger("AETHER_UI")
 
+# Max wait for a bucket that another operation (hedge/recovery/close) holds
+# before a close gives up for this cycle
+_CLOSE_LOCK_TIMEOUT_S = float(os.getenv("AETHER_BUCKET_CLOSE_LOCK_TIMEOUT_S", "5.0"))
+
 
 class PositionState(Enum):
     """Enumeration of possible position states."""
@@ -130,6 +139,31 @@ class BucketStats:
     last_recovery_time: float = 0.0  # Last time calculated recovery was executed
 
 
+@dataclass
+class PositionEvents:
+    """Changes found by reconciling one broker snapshot (ticket lists)."""
+    opened: List[int] = field(default_factory=list)
+    modified: List[int] = field(default_factory=list)  # volume/price/SL/TP changed
+    closed: List[int] = field(default_factory=list)
+    symbols: Set[str] = field(default_factory=set)  # Symbols touched by any event
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.opened or self.modified or self.closed)
+
+
+@dataclass(frozen=True)
+class BucketSnapshot:
+    """Immutable copy of a bucket for readers; never mutated after publication."""
+    bucket_id: str
+    state: PositionState
+    mode: BucketMode
+    closed: bool
+    exit_reason: str
+    positions: Tuple[Position, ...]  # Private copies of the tracked legs
+    net_pnl: float
+
+
 class PositionManager:
     """
     Manages trading positions and bucket-based profit
@@ -171,6 +205,34 @@ class PositionManager:
         
         # Ghost tickets (positions that broker reports but don't exist)
         self._ghost_tickets: Set[int] = set()
+
+        # [RECONCILE] Incremental broker sync state
+        # Fingerprint per tracked ticket: (volume, price_open, sl, tp)
+        self._position_fingerprints: Dict[int, Tuple] = {}
+        # Bumped on any change to tracked tickets or bucket membership
+        self._structure_version = 0
+        self._swept_version = -1
+        self._stats_version = -1
+        self._cleanup_key: Optional[Tuple] = None
+        # Buckets whose floating PnL moved since the last _update_bucket_stats
+        self._pnl_dirty: Set[str] = set()
+        # Lower-cased symbol -> position count from the last full broker snapshot
+        self._broker_symbol_counts: Dict[str, int] = {}
+        # Secondary lookups (ticket/symbol -> bucket, bucket -> tickets, recent closes)
+        self._index = BucketIndex()
+        # [VECTOR PNL] Column store of open bucket legs; metrics cached per
+        # (structure, broker PnL, quote) version
+        self._table = PositionTable()
+        self._pnl_version = 0
+        self._metrics_key: Optional[Tuple] = None
+        # Time of the last accepted broker snapshot (quotes older than it don't mark PnL)
+        self._pnl_synced_at = 0.0
+        self._metrics: Dict[str, BucketMetrics] = {}
+        # [CONCURRENCY] Per-bucket asyncio locks for async bucket operations
+        # (close/hedge/recovery); self._lock only guards short in-memory sections.
+        self._bucket_locks = BucketLocks()
+        # Copy-on-write reader snapshots: bucket_id -> (key, BucketSnapshot)
+        self._snapshots: Dict[str, Tuple[Tuple, BucketSnapshot]] = {}
         
         # [TIMEZONE AUTO-CORRECTION]
         self._time_offset: Optional[float] = None
@@ -179,16 +241,18 @@ class PositionManager:
         # Tracks the highest Net PnL seen for each bucket to prevent round-tripping profits
         self.high_water_marks: Dict[str, float] = {}
 
-        # [SLIPPAGE CALIBRATION] Rolling close slippage samples (per-lot USD)
+        # [SLIPPAGE CALIBRATION] Decayed close slippage quantile sketches (per-lot USD),
+        # keyed by symbol and by "symbol|volume bucket"
         self._slippage_enabled = str(os.getenv("AETHER_ENABLE_SLIPPAGE_CALIBRATION", "1")).strip().lower() in (
             "1",
             "true",
             "yes",
             "on",
         )
-        self._slippage_window = max(10, int(os.getenv("AETHER_SLIPPAGE_CALIBRATION_WINDOW", "200")))
+        self._slippage_compression = max(20, int(os.getenv("AETHER_SLIPPAGE_SKETCH_COMPRESSION", "50")))
+        self._slippage_half_life_s = max(0.0, float(os.getenv("AETHER_SLIPPAGE_HALF_LIFE_HOURS", "72"))) * 3600.0
         self._slippage_p95_multiplier = float(os.getenv("AETHER_SLIPPAGE_P95_MULTIPLIER", "1.25"))
-        self._slippage_samples_per_lot_usd: Dict[str, deque] = {}
+        self._slippage_sketches: Dict[str, QuantileSketch] = {}
 
         # Ensure data directory exists
         os.makedirs(os.path.dirname(state_file), exist_ok=True)
@@ -196,28 +260,24 @@ class PositionManager:
         # Load persisted state
         self._load_state()
 
-    def _p95(self, values: List[float]) -> float:
-        """
-        Calculate 95th percentile of a list of values.
-        """
-        if not values:
-            return 0.0
-        
-        try:
-            sorted_vals = sorted(values)
-            index = int(0.95 * len(sorted_vals))
-            # Clamp index
-            index = max(0, min(index, len(sorted_vals) - 1))
-            return sorted_vals[index]
-        except Exception as e:
-            logger.error(f"Error calculating p95: {e}")
-            return 0.0
+    def _new_slippage_sketch(self) -> QuantileSketch:
+        return QuantileSketch(compression=self._slippage_compression, half_life_s=self._slippage_half_life_s)
 
-    def _record_close_slippage_sample(self, symbol: str, request_price: float, fill_price: float) -> None:
+    def _slippage_sketch_for(self, symbol: str, total_volume: Optional[float] = None) -> Optional[QuantileSketch]:
+        """Volume-bucket sketch when it has enough decayed samples, else the symbol sketch."""
+        if total_volume is not None:
+            sketch = self._slippage_sketches.get(f"{symbol}|{volume_bucket(total_volume)}")
+            if sketch is not None and sketch.effective_count() >= 10:
+                return sketch
+        return self._slippage_sketches.get(symbol)
+
+    def _record_close_slippage_sample(self, symbol: str, request_price: float, fill_price: float,
+                                      bucket_volume: Optional[float] = None) -> None:
         """
         Record slippage sample from a closed trade for P95 calibration.
         Slippage = actual fill price - requested price (in pips/units).
-        Uses rolling window to maintain recent history.
+        Feeds the symbol sketch and, when given, the volume-bucket sketch of the
+        closing bucket's total volume (the key _calibrated_profit_buffer looks up).
         """
         if not self._slippage_enabled or not symbol:
             return
@@ -247,13 +307,18 @@ class PositionManager:
                 slippage_usd_per_lot = slippage_amount * 100000.0 * 10.0
             
             # Record sample with thread safety
+            now = time.time()
+            keys = [symbol]
+            if bucket_volume:
+                keys.append(f"{symbol}|{volume_bucket(float(bucket_volume))}")
             with self._lock:
-                if symbol not in self._slippage_samples_per_lot_usd:
-                    self._slippage_samples_per_lot_usd[symbol] = collections.deque(maxlen=self._slippage_window)
-                
-                self._slippage_samples_per_lot_usd[symbol].append(slippage_usd_per_lot)
-                sample_count = len(self._slippage_samples_per_lot_usd[symbol])
-            
+                for key in keys:
+                    sketch = self._slippage_sketches.get(key)
+                    if sketch is None:
+                        sketch = self._slippage_sketches[key] = self._new_slippage_sketch()
+                    sketch.add(slippage_usd_per_lot, now)
+                sample_count = self._slippage_sketches[symbol].count
+
             # Log at debug level to avoid noise
             if sample_count % 10 == 0:  # Log every 10 samples
                 p95_val = self._get_slippage_p95_per_lot_usd(symbol)
@@ -267,15 +332,17 @@ class PositionManager:
     def _calibrated_profit_buffer(self, symbol: str, total_volume: float, base_buffer_usd: float) -> float:
         """
         Calculate calibrated profit buffer based on volume and symbol slippage stats.
-        Uses p95 of historical slippage if available.
+        Uses the decayed p95 of historical slippage if available.
         """
         if not self._slippage_enabled or not symbol:
              return base_buffer_usd
 
         with self._lock:
-            samples = list(self._slippage_samples_per_lot_usd.get(symbol, []))
+            sketch = self._slippage_sketch_for(symbol, total_volume)
+            enough = sketch is not None and sketch.effective_count() >= 10
+            p95_per_lot = sketch.p95() if enough else 0.0
 
-        if len(samples) < 10:
+        if not enough:
             # Not enough data, use default heuristic
             # XAUUSD/Gold typically has higher spread/slippage
             is_gold = "XAU" in symbol or "GOLD" in symbol
@@ -283,8 +350,6 @@ class PositionManager:
             volume_component = float(total_volume) * slippage_per_lot
             return max(float(base_buffer_usd), volume_component)
 
-        p95_per_lot = self._p95(samples)
-        
         # Calculate expected slippage cost
         calibrated_cost = p95_per_lot * float(total_volume) * float(self._slippage_p95_multiplier)
         
@@ -295,20 +360,20 @@ class PositionManager:
         if not self._slippage_enabled or not symbol:
             return 0
         with self._lock:
-            dq = self._slippage_samples_per_lot_usd.get(symbol)
-            return len(dq) if dq is not None else 0
+            sketch = self._slippage_sketches.get(symbol)
+            return sketch.count if sketch is not None else 0
 
     def _get_slippage_p95_per_lot_usd(self, symbol: str) -> float:
         if not self._slippage_enabled or not symbol:
             return 0.0
         with self._lock:
-            samples = list(self._slippage_samples_per_lot_usd.get(symbol, []))
-        if len(samples) < 10:
-            return 0.0
-        try:
-            return self._p95(samples)
-        except Exception:
-            return 0.0
+            sketch = self._slippage_sketches.get(symbol)
+            if sketch is None or sketch.effective_count() < 10:
+                return 0.0
+            try:
+                return sketch.p95()
+            except Exception:
+                return 0.0
 
     def _load_state(self) -> None:
         """Load position state from disk."""
@@ -354,28 +419,44 @@ class PositionManager:
                 int(k): v for k, v in state.get('active_learning_trades', {}).items()
             }
 
-            # Restore slippage calibration samples (optional; best-effort)
+            # Restore slippage calibration sketches (optional; best-effort)
             if self._slippage_enabled:
-                raw_slip = state.get('slippage_samples_per_lot_usd', {})
-                if isinstance(raw_slip, dict):
-                    for sym, samples in raw_slip.items():
-                        if not sym or not isinstance(samples, list):
+                raw_sketches = state.get('slippage_sketches', {})
+                # Volume-bucket sketches of older files are keyed by leg volume, not bucket volume
+                bucket_keyed = state.get('slippage_volume_key') == 'bucket'
+                if isinstance(raw_sketches, dict):
+                    for key, data in raw_sketches.items():
+                        if not key or not isinstance(data, dict):
+                            continue
+                        if '|' in key and not bucket_keyed:
                             continue
                         try:
-                            dq = deque(maxlen=self._slippage_window)
-                            for v in samples[-self._slippage_window:]:
-                                try:
-                                    fv = float(v)
-                                except Exception:
-                                    continue
-                                if fv < 0 or math.isinf(fv) or math.isnan(fv):
-                                    continue
-                                dq.append(fv)
-                            if len(dq) > 0:
-                                self._slippage_samples_per_lot_usd[sym] = dq
+                            self._slippage_sketches[key] = QuantileSketch.from_dict(
+                                data,
+                                compression=self._slippage_compression,
+                                half_life_s=self._slippage_half_life_s,
+                            )
                         except Exception:
                             continue
 
+                # Older state files hold raw per-symbol samples; fold them in once
+                raw_slip = state.get('slippage_samples_per_lot_usd', {})
+                if isinstance(raw_slip, dict):
+                    for sym, samples in raw_slip.items():
+                        if not sym or not isinstance(samples, list) or sym in self._slippage_sketches:
+                            continue
+                        sketch = self._new_slippage_sketch()
+                        for v in samples:
+                            try:
+                                fv = float(v)
+                            except Exception:
+                                continue
+                            if fv < 0 or math.isinf(fv) or math.isnan(fv):
+                                continue
+                            sketch.add(fv)
+                        if sketch.count > 0:
+                            self._slippage_sketches[sym] = sketch
+
             logger.info(f"Position state restored: {len(self.bucket_stats)} buckets, {len(self.active_learning_trades)} learning records")
 
         except Exception as e:
@@ -418,14 +499,15 @@ class PositionManager:
                 'timestamp': time.time()
             }
 
-            # Persist slippage calibration samples (bounded, optional)
+            # Persist slippage calibration sketches (compact centroids, optional)
             if self._slippage_enabled:
                 with self._lock:
-                    state['slippage_samples_per_lot_usd'] = {
-                        sym: list(dq)
-                        for sym, dq in self._slippage_samples_per_lot_usd.items()
-                        if sym and dq
+                    state['slippage_sketches'] = {
+                        key: sketch.to_dict()
+                        for key, sketch in self._slippage_sketches.items()
+                        if key and sketch.count
                     }
+                    state['slippage_volume_key'] = 'bucket'
 
             with open(self.state_file, 'w') as f:
                 json.dump(state, f, indent=2)
@@ -438,22 +520,8 @@ class PositionManager:
         [PHASE 2] Calculates current drawdown for a bucket in USD.
         Used by 'The Stabilizer' to trigger hedging.
         """
-        if bucket_id not in self.bucket_stats:
-            return 0.0
-            
-        stats = self.bucket_stats[bucket_id]
-        positions = [self.active_positions[t] for t in stats.positions if t in self.active_positions]
-        
-        if not positions:
-            return 0.0
-            
-        # Calculate Net PnL
-        net_pnl, _, _, _ = self.calculate_net_pnl(positions)
-        
-        # Drawdown is negative PnL
-        if net_pnl < 0:
-            return abs(net_pnl)
-        return 0.0
+        metrics = self.get_bucket_metrics(bucket_id)
+        return metrics.drawdown if metrics else 0.0
 
     def check_stabilizer_trigger(self, bucket_id: str, market_data: Dict) -> bool:
         """
@@ -478,10 +546,7 @@ class PositionManager:
             # This cap is intended to be TOTAL positions on the symbol (base + hedges + recovery).
             max_positions_per_symbol = market_data.get('max_positions_per_symbol')
             if max_positions_per_symbol is None:
-                try:
-                    max_positions_per_symbol = int(os.getenv('AETHER_MAX_POSITIONS_PER_SYMBOL', '0'))
-                except Exception:
-                    max_positions_per_symbol = 0
+                max_positions_per_symbol = runtime_settings().max_positions_per_symbol
             try:
                 max_positions_per_symbol = int(max_positions_per_symbol) if max_positions_per_symbol is not None else 0
             except Exception:
@@ -536,6 +601,7 @@ class PositionManager:
             
         return False
 
+    @bucket_exclusive(timeout=0)
     async def execute_perfect_hedge(self, broker, bucket_id: str, market_data: Dict) -> bool:
         """
         [VALKYRIE PROTOCOL] THE PERFECT HEDGE (Flash Freeze).
@@ -544,6 +610,8 @@ class PositionManager:
         Action: Open ONE trade that counter-balances the exact net delta.
         Result: Account PnL is frozen.
         """
+        # Snapshot under the thread lock; the broker round-trip runs under the
+        # bucket's asyncio lock only (taken by @bucket_exclusive)
         with self._lock:
             if bucket_id not in self.bucket_stats:
                 return False
@@ -569,51 +637,55 @@ class PositionManager:
                 
             net_vol = round(net_vol, 2)
             
-            # 2. Determine Freeze Action
-            if abs(net_vol) < 0.01:
-                logger.info(f"[VALKYRIE] Account already neutral (Net: {net_vol}). Freeze successful.")
-                return True
-                
-            action = "SELL" if net_vol > 0 else "BUY"
-            freeze_vol = abs(net_vol)
-            symbol = positions[0].symbol
-            
-            logger.critical(f"❄️ [VALKYRIE] EXECUTING FREEZE | Net: {net_vol} | Action: {action} {freeze_vol} lots")
-            
-            # 3. Execute The Freeze
-            # Bypass Supreme Court? NO. The Court should allow this as it REDUCES risk (delta -> 0).
-            # But technically it increases 'global positions'.
-            # We must force this trade.
-            
-            # Get Price
-            price = market_data.get('bid') if action == "SELL" else market_data.get('ask')
-            
-            result = broker.execute_order(
-                action="OPEN",
-                symbol=symbol,
-                order_type=action,
-                price=price,
-                volume=freeze_vol,
-                sl=0.0, tp=0.0,
-                comment="VALKYRIE_FREEZE",
-                trace_reason="VALKYRIE_PROTOCOL_ENGAGED"
-            )
+        # 2. Determine Freeze Action
+        if abs(net_vol) < 0.01:
+            logger.info(f"[VALKYRIE] Account already neutral (Net: {net_vol}). Freeze successful.")
+            return True
             
-            if result:
-                logger.critical(f"❄️ [VALKYRIE] ACCOUNT FROZEN. WAITING FOR PHASE 3 (BAD BANK).")
-                # Mark bucket as frozen
-                self.bucket_stats[bucket_id].state = PositionState.BUCKET_FROZEN # [VALKYRIE] Frozen
-                
-                # [BAD BANK] Register Toxic Asset
-                try:
-                    self.bad_bank.register_toxic_asset(bucket_id, positions)
-                except Exception as e:
-                    logger.error(f"[BAD BANK] Failed to register asset {bucket_id}: {e}")
-                    
-                return True
-                
+        action = "SELL" if net_vol > 0 else "BUY"
+        freeze_vol = abs(net_vol)
+        symbol = positions[0].symbol
+        
+        logger.critical(f"❄️ [VALKYRIE] EXECUTING FREEZE | Net: {net_vol} | Action: {action} {freeze_vol} lots")
+        
+        # 3. Execute The Freeze
+        # Bypass Supreme Court? NO. The Court should allow this as it REDUCES risk (delta -> 0).
+        # But technically it increases 'global positions'.
+        # We must force this trade.
+        
+        # Get Price
+        price = market_data.get('bid') if action == "SELL" else market_data.get('ask')
+        
+        result = await broker.execute_order_async(
+            action="OPEN",
+            symbol=symbol,
+            order_type=action,
+            price=price,
+            volume=freeze_vol,
+            sl=0.0, tp=0.0,
+            comment="VALKYRIE_FREEZE",
+            trace_reason="VALKYRIE_PROTOCOL_ENGAGED"
+        )
+        
+        if not result:
             return False
 
+        logger.critical(f"❄️ [VALKYRIE] ACCOUNT FROZEN. WAITING FOR PHASE 3 (BAD BANK).")
+        with self._lock:
+            # Mark bucket as frozen (it may have been closed during the order)
+            stats = self.bucket_stats.get(bucket_id)
+            if stats is not None:
+                stats.state = PositionState.BUCKET_FROZEN # [VALKYRIE] Frozen
+        
+        # [BAD BANK] Register Toxic Asset
+        try:
+            self.bad_bank.register_toxic_asset(bucket_id, positions)
+        except Exception as e:
+            logger.error(f"[BAD BANK] Failed to register asset {bucket_id}: {e}")
+            
+        return True
+
+    @bucket_exclusive(timeout=0)
     async def execute_calculated_recovery(self, broker, bucket_id: str, market_data: Dict, shield=None) -> bool:
         """
         [GOD MODE] LIQUIDITY VACUUM RECOVERY (The Muscle Upgrade)
@@ -656,23 +728,15 @@ class PositionManager:
             current_price = market_data.get('current_price', None)
 
             # Freshness gate: block ANY NEW recovery order if feed is stale
-            enable_freshness = str(os.getenv("AETHER_ENABLE_FRESHNESS_GATE", "1")).strip().lower() in (
-                "1",
-                "true",
-                "yes",
-                "on",
-            )
+            rs = runtime_settings()
+            enable_freshness = rs.enable_freshness_gate
             if enable_freshness:
                 now = time.time()
                 tick_ts = float(market_data.get('time', 0.0) or 0.0)
 
                 # [TIMEZONE AUTO-CORRECTION] Prefer explicit override; else auto-detect once.
-                env_offset = os.getenv("AETHER_TIME_OFFSET_SECS", None)
-                if env_offset is not None:
-                    try:
-                        self._time_offset = float(env_offset)
-                    except Exception:
-                        self._time_offset = None
+                if rs.time_offset_secs is not None:
+                    self._time_offset = rs.time_offset_secs
 
                 if self._time_offset is None and tick_ts > 0:
                     raw_diff = now - tick_ts
@@ -699,14 +763,8 @@ class PositionManager:
                     candle_close_age = float('inf')
 
                 # Strict check for recovery
-                try:
-                    max_tick_age = float(os.getenv("AETHER_FRESH_TICK_MAX_AGE_S", os.getenv("AETHER_STRICT_TICK_MAX_AGE_S", "5.0")))
-                except Exception:
-                    max_tick_age = 5.0
-                try:
-                    max_candle_age = float(os.getenv("AETHER_FRESH_CANDLE_CLOSE_MAX_AGE_S", "0"))
-                except Exception:
-                    max_candle_age = 0.0
+                max_tick_age = rs.tick_max_age_s(5.0)
+                max_candle_age = rs.fresh_candle_close_max_age_s
                 if not max_candle_age or max_candle_age <= 0:
                     try:
                         tf_s = float(market_data.get('timeframe_s', 60) or 60)
@@ -730,94 +788,101 @@ class PositionManager:
             # If Net Long (>0), we BUY. If Net Short (<0), we SELL.
             action = "BUY" if net_vol > 0 else "SELL" 
             
-            # [CRITICAL ENHANCEMENT] GOD MODE ML-BASED TREND EXIT
-            # Prevent death spirals by detecting sustained trends BEFORE averaging down
-            # This would have prevented the 8-position BUY loss in downtrend
-            god_mode_ml_enabled = str(os.getenv("AETHER_GOD_MODE_ML_ENABLED", "1")).strip().lower() in ("1", "true", "yes", "on")
+        # The trend check may close the bucket (broker I/O): run it outside the
+        # thread lock, under the bucket's asyncio lock only
+        # [CRITICAL ENHANCEMENT] GOD MODE ML-BASED TREND EXIT
+        # Prevent death spirals by detecting sustained trends BEFORE averaging down
+        # This would have prevented the 8-position BUY loss in downtrend
+        god_mode_ml_enabled = runtime_settings().god_mode_ml_enabled
+        
+        if god_mode_ml_enabled and candles and len(candles) >= 20:
+            # Use Oracle for regime detection
+            if not hasattr(self, '_god_mode_oracle'):
+                from src.ai_core.oracle import Oracle
+                # [FIX] Lazy init Oracle with available dependencies
+                try:
+                    self._god_mode_oracle = Oracle(
+                        mt5_adapter=getattr(self, 'broker_adapter', None),
+                        tick_analyzer=getattr(self, 'tick_analyzer', None),
+                        global_brain=getattr(self, 'global_brain', None)
+                    )
+                except Exception as oracle_init_err:
+                    logger.error(f"[GOD MODE] Failed to initialize Oracle: {oracle_init_err}. Disabling trend detection.")
+                    god_mode_ml_enabled = False
             
-            if god_mode_ml_enabled and candles and len(candles) >= 20:
-                # Use Oracle for regime detection
-                if not hasattr(self, '_god_mode_oracle'):
-                    from src.ai_core.oracle import Oracle
-                    # [FIX] Lazy init Oracle with available dependencies
-                    try:
-                        self._god_mode_oracle = Oracle(
-                            mt5_adapter=getattr(self, 'broker_adapter', None),
-                            tick_analyzer=getattr(self, 'tick_analyzer', None),
-                            global_brain=getattr(self, 'global_brain', None)
+            if god_mode_ml_enabled:
+                try:
+                    # Detect market regime
+                    regime, signal_direction = self._god_mode_oracle.get_regime_and_signal(candles)
+                    
+                    # CRITICAL SAFETY: Exit if fighting sustained trend
+                    if net_vol > 0 and regime == "TREND_DOWN":
+                        # Long positions in downtrend = death spiral
+                        logger.critical(f"🚨 [GOD MODE] TREND EXIT: Sustained DOWNTREND detected")
+                        logger.info(f"[GOD MODE] Exiting {len(positions)} long positions. Deficit: -${deficit:.2f}")
+                        
+                        # Close all positions immediately
+                        close_result = await self.close_bucket_positions(
+                            broker,
+                            bucket_id,
+                            symbol,
+                            trace={"reason": "GOD_MODE_TREND_EXIT_DOWN", "confidence": 0.85, "emergency": True}
                         )
-                    except Exception as oracle_init_err:
-                        logger.error(f"[GOD MODE] Failed to initialize Oracle: {oracle_init_err}. Disabling trend detection.")
-                        god_mode_ml_enabled = False
-                
-                if god_mode_ml_enabled:
-                    try:
-                        # Detect market regime
-                        regime, signal_direction = self._god_mode_oracle.get_regime_and_signal(candles)
                         
-                        # CRITICAL SAFETY: Exit if fighting sustained trend
-                        if net_vol > 0 and regime == "TREND_DOWN":
-                            # Long positions in downtrend = death spiral
-                            logger.critical(f"🚨 [GOD MODE] TREND EXIT: Sustained DOWNTREND detected")
-                            logger.info(f"[GOD MODE] Exiting {len(positions)} long positions. Deficit: -${deficit:.2f}")
-                            
-                            # Close all positions immediately
-                            close_result = await self.close_bucket_positions(
-                                broker,
-                                bucket_id,
-                                symbol,
-                                trace={"reason": "GOD_MODE_TREND_EXIT_DOWN", "confidence": 0.85, "emergency": True}
-                            )
-                            
-                            if close_result:
-                                logger.info(f"✅ [GOD MODE] Trend exit successful. Prevented death spiral.")
-                                return True  # Recovery "successful" - positions are closed
-                            else:
-                                # Close failed - buffer check blocked it. Open SHORT hedge instead to catch bounce
-                                logger.warning(f"[GOD MODE] Could not close long positions. Opening SHORT hedge to catch downtrend.")
-                                action = "SELL"
-                                # Continue to recovery signal logic (don't return, proceed with hedge opening)
+                        if close_result:
+                            logger.info(f"✅ [GOD MODE] Trend exit successful. Prevented death spiral.")
+                            return True  # Recovery "successful" - positions are closed
+                        else:
+                            # Close failed - buffer check blocked it. Open SHORT hedge instead to catch bounce
+                            logger.warning(f"[GOD MODE] Could not close long positions. Opening SHORT hedge to catch downtrend.")
+                            action = "SELL"
+                            # Continue to recovery signal logic (don't return, proceed with hedge opening)
+                    
+                    elif net_vol < 0 and regime == "TREND_UP":
+                        # Short positions in uptrend = death spiral
+                        logger.critical(f"🚨 [GOD MODE] TREND EXIT: Sustained UPTREND detected")
+                        logger.info(f"[GOD MODE] Exiting {len(positions)} short positions. Deficit: -${deficit:.2f}")
                         
-                        elif net_vol < 0 and regime == "TREND_UP":
-                            # Short positions in uptrend = death spiral
-                            logger.critical(f"🚨 [GOD MODE] TREND EXIT: Sustained UPTREND detected")
-                            logger.info(f"[GOD MODE] Exiting {len(positions)} short positions. Deficit: -${deficit:.2f}")
-                            
-                            close_result = await self.close_bucket_positions(
-                                broker,
-                                bucket_id,
-                                symbol,
-                                trace={"reason": "GOD_MODE_TREND_EXIT_UP", "confidence": 0.85, "emergency": True}
-                            )
-                            
-                            if close_result:
-                                logger.info(f"✅ [GOD MODE] Trend exit successful. Prevented death spiral.")
-                                return True  # Recovery "successful" - positions are closed
-                            else:
-                                # Close failed - buffer check blocked it. Open LONG hedge instead to catch rally
-                                logger.warning(f"[GOD MODE] Could not close short positions. Opening LONG hedge to catch uptrend.")
-                                action = "BUY"
-                                # Continue to recovery signal logic (don't return, proceed with hedge opening)
+                        close_result = await self.close_bucket_positions(
+                            broker,
+                            bucket_id,
+                            symbol,
+                            trace={"reason": "GOD_MODE_TREND_EXIT_UP", "confidence": 0.85, "emergency": True}
+                        )
                         
-                        elif regime == "RANGE":
-                            # Safe to average down in ranging market
-                            logger.debug(f"[GOD MODE] Market in RANGE - safe to proceed with recovery")
+                        if close_result:
+                            logger.info(f"✅ [GOD MODE] Trend exit successful. Prevented death spiral.")
+                            return True  # Recovery "successful" - positions are closed
+                        else:
+                            # Close failed - buffer check blocked it. Open LONG hedge instead to catch rally
+                            logger.warning(f"[GOD MODE] Could not close short positions. Opening LONG hedge to catch uptrend.")
+                            action = "BUY"
+                            # Continue to recovery signal logic (don't return, proceed with hedge opening)
                     
-                    except RecursionError as re:
-                        # Recursion depth exceeded in Oracle evaluation - skip trend detection this cycle
-                        logger.warning(f"[GOD MODE] Recursion depth exceeded in trend detection: {re}. Proceeding without trend check.")
-                        # Reset Oracle and disable for this cycle to prevent cascade
-                        if hasattr(self, '_god_mode_oracle'):
-                            delattr(self, '_god_mode_oracle')
-                        god_mode_ml_enabled = False
-                    
-                    except Exception as e:
-                        # Failsafe: if detection fails, log but don't block
-                        logger.warning(f"[GOD MODE] Trend detection error: {e}. Proceeding with caution.")
-                        # Reset Oracle and disable for this cycle
-                        if hasattr(self, '_god_mode_oracle'):
-                            delattr(self, '_god_mode_oracle')
-            
+                    elif regime == "RANGE":
+                        # Safe to average down in ranging market
+                        logger.debug(f"[GOD MODE] Market in RANGE - safe to proceed with recovery")
+                
+                except RecursionError as re:
+                    # Recursion depth exceeded in Oracle evaluation - skip trend detection this cycle
+                    logger.warning(f"[GOD MODE] Recursion depth exceeded in trend detection: {re}. Proceeding without trend check.")
+                    # Reset Oracle and disable for this cycle to prevent cascade
+                    if hasattr(self, '_god_mode_oracle'):
+                        delattr(self, '_god_mode_oracle')
+                    god_mode_ml_enabled = False
+                
+                except Exception as e:
+                    # Failsafe: if detection fails, log but don't block
+                    logger.warning(f"[GOD MODE] Trend detection error: {e}. Proceeding with caution.")
+                    # Reset Oracle and disable for this cycle
+                    if hasattr(self, '_god_mode_oracle'):
+                        delattr(self, '_god_mode_oracle')
+        
+        with self._lock:
+            stats = self.bucket_stats.get(bucket_id)
+            if stats is None:
+                return False
+
             # [FIX] Trend Veto (IronShield) - Only if strict
             if strict_entry and shield:
                 if not trend_ok:
@@ -946,12 +1011,8 @@ class PositionManager:
                 return False
 
         # Check 2: Freshness gate (ANY new recovery order must use fresh tick + fresh candles)
-        enable_freshness = str(os.getenv("AETHER_ENABLE_FRESHNESS_GATE", "1")).strip().lower() in (
-            "1",
-            "true",
-            "yes",
-            "on",
-        )
+        rs = runtime_settings()
+        enable_freshness = rs.enable_freshness_gate
         if enable_freshness:
             # [TIMEZONE AUTO-CORRECTION]
             now = time.time()
@@ -983,15 +1044,8 @@ class PositionManager:
             except Exception:
                 candle_close_age = float('inf')
 
-            try:
-                max_tick_age = float(os.getenv("AETHER_FRESH_TICK_MAX_AGE_S", os.getenv("AETHER_STRICT_TICK_MAX_AGE_S", "2.5")))
-            except Exception:
-                max_tick_age = 2.5
-
-            try:
-                max_candle_age = float(os.getenv("AETHER_FRESH_CANDLE_CLOSE_MAX_AGE_S", "0"))
-            except Exception:
-                max_candle_age = 0.0
+            max_tick_age = rs.tick_max_age_s(2.5)
+            max_candle_age = rs.fresh_candle_close_max_age_s
 
             if not max_candle_age or max_candle_age <= 0:
                 try:
@@ -1039,7 +1093,7 @@ class PositionManager:
         # [SUCCESS] Log execution now that it's approved
         logger.info(f"[GOD MODE] Executing Liquidity Recovery: {action} {recovery_volume} lots @ {price}")
         
-        result = broker.execute_order(
+        result = await broker.execute_order_async(
             action="OPEN",
             symbol=symbol,
             order_type=action,
@@ -1079,6 +1133,8 @@ class PositionManager:
         """
         with self._lock:
             self.active_learning_trades[ticket] = metadata
+            if ticket in self.active_positions:
+                self._apply_entry_targets(self.active_positions[ticket], metadata)
             self._save_state()
             logger.debug(f"Persisted metadata for ticket #{ticket}")
 
@@ -1238,10 +1294,109 @@ class PositionManager:
                 logger.warning(f"[TRANSITION] Rolled back {bucket_id} to {old_state.name}")
             return False
 
+    def _mark_structure_changed(self) -> None:
+        """Record a change to tracked tickets or bucket membership (caller holds _lock)."""
+        self._structure_version += 1
+
+    def _mark_bucket_closed(self, bucket_id: str, stats: BucketStats) -> None:
+        """Close a bucket and record its close time (caller holds _lock)."""
+        stats.closed = True
+        self.closed_buckets.add(bucket_id)
+        self._index.record_close(bucket_id, time.time())
+        self._mark_structure_changed()
+
+    def _get_index(self) -> BucketIndex:
+        """Return the secondary index, rebuilt if the structure changed (caller holds _lock)."""
+        if self._index.version != self._structure_version:
+            self._index.rebuild(self._structure_version, self.bucket_stats, self.active_positions)
+        return self._index
+
+    def update_quote(self, symbol: str, bid: float, ask: float) -> None:
+        """Feed the latest quote; legs of `symbol` are marked to it until the next broker sync."""
+        if not bid or not ask or bid <= 0 or ask <= 0:
+            return
+        with self._lock:
+            self._table.update_quote(symbol, bid, ask)
+
+    def get_all_bucket_metrics(self) -> Dict[str, BucketMetrics]:
+        """
+        Net PnL, exposure, breakeven and drawdown for every open bucket,
+        computed in one vectorized pass and cached until positions, broker
+        PnL or a quote change.
+        """
+        with self._lock:
+            table = self._table
+            if table.version != self._structure_version:
+                table.rebuild(self._structure_version, self.bucket_stats, self.active_positions, get_symbol_spec)
+            if table.pnl_version != self._pnl_version or table.synced_at != self._pnl_synced_at:
+                table.refresh_floating(self.active_positions, self._pnl_version, self._pnl_synced_at)
+            key = (self._structure_version, self._pnl_version, self._pnl_synced_at, table.quote_version)
+            if key != self._metrics_key:
+                self._metrics = table.evaluate()
+                self._metrics_key = key
+            return self._metrics
+
+    def get_bucket_metrics(self, bucket_id: str) -> Optional[BucketMetrics]:
+        return self.get_all_bucket_metrics().get(bucket_id)
+
+    def get_published_bucket_metrics(self) -> Dict[str, BucketMetrics]:
+        """
+        Metrics as of the last broker sync or bucket evaluation. Never rebuilds
+        the table, takes _lock or touches the terminal, so other threads
+        (metrics scrape) can read it without stalling the trading loop.
+        """
+        return self._metrics
+
+    def get_bucket_snapshot(self, bucket_id: str) -> Optional[BucketSnapshot]:
+        """
+        Immutable view of a bucket. A snapshot is republished only when the
+        bucket's structure, PnL or state changed, so repeated reads are cheap
+        and callers can use it across awaits without holding any lock.
+        """
+        with self._lock:
+            stats = self.bucket_stats.get(bucket_id)
+            if stats is None:
+                return None
+            key = (self._structure_version, self._pnl_version, stats.state, stats.mode,
+                   stats.closed, stats.exit_reason)
+            cached = self._snapshots.get(bucket_id)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            tickets = self._get_index().bucket_tickets.get(bucket_id, ())
+            positions = tuple(replace(self.active_positions[t]) for t in tickets)
+            snapshot = BucketSnapshot(
+                bucket_id=bucket_id,
+                state=stats.state,
+                mode=stats.mode,
+                closed=stats.closed,
+                exit_reason=stats.exit_reason,
+                positions=positions,
+                net_pnl=sum(p.profit + p.swap + p.commission for p in positions),
+            )
+            self._snapshots[bucket_id] = (key, snapshot)
+            return snapshot
+
+    def bucket_busy(self, bucket_id: str) -> bool:
+        """True while a close/hedge/recovery operation holds the bucket."""
+        return self._bucket_locks.is_busy(bucket_id)
+
+    def check_index_consistency(self) -> List[str]:
+        """
+        Verify the secondary index against a full scan of bucket/position state.
+
+        Returns:
+            List of mismatches (empty when consistent)
+        """
+        with self._lock:
+            return self._get_index().verify(self.bucket_stats, self.active_positions)
+
     def cleanup_stale_positions(self, broker_positions: List) -> None:
         """
         Remove positions from tracking that no longer exist in the broker.
         CRITICAL for preventing "Position doesn't exist" errors during hedging.
+
+        Skipped when the broker ticket set and the tracked structure are both
+        unchanged since the last cleanup.
         
         Args:
             broker_positions: List of position objects from broker
@@ -1252,9 +1407,12 @@ class PositionManager:
             return
 
         # Get set of valid ticket numbers from broker
-        broker_tickets = {p.ticket if hasattr(p, 'ticket') else p['ticket'] for p in broker_positions} if broker_positions else set()
+        broker_tickets = frozenset(p.ticket if hasattr(p, 'ticket') else p['ticket'] for p in broker_positions)
         
         with self._lock:
+            if self._cleanup_key == (broker_tickets, self._structure_version):
+                return
+
             # Find ALL stale tickets across all tracking structures
             tracked_tickets = set(self.active_positions.keys())
             
@@ -1274,6 +1432,7 @@ class PositionManager:
                 for ticket in stale_tickets:
                     if ticket in self.active_positions:
                         del self.active_positions[ticket]
+                        self._position_fingerprints.pop(ticket, None)
                         logger.info(f"[CLEANUP] Removed stale position #{ticket} from active tracking")
                     
                     # Clean from learning trades
@@ -1291,17 +1450,27 @@ class PositionManager:
                         
                         # Mark bucket as closed if empty
                         if len(stats.positions) == 0:
-                            stats.closed = True
-                            self.closed_buckets.add(bucket_id)
+                            self._mark_bucket_closed(bucket_id, stats)
                             logger.info(f"[CLEANUP] Bucket {bucket_id} marked as closed (no remaining positions)")
                 
+                self._mark_structure_changed()
                 # Persist cleaned state
                 self._save_state()
                 logger.info(f"[CLEANUP] State cleaned and persisted")
 
-    def update_positions(self, broker_positions: List[Dict]) -> None:
+            self._cleanup_key = (broker_tickets, self._structure_version)
+
+    def update_positions(self, broker_positions: List[Dict],
+                         symbols: Optional[Set[str]] = None) -> Optional[PositionEvents]:
         """
-        Update internal position tracking from broker data.
+        Reconcile internal position tracking with a broker snapshot.
+
+        Positions are diffed by (volume, price_open, sl, tp) fingerprint:
+        new tickets are OPENED, fingerprint changes are MODIFIED and tracked
+        tickets missing from the snapshot are CLOSED. Unchanged positions only
+        get their floating fields (price, profit, swap, commission) refreshed
+        in place, and the bucket adoption/cleanup sweep runs only when there
+        were events or the bucket structure changed since the last sweep.
         
         IMPORTANT: MT5 in netting mode consolidates multiple trades for the same symbol
         into ONE position with averaged entry price. Bot tracks individual trades but
@@ -1309,166 +1478,279 @@ class PositionManager:
 
         Args:
             broker_positions: List of position dicts from broker
+            symbols: If the snapshot covers only some symbols, restrict CLOSED
+                detection to tracked positions of these symbols
+
+        Returns:
+            PositionEvents for this snapshot, or None if it was rejected
         """
         if broker_positions is None:
-            return
+            return None
+
+        events = PositionEvents()
+        snapshot_at = time.time()
+        full_snapshot = symbols is None
+        pnl_changed = False
+        symbol_counts: Dict[str, int] = {}
+        parsed = 0
+
+        with self._lock:
+            seen = set()
+            for pos_data in broker_positions:
+                try:
+                    # Handle both dictionary and object (dataclass/namedtuple) input
+                    if isinstance(pos_data, dict):
+                        ticket = pos_data['ticket']
+                        symbol = pos_data['symbol']
+                        volume = pos_data['volume']
+                        price_open = pos_data['price_open']
+                        price_current = pos_data.get('price_current', pos_data['price_open'])
+                        profit = pos_data['profit']
+                        sl = pos_data['sl']
+                        tp = pos_data['tp']
+                        swap = pos_data.get('swap', 0.0)
+                        commission = pos_data.get('commission', 0.0)
+                    else:
+                        ticket = pos_data.ticket
+                        symbol = pos_data.symbol
+                        volume = pos_data.volume
+                        price_open = pos_data.price_open
+                        # MT5Adapter Position might not have price_current
+                        price_current = getattr(pos_data, 'price_current', pos_data.price_open)
+                        profit = pos_data.profit
+                        sl = pos_data.sl
+                        tp = pos_data.tp
+                        swap = getattr(pos_data, 'swap', 0.0)
+                        commission = getattr(pos_data, 'commission', 0.0)
+                except (KeyError, AttributeError, Exception) as e:
+                    logger.warning(f"Invalid position data: {e}")
+                    continue
+
+                parsed += 1
+                if full_snapshot:
+                    key = str(symbol).lower()
+                    symbol_counts[key] = symbol_counts.get(key, 0) + 1
+
+                # [CHRONOS PROTOCOL] Skip Toxic Assets held by Bad Bank
+                if self.bad_bank.is_toxic(ticket):
+                    # Do NOT track this position. It belongs to the Bad Bank.
+                    continue
 
-        # Build new position dictionary atomically to avoid race conditions
-        new_positions = {}
-        # Consolidate broker positions by ticket
-        current_tickets = set()
-        for pos_data in broker_positions:
-            # Safely extract ticket
+                existing = self.active_positions.get(ticket)
+
+                # Ghost check (only for new positions)
+                if existing is None and ticket in self._ghost_tickets:
+                    continue
+
+                seen.add(ticket)
+                fingerprint = (volume, price_open, sl, tp)
+
+                if existing is None:
+                    position = self._build_position(pos_data)
+                    if position is None:
+                        continue
+                    self.active_positions[ticket] = position
+                    self._position_fingerprints[ticket] = fingerprint
+                    events.opened.append(ticket)
+                    events.symbols.add(symbol)
+                    continue
+
+                if self._position_fingerprints.get(ticket) != fingerprint:
+                    existing.volume = volume
+                    existing.price_open = price_open
+                    existing.sl = sl
+                    existing.tp = tp
+                    self._position_fingerprints[ticket] = fingerprint
+                    events.modified.append(ticket)
+                    events.symbols.add(symbol)
+
+                # Floating fields change every tick and are not events
+                if existing.profit != profit or existing.swap != swap or existing.commission != commission:
+                    self._pnl_dirty.add(symbol)
+                    pnl_changed = True
+                existing.price_current = price_current
+                existing.profit = profit
+                existing.swap = swap
+                existing.commission = commission
+
+            # [ROBUSTNESS FIX] Prevent state wipe if parsing failed
+            # If we received positions from broker but failed to parse ANY of them,
+            # do NOT wipe our existing active_positions. This protects against
+            # transient errors, malformed data, or race conditions.
+            if not parsed and broker_positions:
+                logger.warning(f"[SAFETY] update_positions: Input has {len(broker_positions)} items but result is empty. Aborting update to protect state.")
+                return None
+
+            if full_snapshot:
+                self._broker_symbol_counts = symbol_counts
+
+            for ticket, pos in list(self.active_positions.items()):
+                if ticket in seen or (symbols is not None and pos.symbol not in symbols):
+                    continue
+                del self.active_positions[ticket]
+                self._position_fingerprints.pop(ticket, None)
+                events.closed.append(ticket)
+                events.symbols.add(pos.symbol)
+
+            if pnl_changed:
+                self._pnl_version += 1
+            self._pnl_synced_at = snapshot_at
+            if events.changed:
+                self._mark_structure_changed()
+                self._pnl_dirty.update(events.symbols)
+            if self._swept_version != self._structure_version:
+                self._sweep_buckets()
+            # Publish metrics for this snapshot (read by get_published_bucket_metrics)
+            self.get_all_bucket_metrics()
+
+        return events
+
+    def _build_position(self, pos_data) -> Optional[Position]:
+        """Create a tracked Position from broker data (caller holds _lock)."""
+        try:
+            # Handle both dictionary and object (dataclass/namedtuple) input
             if isinstance(pos_data, dict):
                 ticket = pos_data['ticket']
+                symbol = pos_data['symbol']
+                p_type = pos_data['type']
+                volume = pos_data['volume']
+                price_open = pos_data['price_open']
+                price_current = pos_data.get('price_current', pos_data['price_open'])
+                profit = pos_data['profit']
+                sl = pos_data['sl']
+                tp = pos_data['tp']
+                time_val = pos_data['time']
+                swap = pos_data.get('swap', 0.0)
+                commission = pos_data.get('commission', 0.0)
+                magic = pos_data.get('magic', 0)
+                comment = pos_data.get('comment', '')
             else:
                 ticket = pos_data.ticket
-            
-            # [CHRONOS PROTOCOL] Skip Toxic Assets held by Bad Bank
-            if self.bad_bank.is_toxic(ticket):
-                # Do NOT track this position. It belongs to the Bad Bank.
+                symbol = pos_data.symbol
+                p_type = pos_data.type
+                volume = pos_data.volume
+                price_open = pos_data.price_open
+                # MT5Adapter Position might not have price_current
+                price_current = getattr(pos_data, 'price_current', pos_data.price_open)
+                profit = pos_data.profit
+                sl = pos_data.sl
+                tp = pos_data.tp
+                time_val = pos_data.time
+                swap = getattr(pos_data, 'swap', 0.0)
+                commission = getattr(pos_data, 'commission', 0.0)
+                magic = getattr(pos_data, 'magic', 0)
+                comment = getattr(pos_data, 'comment', '')
+        except (KeyError, AttributeError, Exception) as e:
+            logger.warning(f"Invalid position data: {e}")
+            return None
+
+        # Determine position state - check if it's in a bucket
+        # [FIX] Unified Bucket ID: One bucket per symbol
+        bucket_id = symbol
+        if bucket_id in self.bucket_stats and not self.bucket_stats[bucket_id].closed:
+            # Part of existing bucket
+            pos_state = self.bucket_stats[bucket_id].state
+        else:
+            # New single position - assume broker TP/SL active
+            pos_state = PositionState.SINGLE_ACTIVE
+
+        position = Position(
+            ticket=ticket,
+            symbol=symbol,
+            type=p_type,
+            volume=volume,
+            price_open=price_open,
+            price_current=price_current,
+            profit=profit,
+            sl=sl,
+            tp=tp,
+            time=time_val,
+            swap=swap,
+            commission=commission,
+            magic=magic,
+            comment=comment,
+            state=pos_state
+        )
+        # Check if we have stored entry targets for this position
+        if ticket in self.active_learning_trades:
+            self._apply_entry_targets(position, self.active_learning_trades[ticket])
+        return position
+
+    @staticmethod
+    def _apply_entry_targets(position: Position, metadata: Dict) -> None:
+        position.entry_tp_pips = metadata.get('entry_tp_pips', 0.0)
+        position.entry_sl_pips = metadata.get('entry_sl_pips', 0.0)
+        position.entry_atr = metadata.get('entry_atr', 0.0)
+
+    def _sweep_buckets(self) -> None:
+        """
+        Align bucket membership with tracked positions (caller holds _lock).
+        Runs only after a structural change, not on PnL-only cycles.
+        """
+        dirty = False
+
+        # [SELF-HEALING] Scan for orphans and adopt them into buckets
+        # This ensures that if a manual trade or hedge appears, it is IMMEDIATELY managed.
+        for ticket, pos in self.active_positions.items():
+            bucket_id = pos.symbol
+            if bucket_id in self.bucket_stats and not self.bucket_stats[bucket_id].closed:
+                stats = self.bucket_stats[bucket_id]
+                if ticket not in stats.positions:
+                    stats.positions.append(ticket)
+                    stats.last_update = time.time()
+                    # Update the position state to match the bucket
+                    pos.state = stats.state
+                    logger.info(f"[ADOPTION] Bucket {bucket_id} adopted orphan position #{ticket}")
+                    dirty = True
+
+        # [CLEANUP] Remove stale tickets from buckets
+        # If a position is closed in MT5, it disappears from active_positions.
+        # We must also remove it from the bucket stats to prevent "Ghost Trades".
+        for bucket_id, stats in list(self.bucket_stats.items()):
+            if stats.closed:
                 continue
-                
-            current_tickets.add(ticket)
             
-            # [FIX] Process ALL positions (both new and existing)
-            # The old logic only processed NEW positions, causing existing ones to be dropped
+            original_count = len(stats.positions)
+            # Keep only tickets that are still tracked
+            stats.positions = [t for t in stats.positions if t in self.active_positions]
             
-            # Ghost check (only for new positions)
-            if ticket not in self.active_positions and ticket in self._ghost_tickets:
-                continue
+            if len(stats.positions) < original_count:
+                removed_count = original_count - len(stats.positions)
+                logger.info(f"[CLEANUP] Removed {removed_count} stale positions from Bucket {bucket_id}")
+                stats.last_update = time.time()
+                dirty = True
+            
+            # If bucket becomes empty after cleanup, close it automatically
+            if not stats.positions:
+                logger.info(f"[CLEANUP] Bucket {bucket_id} is now empty. Auto-closing.")
+                self._mark_bucket_closed(bucket_id, stats)
+                self._set_position_state(bucket_id, PositionState.CLOSED)
+                dirty = True
 
-            try:
-                # Handle both dictionary and object (dataclass/namedtuple) input
-                if isinstance(pos_data, dict):
-                    # ticket already extracted
-                    symbol = pos_data['symbol']
-                    p_type = pos_data['type']
-                    volume = pos_data['volume']
-                    price_open = pos_data['price_open']
-                    price_current = pos_data.get('price_current', pos_data['price_open'])
-                    profit = pos_data['profit']
-                    sl = pos_data['sl']
-                    tp = pos_data['tp']
-                    time_val = pos_data['time']
-                    swap = pos_data.get('swap', 0.0)
-                    commission = pos_data.get('commission', 0.0)
-                    magic = pos_data.get('magic', 0)
-                    comment = pos_data.get('comment', '')
-                else:
-                    ticket = pos_data.ticket
-                    symbol = pos_data.symbol
-                    p_type = pos_data.type
-                    volume = pos_data.volume
-                    price_open = pos_data.price_open
-                    # MT5Adapter Position might not have price_current
-                    price_current = getattr(pos_data, 'price_current', pos_data.price_open)
-                    profit = pos_data.profit
-                    sl = pos_data.sl
-                    tp = pos_data.tp
-                    time_val = pos_data.time
-                    swap = getattr(pos_data, 'swap', 0.0)
-                    commission = getattr(pos_data, 'commission', 0.0)
-                    magic = getattr(pos_data, 'magic', 0)
-                    comment = getattr(pos_data, 'comment', '')
-
-                # Check if we have stored entry targets for this position
-                entry_tp_pips = 0.0
-                entry_sl_pips = 0.0
-                entry_atr = 0.0
-                if ticket in self.active_learning_trades:
-                    metadata = self.active_learning_trades[ticket]
-                    entry_tp_pips = metadata.get('entry_tp_pips', 0.0)
-                    entry_sl_pips = metadata.get('entry_sl_pips', 0.0)
-                    entry_atr = metadata.get('entry_atr', 0.0)
-                
-                # Determine position state - check if it's in a bucket
-                # [FIX] Unified Bucket ID: One bucket per symbol
-                bucket_id = symbol
-                if bucket_id in self.bucket_stats and not self.bucket_stats[bucket_id].closed:
-                    # Part of existing bucket
-                    pos_state = self.bucket_stats[bucket_id].state
-                else:
-                    # New single position - assume broker TP/SL active
-                    pos_state = PositionState.SINGLE_ACTIVE
-                
-                position = Position(
-                    ticket=ticket,
-                    symbol=symbol,
-                    type=p_type,
-                    volume=volume,
-                    price_open=price_open,
-                    price_current=price_current,
-                    profit=profit,
-                    sl=sl,
-                    tp=tp,
-                    time=time_val,
-                    swap=swap,
-                    commission=commission,
-                    magic=magic,
-                    comment=comment,
-                    state=pos_state,
-                    entry_tp_pips=entry_tp_pips,
-                    entry_sl_pips=entry_sl_pips,
-                    entry_atr=entry_atr
-                )
-                new_positions[position.ticket] = position
+        # Drop fingerprints of tickets removed outside the reconciler
+        for ticket in [t for t in self._position_fingerprints if t not in self.active_positions]:
+            del self._position_fingerprints[ticket]
+
+        if dirty:
+            self._mark_structure_changed()
+            self._save_state()
+        self._swept_version = self._structure_version
 
-            except (KeyError, AttributeError, Exception) as e:
-                logger.warning(f"Invalid position data: {e}")
+    def has_broker_positions(self, symbol: str) -> bool:
+        """
+        True if the last full broker snapshot holds any position for `symbol`
+        (including Bad Bank holdings). Matching is case-insensitive and
+        tolerates broker suffixes like .m, .pro or +.
+        """
+        cfg_clean = symbol.lower()
+        for sym_clean, count in self._broker_symbol_counts.items():
+            if not count:
                 continue
-        
-        
-        # Atomic replacement under lock to prevent race conditions
-        with self._lock:
-            # [ROBUSTNESS FIX] Prevent state wipe if parsing failed
-            # If we received positions from broker but failed to parse ANY of them,
-            # do NOT wipe our existing active_positions. This protects against
-            # transient errors, malformed data, or race conditions.
-            if not new_positions and broker_positions:
-                 logger.warning(f"[SAFETY] update_positions: Input has {len(broker_positions)} items but result is empty. Aborting update to protect state.")
-                 return
-
-            self.active_positions = new_positions
-            
-            # [SELF-HEALING] Scan for orphans and adopt them into buckets
-            # This ensures that if a manual trade or hedge appears, it is IMMEDIATELY managed.
-            for ticket, pos in self.active_positions.items():
-                bucket_id = pos.symbol
-                if bucket_id in self.bucket_stats and not self.bucket_stats[bucket_id].closed:
-                    stats = self.bucket_stats[bucket_id]
-                    if ticket not in stats.positions:
-                        stats.positions.append(ticket)
-                        stats.last_update = time.time()
-                        # Update the position state to match the bucket
-                        pos.state = stats.state 
-                        logger.info(f"[ADOPTION] Bucket {bucket_id} adopted orphan position #{ticket}")
-                        self._save_state()
-
-            # [CLEANUP] Remove stale tickets from buckets
-            # If a position is closed in MT5, it disappears from active_positions.
-            # We must also remove it from the bucket stats to prevent "Ghost Trades".
-            for bucket_id, stats in list(self.bucket_stats.items()):
-                if stats.closed:
-                    continue
-                
-                original_count = len(stats.positions)
-                # Keep only tickets that exist in the new_positions map
-                stats.positions = [t for t in stats.positions if t in new_positions]
-                
-                if len(stats.positions) < original_count:
-                    removed_count = original_count - len(stats.positions)
-                    logger.info(f"[CLEANUP] Removed {removed_count} stale positions from Bucket {bucket_id}")
-                    stats.last_update = time.time()
-                    self._save_state()
-                
-                # If bucket becomes empty after cleanup, close it automatically
-                if not stats.positions:
-                    logger.info(f"[CLEANUP] Bucket {bucket_id} is now empty. Auto-closing.")
-                    stats.closed = True
-                    self.closed_buckets.add(bucket_id)
-                    self._set_position_state(bucket_id, PositionState.CLOSED)
-                    self._save_state()
+            if sym_clean == cfg_clean:
+                return True
+            if sym_clean.startswith(cfg_clean) and len(sym_clean) <= len(cfg_clean) + 4:
+                return True
+        return False
 
     def mark_position_as_ghost(self, ticket: int) -> None:
         """
@@ -1479,6 +1761,7 @@ class PositionManager:
             self._ghost_tickets.add(ticket)
             if ticket in self.active_positions:
                 del self.active_positions[ticket]
+                self._mark_structure_changed()
 
     def _get_bucket_stats(self, bucket_id: str) -> BucketStats:
         """
@@ -1503,12 +1786,28 @@ class PositionManager:
                 last_state_check=time.time(),
                 exit_reason=""
             )
+            self._index.forget_close(bucket_id)
+            self._mark_structure_changed()
         return self.bucket_stats[bucket_id]
 
     def _update_bucket_stats(self) -> None:
-        """Update statistics for all active buckets."""
+        """
+        Update statistics for active buckets.
+
+        A full pass runs only after a structural change; otherwise only the
+        buckets whose floating PnL moved since the last call are re-summed.
+        """
         with self._lock:
-            for bucket_id, stats in self.bucket_stats.items():
+            if self._stats_version != self._structure_version:
+                bucket_ids = list(self.bucket_stats.keys())
+            elif self._pnl_dirty:
+                bucket_ids = [b for b in self._pnl_dirty if b in self.bucket_stats]
+            else:
+                return
+            self._pnl_dirty.clear()
+
+            for bucket_id in bucket_ids:
+                stats = self.bucket_stats[bucket_id]
                 if stats.closed:
                     continue
 
@@ -1526,13 +1825,15 @@ class PositionManager:
 
                 # Mark bucket as closed if no positions remain
                 if active_positions == 0:
-                    stats.closed = True
-                    self.closed_buckets.add(bucket_id)
+                    self._mark_bucket_closed(bucket_id, stats)
+
+            self._stats_version = self._structure_version
 
     def get_positions_for_symbol(self, symbol: str) -> List[Position]:
         """Get all active positions for a specific symbol."""
         with self._lock:
-            return [pos for pos in self.active_positions.values() if pos.symbol == symbol]
+            tickets = self._get_index().symbol_tickets.get(symbol, ())
+            return [self.active_positions[t] for t in tickets]
 
     def find_bucket_by_tickets(self, tickets: List[int]) -> Optional[str]:
         """
@@ -1545,9 +1846,10 @@ class PositionManager:
             Bucket ID if found, None otherwise
         """
         with self._lock:
-            ticket_set = set(tickets)
-            for bucket_id, stats in self.bucket_stats.items():
-                if not stats.closed and ticket_set.intersection(set(stats.positions)):
+            ticket_to_bucket = self._get_index().ticket_to_bucket
+            for ticket in tickets:
+                bucket_id = ticket_to_bucket.get(ticket)
+                if bucket_id is not None:
                     return bucket_id
             return None
 
@@ -1557,17 +1859,10 @@ class PositionManager:
         Returns the first found active bucket or None.
         """
         with self._lock:
-            for bucket_id, stats in self.bucket_stats.items():
-                 if stats.closed:
-                     continue
-                 if stats.state == PositionState.CLOSED:
-                     continue
-                 
-                 # Check positions
-                 for ticket in stats.positions:
-                     if ticket in self.active_positions:
-                         if self.active_positions[ticket].symbol == symbol:
-                             return bucket_id
+            for bucket_id in self._get_index().symbol_buckets.get(symbol, ()):
+                # State is not part of the index structure; check it on read
+                if self.bucket_stats[bucket_id].state != PositionState.CLOSED:
+                    return bucket_id
         return None
 
     def create_bucket(self, positions: List[Position]) -> str:
@@ -1602,6 +1897,8 @@ class PositionManager:
                 mode=initial_mode,
                 last_state_check=time.time()
             )
+            self._index.forget_close(bucket_id)
+            self._mark_structure_changed()
 
             self._save_state()
 
@@ -1624,12 +1921,12 @@ class PositionManager:
         
         # Try to calculate dynamic target based on ATR
         if atr_value and atr_value > 0:
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info:
+            spec = get_symbol_spec(symbol)
+            if spec:
                 # 1% of Daily ATR as pure profit target
                 # XAUUSD Example: ATR=20.0, Contract=100. Target = 1.0 * 100 * (20.0 * 0.01) = $20.00
                 # EURUSD Example: ATR=0.0060, Contract=100k. Target = 1.0 * 100k * (0.00006) = $6.00
-                target = total_lots * symbol_info.trade_contract_size * (atr_value * 0.01)
+                target = total_lots * spec.contract_size * (atr_value * 0.01)
         
         # Fallback if ATR/Symbol info fails
         if target == 0.0:
@@ -1762,19 +2059,32 @@ class PositionManager:
                 logger.debug(f"[TP_CHECK_SKIP] Bucket {bucket_id} has no active active positions")
                 return False, 0.0
             
-            # Log bucket status for hedged positions
-            if len(positions) > 1:
-                total_profit, _, _, _ = self.calculate_net_pnl(positions)
-                logger.debug(f"[BUCKET] {bucket_id}: {len(positions)} positions, Net P&L: ${total_profit:.2f}")
-
             first_pos = positions[0]
             current_time = time.time()
             # FIX: Use .time instead of .time_open (Position dataclass uses 'time')
             position_age_seconds = current_time - first_pos.time
             position_age_minutes = position_age_seconds / 60
 
-            # Live Net PnL is always the most reliable real-time signal.
-            net_pnl, gross_pnl, swap, comm = self.calculate_net_pnl(positions)
+            # Precomputed for all buckets in one pass. The quote keeps the marked
+            # drawdown current; the close gate itself uses the broker's profit as of
+            # the last sync (marked PnL can drift from it, see position_table).
+            if market_data and ('bid' in market_data) and ('ask' in market_data):
+                try:
+                    self.update_quote(first_pos.symbol, float(market_data['bid']), float(market_data['ask']))
+                except (TypeError, ValueError):
+                    pass
+            metrics = self.get_bucket_metrics(bucket_id)
+            if metrics is not None:
+                net_pnl, swap, comm = metrics.broker_net_pnl, metrics.swap, metrics.commission
+                gross_pnl = net_pnl - swap - comm
+                bucket_volume = metrics.total_volume
+            else:
+                net_pnl, gross_pnl, swap, comm = self.calculate_net_pnl(positions)
+                bucket_volume = sum(pos.volume for pos in positions)
+
+            # Log bucket status for hedged positions
+            if len(positions) > 1:
+                logger.debug(f"[BUCKET] {bucket_id}: {len(positions)} positions, Net P&L: ${net_pnl:.2f}")
 
             # Get market data for intelligent analysis (avoid synthetic defaults where possible)
             strict_entry = bool(market_data.get('strict_entry', False)) if market_data else False
@@ -1825,7 +2135,7 @@ class PositionManager:
             # Calculate current profit in pips FOR THE ENTIRE BUCKET (not just first position)
             # For hedged buckets, we must use NET P&L, not individual position pips
             contract_size = 100 if "XAU" in first_pos.symbol or "GOLD" in first_pos.symbol else 100000
-            total_volume = sum(pos.volume for pos in positions)
+            total_volume = bucket_volume
             
             # Convert NET P&L to pips equivalent
             if total_volume > 0:
@@ -1962,8 +2272,7 @@ class PositionManager:
                         
                         # Check if actual profit exceeds target
                         # [FIX] Use Net PnL (Profit + Swap + Comm) to avoid closing in loss
-                        net_pnl, _, _, _ = self.calculate_net_pnl(positions)
-                        
+                        # (net_pnl already computed above)
                         if net_pnl >= target_profit_usd:
                             logger.debug(f"[TP FALLBACK] Broker profit target reached: ${net_pnl:.2f} >= ${target_profit_usd:.2f}")
                             profit_exit = True
@@ -1981,8 +2290,8 @@ class PositionManager:
                         logger.info(f"[TP HIT] PROFIT TARGET REACHED: {profit_pips:.1f} pips >= {final_tp_pips:.1f} pips target | TP Price: {tp_price:.{precision}f}")
             else:
                 # BUCKET: Use DYNAMIC BREAK-EVEN LOGIC
-                total_profit_usd, _, _, _ = self.calculate_net_pnl(positions)
-                total_volume = sum(pos.volume for pos in positions)
+                total_profit_usd = net_pnl
+                total_volume = bucket_volume
                 num_trades = len(positions)
                 
                 # INTELLIGENCE UPGRADE: Use Velvet Cushion Protocol
@@ -2007,7 +2316,7 @@ class PositionManager:
                 # 2 Trades: 50% Target
                 # 3+ Trades: Survival Mode (Just cover costs + $1)
                 
-                total_volume = sum(p.volume for p in positions)
+                total_volume = bucket_volume
                 
                 # [SURVIVAL DYNAMIC] PURE LIVE MARKET LOGIC
                 # Floor = Live Spread Cost * 2.0 (Cover spread twice)
@@ -2195,8 +2504,8 @@ class PositionManager:
             try:
                 if ppo_guardian and len(positions) > 1:
                     # BUCKET MODE: Use sophisticated should_exit_bucket
-                    total_pnl, _, _, _ = self.calculate_net_pnl(positions)
-                    total_volume = sum(pos.volume for pos in positions)
+                    total_pnl = net_pnl
+                    total_volume = bucket_volume
                     
                     # If ATR is unavailable, do not run ATR-dependent AI exit logic.
                     if atr_value is None or float(atr_value) <= 0:
@@ -2254,12 +2563,8 @@ class PositionManager:
             # 
             # CRITICAL FIX: Buffer should NOT exceed the actual profit!
             # If net_pnl > $5.00, don't block exits requiring $2.00 buffer.
-            allow_emergency_close_loss = str(os.getenv("AETHER_ALLOW_EMERGENCY_CLOSE_LOSS", "0")).strip().lower() in (
-                "1",
-                "true",
-                "yes",
-                "on",
-            )
+            rs = runtime_settings()
+            allow_emergency_close_loss = rs.allow_emergency_close_loss
 
             if should_close and not (stop_loss_exit or (emergency_exit and allow_emergency_close_loss)):
                 # Dynamic buffer: higher in volatile markets
@@ -2280,7 +2585,7 @@ class PositionManager:
                     min_profit_buffer = min(min_profit_buffer, max_acceptable_buffer)
 
                 if net_pnl < min_profit_buffer:
-                    if str(os.getenv("AETHER_SLIPPAGE_CALIBRATION_LOG", "1")).strip().lower() in ("1", "true", "yes", "on"):
+                    if rs.slippage_calibration_log:
                         sc = self._get_slippage_sample_count(first_pos.symbol)
                         p95pl = self._get_slippage_p95_per_lot_usd(first_pos.symbol)
                         logger.debug(
@@ -2387,7 +2692,7 @@ class PositionManager:
                 try:
                     # Use broker adapter to modify position
                     order_type_str = "BUY" if pos.type == 0 else "SELL"
-                    broker.execute_order(
+                    await broker.execute_order_async(
                         symbol=pos.symbol, 
                         action="MODIFY", 
                         volume=pos.volume, 
@@ -2403,6 +2708,7 @@ class PositionManager:
 
 
 
+    @bucket_exclusive(timeout=0)
     async def execute_ai_sniper_logic(self, bucket_id: str, oracle, broker, candles: List[Dict], symbol: str) -> bool:
         """
         Executes the 'AI Sniper' Proportional Unwind logic (v5.6.0).
@@ -2584,6 +2890,7 @@ class PositionManager:
 
         return winner_ok or loser_ok
 
+    @bucket_exclusive(timeout=0)
     async def execute_eraser_logic(self, bucket_id: str, broker, market_data: Dict = None, ai_context: Dict = None) -> bool:
         """
         v5.4.0: THE NEXUS HARVESTER (God Tier)
@@ -2840,6 +3147,7 @@ class PositionManager:
                 
             # 3. Remove Bucket Stats
             del self.bucket_stats[bucket_id]
+            self._mark_structure_changed()
             
             # 4. Persist State
             self._save_state()
@@ -2847,6 +3155,7 @@ class PositionManager:
             logger.critical(f"⏳ [CHRONOS] Bucket {bucket_id} OFFLOADED to Bad Bank. Partition cleared.")
             return True
 
+    @bucket_exclusive(timeout=_CLOSE_LOCK_TIMEOUT_S)
     async def close_bucket_positions(self, broker, bucket_id: str, symbol: str, trace: dict = None, ppo_guardian=None) -> bool:
         """
         Close all positions in a bucket.
@@ -2926,17 +3235,13 @@ class PositionManager:
         total_volume_for_buffer = sum(pos.volume for pos in positions)
         min_profit_buffer = self._calibrated_profit_buffer(symbol, total_volume_for_buffer, base_buffer)
 
-        allow_emergency_close_loss = str(os.getenv("AETHER_ALLOW_EMERGENCY_CLOSE_LOSS", "0")).strip().lower() in (
-            "1",
-            "true",
-            "yes",
-            "on",
-        ) or is_emergency_from_trace  # [FIX] Include emergency from trace
+        rs = runtime_settings()
+        allow_emergency_close_loss = rs.allow_emergency_close_loss or is_emergency_from_trace  # [FIX] Include emergency from trace
         is_emergency_close = (stats.exit_reason or "").find("EMERGENCY") >= 0
 
         if live_net_pnl < min_profit_buffer and not (allow_emergency_close_loss and is_emergency_close):
             logger.debug(f"Abort Close. Live={live_net_pnl} Buffer={min_profit_buffer} Reason={stats.exit_reason}")
-            if str(os.getenv("AETHER_SLIPPAGE_CALIBRATION_LOG", "1")).strip().lower() in ("1", "true", "yes", "on"):
+            if rs.slippage_calibration_log:
                 sc = self._get_slippage_sample_count(symbol)
                 p95pl = self._get_slippage_p95_per_lot_usd(symbol)
                 logger.info(
@@ -2958,7 +3263,7 @@ class PositionManager:
             f"[BUCKET CLOSE] batch={close_batch_id} symbol={symbol} tickets={[p.ticket for p in positions]}"
         )
 
-        if str(os.getenv("AETHER_SLIPPAGE_CALIBRATION_LOG", "1")).strip().lower() in ("1", "true", "yes", "on"):
+        if rs.slippage_calibration_log:
             sc = self._get_slippage_sample_count(symbol)
             p95pl = self._get_slippage_p95_per_lot_usd(symbol)
             logger.debug(f"[SLIPPAGE] Calibration: samples={sc}, P95/lot=${p95pl:.2f}")
@@ -3007,89 +3312,15 @@ class PositionManager:
         logger.info(exit_report)
 
 
-        # [ATOMIC BATCH CLOSE] Prepare all positions for simultaneous close
-        # Instead of sequential CLOSE_BY + remaining + retry, we batch everything
-        
+        # [ATOMIC BATCH CLOSE] One batch for the whole bucket. The broker adapter plans
+        # the minimum-deal sequence (exact CLOSE_BY pairs, partial CLOSE_BY netting,
+        # then a residual market close) so only the net volume pays spread.
+        close_results = {}
         try:
-            buys = [p for p in positions if p.type == 0]
-            sells = [p for p in positions if p.type == 1]
-            
-            # Strategy: Try CLOSE_BY for hedged pairs, but prepare ALL in one go
-            # This minimizes latency between closes
-            
-            # Sort by volume for optimal matching
-            buys.sort(key=lambda x: x.volume, reverse=True)
-            sells.sort(key=lambda x: x.volume, reverse=True)
-            
-            # Prepare close operations (don't execute yet)
-            close_operations = []  # List of (type, position(s)) tuples
-            matched_tickets = set()
-            
-            # Match buys vs sells for CLOSE_BY
-            buys_copy = list(buys)
-            sells_copy = list(sells)
-            
-            while buys_copy and sells_copy:
-                buy = buys_copy[0]
-                sell = sells_copy[0]
-                
-                match_vol = min(buy.volume, sell.volume)
-                match_vol = round(match_vol, 2)
-                
-                if match_vol < 0.01:
-                    break
-                
-                # Prepare CLOSE_BY operation
-                close_operations.append(('CLOSE_BY', buy, sell, match_vol))
-                matched_tickets.add(buy.ticket)
-                matched_tickets.add(sell.ticket)
-                
-                # Update volumes
-                buy.volume = round(buy.volume - match_vol, 2)
-                sell.volume = round(sell.volume - match_vol, 2)
-                
-                if buy.volume < 0.01:
-                    buys_copy.pop(0)
-                if sell.volume < 0.01:
-                    sells_copy.pop(0)
-            
-            # Collect remaining unmatched positions
-            remaining = [p for p in positions if p.ticket not in matched_tickets and p.volume >= 0.01]
-            
-            # [ATOMIC EXECUTION] Execute all closes simultaneously
-            logger.info(f"[ATOMIC CLOSE] Batch closing: {len(close_operations)} hedged pairs + {len(remaining)} unmatched")
-            
-            close_results = {}
-            
-            # Execute CLOSE_BY operations (these are fast, no async needed)
-            for op in close_operations:
-                if op[0] == 'CLOSE_BY':
-                    _, buy, sell, match_vol = op
-                    logger.debug(f"[CLOSE_BY] {buy.ticket} vs {sell.ticket} ({match_vol} lots)")
-                    res = broker.close_hedge_by_ticket(buy.ticket, sell.ticket, symbol, match_vol)
-                    
-                    if res.get('retcode') == mt5.TRADE_RETCODE_DONE:
-                        close_results[buy.ticket] = res
-                        close_results[sell.ticket] = res
-                    else:
-                        # If CLOSE_BY fails, add to remaining for normal close
-                        logger.warning(f"[CLOSE_BY] Failed, falling back to normal close")
-                        remaining.append(buy)
-                        remaining.append(sell)
-            
-            # [CRITICAL] Close all remaining positions in ONE async batch
-            if remaining:
-                logger.info(f"[BATCH CLOSE] Closing {len(remaining)} positions simultaneously...")
-                rem_res = await broker.close_positions(remaining, trace=trace)
-                close_results.update(rem_res)
-                
+            logger.info(f"[ATOMIC CLOSE] Batch closing {len(positions)} positions")
+            close_results = await broker.close_positions(positions, trace=trace)
         except Exception as e:
             logger.error(f"[ATOMIC CLOSE] Error: {e}")
-            # Fallback: close all normally
-            try:
-                close_results = await broker.close_positions(positions, trace=trace)
-            except:
-                pass
 
         # [CALIBRATION] Ingest slippage samples from successful closes
         try:
@@ -3102,6 +3333,7 @@ class PositionManager:
                     symbol=result.get('symbol') or symbol,
                     request_price=result.get('request_price'),
                     fill_price=result.get('price'),
+                    bucket_volume=total_volume,
                 )
         except Exception:
             pass
@@ -3130,15 +3362,24 @@ class PositionManager:
         # RETRY LOOP for failed tickets
         if failed_tickets:
             logger.info(f"[CLOSE RETRY] Attempting to close {len(failed_tickets)} failed positions...")
-            # Get position objects for failed tickets
-            retry_positions = [self.active_positions[t] for t in failed_tickets if t in self.active_positions]
+            # Re-read the failed tickets from the broker: a partial CLOSE_BY may have
+            # reduced them (or closed them outright) since the batch was planned.
+            live_positions = await asyncio.to_thread(broker.get_positions, symbol)
+            if live_positions is None:
+                logger.error(f"[CLOSE RETRY] Could not re-read positions for {symbol}. Retrying next cycle.")
+                retry_positions = []
+            else:
+                live_by_ticket = {p.ticket if hasattr(p, 'ticket') else p['ticket']: p for p in live_positions}
+                retry_positions = [live_by_ticket[t] for t in failed_tickets if t in live_by_ticket]
+                gone = [t for t in failed_tickets if t not in live_by_ticket]
+                if gone:
+                    successful_closes += len(gone)
+                    failed_tickets = [t for t in failed_tickets if t in live_by_ticket]
+                    logger.info(f"[CLOSE RETRY] Already closed on broker: {gone}")
             
             if retry_positions:
                 # Retry once with high priority
-                try:
-                    retry_results = await broker.close_positions(retry_positions, trace=trace)
-                except TypeError:
-                    retry_results = await broker.close_positions(retry_positions)
+                retry_results = await broker.close_positions(retry_positions, trace=trace)
 
                 # [CALIBRATION] Ingest retry slippage samples
                 try:
@@ -3151,6 +3392,7 @@ class PositionManager:
                             symbol=result.get('symbol') or symbol,
                             request_price=result.get('request_price'),
                             fill_price=result.get('price'),
+                            bucket_volume=total_volume,
                         )
                 except Exception:
                     pass
@@ -3172,10 +3414,7 @@ class PositionManager:
                     still_failed = []
                     for ticket in failed_tickets:
                         if ticket in self.active_positions:
-                            try:
-                                res = await broker.close_position(ticket, trace=trace)
-                            except TypeError:
-                                res = await broker.close_position(ticket)
+                            res = await broker.close_position(ticket, trace=trace)
                             if res:
                                 successful_closes += 1
                                 logger.info(f"[CLOSE INDIVIDUAL] Success: Closed {ticket}")
@@ -3204,6 +3443,7 @@ class PositionManager:
 
                 # Update bucket positions list
                 stats.positions = [t for t in stats.positions if t in failed_tickets]
+                self._mark_structure_changed()
                 # Reset state to ACTIVE so we keep managing the leftovers
                 self._set_position_state(bucket_id, PositionState.BUCKET_ACTIVE)
                 
@@ -3248,7 +3488,7 @@ class PositionManager:
                     exit_reason=exit_reason,
                     ai_metrics=None
                 )
-                print(explanation, flush=True)
+                ui_logger.info(explanation)
             except Exception as e:
                 logger.warning(f"[EXPLAINER] Failed to generate detailed explanation: {e}")
                 # Fallback to simple summary
@@ -3298,12 +3538,7 @@ class PositionManager:
 
         # === PPO MEMORY FEEDBACK (Optional) ===
         # Feed realized outcomes back into PPO as experience so session-end evolve() has real data.
-        enable_ppo_memory = str(os.getenv("AETHER_ENABLE_PPO_MEMORY", "1")).strip().lower() in (
-            "1",
-            "true",
-            "yes",
-            "on",
-        )
+        enable_ppo_memory = runtime_settings().enable_ppo_memory
         if enable_ppo_memory and ppo_guardian is not None and hasattr(ppo_guardian, "remember"):
             try:
                 with self._lock:
@@ -3340,9 +3575,8 @@ class PositionManager:
                 self.active_learning_trades.pop(t, None)
 
             stats.positions = []
-            stats.closed = True
             stats.last_update = time.time()
-            self.closed_buckets.add(bucket_id)
+            self._mark_bucket_closed(bucket_id, stats)
             self._set_position_state(bucket_id, PositionState.CLOSED)
 
         self.clear_pending_close(symbol)
@@ -3440,13 +3674,15 @@ class PositionManager:
             if bucket_id not in self.closed_buckets:
                 return False
 
-            # Find the close time
-            for stats in self.bucket_stats.values():
-                if stats.bucket_id == bucket_id and stats.closed:
-                    time_since_close = time.time() - stats.last_update
-                    return time_since_close < cooldown_seconds
+            stats = self.bucket_stats.get(bucket_id)
+            if stats is None or not stats.closed:
+                return False
 
-        return False
+            # Buckets closed before a restart have no recorded close time
+            closed_at = self._index.last_close(bucket_id)
+            if closed_at is None:
+                closed_at = stats.last_update
+            return time.time() - closed_at < cooldown_seconds
 
     def record_learning_trade(self, ticket: int, symbol: str, trade_data: Dict) -> None:
         """
@@ -3459,6 +3695,8 @@ class PositionManager:
         """
         with self._lock:
             self.active_learning_trades[ticket] = trade_data
+            if ticket in self.active_positions:
+                self._apply_entry_targets(self.active_positions[ticket], trade_data)
 
     def get_learning_data(self, ticket: int) -> Optional[Dict]:
         """Get learning data for a specific ticket."""
@@ -3492,15 +3730,8 @@ class PositionManager:
         Get all Position objects belonging to a specific bucket.
         """
         with self._lock:
-            if bucket_id not in self.bucket_stats:
-                return []
-            
-            ticket_ids = self.bucket_stats[bucket_id].positions
-            positions = []
-            for ticket in ticket_ids:
-                if ticket in self.active_positions:
-                    positions.append(self.active_positions[ticket])
-            return positions
+            tickets = self._get_index().bucket_tickets.get(bucket_id, ())
+            return [self.active_positions[t] for t in tickets]
 
     def add_position_to_bucket(self, bucket_id: str, ticket: int) -> bool:
         """
@@ -3523,6 +3754,7 @@ class PositionManager:
             if ticket not in stats.positions:
                 stats.positions.append(ticket)
                 stats.last_update = time.time()
+                self._mark_structure_changed()
                 # Ensure mode is BUCKET
                 stats.mode = BucketMode.BUCKET
                 stats.state = PositionState.BUCKET_ACTIVE
@@ -12,6 +12,8 @@ License: MIT
 Version: 1.0.1 [SUPERBOT EVOLUTION]
 """
 
+import asyncio
+import inspect
 import time
 import os
 import logging
@@ -42,7 +44,7 @@ if not ui_logger.handlers:
     ui_logger.propagate = False
 
 
-def retry_with_backoff(
+async def retry_with_backoff(
     operation: Callable,
     max_attempts: int = 3,
     initial_delay: float = 0.5,
@@ -52,6 +54,8 @@ def retry_with_backoff(
 ) -> Tuple[bool, Any]:
     """
     Retry an operation with exponential backoff and timeout.
+    `operation` may be sync or return an awaitable; backoff is awaited so the
+    event loop keeps running between attempts.
     """
     delay = initial_delay
     start_time = time.time()
@@ -62,7 +66,10 @@ def retry_with_backoff(
             return False, None
         
         try:
-            success, result = operation()
+            outcome = operation()
+            if inspect.isawaitable(outcome):
+                outcome = await outcome
+            success, result = outcome
             
             if success:
                 if attempt > 1:
@@ -77,7 +84,7 @@ def retry_with_backoff(
             
             if attempt < max_attempts:
                 logger.warning(f"[RETRY] {operation_name} failed (attempt {attempt}/{max_attempts}), retrying in {delay:.1f}s...")
-                time.sleep(delay)
+                await asyncio.sleep(delay)
                 delay *= backoff_multiplier
             else:
                 logger.error(f"[RETRY] {operation_name} failed after {max_attempts} attempts")
@@ -86,7 +93,7 @@ def retry_with_backoff(
         except Exception as e:
             if attempt < max_attempts:
                 logger.warning(f"[RETRY] {operation_name} exception (attempt {attempt}/{max_attempts}): {e}, retrying in {delay:.1f}s...")
-                time.sleep(delay)
+                await asyncio.sleep(delay)
                 delay *= backoff_multiplier
             else:
                 logger.error(f"[RETRY] {operation_name} exception after {max_attempts} attempts: {e}")
@@ -285,12 +292,15 @@ class RiskManager:
         tp_width_points = tp_pips * point
         return zone_width_points, tp_width_points
 
-    def execute_zone_recovery(self, broker, symbol: str, positions: List[Dict],
+    async def execute_zone_recovery(self, broker, symbol: str, positions: List[Dict],
                             tick: Dict, point: float, shield, ppo_guardian,
                             position_manager, strict_entry: bool, oracle=None, atr_val: float = None,
                             volatility_ratio: float = 1.0, rsi_value: float = None, trap_hunter=None, pressure_metrics=None,
                             max_hedges_override: int = None, hybrid_intelligence=None) -> bool:
-        
+        """
+        Place the next zone-recovery hedge for a bucket if price left the zone.
+        Broker calls run off the event loop (worker thread / execute_order_async).
+        """
         positions = normalize_positions(positions)
         last_pending = self._pending_hedges.get(symbol, 0)
         if time.time() - last_pending < 10.0:
@@ -322,7 +332,7 @@ class RiskManager:
                 return False
 
         try:
-            if not broker.is_trade_allowed():
+            if not await asyncio.to_thread(broker.is_trade_allowed):
                 self._pending_hedges.pop(symbol, None)
                 return False
         except Exception:
@@ -333,13 +343,22 @@ class RiskManager:
         coordinator = get_hedge_coordinator()
         first_pos = sorted(positions, key=lambda p: p['time'])[0]
         bucket_id = f"{symbol}_{first_pos['ticket']}"
-        can_hedge_bucket, _ = coordinator.can_hedge_bucket(bucket_id)
-        if not can_hedge_bucket:
+        # Queue briefly behind another path hedging this bucket; None if it stays held,
+        # or it was hedged within the minimum interval (also re-checked on hand-off)
+        lease = await coordinator.acquire_hedge_lock(bucket_id, timeout=coordinator.lease_wait,
+                                                     owner="zone_recovery")
+        if lease is None:
             self._pending_hedges.pop(symbol, None)
             return False
-        
-        can_hedge, reason = self.validate_hedge_conditions(broker, symbol, positions, tick, point, atr_val=atr_val, max_hedges_override=max_hedges_override)
+
+        try:
+            can_hedge, reason = await asyncio.to_thread(
+                self.validate_hedge_conditions, broker, symbol, positions, tick, point,
+                atr_val=atr_val, max_hedges_override=max_hedges_override)
+        except Exception:
+            can_hedge = False
         if not can_hedge:
+            coordinator.release_hedge_lock(bucket_id, lease)
             self._pending_hedges.pop(symbol, None)
             return False
 
@@ -449,7 +468,7 @@ class RiskManager:
             hedge_market_data = {'atr': atr_val, 'rsi': rsi_value, 'trend_strength': 0.0, 'symbol': symbol, 'current_price': target_price, 'volatility_ratio': volatility_ratio, 'pressure_metrics': pressure_metrics}
             drawdown_pct = 0.0
             try:
-                acc_info = broker.get_account_info()
+                acc_info = await asyncio.to_thread(broker.get_account_info)
                 if acc_info: drawdown_pct = max(0.0, (acc_info.get('balance', 1.0) - acc_info.get('equity', 1.0)) / acc_info.get('balance', 1.0))
             except Exception: pass
 
@@ -467,7 +486,7 @@ class RiskManager:
                 return True
 
             # Execution
-            result = broker.execute_order(
+            result = await broker.execute_order_async(
                 action="OPEN", symbol=symbol, order_type=next_action, price=target_price,
                 volume=hedge_lot, sl=0.0, tp=0.0, strict_entry=bool(strict_entry),
                 trace_reason="OPEN_ZONE_RECOVERY", comment=f"HDG_Z{int(zone_width_points/point)}"[:31]
@@ -490,6 +509,8 @@ class RiskManager:
             logger.error(f"Zone recovery error: {e}")
             self._pending_hedges.pop(symbol, None)
             return False
+        finally:
+            coordinator.release_hedge_lock(bucket_id, lease)
 
     def get_risk_status(self, symbol: str) -> Dict[str, Any]:
         state = self._get_hedge_state(symbol)
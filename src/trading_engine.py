@@ -19,6 +19,8 @@ import logging
 import asyncio
 import MetaTrader5 as mt5
 from src.core.trade_authority import TradeAuthority 
+from src.core.bucket_locks import BucketBusy, BucketLocks
+from src.utils.cycle_trace import get_cycle_tracer
 from src.config.settings import FLAGS, POLICY as _PTUNE, RISK as _RLIM
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, is_dataclass
@@ -44,14 +46,16 @@ from .ai_core.global_brain import GlobalBrain
 from .ai_core.hybrid_hedge_intelligence import HybridHedgeIntelligence
 from .ai_core.multi_horizon_predictor import MultiHorizonPredictor
 from .ai_core.architect import Architect
+from .bridge.symbol_specs import get_symbol_spec
 
 # [AI INTELLIGENCE] New Policy & Governance Modules
 from src.config.settings import FLAGS, POLICY as _PTUNE, RISK as _RLIM
+from src.config.runtime_settings import runtime_settings
 from src.policy.hedge_policy import HedgePolicy, HedgeConfig
 from src.policy.risk_governor import RiskGovernor, RiskLimits
 from src.core.trade_authority import TradeAuthority # [PHASE 5] Supreme Court
 from src.utils.telemetry import TelemetryWriter, DecisionRecord
-from src.utils.data_normalization import normalize_positions, normalize_position
+from src.utils.data_normalization import normalize_positions
 from src.features.market_features import (
     spread_atr,
     zscore,
@@ -124,6 +128,7 @@ class TradingEngine:
         self.risk_manager = risk_manager
         self.ppo_guardian = ppo_guardian
         self.global_brain = global_brain # Layer 9: Inter-Market Correlation
+        self.entries_enabled = True # False while AI layers warm up (fast start)
 
         # [PHASE 3] Initialize Supervisor and Workers
         from .ai_core.supervisor import Supervisor
@@ -144,7 +149,7 @@ class TradingEngine:
         if global_brain:
              self.global_brain = global_brain
         else:
-             self.global_brain = GlobalBrain(self.market_data)
+             self.global_brain = GlobalBrain(self.market_data, target_symbol=config.symbol)
              
         self.multi_horizon = MultiHorizonPredictor() # [FUTURE SIGHT] Multi-Timeframe Oracle
         self.architect = Architect(self.broker) # [SPATIAL AWARENESS] H1 Structure
@@ -190,6 +195,10 @@ class TradingEngine:
         self.last_trade_time = 0.0
         self.trade_cooldown_active = False
         self.entry_cooldowns = {}  # [FIX] Per-symbol entry cooldowns to prevent double entries
+        # Per-symbol asyncio entry locks (entries on different symbols don't wait on each other)
+        self._entry_locks = BucketLocks()
+        # Per-stage latency spans for run_trading_cycle (no-op unless AETHER_CYCLE_TRACE=1)
+        self._tracer = get_cycle_tracer()
         
         # Status Tracking (For UI Feedback)
         self.last_pause_reason = None
@@ -519,10 +528,7 @@ class TradingEngine:
         """Track equity peak and max drawdown, throttled for HFT loop safety."""
         now = time.time()
         # Default: check once every 2 seconds to avoid broker/API spam.
-        try:
-            every_s = float(os.getenv("AETHER_EQUITY_TRACK_EVERY_S", "2.0"))
-        except Exception:
-            every_s = 2.0
+        every_s = runtime_settings().equity_track_every_s
 
         if every_s <= 0:
             every_s = 2.0
@@ -704,7 +710,7 @@ class TradingEngine:
             )
             
             # Log accuracy summary every 50 trades
-            matched_count = sum(1 for p in self.model_monitor.predictions if p['actual'] is not None)
+            matched_count = self.model_monitor.matched_count
             if matched_count > 0 and matched_count % 50 == 0:
                 accuracy = self.model_monitor.get_accuracy()
                 should_retrain, reason = self.model_monitor.should_retrain()
@@ -765,6 +771,7 @@ class TradingEngine:
 
     async def shutdown_database(self) -> None:
         """Shutdown async database components."""
+        self._telemetry.close()
         if self.db_queue:
             await self.db_queue.stop()
         if self.db_manager:
@@ -879,12 +886,7 @@ class TradingEngine:
             # IronShield.calculate_entry_lot() already applies equity/confidence/ATR/trend scaling.
             # Re-applying balance/conf scalers here causes quadratic growth in size (high-risk).
             # If you want the legacy extra scalers, enable AETHER_ENGINE_EXTRA_SCALING=1.
-            enable_extra_scaling = str(os.getenv("AETHER_ENGINE_EXTRA_SCALING", "0")).strip().lower() in (
-                "1",
-                "true",
-                "yes",
-                "on",
-            )
+            enable_extra_scaling = runtime_settings().engine_extra_scaling
 
             win_rate_scale = 1.0
 
@@ -1103,16 +1105,23 @@ class TradingEngine:
 
         # [2] LIQUIDITY WALLS (LiquidityMapper)
         # Verify we are not buying into Resistance or Selling into Support
+        # Opt-in (AETHER_ENABLE_LIQUIDITY_WALLS): this filter can block entries
         # Need history for mapper
         recent_candles = []
-        if hasattr(self.market_data, 'candles'):
+        if runtime_settings().enable_liquidity_walls and hasattr(self.market_data, 'candles'):
              try:
-                 recent_candles = self.market_data.candles.get_history(symbol, timeframe="M1", count=100)
-             except Exception:
-                 pass
+                 liq_bars = runtime_settings().liquidity_lookback_bars
+                 # Closed bars of the trading timeframe; CandleManager keeps only the
+                 # last 100, so lookbacks above 100 map the same 100 bars
+                 recent_candles = self.market_data.candles.get_history(symbol)[-liq_bars:]
+             except Exception as e:
+                 logger.debug(f"[LIQUIDITY] History unavailable for {symbol}: {e}")
         
         if recent_candles:
-            liq_map = self.liquidity_mapper.map_liquidity(recent_candles, tick['bid'])
+            # Keyed per series: pivots are maintained incrementally as new bars close
+            liq_map = self.liquidity_mapper.map_liquidity(
+                recent_candles, tick['bid'], key=f"{symbol}:{self.market_data.candles.timeframe}"
+            )
             avoid, liq_reason = self.liquidity_mapper.should_avoid_entry(
                 tick['bid'], signal.action.value, liq_map
             )
@@ -1530,7 +1539,7 @@ class TradingEngine:
                 logger.warning(f"⚖️ [TRADE ENTRY] BLOCKED by Supreme Court: {reason}")
                 return None
 
-            result = self.broker.execute_order(
+            result = await self.broker.execute_order_async(
                 action="OPEN",
                 symbol=signal.symbol,
                 order_type=order_type,
@@ -1884,7 +1893,8 @@ class TradingEngine:
 
         # [CRITICAL FIX] Update PositionManager with latest broker data (Profit/Price)
         # This ensures 'should_close_bucket' uses real-time PnL, not stale data.
-        self.position_manager.update_positions(positions)
+        # The list only covers this symbol, so close detection is scoped to it.
+        self.position_manager.update_positions(positions, symbols={symbol} | {p['symbol'] for p in positions})
 
         # Only log when we have multiple positions (actual bucket)
         if len(positions) > 1:
@@ -1917,9 +1927,10 @@ class TradingEngine:
              logger.debug(f"[BUCKET] REUSING EXISTING: {bucket_id} for {len(positions)} positions")
 
         # If frozen, we do NOT touch it. No TP, no SL moves, no hedges.
-        if bucket_id and bucket_id in self.position_manager.bucket_stats:
+        snapshot = self.position_manager.get_bucket_snapshot(bucket_id) if bucket_id else None
+        if snapshot is not None:
              # Access String Value safely or Enum
-             state = self.position_manager.bucket_stats[bucket_id].state
+             state = snapshot.state
              # Check against Enum value (bucket_frozen)
              if str(state.value) == "bucket_frozen": 
                  # Log only once every minute to reduce spam
@@ -2452,7 +2463,7 @@ class TradingEngine:
                  return bucket_closed
 
             logger.debug(f"[ZONE_CHECK] Calling execute_zone_recovery for {symbol} with {len(positions_dict)} positions | ATR: {safe_atr:.5f} | VolRatio: {safe_vol:.2f}")
-            zone_recovery_executed = self.risk_manager.execute_zone_recovery(
+            zone_recovery_executed = await self.risk_manager.execute_zone_recovery(
                 self.broker, symbol, positions_dict, tick, point_value,
                 shield, ppo_guardian, self.position_manager, bool(self._strict_entry), oracle=oracle, atr_val=atr_value,
                 volatility_ratio=volatility_ratio, rsi_value=rsi_value, trap_hunter=trap_hunter, pressure_metrics=pressure_metrics,
@@ -2471,7 +2482,7 @@ class TradingEngine:
                      logger.debug(f"[PIPELINE COMMIT] Hedge executed -> Locked Initial Entry Cooldown for {symbol}")
 
                 await asyncio.sleep(0.2) # Give broker a moment
-                all_positions = self.broker.get_positions()
+                all_positions = await asyncio.to_thread(self.broker.get_positions)
                 if all_positions:
                     self.position_manager.update_positions(all_positions)
                     logger.debug(f"[SYNC] Positions updated after hedge. Total: {len(all_positions)}")
@@ -2524,13 +2535,8 @@ class TradingEngine:
                 self._valkyrie_executed = True
                 print(">>> ❄️ [VALKYRIE] ACCOUNT FROZEN. TRADING STOPPED.", flush=True)
 
-        enable_doomsday = str(os.getenv("AETHER_ENABLE_DOOMSDAY", "0")).strip().lower() in (
-            "1",
-            "true",
-            "yes",
-            "on",
-        )
-        if not enable_doomsday:
+        rs = runtime_settings()
+        if not rs.enable_doomsday:
             return
 
         if getattr(self, '_safety_lock', False):
@@ -2548,10 +2554,7 @@ class TradingEngine:
         drawdown_pct = (balance - equity) / balance
         
         # Safety limit (defaults to 75%, override via env)
-        try:
-            limit = float(os.getenv("AETHER_DOOMSDAY_DRAWDOWN_PCT", "0.75"))
-        except Exception:
-            limit = 0.75
+        limit = rs.doomsday_drawdown_pct
 
         if drawdown_pct > limit:
             logger.critical(f"[DOOMSDAY] GLOBAL EQUITY STOP TRIGGERED! Drawdown: {drawdown_pct*100:.1f}%")
@@ -2575,8 +2578,9 @@ class TradingEngine:
                                 'reason': 'DOOMSDAY_GLOBAL_EQUITY_STOP',
                             },
                         )
-                    except TypeError:
-                        close_results = await self.broker.close_positions(positions)
+                    except Exception as e:
+                        logger.critical(f"[DOOMSDAY] Batch close failed: {e}")
+                        close_results = {}
                     try:
                         for ticket, res in (close_results or {}).items():
                             r = res or {}
@@ -2620,17 +2624,20 @@ class TradingEngine:
             oracle: Optional Oracle instance (Layer 4)
         """
         symbol = self.config.symbol
+        tracer = self._tracer
+        trace = tracer.begin_cycle(symbol)
 
         try:
             # [SAFETY FIRST] Check Global Equity Stop
-            await self._check_global_safety()
+            with tracer.span("safety"):
+                await self._check_global_safety()
 
-            # Maintain end-of-session risk metrics (profit vs drawdown)
-            self._update_equity_metrics_throttled()
+                # Maintain end-of-session risk metrics (profit vs drawdown)
+                self._update_equity_metrics_throttled()
 
             # Get market data
-            # print(f">>> [DEBUG] Fetching tick for {symbol}...", flush=True)
-            tick = self.market_data.get_tick_data(symbol)
+            with tracer.span("tick_fetch"):
+                tick = self.market_data.get_tick_data(symbol)
             if not tick:
                 logger.warning(f"No tick data for {symbol}")
                 return
@@ -2640,14 +2647,17 @@ class TradingEngine:
             self._maybe_log_data_provenance_trace(symbol, tick)
 
             # [HIGHEST INTELLIGENCE] Update Tick Pressure Analyzer
-            self.tick_analyzer.add_tick(tick)
-            pressure_metrics = self.tick_analyzer.get_pressure_metrics()
+            with tracer.span("tick_pressure"):
+                self.tick_analyzer.add_tick(tick)
+                pressure_metrics = self.tick_analyzer.get_pressure_metrics()
 
             # Record market data to database
-            await self._record_market_data(symbol, tick)
+            with tracer.span("db_enqueue"):
+                await self._record_market_data(symbol, tick)
 
             # Validate market conditions
-            market_ok, reason = self.validate_market_conditions(symbol, tick)
+            with tracer.span("market_validation"):
+                market_ok, reason = self.validate_market_conditions(symbol, tick)
             
             if not market_ok:
                 # [MODIFICACIÓN SUPERBOT] Detectar si la razón es el nuevo Veto de Salud
@@ -2664,9 +2674,9 @@ class TradingEngine:
                     logger.debug(f"[PAUSED] TRADING PAUSED: {reason}")
                     # Si es un VETO de salud, queremos verlo en la terminal aunque sea un tema de spread
                     if "VETO" in reason:
-                        print(f">>> [LIQUIDITY ALERT] {reason}", flush=True)
+                        ui_logger.info(">>> [LIQUIDITY ALERT] %s", reason)
                     elif not is_spread_issue:
-                        print(f">>> [PAUSED] {reason}", flush=True)
+                        ui_logger.info(">>> [PAUSED] %s", reason)
                         
                     self.last_pause_reason = reason
                 return
@@ -2681,78 +2691,55 @@ class TradingEngine:
             # print(f">>> [DEBUG] Cycle Running: {symbol}", flush=True)
 
             # Get account info
-            account_info = self.broker.get_account_info()
+            with tracer.span("account_fetch"):
+                account_info = self.broker.get_account_info()
             if not account_info:
-                print(">>> [WARN] Could not fetch account info", flush=True)
+                ui_logger.warning(">>> [WARN] Could not fetch account info")
                 return
 
             # Process management for existing positions
             # Check for positions first to determine mode (Management vs Hunting)
-            # [ROBUSTNESS] Fetch all positions and filter manually to handle case-sensitivity
+            # [ROBUSTNESS] Match symbols case-insensitively and with broker suffixes
             # This prevents "Ghost Entries" where bot misses existing trades due to 'xauusd' vs 'XAUUSD'
-            all_pos = self.broker.get_all_positions()
-            if all_pos is None:
-                positions = None
-            else:
-                # FIX: Handle both Object (dot notation) and Dict (subscript) just in case
-                positions = []
-                # DEBUG: Log all visible symbols to help user debug matching issues
-                if all_pos:
-                    visible_symbols = set()
-                    for p in all_pos:
-                        s = p.symbol if hasattr(p, 'symbol') else (p.get('symbol') if isinstance(p, dict) else 'Unknown')
-                        visible_symbols.add(s)
-
-
-                positions = []
-                for p in all_pos:
-                     # Adapt to Object or Dict
-                     if hasattr(p, 'symbol'):
-                         sym = p.symbol
-                     else:
-                         sym = p.get('symbol') if isinstance(p, dict) else None
-                         
-                     # [ROBUSTNESS] Fuzzy Match (Handle suffixes like .m, .pro, +, etc.)
-                     # If configured "XAUUSD" matches "XAUUSD.m" or "XAUUSD+"
-                     match = False
-                     if sym:
-                         sym_clean = sym.lower()
-                         cfg_clean = symbol.lower()
-                         if sym_clean == cfg_clean:
-                              match = True
-                         elif sym_clean.startswith(cfg_clean) and len(sym_clean) <= len(cfg_clean) + 4:
-                              match = True
-                     
-                     if match:
-                         # FIX: Convert namedtuple/dataclass to dict for downstream compatibility
-                         positions.append(normalize_position(p))
+            # The snapshot is reconciled once (only open/modify/close events do work)
+            # and the per-symbol lookup uses the position manager's symbol index.
+            with tracer.span("position_sync"):
+                all_pos = self.broker.get_all_positions()
+                if all_pos is not None:
+                    self.position_manager.update_positions(all_pos)
+                    has_positions = self.position_manager.has_broker_positions(symbol)
             
             # [CRITICAL FIX] Handle Broker API Failure
-            if positions is None:
+            if all_pos is None:
                 logger.warning(f"[SAFETY] Failed to fetch positions for {symbol} - Skipping cycle to prevent ghost trades.")
                 return
 
-            if positions:
+            if has_positions:
                 # MANAGEMENT MODE
-                # print(f">>> [DEBUG] Processing {len(positions)} existing positions...", flush=True)
-                await self._process_existing_positions(symbol, tick, shield, ppo_guardian, oracle, pressure_metrics)
+                with tracer.span("position_management"):
+                    await self._process_existing_positions(symbol, tick, shield, ppo_guardian, oracle, pressure_metrics,
+                                                           broker_positions=all_pos)
                 return # STRICTLY RETURN - No new entries while positions exist
 
+            # [FAST START] AI layers still warming up in background - manage only, no new entries
+            if not self.entries_enabled:
+                return
+
             # Hunting mode - no existing positions
 
             # HUNTING MODE
             # Proceed to AI analysis for new entries
 
             # [STRICT ENTRIES] Require real, sufficient, fresh inputs before opening new positions.
-            macro_context = self.market_data.get_macro_context()
-            atr_value, trend_strength = self._calculate_indicators(symbol)
-            atr_value, trend_strength = self._calculate_indicators(symbol)
-            rsi_value = self.market_data.calculate_rsi(symbol)
-            
-            # [PHASE 5] Update Constitution (Dynamic Layers)
-            # Fetch equity for scaling
-            current_equity = self.broker.get_equity()
-            self.authority.update_constitution(atr_value, current_equity)
+            with tracer.span("indicators"):
+                macro_context = self.market_data.get_macro_context()
+                atr_value, trend_strength = self._calculate_indicators(symbol)
+                rsi_value = self.market_data.calculate_rsi(symbol)
+
+                # [PHASE 5] Update Constitution (Dynamic Layers)
+                # Fetch equity for scaling
+                current_equity = self.broker.get_equity()
+                self.authority.update_constitution(atr_value, current_equity)
 
             # Freshness gate applies to any NEW entry attempt (even if strict mode is off)
             if self._freshness_gate:
@@ -2764,7 +2751,8 @@ class TradingEngine:
             if self._strict_entry:
                 # Candle sufficiency check (prevents ATR/RSI/trend falling back to neutral defaults)
                 # [FRESHNESS] Force refresh candles to ensure strict entry checks use latest data
-                history = self.market_data.candles.get_history(symbol, force_refresh=True)
+                with tracer.span("candle_refresh"):
+                    history = self.market_data.candles.get_history(symbol, force_refresh=True)
                 if not history or len(history) < self._strict_entry_min_candles:
                     self._log_entry_gate(
                         f"Insufficient candles: have={len(history) if history else 0} need={self._strict_entry_min_candles}"
@@ -2813,7 +2801,8 @@ class TradingEngine:
             # --- PHASE 4: PREDATOR VISION (Trap Trading) ---
             # "Stop Hunting the Stop Hunters"
             # If we detect a Bull Trap, we SELL immediately (fading the breakout).
-            trap_signal = self.trap_hunter.scan(symbol, history, tick)
+            with tracer.span("predator_scan"):
+                trap_signal = self.trap_hunter.scan(symbol, history, tick)
             
             if trap_signal.is_trap and trap_signal.suggested_action in ("BUY", "SELL"):
                  # Check confidence
@@ -2864,49 +2853,43 @@ class TradingEngine:
                      )
                      
                      # [DUPLICATE FIX] Check entry cooldown (same as main entry logic)
-                     import threading
-                     if not hasattr(self, '_entry_lock'):
-                         self._entry_lock = threading.Lock()
-                     
-                     acquired = self._entry_lock.acquire(blocking=True, timeout=0.5)
-                     if not acquired:
-                         logger.warning(f"[PREDATOR] Failed to acquire entry lock - skipping to prevent duplicate")
-                         return
-                     
                      try:
-                         last_entry_ts = self.entry_cooldowns.get(symbol, 0)
-                         time_since_last = time.time() - last_entry_ts
-                         cooldown_limit = self.config.global_trade_cooldown
+                         async with self._entry_locks.hold(symbol, timeout=0.5):
+                             last_entry_ts = self.entry_cooldowns.get(symbol, 0)
+                             time_since_last = time.time() - last_entry_ts
+                             cooldown_limit = self.config.global_trade_cooldown
                          
-                         if time_since_last < cooldown_limit:
-                             if time_since_last > 1.0:
-                                 logger.info(f"[PREDATOR] Cooldown active ({time_since_last:.1f}s < {cooldown_limit}s) - skipping")
-                             return
+                             if time_since_last < cooldown_limit:
+                                 if time_since_last > 1.0:
+                                     logger.info(f"[PREDATOR] Cooldown active ({time_since_last:.1f}s < {cooldown_limit}s) - skipping")
+                                 return
                          
-                         # Execute if approved and not vetoed
-                         if not veto and approved:
-                              # Reserve entry slot
-                              self.entry_cooldowns[symbol] = time.time()
-                              logger.info(f"[ENTRY_LOCK] ✅ PREDATOR entry reserved for {symbol}")
+                             # Execute if approved and not vetoed
+                             if not veto and approved:
+                                  # Reserve entry slot
+                                  self.entry_cooldowns[symbol] = time.time()
+                                  logger.info(f"[ENTRY_LOCK] ✅ PREDATOR entry reserved for {symbol}")
                               
-                              self.broker.execute_order(
-                                    symbol=symbol,
-                                    action="OPEN",
-                                    order_type=trap_signal.suggested_action,
-                                    price=price,
-                                    volume=base_vol,
-                                    sl=0.0, tp=0.0, # Managed by bucket logic
-                                    comment="PREDATOR_TRAP",
-                                    trace_reason=f"PREDATOR_{trap_signal.trap_type}"
-                              )
-                              return # Skip standard AI logic
+                                  with tracer.span("execution"):
+                                      await self.broker.execute_order_async(
+                                            symbol=symbol,
+                                            action="OPEN",
+                                            order_type=trap_signal.suggested_action,
+                                            price=price,
+                                            volume=base_vol,
+                                            sl=0.0, tp=0.0, # Managed by bucket logic
+                                            comment="PREDATOR_TRAP",
+                                            trace_reason=f"PREDATOR_{trap_signal.trap_type}"
+                                      )
+                                  return # Skip standard AI logic
                          
-                         if veto:
-                              logger.warning(f"[PREDATOR] Signal valid but Risk Governor Veto: {veto_reason}")
-                         if not approved:
-                              logger.warning(f"[PREDATOR] Signal valid but Unconstitutional: {reason}")
-                     finally:
-                         self._entry_lock.release()
+                             if veto:
+                                  logger.warning(f"[PREDATOR] Signal valid but Risk Governor Veto: {veto_reason}")
+                             if not approved:
+                                  logger.warning(f"[PREDATOR] Signal valid but Unconstitutional: {reason}")
+                     except BucketBusy:
+                         logger.warning(f"[PREDATOR] Failed to acquire entry lock - skipping to prevent duplicate")
+                         return
 
 
             # --- LAYER 4: ORACLE ENGINE ---
@@ -2914,31 +2897,32 @@ class TradingEngine:
             oracle_confidence = 0.0
             history = self.market_data.candles.get_history(symbol) # Get history once
             
-            if oracle:
-                # Get last 60 candles
-                if len(history) >= 60:
-                    # [UPGRADE] Use V2 Logic (AI + Macro + Fusion)
-                    oracle_result = await oracle.get_sniper_signal_v2(symbol, history[-60:])
-                    
-                    # Map result back to prediction/confidence for compatibility
-                    sig = oracle_result['signal']
-                    if sig == 1: oracle_prediction = "UP"
-                    elif sig == -1: oracle_prediction = "DOWN"
-                    else: oracle_prediction = "NEUTRAL"
-                    
-                    oracle_confidence = oracle_result['confidence']
-                    
-                    if oracle_confidence > 0.5: # Lower threshold as Fusion is stricter
-                        logger.debug(f"[ORACLE] Prediction: {oracle_prediction} ({oracle_confidence:.2f}) | {oracle_result['reason']}")
+            with tracer.span("oracle"):
+                if oracle:
+                    # Get last 60 candles
+                    if len(history) >= 60:
+                        # [UPGRADE] Use V2 Logic (AI + Macro + Fusion)
+                        oracle_result = await oracle.get_sniper_signal_v2(symbol, history[-60:])
 
-                    # [HIGHEST INTELLIGENCE] LAYER 1: REGIME DETECTION
-                    # Use Oracle's advanced math to double-check regime
-                    oracle_regime, oracle_signal = oracle.get_regime_and_signal(history[-60:])
-                    logger.debug(f"[ORACLE] Regime: {oracle_regime} | Signal: {oracle_signal}")
-                    
-                    # [USER REQUEST] DISABLED CIRCUIT BREAKER FOR INITIAL ENTRIES
-                    # The user requested that enhancements apply ONLY to hedging/recovery.
-                    # We log the Oracle's opinion but do NOT block the trade.
+                        # Map result back to prediction/confidence for compatibility
+                        sig = oracle_result['signal']
+                        if sig == 1: oracle_prediction = "UP"
+                        elif sig == -1: oracle_prediction = "DOWN"
+                        else: oracle_prediction = "NEUTRAL"
+
+                        oracle_confidence = oracle_result['confidence']
+
+                        if oracle_confidence > 0.5: # Lower threshold as Fusion is stricter
+                            logger.debug(f"[ORACLE] Prediction: {oracle_prediction} ({oracle_confidence:.2f}) | {oracle_result['reason']}")
+
+                        # [HIGHEST INTELLIGENCE] LAYER 1: REGIME DETECTION
+                        # Use Oracle's advanced math to double-check regime
+                        oracle_regime, oracle_signal = oracle.get_regime_and_signal(history[-60:])
+                        logger.debug(f"[ORACLE] Regime: {oracle_regime} | Signal: {oracle_signal}")
+
+                        # [USER REQUEST] DISABLED CIRCUIT BREAKER FOR INITIAL ENTRIES
+                        # The user requested that enhancements apply ONLY to hedging/recovery.
+                        # We log the Oracle's opinion but do NOT block the trade.
 
             # --- HIERARCHICAL AI DECISION LOGIC (v5.0) ---
             # 1. Supervisor: Detect Regime
@@ -2959,7 +2943,11 @@ class TradingEngine:
             }
             
             # [UPGRADE] Pass candle history to Supervisor for Geometrician (Entropy/Hurst) Analysis
-            regime = self.supervisor.detect_regime(supervisor_data, candles=history)
+            with tracer.span("supervisor"):
+                regime = self.supervisor.detect_regime(
+                    supervisor_data, candles=history,
+                    bar_aggregator=self.market_data.get_bar_aggregator(symbol),
+                )
             logger.debug(f"[SUPERVISOR] Market Regime: {regime.name} ({regime.confidence:.2f}) | {regime.description}")
             
             # 2. Supervisor: Select Worker
@@ -2993,14 +2981,15 @@ class TradingEngine:
             
             action, confidence, reason = "HOLD", 0.0, "No Worker"
             
-            if worker_name == "RANGE_WORKER":
-                action, confidence, reason = self.range_worker.get_signal(market_context)
-            elif worker_name == "TREND_WORKER":
-                action, confidence, reason = self.trend_worker.get_signal(market_context)
-            elif worker_name == "DEFENSIVE_WORKER":
-                # Fallback for CHAOS or DEFENSIVE regimes - use conservative range strategy
-                action, confidence, reason = self.range_worker.get_signal(market_context)
-                reason = f"[DEFENSIVE] {reason}"
+            with tracer.span("worker"):
+                if worker_name == "RANGE_WORKER":
+                    action, confidence, reason = self.range_worker.get_signal(market_context)
+                elif worker_name == "TREND_WORKER":
+                    action, confidence, reason = self.trend_worker.get_signal(market_context)
+                elif worker_name == "DEFENSIVE_WORKER":
+                    # Fallback for CHAOS or DEFENSIVE regimes - use conservative range strategy
+                    action, confidence, reason = self.range_worker.get_signal(market_context)
+                    reason = f"[DEFENSIVE] {reason}"
 
             # [FILTER] Block Zero/Low Confidence Signals Immediately
             # Prevents pollution of downstream logic with "BUY 0%" noise.
@@ -3024,8 +3013,9 @@ class TradingEngine:
             confidence = max(0.0, min(1.0, confidence))
                 
             # [TRAP HUNTER] Check for institutional traps (Fakeouts/Icebergs)
-            self.trap_hunter.scan(symbol, history, tick)
-            is_trap = self.trap_hunter.is_trap(action)
+            with tracer.span("trap_hunter"):
+                self.trap_hunter.scan(symbol, history, tick)
+                is_trap = self.trap_hunter.is_trap(action)
             if action != "HOLD" and is_trap:
                 log_msg = f"[TRAP DETECTED] {action} signal blocked by Trap Hunter."
                 logger.warning(log_msg)
@@ -3040,9 +3030,10 @@ class TradingEngine:
             # Integrated: January 8, 2026
             # ====================================================================
             if action != "HOLD" and confidence > 0.5:
-                physics_ok, physics_reason = self._validate_physics_conditions(
-                    action, regime, pressure_metrics, tick
-                )
+                with tracer.span("physics"):
+                    physics_ok, physics_reason = self._validate_physics_conditions(
+                        action, regime, pressure_metrics, tick
+                    )
                 
                 if not physics_ok:
                     # [PHYSICS] Soft Block (User Preference: Continuous Trading)
@@ -3064,13 +3055,15 @@ class TradingEngine:
                     macro_dict = macro_context if isinstance(macro_context, dict) else {}
                     
                     # Fetch Multi-Timeframe Trends (Factor 5)
-                    mtf_trends = self.market_data.calculate_multi_timeframe_trends(symbol)
+                    with tracer.span("mtf_trends"):
+                        mtf_trends = self.market_data.calculate_multi_timeframe_trends(symbol)
                     
                     # [PREDICTIVE INTELLIGENCE] Calculate next 5 candles trajectory
                     oracle_trajectory = []
                     if oracle:
                         # Use same history cache
-                        oracle_trajectory = oracle.predict_trajectory(history[-60:], horizon=5)
+                        with tracer.span("oracle_trajectory"):
+                            oracle_trajectory = oracle.predict_trajectory(history[-60:], horizon=5)
 
                     validation_data = {
                         'trend': regime.name if hasattr(regime, 'name') else str(regime),
@@ -3095,7 +3088,8 @@ class TradingEngine:
                     }
                     
                     # Validate direction (protected by validator's internal error handling)
-                    validation = validator.validate_direction(action, validation_data, confidence)
+                    with tracer.span("direction_validator"):
+                        validation = validator.validate_direction(action, validation_data, confidence)
                     
                     # Apply validation results
                     original_confidence = confidence
@@ -3133,11 +3127,12 @@ class TradingEngine:
                         from src.ai_core.wick_intelligence import get_wick_intelligence
                         
                         wick_intel = get_wick_intelligence()
-                        should_block, wick_reason = wick_intel.should_block_trade(
-                            direction=action,
-                            current_price=tick['bid'],
-                            recent_candles=history[-10:] if history else []
-                        )
+                        with tracer.span("wick_intelligence"):
+                            should_block, wick_reason = wick_intel.should_block_trade(
+                                direction=action,
+                                current_price=tick['bid'],
+                                recent_candles=history[-10:] if history else []
+                            )
                         
                         if should_block:
                             # Use Dashboard for deduped blocking logs
@@ -3211,38 +3206,30 @@ class TradingEngine:
                         )
                 return
             
-            # [CRITICAL FIX] Double Entry Prevention (Thread-Safe + Async-Safe)
-            # Use threading.Lock with proper async handling
-            import threading
-            if not hasattr(self, '_entry_lock'):
-                self._entry_lock = threading.Lock()
-            
-            # Atomic cooldown check and set (ASYNC-COMPATIBLE)
-            acquired = self._entry_lock.acquire(blocking=True, timeout=0.5)
-            if not acquired:
+            # [CRITICAL FIX] Double Entry Prevention (per-symbol asyncio lock, never blocks the loop)
+            # Atomic cooldown check and set
+            try:
+                async with self._entry_locks.hold(symbol, timeout=0.5):
+                    last_entry_ts = self.entry_cooldowns.get(symbol, 0)
+                    time_since_last = time.time() - last_entry_ts
+                
+                    # [FIX] Use Configurable Cooldown (was hardcoded 60s)
+                    # For scalping, 5.0s is usually sufficient to prevent machine-gunning
+                    cooldown_limit = self.config.global_trade_cooldown
+                
+                    if time_since_last < cooldown_limit:
+                        # Cooldown active - block this entry
+                        # Only log if it's not super spammy (e.g. every 5s)
+                        if time_since_last > 1.0: 
+                             logger.info(f"[COOLDOWN] Entry blocked for {symbol}. Last entry was {time_since_last:.1f}s ago (limit: {cooldown_limit}s).")
+                        return
+                
+                    # Reserve this entry slot immediately (atomic)
+                    self.entry_cooldowns[symbol] = time.time()
+                    logger.info(f"[ENTRY_LOCK] ✅ Entry slot reserved for {symbol}. Cooldown {cooldown_limit}s active.")
+            except BucketBusy:
                 logger.warning(f"[ENTRY_LOCK] Failed to acquire lock for {symbol} - skipping to prevent race")
                 return
-                
-            try:
-                last_entry_ts = self.entry_cooldowns.get(symbol, 0)
-                time_since_last = time.time() - last_entry_ts
-                
-                # [FIX] Use Configurable Cooldown (was hardcoded 60s)
-                # For scalping, 5.0s is usually sufficient to prevent machine-gunning
-                cooldown_limit = self.config.global_trade_cooldown
-                
-                if time_since_last < cooldown_limit:
-                    # Cooldown active - block this entry
-                    # Only log if it's not super spammy (e.g. every 5s)
-                    if time_since_last > 1.0: 
-                         logger.info(f"[COOLDOWN] Entry blocked for {symbol}. Last entry was {time_since_last:.1f}s ago (limit: {cooldown_limit}s).")
-                    return
-                
-                # Reserve this entry slot immediately (atomic)
-                self.entry_cooldowns[symbol] = time.time()
-                logger.info(f"[ENTRY_LOCK] ✅ Entry slot reserved for {symbol}. Cooldown {cooldown_limit}s active.")
-            finally:
-                self._entry_lock.release()
 
 
             # Show AI decision on dashboard (event-driven, no spam)
@@ -3314,12 +3301,13 @@ class TradingEngine:
             # ATR/trend already computed for this cycle; reuse to avoid introducing fallbacks.
 
             # Calculate position size with PPO optimization
-            lot_size, lot_reason = self.calculate_position_size(
-                signal, account_info, shield,
-                ppo_guardian=ppo_guardian,
-                atr_value=atr_value,
-                trend_strength=trend_strength
-            )
+            with tracer.span("sizing"):
+                lot_size, lot_reason = self.calculate_position_size(
+                    signal, account_info, shield,
+                    ppo_guardian=ppo_guardian,
+                    atr_value=atr_value,
+                    trend_strength=trend_strength
+                )
             
             # [FORENSIC LOGGING] Track initial lot calculation
             initial_lot_size = lot_size
@@ -3459,7 +3447,8 @@ class TradingEngine:
             # Final validation (is_recovery_trade=False for normal entries)
             # [OPTIMIZATION] For Continuous Scalping, we relax the cooldown check if the signal is strong
             # But we must respect the global cooldown to prevent API bans
-            validation_result = self.validate_trade_entry(signal, lot_size, account_info, tick, is_recovery_trade=False)
+            with tracer.span("entry_validation"):
+                validation_result = self.validate_trade_entry(signal, lot_size, account_info, tick, is_recovery_trade=False)
             
             # Default values
             can_enter = False
@@ -3636,11 +3625,12 @@ class TradingEngine:
                     ui_logger.info(clean_summary)
             
             # Pass specific overrides if Quantum Sniper engaged
-            result = await self.execute_trade_entry(
-                signal, lot_size, tick, None, shield, 
-                action_override=override_action, 
-                price_override=override_price
-            )
+            with tracer.span("execution"):
+                result = await self.execute_trade_entry(
+                    signal, lot_size, tick, None, shield,
+                    action_override=override_action,
+                    price_override=override_price
+                )
             
             if result:
                 order_desc = f"{override_action if override_action else signal.action.value}"
@@ -3651,10 +3641,9 @@ class TradingEngine:
                 logger.error(f"[TRADE] EXECUTION FAILED for {signal.symbol}")
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            print(f"Error in trading cycle: {e}", flush=True)
-            logger.error(f"Error in trading cycle: {e}")
+            logger.error("Error in trading cycle: %s", e, exc_info=True)
+        finally:
+            tracer.end_cycle(trace)
 
     async def _record_market_data(self, symbol: str, tick: Dict) -> None:
         """Record tick and candle data to database."""
@@ -3691,28 +3680,34 @@ class TradingEngine:
         """
         Returns correct pip value and point size for the symbol.
         CRITICAL: Distinguishes between Forex (10.0) and Gold (1.0).
+        Point size comes from the cached broker spec when available.
         """
         symbol_upper = symbol.upper()
         
         if "XAU" in symbol_upper or "GOLD" in symbol_upper:
-            return {
+            props = {
                 "pip_value": 1.0,      # 1 pip = $1 per lot (approx) on Gold
                 "point_size": 0.01,    # Price moves in cents
                 "pip_size": 0.10       # Standard Gold Pip is 10 cents
             }
         elif "JPY" in symbol_upper:
-            return {
+            props = {
                 "pip_value": 9.0,      # Approx for JPY pairs
                 "point_size": 0.001,
                 "pip_size": 0.01
             }
         else: # Standard Forex (EURUSD, GBPUSD, etc.)
-            return {
+            props = {
                 "pip_value": 10.0,     # Standard Lot = $10/pip
                 "point_size": 0.00001,
                 "pip_size": 0.0001
             }
 
+        spec = get_symbol_spec(symbol)
+        if spec is not None and spec.point > 0:
+            props["point_size"] = spec.point
+        return props
+
     async def _handle_blocked_hedge_strategy(self, symbol, positions, decision, tick):
         """
         [HIGHEST INTELLIGENCE] Plan B:
@@ -3741,13 +3736,16 @@ class TradingEngine:
                                f"Holding {symbol} positions defensively (No new risk added).")
                 setattr(self, f"_plan_b_veto_{symbol}", True)
 
-    async def _process_existing_positions(self, symbol: str, tick: Dict, shield, ppo_guardian, oracle=None, pressure_metrics=None) -> bool:
+    async def _process_existing_positions(self, symbol: str, tick: Dict, shield, ppo_guardian, oracle=None, pressure_metrics=None,
+                                          broker_positions: Optional[List] = None) -> bool:
         """
         Process management for existing positions.
         Returns True if positions were managed (skipping new entries).
+
+        broker_positions: snapshot already fetched this cycle (fetched here if None)
         """
         # Update positions from broker
-        all_positions = self.broker.get_positions()
+        all_positions = broker_positions if broker_positions is not None else self.broker.get_positions()
         
         # FAIL-SAFE: If broker returns None (error), DO NOT update or cleanup.
         # This prevents wiping state during temporary connection loss.
@@ -3756,6 +3754,7 @@ class TradingEngine:
             return False
 
         # Always update positions, even if empty, to ensure closed positions are removed
+        # (a no-op diff when the snapshot was already reconciled this cycle)
         self.position_manager.update_positions(all_positions)
         # CRITICAL: Cleanup stale positions immediately after broker update
         self.position_manager.cleanup_stale_positions(all_positions)
@@ -0,0 +1,223 @@
+"""
+Cycle Trace - Per-stage latency spans for the trading cycle.
+
+    trace = tracer.begin_cycle(symbol)
+    try:
+        with tracer.span("tick_fetch"):
+            tick = ...
+    finally:
+        tracer.end_cycle(trace)
+
+Each span is timed with perf_counter_ns and observed into a per-stage
+histogram (log-spaced buckets); the whole cycle goes into the "cycle"
+histogram. A cycle slower than the threshold is logged as a trace with
+every stage's offset and duration, and kept in `recent_slow`.
+
+Disabled (the default) `span()` returns a shared no-op context manager and
+`begin_cycle()` returns None, so instrumented code pays one attribute check.
+Spans may also be used outside a cycle (e.g. from helpers); they then only
+feed the histograms. The current cycle is held in a ContextVar, so cycles
+of concurrently running engines never mix.
+
+Env:
+    AETHER_CYCLE_TRACE=1                 enable
+    AETHER_CYCLE_TRACE_SLOW_MS=100       slow-cycle dump threshold
+    AETHER_CYCLE_TRACE_SUMMARY_EVERY=500 per-stage summary every N cycles (0 = off)
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.utils.histogram import Histogram, STAGE_MS_BOUNDS
+
+logger = logging.getLogger("CycleTrace")
+
+_current: ContextVar[Optional["CycleTraceRecord"]] = ContextVar("aether_cycle_trace", default=None)
+
+
+class CycleTraceRecord:
+    """Spans of one cycle: (stage, start offset ns, duration ns)."""
+    __slots__ = ("label", "start_ns", "spans", "token")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.start_ns = time.perf_counter_ns()
+        self.spans: List[Tuple[str, int, int]] = []
+        self.token = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: "CycleTracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer._record(self.name, self.start, end - self.start)
+        return False
+
+
+def _env_flag(name: str, default: str = "0") -> bool:
+    return str(os.getenv(name, default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+class CycleTracer:
+    """Stage histograms plus slow-cycle traces."""
+
+    def __init__(self, enabled: Optional[bool] = None, slow_ms: Optional[float] = None,
+                 summary_every: Optional[int] = None):
+        self.enabled = _env_flag("AETHER_CYCLE_TRACE") if enabled is None else bool(enabled)
+        try:
+            self.slow_ms = float(os.getenv("AETHER_CYCLE_TRACE_SLOW_MS", "100")) if slow_ms is None else float(slow_ms)
+        except Exception:
+            self.slow_ms = 100.0
+        try:
+            self.summary_every = (int(os.getenv("AETHER_CYCLE_TRACE_SUMMARY_EVERY", "500"))
+                                  if summary_every is None else int(summary_every))
+        except Exception:
+            self.summary_every = 500
+
+        self.stages: Dict[str, Histogram] = {}
+        self.cycle_ms = Histogram(STAGE_MS_BOUNDS)
+        self.cycles = 0
+        self.slow_cycles = 0
+        self.recent_slow: Deque[Dict] = deque(maxlen=20)
+        self._lock = threading.Lock()
+
+    def _stage(self, name: str) -> Histogram:
+        hist = self.stages.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.stages.setdefault(name, Histogram(STAGE_MS_BOUNDS))
+        return hist
+
+    def _record(self, name: str, start_ns: int, duration_ns: int) -> None:
+        self._stage(name).observe(duration_ns / 1e6)
+        trace = _current.get()
+        if trace is not None:
+            trace.spans.append((name, start_ns - trace.start_ns, duration_ns))
+
+    def span(self, name: str):
+        """Context manager timing one stage (no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def begin_cycle(self, label: str = "") -> Optional[CycleTraceRecord]:
+        if not self.enabled:
+            return None
+        trace = CycleTraceRecord(label)
+        trace.token = _current.set(trace)
+        return trace
+
+    def end_cycle(self, trace: Optional[CycleTraceRecord]) -> None:
+        if trace is None:
+            return
+        total_ns = time.perf_counter_ns() - trace.start_ns
+        try:
+            _current.reset(trace.token)
+        except ValueError:
+            _current.set(None)  # Ended from a different context
+        total_ms = total_ns / 1e6
+        self.cycle_ms.observe(total_ms)
+        with self._lock:
+            self.cycles += 1
+            cycles = self.cycles
+
+        if self.slow_ms > 0 and total_ms >= self.slow_ms:
+            self.slow_cycles += 1
+            self._dump_slow(trace, total_ns)
+
+        if self.summary_every > 0 and cycles % self.summary_every == 0:
+            self.log_summary()
+
+    def _dump_slow(self, trace: CycleTraceRecord, total_ns: int) -> None:
+        traced_ns = sum(d for _, _, d in trace.spans)
+        record = {
+            "label": trace.label,
+            "ts": time.time(),
+            "total_ms": round(total_ns / 1e6, 3),
+            "untraced_ms": round(max(0, total_ns - traced_ns) / 1e6, 3),
+            "spans": [(name, round(off / 1e6, 3), round(dur / 1e6, 3)) for name, off, dur in trace.spans],
+        }
+        self.recent_slow.append(record)
+        stages = " ".join(f"{name}=+{off:.1f}/{dur:.1f}" for name, off, dur in record["spans"])
+        logger.warning(
+            f"[CYCLE TRACE] {trace.label} slow cycle {record['total_ms']:.1f}ms "
+            f"(threshold {self.slow_ms:g}ms): {stages} | untraced={record['untraced_ms']:.1f}ms"
+        )
+
+    def snapshot(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "cycles": self.cycles,
+            "slow_cycles": self.slow_cycles,
+            "cycle_ms": self.cycle_ms.snapshot(),
+            "stages": {name: hist.snapshot() for name, hist in list(self.stages.items())},
+            "recent_slow": list(self.recent_slow),
+        }
+
+    def log_summary(self) -> None:
+        logger.info(f"[CYCLE TRACE] cycles={self.cycles} slow={self.slow_cycles} | cycle {self.cycle_ms.summary('ms')}")
+        ranked = sorted(self.stages.items(), key=lambda kv: kv[1].sum, reverse=True)
+        for name, hist in ranked:
+            logger.info(f"[CYCLE TRACE]   {name}: {hist.summary('ms')}")
+
+
+def traced(stage: str):
+    """Decorator form of `get_cycle_tracer().span(stage)` (sync or async functions)."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with get_cycle_tracer().span(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_cycle_tracer().span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+# Singleton instance
+_tracer_instance = None
+_tracer_lock = threading.Lock()
+
+def get_cycle_tracer() -> CycleTracer:
+    """Get or create the singleton CycleTracer instance."""
+    global _tracer_instance
+    if _tracer_instance is None:
+        with _tracer_lock:
+            if _tracer_instance is None:
+                _tracer_instance = CycleTracer()
+    return _tracer_instance
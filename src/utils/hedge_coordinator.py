@@ -4,60 +4,145 @@ Hedge Coordinator - Prevents duplicate/conflicting hedge placements
 This module provides centralized coordination for hedge decisions to prevent
 the "hedges from all corners" problem where multiple systems trigger hedges
 simultaneously on the same bucket.
+
+Exclusivity is handed out as per-bucket leases:
+- async callers `await acquire_hedge_lock()` and queue FIFO behind the current
+  holder without blocking the event loop (other buckets are unaffected);
+- sync callers use `try_acquire_hedge_lock()`, which never waits;
+- a lease expires after its TTL, so a crashed or stuck holder cannot wedge a
+  bucket; the next waiter is granted the lease when the holder releases or
+  expires (direct hand-off, no barging past queued waiters).
+
+A waiter handed the lease re-checks min_hedge_interval: the holder it waited
+on has usually just hedged the same bucket.
+
+Env:
+    AETHER_HEDGE_LEASE_TTL_S   Lease lifetime (default 30)
+    AETHER_HEDGE_LEASE_WAIT_S  How long hedge paths queue for a held bucket (default 2)
 """
 
+import asyncio
+import itertools
+import logging
+import os
 import threading
 import time
-import logging
-from typing import Dict, Tuple, Optional
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+from src.utils.histogram import Histogram, LATENCY_MS_BOUNDS
 
 logger = logging.getLogger("HedgeCoordinator")
 
 
+@dataclass
+class HedgeLease:
+    """Exclusive right to place a hedge on one bucket until `expires_at`."""
+    bucket_id: str
+    owner: str
+    token: int
+    acquired_at: float   # time.monotonic()
+    expires_at: float    # time.monotonic()
+    waited_ms: float = 0.0
+
+
+class _Waiter:
+    __slots__ = ("future", "owner", "enqueued_at", "lease")
+
+    def __init__(self, future: asyncio.Future, owner: str, enqueued_at: float):
+        self.future = future
+        self.owner = owner
+        self.enqueued_at = enqueued_at
+        self.lease: Optional[HedgeLease] = None
+
+
+class _BucketSlot:
+    __slots__ = ("bucket_id", "holder", "waiters")
+
+    def __init__(self, bucket_id: str):
+        self.bucket_id = bucket_id
+        self.holder: Optional[HedgeLease] = None
+        self.waiters: Deque[_Waiter] = deque()
+
+
+def _resolve(future: asyncio.Future, lease: HedgeLease) -> None:
+    if not future.done():
+        future.set_result(lease)
+
+
 class HedgeCoordinator:
     """
     Central coordinator to prevent duplicate hedge placements.
-    
+
     Provides locking mechanism to ensure only ONE hedge decision
     per bucket at a time, preventing loops and conflicts.
     """
-    
+
     def __init__(self):
         self.active_hedges: Dict[str, Dict] = {}  # bucket_id -> hedge_info
         self.lock = threading.Lock()
         self.min_hedge_interval = 30.0  # Minimum seconds between hedges on same bucket
-        logger.info(f"HedgeCoordinator initialized (min interval: {self.min_hedge_interval}s)")
-    
+        try:
+            self.lease_ttl = max(0.1, float(os.getenv("AETHER_HEDGE_LEASE_TTL_S", "30")))
+        except Exception:
+            self.lease_ttl = 30.0
+        try:
+            self.lease_wait = max(0.0, float(os.getenv("AETHER_HEDGE_LEASE_WAIT_S", "2")))
+        except Exception:
+            self.lease_wait = 2.0
+        self._slots: Dict[str, _BucketSlot] = {}
+        self._tokens = itertools.count(1)
+
+        # Metrics
+        self.wait_ms = Histogram(LATENCY_MS_BOUNDS)
+        self.granted = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.expired = 0
+        self.handoffs = 0
+        self.max_queue = 0
+        logger.info(f"HedgeCoordinator initialized (min interval: {self.min_hedge_interval}s, lease ttl: {self.lease_ttl}s)")
+
+    def _can_hedge_locked(self, bucket_id: str, interval: float) -> Tuple[bool, str]:
+        if bucket_id not in self.active_hedges:
+            return True, "No recent hedge on this bucket"
+
+        hedge_info = self.active_hedges[bucket_id]
+        last_hedge_time = hedge_info['time']
+        time_since = time.time() - last_hedge_time
+
+        if time_since < interval:
+            return False, f"Hedged {time_since:.1f}s ago (min {interval}s required)"
+
+        return True, f"Last hedge {time_since:.1f}s ago (OK to hedge)"
+
     def can_hedge_bucket(self, bucket_id: str, min_interval: Optional[float] = None) -> Tuple[bool, str]:
         """
         Check if a bucket can be hedged (not hedged recently).
-        
+
         Args:
             bucket_id: Unique identifier for the position bucket
             min_interval: Optional override for minimum interval (seconds)
-            
+
         Returns:
             Tuple of (can_hedge: bool, reason: str)
         """
         interval = min_interval if min_interval is not None else self.min_hedge_interval
-        
+
         with self.lock:
-            if bucket_id not in self.active_hedges:
-                return True, "No recent hedge on this bucket"
-            
-            hedge_info = self.active_hedges[bucket_id]
-            last_hedge_time = hedge_info['time']
-            time_since = time.time() - last_hedge_time
-            
-            if time_since < interval:
-                return False, f"Hedged {time_since:.1f}s ago (min {interval}s required)"
-            
-            return True, f"Last hedge {time_since:.1f}s ago (OK to hedge)"
-    
+            slot = self._slots.get(bucket_id)
+            if slot is not None:
+                self._expire_locked(slot, time.monotonic())
+                if slot.holder is not None:
+                    return False, f"Hedge in progress ({slot.holder.owner})"
+            return self._can_hedge_locked(bucket_id, interval)
+
     def record_hedge(self, bucket_id: str, action: str, lots: float, price: float):
         """
         Record that a hedge was just placed on a bucket.
-        
+
         Args:
             bucket_id: Bucket identifier
             action: Hedge action ('BUY' or 'SELL')
@@ -72,11 +157,11 @@ class HedgeCoordinator:
                 'price': price
             }
             logger.info(f"[COORDINATOR] Recorded hedge: {bucket_id} -> {action} {lots} @ {price}")
-    
+
     def clear_bucket(self, bucket_id: str):
         """
         Clear hedge history for a bucket (when bucket is closed).
-        
+
         Args:
             bucket_id: Bucket identifier to clear
         """
@@ -84,72 +169,233 @@ class HedgeCoordinator:
             if bucket_id in self.active_hedges:
                 del self.active_hedges[bucket_id]
                 logger.info(f"[COORDINATOR] Cleared bucket: {bucket_id}")
-    
+            slot = self._slots.get(bucket_id)
+            if slot is not None and slot.holder is None and not slot.waiters:
+                del self._slots[bucket_id]
+
     def get_bucket_status(self, bucket_id: str) -> Optional[Dict]:
         """
         Get the current hedge status for a bucket.
-        
+
         Args:
             bucket_id: Bucket identifier
-            
+
         Returns:
             Hedge info dict or None if no recent hedge
         """
         with self.lock:
             return self.active_hedges.get(bucket_id)
-    
-    def acquire_hedge_lock(self, bucket_id: str, timeout: float = 5.0) -> bool:
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+
+    def _slot(self, bucket_id: str) -> _BucketSlot:
+        slot = self._slots.get(bucket_id)
+        if slot is None:
+            slot = self._slots[bucket_id] = _BucketSlot(bucket_id)
+        return slot
+
+    def _grant_locked(self, slot: _BucketSlot, owner: str, now: float, waited_ms: float) -> HedgeLease:
+        lease = HedgeLease(
+            bucket_id=slot.bucket_id,
+            owner=owner,
+            token=next(self._tokens),
+            acquired_at=now,
+            expires_at=now + self.lease_ttl,
+            waited_ms=waited_ms,
+        )
+        slot.holder = lease
+        self.granted += 1
+        self.wait_ms.observe(waited_ms)
+        return lease
+
+    def _handoff_locked(self, slot: _BucketSlot, now: float) -> None:
+        """Grant the free lease to the oldest live waiter."""
+        while slot.holder is None and slot.waiters:
+            waiter = slot.waiters.popleft()
+            if waiter.future.done():
+                continue
+            waiter.lease = self._grant_locked(slot, waiter.owner, now, (now - waiter.enqueued_at) * 1000.0)
+            self.handoffs += 1
+            loop = waiter.future.get_loop()
+            loop.call_soon_threadsafe(_resolve, waiter.future, waiter.lease)
+
+    def _expire_locked(self, slot: _BucketSlot, now: float) -> None:
+        holder = slot.holder
+        if holder is not None and now >= holder.expires_at:
+            logger.warning(
+                f"[COORDINATOR] Lease expired: {holder.bucket_id} held by {holder.owner} "
+                f"for {now - holder.acquired_at:.1f}s"
+            )
+            slot.holder = None
+            self.expired += 1
+            self._handoff_locked(slot, now)
+
+    def try_acquire_hedge_lock(self, bucket_id: str, owner: str = "sync",
+                               check_interval: bool = True) -> Optional[HedgeLease]:
+        """
+        Take the bucket lease only if it is free right now (never waits).
+
+        Returns:
+            The lease, or None if the bucket is held, has queued waiters, or
+            (with check_interval) was hedged within min_hedge_interval
+        """
+        now = time.monotonic()
+        with self.lock:
+            if check_interval and not self._can_hedge_locked(bucket_id, self.min_hedge_interval)[0]:
+                return None
+            slot = self._slot(bucket_id)
+            self._expire_locked(slot, now)
+            if slot.holder is not None or slot.waiters:
+                self.contended += 1
+                return None
+            return self._grant_locked(slot, owner, now, 0.0)
+
+    async def acquire_hedge_lock(self, bucket_id: str, timeout: float = 5.0, owner: str = "async",
+                                 check_interval: bool = True) -> Optional[HedgeLease]:
         """
         Try to acquire exclusive hedge lock for a bucket.
-        
-        This is a more advanced locking mechanism for critical sections.
-        
+
+        Waiters queue FIFO per bucket and are suspended on a future, so the
+        event loop keeps serving every other bucket while this one waits.
+
         Args:
             bucket_id: Bucket identifier
             timeout: Maximum time to wait for lock (seconds)
-            
+            owner: Label recorded on the lease (for logs/metrics)
+            check_interval: Refuse (without waiting) if the bucket was hedged
+                within min_hedge_interval; checked again on hand-off
+
         Returns:
-            True if lock acquired, False if timeout
+            HedgeLease if acquired, None if refused or timed out
         """
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            can_hedge, reason = self.can_hedge_bucket(bucket_id)
-            if can_hedge:
-                # Mark as "in progress" to prevent others
+        lease = self.try_acquire_hedge_lock(bucket_id, owner, check_interval)
+        if lease is not None or timeout <= 0:
+            return lease
+
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        deadline = start + timeout
+        waiter = _Waiter(loop.create_future(), owner, start)
+        with self.lock:
+            if check_interval and not self._can_hedge_locked(bucket_id, self.min_hedge_interval)[0]:
+                return None
+            slot = self._slot(bucket_id)
+            if slot.holder is None and not slot.waiters:
+                return self._grant_locked(slot, owner, start, 0.0)
+            slot.waiters.append(waiter)
+            self.max_queue = max(self.max_queue, len(slot.waiters))
+
+        try:
+            while True:
+                now = time.monotonic()
                 with self.lock:
-                    self.active_hedges[bucket_id] = {
-                        'time': time.time(),
-                        'action': 'PENDING',
-                        'lots': 0.0,
-                        'price': 0.0
-                    }
-                return True
-            
-            time.sleep(0.1)  # Brief wait before retry
-        
-        return False
-    
-    def release_hedge_lock(self, bucket_id: str):
+                    self._expire_locked(slot, now)
+                    granted = waiter.lease
+                    if granted is None and now >= deadline:
+                        try:
+                            slot.waiters.remove(waiter)
+                        except ValueError:
+                            pass
+                        self.timeouts += 1
+                        if slot.holder is None and not slot.waiters:
+                            self._slots.pop(bucket_id, None)
+                        logger.info(f"[COORDINATOR] Lease wait timed out: {bucket_id} ({owner}) after {timeout:.1f}s")
+                        return None
+                    wake = deadline
+                    if slot.holder is not None:
+                        wake = min(wake, slot.holder.expires_at)
+                if granted is not None:
+                    if check_interval:
+                        with self.lock:
+                            fresh = self._can_hedge_locked(bucket_id, self.min_hedge_interval)[0]
+                        if not fresh:
+                            # The holder we queued behind hedged this bucket meanwhile
+                            self.release_hedge_lock(bucket_id, granted)
+                            return None
+                    return granted
+                try:
+                    # shield: a wake-up for lease expiry must not cancel the hand-off future
+                    await asyncio.wait_for(asyncio.shield(waiter.future), max(0.0, wake - now))
+                except asyncio.TimeoutError:
+                    continue
+        except asyncio.CancelledError:
+            with self.lock:
+                try:
+                    slot.waiters.remove(waiter)
+                except ValueError:
+                    pass
+                granted = waiter.lease
+            if granted is not None:
+                self.release_hedge_lock(bucket_id, granted)
+            raise
+
+    def release_hedge_lock(self, bucket_id: str, lease: Optional[HedgeLease] = None):
         """
-        Release hedge lock if it was acquired but hedge wasn't executed.
-        
+        Release the bucket lease (hedge placed or abandoned) and hand it to the
+        next waiter. A stale lease (expired and re-granted) is ignored.
+
         Args:
             bucket_id: Bucket identifier
+            lease: Lease being released (None releases whoever holds it)
         """
         with self.lock:
-            if bucket_id in self.active_hedges:
-                if self.active_hedges[bucket_id]['action'] == 'PENDING':
-                    del self.active_hedges[bucket_id]
-                    logger.info(f"[COORDINATOR] Released lock: {bucket_id}")
+            slot = self._slots.get(bucket_id)
+            if slot is None or slot.holder is None:
+                return
+            if lease is not None and slot.holder.token != lease.token:
+                logger.info(f"[COORDINATOR] Ignored stale release: {bucket_id} ({lease.owner})")
+                return
+            slot.holder = None
+            self._handoff_locked(slot, time.monotonic())
+            if slot.holder is None and not slot.waiters:
+                del self._slots[bucket_id]
+
+    @asynccontextmanager
+    async def hedge_lease(self, bucket_id: str, timeout: float = 5.0, owner: str = "async",
+                          check_interval: bool = True):
+        """`async with` form of acquire/release; yields the lease or None."""
+        lease = await self.acquire_hedge_lock(bucket_id, timeout, owner, check_interval)
+        try:
+            yield lease
+        finally:
+            if lease is not None:
+                self.release_hedge_lock(bucket_id, lease)
+
+    def get_metrics(self) -> Dict:
+        with self.lock:
+            held = sum(1 for s in self._slots.values() if s.holder is not None)
+            queued = sum(len(s.waiters) for s in self._slots.values())
+            return {
+                "granted": self.granted,
+                "contended": self.contended,
+                "timeouts": self.timeouts,
+                "expired": self.expired,
+                "handoffs": self.handoffs,
+                "max_queue": self.max_queue,
+                "held": held,
+                "queued": queued,
+                "wait_ms": self.wait_ms.snapshot(),
+            }
+
+    def log_summary(self) -> None:
+        logger.info(
+            f"[COORDINATOR] leases granted={self.granted} contended={self.contended} "
+            f"timeouts={self.timeouts} expired={self.expired} handoffs={self.handoffs} "
+            f"max_queue={self.max_queue} | wait {self.wait_ms.summary('ms')}"
+        )
 
 
 # Singleton instance
 _coordinator_instance = None
+_coordinator_lock = threading.Lock()
 
 def get_hedge_coordinator() -> HedgeCoordinator:
     """Get or create the singleton HedgeCoordinator instance."""
     global _coordinator_instance
     if _coordinator_instance is None:
-        _coordinator_instance = HedgeCoordinator()
+        with _coordinator_lock:
+            if _coordinator_instance is None:
+                _coordinator_instance = HedgeCoordinator()
     return _coordinator_instance
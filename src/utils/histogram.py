@@ -0,0 +1,84 @@
+"""
+Fixed-Bucket Histogram
+
+Cumulative-bucket histogram with O(number of buckets) observe and
+quantile estimates, cheap enough for per-order and per-cycle hot paths.
+Buckets follow the Prometheus convention (upper bounds, last bucket +Inf).
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+# Milliseconds: sub-millisecond local work up to multi-second terminal stalls
+LATENCY_MS_BOUNDS = (0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Milliseconds, log-spaced 1-2-5 steps (HDR-style relative precision) for per-stage spans
+STAGE_MS_BOUNDS = tuple(m * 10.0 ** e for e in range(-2, 4) for m in (1, 2, 5)) + (10000.0,)
+
+# Price points (multiples of the symbol point)
+SLIPPAGE_POINTS_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """Thread-safe histogram over fixed upper bounds (plus an implicit +Inf bucket)."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_MS_BOUNDS):
+        self.bounds: List[float] = sorted(float(b) for b in bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        value = float(value)
+        idx = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max for the +Inf bucket)."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = q * self.count
+            running = 0
+            for idx, c in enumerate(self.counts):
+                running += c
+                if running >= target and c:
+                    return self.bounds[idx] if idx < len(self.bounds) else self.max
+            return self.max
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            cumulative = []
+            running = 0
+            for c in self.counts:
+                running += c
+                cumulative.append(running)
+            return {
+                "bounds": list(self.bounds),
+                "cumulative": cumulative,
+                "count": self.count,
+                "sum": self.sum,
+                "max": self.max,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+    def summary(self, unit: str = "ms") -> str:
+        return (f"n={self.count} mean={self.mean():.1f}{unit} p50<={self.quantile(0.5):g}{unit} "
+                f"p95<={self.quantile(0.95):g}{unit} max={self.max:.1f}{unit}")
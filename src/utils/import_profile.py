@@ -0,0 +1,117 @@
+"""
+Import-Time Profiler
+
+Measures how long first-time module imports take during startup and during
+the background AI warm-up, so slow launches can be traced to the library
+responsible (torch, stable-baselines3, pandas, ta, ...).
+
+Enable/disable with AETHER_IMPORT_PROFILE (default on). The hook only wraps
+builtins.__import__ while installed and records modules that were not yet
+in sys.modules, so steady-state imports cost nothing.
+"""
+
+import builtins
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def _enabled() -> bool:
+    return str(os.getenv("AETHER_IMPORT_PROFILE", "1")).strip().lower() in ("1", "true", "yes", "on")
+
+
+class ImportProfiler:
+    """Records inclusive wall time of first-time imports, tagged by startup phase."""
+
+    def __init__(self):
+        self._original_import = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.phase = "startup"
+        # module name -> (seconds, phase, depth)
+        self.records: Dict[str, Tuple[float, str, int]] = {}
+        self.phase_started: Dict[str, float] = {}
+
+    def install(self) -> None:
+        if self._original_import is not None or not _enabled():
+            return
+        self._original_import = builtins.__import__
+        self.phase_started[self.phase] = time.perf_counter()
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self) -> None:
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    @property
+    def installed(self) -> bool:
+        return self._original_import is not None
+
+    def mark(self, phase: str) -> None:
+        """Start a new phase; later imports are attributed to it."""
+        self.phase = phase
+        self.phase_started[phase] = time.perf_counter()
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if original is None or level != 0 or name in sys.modules:
+            return (original or self._fallback_import)(name, globals, locals, fromlist, level)
+
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._local.depth = depth
+            with self._lock:
+                if name not in self.records:
+                    self.records[name] = (elapsed, self.phase, depth)
+
+    @staticmethod
+    def _fallback_import(name, globals=None, locals=None, fromlist=(), level=0):
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    def report(self, top: int = 15, min_seconds: float = 0.005) -> List[str]:
+        """Return formatted lines for the slowest top-level imports per phase."""
+        with self._lock:
+            rows = [(name, secs, phase) for name, (secs, phase, depth) in self.records.items()
+                    if depth == 0 and secs >= min_seconds]
+        rows.sort(key=lambda r: r[1], reverse=True)
+
+        lines = ["[IMPORT PROFILE] slowest first-time imports (inclusive):"]
+        for name, secs, phase in rows[:top]:
+            lines.append(f"  {secs * 1000:8.1f} ms  {phase:<8}  {name}")
+        totals: Dict[str, float] = {}
+        for name, secs, phase in rows:
+            totals[phase] = totals.get(phase, 0.0) + secs
+        for phase, secs in totals.items():
+            lines.append(f"  total {phase}: {secs * 1000:.1f} ms")
+        return lines
+
+    def print_report(self, top: int = 15) -> None:
+        if not self.records:
+            return
+        for line in self.report(top=top):
+            print(line, flush=True)
+
+
+IMPORT_PROFILER = ImportProfiler()
+
+
+def timed_import(module_name: str, phase: Optional[str] = None):
+    """Import a module by name, recording its cost even if the hook is not installed."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    import importlib
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+    with IMPORT_PROFILER._lock:
+        IMPORT_PROFILER.records.setdefault(module_name, (elapsed, phase or IMPORT_PROFILER.phase, 0))
+    return module
@@ -0,0 +1,315 @@
+"""
+Log Pipeline - Non-blocking logging for the trading hot path.
+
+    pipeline = setup_logging()
+    ...
+    pipeline.stop()
+
+Every logger (root and the propagate=False console loggers such as
+AETHER_UI / TRADER) is switched to one QueueHandler. The calling thread
+only runs the dedup filter and a put_nowait(); a QueueListener thread
+formats the records and writes them to the console and a rotating log
+file. A full queue drops the record (counted) instead of blocking.
+
+Formatting is deferred: the QueueHandler passes the record unformatted,
+so `logger.info("closed %s at %.5f", ticket, price)` costs no string
+building on the event loop. Arguments are rendered on the writer thread,
+so pass values, not objects that are mutated right after the call.
+Exceptions are rendered eagerly (rare path; tracebacks pin frames).
+
+Duplicate records (same logger, level, message and args) are rate-limited
+per DEDUP_CONFIG: at most `max_repeats` within `time_window` seconds; the
+next record after the window reports how many were suppressed. Records
+above `max_level` (errors) are never suppressed.
+
+The file receives structured JSON lines (ts, level, logger, msg plus any
+`extra=` fields) or plain text, rotated by size or time.
+
+Env:
+    AETHER_LOG_PIPELINE=1            install the pipeline (0 = stdlib default)
+    AETHER_LOG_LEVEL=WARNING         root level
+    AETHER_LOG_FILE=logs/aether.log  empty = console only
+    AETHER_LOG_FORMAT=json           json | text (file only)
+    AETHER_LOG_ROTATE=size           size | time
+    AETHER_LOG_MAX_MB=50             size rotation threshold
+    AETHER_LOG_ROTATE_WHEN=midnight  time rotation interval (TimedRotatingFileHandler `when`)
+    AETHER_LOG_BACKUPS=10            rotated files kept
+    AETHER_LOG_QUEUE_SIZE=10000      records buffered before dropping
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from src.config.logging_config import DEDUP_CONFIG
+
+_EXC_FORMATTER = logging.Formatter()
+_STD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "dedup_suppressed"}
+
+
+def _env_flag(name: str, default: str = "0") -> bool:
+    return str(os.getenv(name, default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+class DedupFilter(logging.Filter):
+    """Rate-limits identical records (caller side, O(1) per record)."""
+
+    def __init__(self, time_window: float = 60.0, max_repeats: int = 1,
+                 max_level: int = logging.WARNING, max_keys: int = 4096):
+        super().__init__()
+        self.time_window = float(time_window)
+        self.max_repeats = max(1, int(max_repeats))
+        self.max_level = max_level
+        self.max_keys = max_keys
+        self.suppressed = 0
+        # key -> [window start, records passed in window, suppressed in window]
+        self._seen: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict = DEDUP_CONFIG) -> Optional["DedupFilter"]:
+        if not config.get("enabled", False):
+            return None
+        max_level = logging.getLevelName(str(config.get("max_level", "WARNING")).upper())
+        return cls(
+            time_window=config.get("time_window", 60),
+            max_repeats=config.get("max_repeats", 1),
+            max_level=max_level if isinstance(max_level, int) else logging.WARNING,
+        )
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        key = (record.name, record.levelno, record.msg, record.args)
+        try:
+            hash(key)
+        except TypeError:
+            key = (record.name, record.levelno, str(record.msg), repr(record.args))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.time_window:
+                if entry is not None and entry[2]:
+                    record.dedup_suppressed = entry[2]
+                if entry is None and len(self._seen) >= self.max_keys:
+                    self._prune(now)
+                self._seen[key] = [now, 1, 0]
+                return True
+            if entry[1] < self.max_repeats:
+                entry[1] += 1
+                return True
+            entry[2] += 1
+            self.suppressed += 1
+            return False
+
+    def _prune(self, now: float) -> None:
+        expired = [k for k, e in self._seen.items() if now - e[0] >= self.time_window]
+        for k in expired:
+            del self._seen[k]
+        if len(self._seen) >= self.max_keys:
+            self._seen.clear()
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg and `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues the raw record and never blocks."""
+
+    def __init__(self, q: "queue.Queue"):
+        super().__init__(q)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message here; the listener does it instead
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class _RoutingListener(logging.handlers.QueueListener):
+    """
+    Writer thread. Records of adopted loggers go to their original handlers,
+    everything else to the console handler; the file handler gets both.
+    """
+
+    def __init__(self, q: "queue.Queue", console: logging.Handler, shared: List[logging.Handler]):
+        super().__init__(q, console, respect_handler_level=True)
+        self.shared = shared
+        self.routes: Dict[str, List[logging.Handler]] = {}
+        self.written = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        suppressed = getattr(record, "dedup_suppressed", 0)
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} repeats suppressed)"
+            record.args = None
+        for handler in self.routes.get(record.name, self.handlers):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        for handler in self.shared:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        self.written += 1
+
+    def enqueue_sentinel(self) -> None:
+        # The queue is bounded: wait for room rather than losing the stop signal
+        self.queue.put(self._sentinel, timeout=5.0)
+
+
+class LogPipeline:
+    """Owns the queue, the writer thread and the handler swap (undone by stop())."""
+
+    def __init__(self, level: Optional[str] = None, log_file: Optional[str] = None,
+                 file_format: Optional[str] = None, queue_size: Optional[int] = None):
+        self.level = (level or os.getenv("AETHER_LOG_LEVEL", "WARNING")).strip().upper()
+        self.log_file = os.getenv("AETHER_LOG_FILE", "logs/aether.log") if log_file is None else log_file
+        self.file_format = (file_format or os.getenv("AETHER_LOG_FORMAT", "json")).strip().lower()
+        size = queue_size if queue_size is not None else _env_int("AETHER_LOG_QUEUE_SIZE", 10000)
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(100, size))
+        self.handler = _DeferredQueueHandler(self.queue)
+        self.dedup = DedupFilter.from_config()
+        if self.dedup is not None:
+            self.handler.addFilter(self.dedup)
+        self.listener: Optional[_RoutingListener] = None
+        self._saved: List[Tuple[logging.Logger, List[logging.Handler]]] = []
+        self._saved_root_level = None
+
+    def _file_handler(self) -> Optional[logging.Handler]:
+        if not self.log_file:
+            return None
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_file)), exist_ok=True)
+            backups = _env_int("AETHER_LOG_BACKUPS", 10)
+            if os.getenv("AETHER_LOG_ROTATE", "size").strip().lower() == "time":
+                handler = logging.handlers.TimedRotatingFileHandler(
+                    self.log_file, when=os.getenv("AETHER_LOG_ROTATE_WHEN", "midnight"),
+                    backupCount=backups, encoding="utf-8", delay=True)
+            else:
+                handler = logging.handlers.RotatingFileHandler(
+                    self.log_file, maxBytes=_env_int("AETHER_LOG_MAX_MB", 50) * 1024 * 1024,
+                    backupCount=backups, encoding="utf-8", delay=True)
+        except Exception as e:
+            print(f">>> [LOG] File logging disabled: {e}", file=sys.stderr, flush=True)
+            return None
+        if self.file_format == "text":
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        else:
+            handler.setFormatter(JsonLineFormatter())
+        return handler
+
+    def start(self) -> "LogPipeline":
+        if self.listener is not None:
+            return self
+        # Message-only, like the stdlib last-resort handler the root used until now
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(logging.Formatter("%(message)s"))
+        file_handler = self._file_handler()
+        self.listener = _RoutingListener(self.queue, console, [file_handler] if file_handler else [])
+
+        root = logging.getLogger()
+        self._saved_root_level = root.level
+        root.setLevel(self.level)
+        self._swap(root)
+        # Console loggers that bypass the root keep their handlers, on the writer thread
+        for logger in list(logging.Logger.manager.loggerDict.values()):
+            if isinstance(logger, logging.Logger) and not logger.propagate and logger.handlers:
+                self.listener.routes[logger.name] = self._swap(logger)
+
+        self.listener.start()
+        return self
+
+    def _swap(self, logger: logging.Logger) -> List[logging.Handler]:
+        original = list(logger.handlers)
+        self._saved.append((logger, original))
+        logger.handlers = [self.handler]
+        return original
+
+    def stop(self) -> None:
+        """Drain the queue, restore the original handlers and close the file."""
+        if self.listener is None:
+            return
+        for logger, handlers in reversed(self._saved):
+            logger.handlers = handlers
+        self._saved = []
+        if self._saved_root_level is not None:
+            logging.getLogger().setLevel(self._saved_root_level)
+        try:
+            self.listener.stop()
+        except queue.Full:
+            pass
+        for handler in self.listener.shared:
+            handler.close()
+        self.listener = None
+
+    def stats(self) -> Dict:
+        return {
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "suppressed": self.dedup.suppressed if self.dedup is not None else 0,
+            "written": self.listener.written if self.listener is not None else 0,
+            "queue_depth": self.queue.qsize(),
+        }
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def setup_logging() -> Optional[LogPipeline]:
+    """Install the pipeline once (no-op with AETHER_LOG_PIPELINE=0)."""
+    global _pipeline
+    if _pipeline is None and _env_flag("AETHER_LOG_PIPELINE", "1"):
+        _pipeline = LogPipeline().start()
+    return _pipeline
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    return _pipeline
+
+
+def shutdown_logging() -> None:
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
@@ -0,0 +1,198 @@
+"""
+Metrics Server - Optional Prometheus-text endpoint (GET /metrics).
+
+The server runs uvicorn on its own daemon thread and event loop, so a
+scrape never competes with the trading loop. Every value comes from
+in-memory counters and histograms that the bot already maintains; the
+registered collectors must not call the broker or the database.
+
+    exporter = MetricsExporter()
+    exporter.add_collector(lambda w: w.gauge("aether_open_buckets", "Open buckets", 3))
+    exporter.start()
+
+FastAPI/uvicorn are optional: if they are missing the exporter logs a
+warning and the bot runs without it.
+
+Env:
+    AETHER_METRICS_ENABLED=1        start the endpoint
+    AETHER_METRICS_HOST=127.0.0.1   bind address (0.0.0.0 to scrape remotely)
+    AETHER_METRICS_PORT=9108
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.utils.histogram import Histogram, STAGE_MS_BOUNDS
+
+logger = logging.getLogger("MetricsServer")
+
+
+def metrics_enabled() -> bool:
+    return str(os.getenv("AETHER_METRICS_ENABLED", "0")).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Optional[Dict]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class MetricsWriter:
+    """
+    Accumulates one scrape in the Prometheus text exposition format.
+    Samples are grouped per metric family, so collectors may emit families
+    in any order (e.g. several metrics per symbol in one loop).
+    """
+
+    def __init__(self):
+        self._families: Dict[str, List[str]] = {}
+
+    def _family(self, name: str, kind: str, help_text: str) -> List[str]:
+        lines = self._families.get(name)
+        if lines is None:
+            lines = self._families[name] = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        return lines
+
+    def gauge(self, name: str, help_text: str, value: float, labels: Optional[Dict] = None) -> None:
+        self._family(name, "gauge", help_text).append(f"{name}{_labels(labels)} {_fmt(value)}")
+
+    def counter(self, name: str, help_text: str, value: float, labels: Optional[Dict] = None) -> None:
+        self._family(name, "counter", help_text).append(f"{name}{_labels(labels)} {_fmt(value)}")
+
+    def histogram(self, name: str, help_text: str, snapshot: Dict, labels: Optional[Dict] = None) -> None:
+        """Write a Histogram.snapshot() (cumulative buckets, last one is +Inf)."""
+        lines = self._family(name, "histogram", help_text)
+        labels = dict(labels or {})
+        bounds = list(snapshot.get("bounds", [])) + [float("inf")]
+        for bound, cumulative in zip(bounds, snapshot.get("cumulative", [])):
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': _fmt(bound)})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_fmt(snapshot.get('sum', 0.0))}")
+        lines.append(f"{name}_count{_labels(labels)} {snapshot.get('count', 0)}")
+
+    def render(self) -> str:
+        return "\n".join(line for lines in self._families.values() for line in lines) + "\n"
+
+
+class GCPauseMonitor:
+    """Times garbage collector runs through gc.callbacks."""
+
+    def __init__(self):
+        self.pause_ms: Dict[int, Histogram] = {g: Histogram(STAGE_MS_BOUNDS) for g in range(3)}
+        self.collected = 0
+        self._start = 0.0
+        self._installed = False
+
+    def _callback(self, phase: str, info: Dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start:
+            self.pause_ms[info.get("generation", 2)].observe((time.perf_counter() - self._start) * 1000.0)
+            self.collected += info.get("collected", 0)
+            self._start = 0.0
+
+    def install(self) -> None:
+        if not self._installed:
+            gc.callbacks.append(self._callback)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        if self._installed:
+            try:
+                gc.callbacks.remove(self._callback)
+            except ValueError:
+                pass
+            self._installed = False
+
+    def collect(self, w: MetricsWriter) -> None:
+        for generation, hist in self.pause_ms.items():
+            w.histogram("aether_gc_pause_ms", "Garbage collector pause (ms)", hist.snapshot(),
+                        {"generation": generation})
+        w.counter("aether_gc_collected_objects_total", "Objects collected by the GC", self.collected)
+
+
+class MetricsExporter:
+    """Collector registry plus the uvicorn thread serving it."""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None):
+        self.host = host or os.getenv("AETHER_METRICS_HOST", "127.0.0.1")
+        try:
+            self.port = int(port if port is not None else os.getenv("AETHER_METRICS_PORT", "9108"))
+        except Exception:
+            self.port = 9108
+        self._collectors: List[Callable[[MetricsWriter], None]] = []
+        self._started_at = time.time()
+        self.gc_monitor = GCPauseMonitor()
+        self.scrapes = 0
+        self.collector_errors = 0
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add_collector(self, collector: Callable[[MetricsWriter], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        w = MetricsWriter()
+        w.gauge("aether_up", "Metrics endpoint is serving", 1)
+        w.gauge("aether_uptime_seconds", "Seconds since the exporter started", time.time() - self._started_at)
+        for collector in list(self._collectors):
+            try:
+                collector(w)
+            except Exception as e:
+                # Collectors read live structures from another thread; skip a torn read
+                self.collector_errors += 1
+                logger.debug(f"[METRICS] Collector {getattr(collector, '__name__', collector)} failed: {e}")
+        self.gc_monitor.collect(w)
+        self.scrapes += 1
+        w.counter("aether_metrics_scrapes_total", "Scrapes served", self.scrapes)
+        w.counter("aether_metrics_collector_errors_total", "Collector failures", self.collector_errors)
+        return w.render()
+
+    def start(self) -> bool:
+        """Start serving in a daemon thread. Returns False if FastAPI/uvicorn are unavailable."""
+        if self._thread is not None:
+            return True
+        try:
+            import uvicorn
+            from fastapi import FastAPI
+            from fastapi.responses import PlainTextResponse
+        except ImportError as e:
+            logger.warning(f"[METRICS] Endpoint disabled: {e}")
+            return False
+
+        app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+        @app.get("/metrics", response_class=PlainTextResponse)
+        def metrics():
+            return PlainTextResponse(self.render(), media_type="text/plain; version=0.0.4")
+
+        config = uvicorn.Config(app, host=self.host, port=self.port, log_level="warning", access_log=False)
+        # uvicorn only installs signal handlers on the main thread, so the bot keeps its own
+        self._server = uvicorn.Server(config)
+        self.gc_monitor.install()
+        self._thread = threading.Thread(target=self._server.run, name="aether-metrics", daemon=True)
+        self._thread.start()
+        logger.info(f"[METRICS] Serving Prometheus metrics on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.gc_monitor.uninstall()
+        self._server = None
+        self._thread = None
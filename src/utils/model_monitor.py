@@ -6,10 +6,18 @@ Tracks AI model prediction accuracy in real-time and detects degradation.
 ENHANCEMENT 8: Added January 4, 2026
 Purpose: Monitor AI model performance and trigger retraining when needed
 
+All metrics are running counters over the sliding window of the last
+`max_history` predictions: an entry's contribution is added when its
+outcome is matched and subtracted when it is evicted, so every query is
+O(1) (calibration O(bins)). Unmatched predictions are kept in a
+time-ordered index, so outcome matching is a bisect instead of a scan.
+
 Author: AETHER Development Team
 Version: 1.0
 """
 
+import bisect
+import math
 import time
 import logging
 from typing import Dict, List, Optional, Tuple
@@ -17,6 +25,23 @@ from collections import deque
 
 logger = logging.getLogger("ModelMonitor")
 
+DIRECTIONS = ('UP', 'DOWN', 'NEUTRAL')
+
+# Named confidence buckets (upper bounds) used by the calibration report
+CONFIDENCE_BUCKETS = (('low', 0.6), ('medium', 0.75), ('high', float('inf')))
+
+# Reliability bins for the expected calibration error
+CALIBRATION_BINS = 10
+
+MATCH_WINDOW_S = 300  # Outcome must be within 5 minutes of its prediction
+
+
+def _confidence_bucket(confidence: float) -> str:
+    for name, upper in CONFIDENCE_BUCKETS:
+        if confidence < upper:
+            return name
+    return CONFIDENCE_BUCKETS[-1][0]
+
 
 class ModelMonitor:
     """
@@ -25,26 +50,57 @@ class ModelMonitor:
     ENHANCEMENT 8: Monitors predictions vs actual outcomes
     """
     
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, drift_alpha: float = 0.05):
         """
         Initialize model monitor.
         
         Args:
             max_history: Maximum number of predictions to track
+            drift_alpha: EWMA weight of the newest sample in the drift statistics
         """
-        self.predictions = deque(maxlen=max_history)
+        self.predictions = deque()
         self.max_history = max_history
         
         # Performance thresholds
         self.accuracy_threshold = 0.52  # Retrain if below 52%
         self.min_samples = 100  # Need at least 100 predictions
+        self.brier_threshold = 0.30  # Retrain if mean squared confidence error exceeds this
+        self.drift_threshold = 0.10  # Retrain if recent accuracy falls this far below the window
         
         # Tracking
         self.last_accuracy = 0.0
         self.last_check_time = 0.0
         
+        # Unmatched predictions ordered by timestamp (parallel lists)
+        self._pending_ts: List[float] = []
+        self._pending: List[Dict] = []
+        
+        # Window counters over all predictions
+        self.confidence_sum = 0.0
+        self.class_counts = {d: 0 for d in DIRECTIONS}
+        
+        # Window counters over matched predictions
+        self.matched_count = 0
+        self.correct_score = 0.0  # NEUTRAL that avoided a loss counts 0.5
+        self.confusion = {(p, a): 0 for p in DIRECTIONS for a in DIRECTIONS}
+        self.brier_sum = 0.0
+        self.confidence_sum_correct = 0.0
+        self.confidence_sum_incorrect = 0.0
+        self.bucket_counts = {name: [0, 0] for name, _ in CONFIDENCE_BUCKETS}  # [total, correct]
+        self.bins = [[0, 0, 0.0] for _ in range(CALIBRATION_BINS)]  # [total, correct, confidence sum]
+        
+        # Drift: EWMAs of the newest samples against the window means
+        self.drift_alpha = drift_alpha
+        self.ewma_accuracy: Optional[float] = None
+        self.ewma_brier: Optional[float] = None
+        self.ewma_confidence: Optional[float] = None
+        self.ewma_class_share = {d: 1.0 / len(DIRECTIONS) for d in DIRECTIONS}
+        
         logger.info(f"[MODEL MONITOR] Initialized (threshold: {self.accuracy_threshold:.1%}, min_samples: {self.min_samples})")
     
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        return value if current is None else current + self.drift_alpha * (value - current)
+    
     def record_prediction(self, prediction: str, confidence: float, metadata: Optional[Dict] = None):
         """
         Record a prediction when signal is generated.
@@ -62,9 +118,67 @@ class ModelMonitor:
             'metadata': metadata or {}
         }
         
+        if len(self.predictions) >= self.max_history:
+            self._evict(self.predictions.popleft())
         self.predictions.append(entry)
         
-        logger.debug(f"[MODEL MONITOR] Recorded prediction: {prediction} ({confidence:.2f})")
+        ts = entry['timestamp']
+        if self._pending_ts and ts < self._pending_ts[-1]:
+            idx = bisect.bisect_right(self._pending_ts, ts)
+            self._pending_ts.insert(idx, ts)
+            self._pending.insert(idx, entry)
+        else:
+            self._pending_ts.append(ts)
+            self._pending.append(entry)
+        
+        self.confidence_sum += confidence
+        self.class_counts[prediction] = self.class_counts.get(prediction, 0) + 1
+        self.ewma_confidence = self._ewma(self.ewma_confidence, confidence)
+        for direction in self.ewma_class_share:
+            hit = 1.0 if direction == prediction else 0.0
+            self.ewma_class_share[direction] += self.drift_alpha * (hit - self.ewma_class_share[direction])
+        
+        logger.debug("[MODEL MONITOR] Recorded prediction: %s (%.2f)", prediction, confidence)
+    
+    def _evict(self, entry: Dict) -> None:
+        self.confidence_sum -= entry['confidence']
+        self.class_counts[entry['prediction']] -= 1
+        if entry['actual'] is not None:
+            self._apply_outcome(entry, -1)
+            return
+        # Unmatched: normally the oldest pending entry
+        if self._pending and self._pending[0] is entry:
+            del self._pending_ts[0]
+            del self._pending[0]
+        else:
+            idx = bisect.bisect_left(self._pending_ts, entry['timestamp'])
+            while idx < len(self._pending) and self._pending[idx] is not entry:
+                idx += 1
+            if idx < len(self._pending):
+                del self._pending_ts[idx]
+                del self._pending[idx]
+    
+    def _apply_outcome(self, entry: Dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a matched entry's contribution."""
+        prediction, actual, conf = entry['prediction'], entry['actual'], entry['confidence']
+        correct = prediction == actual
+        score = 1.0 if correct else (0.5 if prediction == 'NEUTRAL' and abs(entry.get('profit', 0)) < 0.01 else 0.0)
+        
+        self.matched_count += sign
+        self.correct_score += sign * score
+        self.confusion[(prediction, actual)] = self.confusion.get((prediction, actual), 0) + sign
+        self.brier_sum += sign * (conf - (1.0 if correct else 0.0)) ** 2
+        if correct:
+            self.confidence_sum_correct += sign * conf
+        else:
+            self.confidence_sum_incorrect += sign * conf
+        bucket = self.bucket_counts[_confidence_bucket(conf)]
+        bucket[0] += sign
+        bucket[1] += sign * int(correct)
+        b = self.bins[min(CALIBRATION_BINS - 1, max(0, int(conf * CALIBRATION_BINS)))]
+        b[0] += sign
+        b[1] += sign * int(correct)
+        b[2] += sign * conf
     
     def record_outcome(self, timestamp: float, actual_direction: str, profit: float = 0.0):
         """
@@ -75,18 +189,25 @@ class ModelMonitor:
             actual_direction: Actual direction ('UP' if profit > 0, 'DOWN' if profit < 0)
             profit: Actual profit/loss
         """
-        # Find matching prediction (within 5 minutes)
-        for pred in reversed(self.predictions):
-            if pred['actual'] is None:  # Not yet matched
-                time_diff = abs(pred['timestamp'] - timestamp)
-                
-                if time_diff < 300:  # Within 5 minutes
-                    pred['actual'] = actual_direction
-                    pred['profit'] = profit
-                    pred['matched_at'] = time.time()
-                    
-                    logger.debug(f"[MODEL MONITOR] Matched outcome: {actual_direction} (profit: {profit:.2f})")
-                    break
+        # Newest unmatched prediction within 5 minutes
+        idx = bisect.bisect_left(self._pending_ts, timestamp + MATCH_WINDOW_S) - 1
+        if idx < 0 or timestamp - self._pending_ts[idx] >= MATCH_WINDOW_S:
+            return
+        
+        pred = self._pending[idx]
+        del self._pending_ts[idx]
+        del self._pending[idx]
+        
+        pred['actual'] = actual_direction
+        pred['profit'] = profit
+        pred['matched_at'] = time.time()
+        self._apply_outcome(pred, 1)
+        
+        correct = pred['prediction'] == actual_direction
+        self.ewma_accuracy = self._ewma(self.ewma_accuracy, 1.0 if correct else 0.0)
+        self.ewma_brier = self._ewma(self.ewma_brier, (pred['confidence'] - (1.0 if correct else 0.0)) ** 2)
+        
+        logger.debug("[MODEL MONITOR] Matched outcome: %s (profit: %.2f)", actual_direction, profit)
     
     def get_accuracy(self) -> float:
         """
@@ -95,21 +216,7 @@ class ModelMonitor:
         Returns:
             Accuracy as a percentage (0.0-1.0)
         """
-        correct = 0
-        total = 0
-        
-        for pred in self.predictions:
-            if pred['actual'] is not None:
-                total += 1
-                
-                # Check if prediction matches actual
-                if pred['prediction'] == pred['actual']:
-                    correct += 1
-                # Also count NEUTRAL as half-correct if it avoided a loss
-                elif pred['prediction'] == 'NEUTRAL' and abs(pred.get('profit', 0)) < 0.01:
-                    correct += 0.5
-        
-        accuracy = correct / total if total > 0 else 0.0
+        accuracy = self.correct_score / self.matched_count if self.matched_count > 0 else 0.0
         self.last_accuracy = accuracy
         
         return accuracy
@@ -121,41 +228,60 @@ class ModelMonitor:
         Returns:
             Dict with calibration metrics
         """
-        # Group predictions by confidence buckets
-        buckets = {
-            'low': {'correct': 0, 'total': 0},      # 0.0-0.6
-            'medium': {'correct': 0, 'total': 0},   # 0.6-0.75
-            'high': {'correct': 0, 'total': 0}      # 0.75-1.0
-        }
-        
-        for pred in self.predictions:
-            if pred['actual'] is None:
-                continue
-            
-            conf = pred['confidence']
-            correct = (pred['prediction'] == pred['actual'])
-            
-            if conf < 0.6:
-                bucket = 'low'
-            elif conf < 0.75:
-                bucket = 'medium'
-            else:
-                bucket = 'high'
-            
-            buckets[bucket]['total'] += 1
-            if correct:
-                buckets[bucket]['correct'] += 1
-        
-        # Calculate accuracy per bucket
         calibration = {}
-        for bucket_name, bucket_data in buckets.items():
-            if bucket_data['total'] > 0:
-                calibration[f'{bucket_name}_accuracy'] = bucket_data['correct'] / bucket_data['total']
-            else:
-                calibration[f'{bucket_name}_accuracy'] = 0.0
+        for bucket_name, (total, correct) in self.bucket_counts.items():
+            calibration[f'{bucket_name}_accuracy'] = correct / total if total > 0 else 0.0
+        calibration['brier_score'] = self.get_brier_score()
+        calibration['expected_calibration_error'] = self.get_expected_calibration_error()
         
         return calibration
     
+    def get_brier_score(self) -> float:
+        """Mean squared error between confidence and correctness (0 = perfect)."""
+        return self.brier_sum / self.matched_count if self.matched_count > 0 else 0.0
+    
+    def get_expected_calibration_error(self) -> float:
+        """Count-weighted gap between mean confidence and accuracy per bin."""
+        if self.matched_count <= 0:
+            return 0.0
+        ece = 0.0
+        for total, correct, conf_sum in self.bins:
+            if total > 0:
+                ece += abs(conf_sum / total - correct / total) * total
+        return ece / self.matched_count
+    
+    def get_confusion_matrix(self) -> Dict[str, Dict[str, int]]:
+        """Window counts as {predicted: {actual: n}}."""
+        matrix: Dict[str, Dict[str, int]] = {}
+        for (prediction, actual), n in self.confusion.items():
+            matrix.setdefault(prediction, {})[actual] = n
+        return matrix
+    
+    def get_drift(self) -> Dict[str, float]:
+        """
+        Recent (EWMA) statistics against the window averages. Negative
+        accuracy drift / positive Brier drift mean the model is degrading;
+        `class_psi` is the population stability index of the predicted
+        direction mix.
+        """
+        window_accuracy = self.get_accuracy()
+        n = len(self.predictions)
+        window_confidence = self.confidence_sum / n if n else 0.0
+        
+        psi = 0.0
+        if n:
+            for direction in DIRECTIONS:
+                expected = max(self.class_counts.get(direction, 0) / n, 1e-4)
+                actual = max(self.ewma_class_share[direction], 1e-4)
+                psi += (actual - expected) * math.log(actual / expected)
+        
+        return {
+            'accuracy_drift': (self.ewma_accuracy - window_accuracy) if self.ewma_accuracy is not None else 0.0,
+            'brier_drift': (self.ewma_brier - self.get_brier_score()) if self.ewma_brier is not None else 0.0,
+            'confidence_drift': (self.ewma_confidence - window_confidence) if self.ewma_confidence is not None else 0.0,
+            'class_psi': psi,
+        }
+    
     def should_retrain(self) -> Tuple[bool, str]:
         """
         Determine if model needs retraining.
@@ -164,7 +290,7 @@ class ModelMonitor:
             (should_retrain, reason)
         """
         # Need minimum samples
-        matched_count = sum(1 for p in self.predictions if p['actual'] is not None)
+        matched_count = self.matched_count
         
         if matched_count < self.min_samples:
             return False, f"Insufficient data ({matched_count}/{self.min_samples})"
@@ -182,6 +308,14 @@ class ModelMonitor:
         if calibration.get('high_accuracy', 1.0) < 0.65:
             return True, f"High-confidence predictions only {calibration['high_accuracy']:.2%} accurate"
         
+        if calibration['brier_score'] > self.brier_threshold:
+            return True, f"Confidence miscalibrated (Brier {calibration['brier_score']:.3f} > {self.brier_threshold:.2f})"
+        
+        # Recent accuracy sliding away from the window average
+        drift = self.get_drift()
+        if drift['accuracy_drift'] < -self.drift_threshold:
+            return True, f"Accuracy drifting ({drift['accuracy_drift']:+.2%} vs window {accuracy:.2%})"
+        
         return False, f"Model performing well ({accuracy:.2%})"
     
     def get_performance_summary(self) -> Dict:
@@ -191,25 +325,23 @@ class ModelMonitor:
         Returns:
             Dict with performance metrics
         """
-        matched_count = sum(1 for p in self.predictions if p['actual'] is not None)
         accuracy = self.get_accuracy()
         calibration = self.get_confidence_calibration()
-        
-        # Calculate average confidence for correct vs incorrect predictions
-        correct_confidences = [p['confidence'] for p in self.predictions 
-                              if p['actual'] is not None and p['prediction'] == p['actual']]
-        incorrect_confidences = [p['confidence'] for p in self.predictions 
-                                if p['actual'] is not None and p['prediction'] != p['actual']]
+        correct_count = sum(n for (p, a), n in self.confusion.items() if p == a)
+        incorrect_count = self.matched_count - correct_count
+        should_retrain, reason = self.should_retrain()
         
         return {
             'total_predictions': len(self.predictions),
-            'matched_predictions': matched_count,
+            'matched_predictions': self.matched_count,
             'accuracy': accuracy,
             'calibration': calibration,
-            'avg_confidence_correct': sum(correct_confidences) / len(correct_confidences) if correct_confidences else 0.0,
-            'avg_confidence_incorrect': sum(incorrect_confidences) / len(incorrect_confidences) if incorrect_confidences else 0.0,
-            'should_retrain': self.should_retrain()[0],
-            'retrain_reason': self.should_retrain()[1]
+            'confusion_matrix': self.get_confusion_matrix(),
+            'drift': self.get_drift(),
+            'avg_confidence_correct': self.confidence_sum_correct / correct_count if correct_count else 0.0,
+            'avg_confidence_incorrect': self.confidence_sum_incorrect / incorrect_count if incorrect_count else 0.0,
+            'should_retrain': should_retrain,
+            'retrain_reason': reason
         }
     
     def log_performance_summary(self):
@@ -222,7 +354,11 @@ class ModelMonitor:
             f"  Accuracy: {summary['accuracy']:.2%}\n"
             f"  Calibration: Low={summary['calibration'].get('low_accuracy', 0):.2%} | "
             f"Med={summary['calibration'].get('medium_accuracy', 0):.2%} | "
-            f"High={summary['calibration'].get('high_accuracy', 0):.2%}\n"
+            f"High={summary['calibration'].get('high_accuracy', 0):.2%} | "
+            f"Brier={summary['calibration']['brier_score']:.3f} | "
+            f"ECE={summary['calibration']['expected_calibration_error']:.3f}\n"
+            f"  Drift: Acc={summary['drift']['accuracy_drift']:+.2%} | "
+            f"PSI={summary['drift']['class_psi']:.3f}\n"
             f"  Avg Confidence: Correct={summary['avg_confidence_correct']:.2f} | "
             f"Incorrect={summary['avg_confidence_incorrect']:.2f}\n"
             f"  Status: {summary['retrain_reason']}"
@@ -1,17 +1,38 @@
+"""
+News Calendar - High-impact event blackouts ("Event Horizon").
+
+Events from config/news_events.json are compiled once per load into, per
+currency, sorted arrays of merged blackout windows (event - pre, event +
+post). A blackout check is one bisect per relevant currency, and a
+symbol's currencies are resolved once and cached. The file is re-read
+when its mtime changes (checked at most every AETHER_NEWS_RELOAD_S
+seconds); the new index is swapped in whole.
+"""
+
+import bisect
 import datetime
 import json
 import logging
 import os
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger("NewsCalendar")
 
+# Currencies whose HIGH impact events black out symbols containing them
+BLACKOUT_CURRENCIES = ("USD", "EUR", "GBP", "JPY")
+DEFAULT_PRE_MINUTES = 30
+DEFAULT_POST_MINUTES = 30
+
 class NewsEvent:
-    def __init__(self, title: str, time_str: str, impact: str, currency: str):
+    def __init__(self, title: str, time_str: str, impact: str, currency: str,
+                 pre_minutes: float = DEFAULT_PRE_MINUTES, post_minutes: float = DEFAULT_POST_MINUTES):
         self.title = title
         self.time_str = time_str # Format: "YYYY-MM-DD HH:MM"
         self.impact = impact # "HIGH", "MEDIUM", "LOW"
         self.currency = currency # "USD", "EUR", etc.
+        self.pre_minutes = pre_minutes
+        self.post_minutes = post_minutes
         
         try:
             # Try parsing with seconds first, then without
@@ -22,6 +43,47 @@ class NewsEvent:
         except ValueError:
             logger.error(f"Invalid time format for news event: {time_str}")
             self.timestamp = datetime.datetime.now() + datetime.timedelta(days=365) # Push to future
+        self.epoch = self.timestamp.timestamp()
+
+    @property
+    def window(self) -> Tuple[float, float]:
+        """Blackout window as epoch seconds."""
+        return self.epoch - self.pre_minutes * 60.0, self.epoch + self.post_minutes * 60.0
+
+
+class _BlackoutIndex:
+    """Merged windows of one currency (or symbol): parallel sorted arrays."""
+    __slots__ = ("starts", "ends", "labels", "event_times", "events")
+
+    def __init__(self, events: List[NewsEvent]):
+        self.events = sorted(events, key=lambda e: e.epoch)
+        self.event_times = [e.epoch for e in self.events]
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.labels: List[str] = []
+        for start, end, event in sorted((e.window + (e,) for e in self.events), key=lambda w: w[0]):
+            label = f"{event.title} ({event.time_str})"
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+                self.labels[-1] += f", {label}"
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+                self.labels.append(label)
+
+    def window_at(self, now: float) -> int:
+        """Index of the window containing `now`, or -1."""
+        i = bisect.bisect_right(self.starts, now) - 1
+        return i if i >= 0 and now <= self.ends[i] else -1
+
+    def next_window(self, now: float) -> int:
+        """Index of the first window starting after `now`, or -1."""
+        i = bisect.bisect_right(self.starts, now)
+        return i if i < len(self.starts) else -1
+
+    def next_event(self, now: float) -> Optional[NewsEvent]:
+        i = bisect.bisect_right(self.event_times, now)
+        return self.events[i] if i < len(self.events) else None
 
 class NewsCalendar:
     """
@@ -31,29 +93,79 @@ class NewsCalendar:
     def __init__(self, config_path: str = "config/news_events.json"):
         self.config_path = config_path
         self.events: List[NewsEvent] = []
+        # (per-currency index, per-symbol cache): replaced together on reload
+        self._index: Tuple[Dict[str, _BlackoutIndex], Dict[str, _BlackoutIndex]] = ({}, {})
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._logged_window: Dict[str, float] = {}
+        try:
+            self.reload_interval_s = float(os.getenv("AETHER_NEWS_RELOAD_S", "30"))
+        except Exception:
+            self.reload_interval_s = 30.0
         self.load_events()
         
     def load_events(self):
-        """Load news events from JSON file."""
+        """Load news events from JSON file and rebuild the blackout index."""
         if not os.path.exists(self.config_path):
             logger.warning(f"News config not found at {self.config_path}. Creating template.")
             self._create_template()
+            self._mtime = self._stat()
             return
 
+        mtime = self._stat()
         try:
             with open(self.config_path, 'r') as f:
                 data = json.load(f)
-                for item in data.get('events', []):
-                    event = NewsEvent(
-                        item['title'],
-                        item['time'],
-                        item['impact'],
-                        item['currency']
-                    )
-                    self.events.append(event)
-            logger.info(f"Loaded {len(self.events)} news events.")
+            events = []
+            for item in data.get('events', []):
+                events.append(NewsEvent(
+                    item['title'],
+                    item['time'],
+                    item['impact'],
+                    item['currency'],
+                    item.get('pre_minutes', DEFAULT_PRE_MINUTES),
+                    item.get('post_minutes', DEFAULT_POST_MINUTES),
+                ))
         except Exception as e:
+            # Keep the previous index on a bad edit
             logger.error(f"Failed to load news events: {e}")
+            self._mtime = mtime
+            return
+
+        by_currency: Dict[str, List[NewsEvent]] = {}
+        for event in events:
+            if event.impact == "HIGH" and event.currency in BLACKOUT_CURRENCIES:
+                by_currency.setdefault(event.currency, []).append(event)
+
+        self.events = events
+        self._index = ({ccy: _BlackoutIndex(evts) for ccy, evts in by_currency.items()}, {})
+        self._mtime = mtime
+        logger.info(f"Loaded {len(self.events)} news events.")
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.config_path)
+        except OSError:
+            return None
+
+    def maybe_reload(self, now: Optional[float] = None) -> bool:
+        """Re-read the events file if it changed (mtime polled every reload_interval_s)."""
+        now = time.time() if now is None else now
+        if self.reload_interval_s <= 0 or now < self._next_check:
+            return False
+        self._next_check = now + self.reload_interval_s
+        if self._stat() == self._mtime:
+            return False
+        self.load_events()
+        return True
+
+    def _index_for(self, symbol: str) -> _BlackoutIndex:
+        by_currency, by_symbol = self._index
+        index = by_symbol.get(symbol)
+        if index is None:
+            events = [e for ccy, idx in by_currency.items() if ccy in symbol for e in idx.events]
+            index = by_symbol[symbol] = _BlackoutIndex(events)
+        return index
 
     def _create_template(self):
         """Create a template news file."""
@@ -84,31 +196,32 @@ class NewsCalendar:
         """
         Check if we are currently in a news blackout period.
         """
-        now = datetime.datetime.now()
-        
-        for event in self.events:
-            # Filter by currency relevance (Simple check)
-            # If symbol is XAUUSD, we care about USD news.
-            relevant = False
-            if "USD" in symbol and event.currency == "USD": relevant = True
-            if "EUR" in symbol and event.currency == "EUR": relevant = True
-            if "GBP" in symbol and event.currency == "GBP": relevant = True
-            if "JPY" in symbol and event.currency == "JPY": relevant = True
-            
-            if not relevant:
-                continue
-                
-            if event.impact != "HIGH":
-                continue
-                
-            # Define Blackout Window
-            # Pre-News: 30 mins before
-            # Post-News: 30 mins after
-            pre_window = datetime.timedelta(minutes=30)
-            post_window = datetime.timedelta(minutes=30)
-            
-            if (event.timestamp - pre_window) <= now <= (event.timestamp + post_window):
-                logger.warning(f"[EVENT HORIZON] Trading Blackout: {event.title} ({event.time_str})")
-                return True
-                
-        return False
+        now = time.time()
+        self.maybe_reload(now)
+        index = self._index_for(symbol)
+        i = index.window_at(now)
+        if i < 0:
+            return False
+        if self._logged_window.get(symbol) != index.starts[i]:
+            self._logged_window[symbol] = index.starts[i]
+            logger.warning(f"[EVENT HORIZON] Trading Blackout: {index.labels[i]}")
+        return True
+
+    def next_event(self, symbol: str = "XAUUSD", now: Optional[float] = None) -> Optional[NewsEvent]:
+        """Next upcoming HIGH impact event relevant to `symbol`."""
+        return self._index_for(symbol).next_event(time.time() if now is None else now)
+
+    def next_blackout(self, symbol: str = "XAUUSD",
+                      now: Optional[float] = None) -> Optional[Tuple[float, float, str]]:
+        """
+        The current or next blackout window for `symbol` as
+        (start epoch, end epoch, label), or None.
+        """
+        now = time.time() if now is None else now
+        index = self._index_for(symbol)
+        i = index.window_at(now)
+        if i < 0:
+            i = index.next_window(now)
+        if i < 0:
+            return None
+        return index.starts[i], index.ends[i], index.labels[i]
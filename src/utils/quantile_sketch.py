@@ -0,0 +1,240 @@
+"""
+Quantile Sketch - Mergeable, time-decayed streaming quantiles (t-digest style).
+
+Keeps a bounded set of centroids (mean, weight) instead of raw samples, so
+history length no longer drives memory or query cost:
+
+- add(): appends to a small buffer; the buffer is merged into the centroids
+  (sort + one greedy pass) when it fills, i.e. O(log n) amortized per sample.
+- quantile(): the tracked quantiles (p50/p95/p99 by default) are recomputed
+  once after new samples arrive and then served from a cache in O(1).
+- merge(): two sketches combine by merging their centroid lists.
+- to_dict()/from_dict(): compact persisted form (rounded centroid pairs).
+
+Time decay uses forward decay: a sample observed at t gets weight
+2^((t - landmark) / half_life), so older samples count exponentially less
+without touching existing centroids on every add. Weights are renormalized
+(landmark moved forward) before they grow large. Quantiles only depend on
+relative weights; `effective_count()` reports the decayed sample count.
+"""
+
+import bisect
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Renormalize forward-decay weights once they exceed 2^40
+_MAX_EXPONENT = 40.0
+
+
+class QuantileSketch:
+    """Decayed t-digest over float samples (not thread-safe; callers lock)."""
+
+    def __init__(self, compression: int = 100, half_life_s: float = 0.0,
+                 tracked: Sequence[float] = DEFAULT_QUANTILES):
+        self.compression = max(20, int(compression))
+        self.half_life_s = max(0.0, float(half_life_s))
+        self.tracked = tuple(tracked)
+        self.count = 0                      # Observations ever added (undecayed)
+        self.min = math.inf
+        self.max = -math.inf
+        self._landmark = time.time()
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._total = 0.0
+        self._buffer: List[Tuple[float, float]] = []
+        self._buffer_cap = 5 * self.compression
+        self._cache: Dict[float, float] = {}
+        self._dirty = False
+
+    # ------------------------------------------------------------------ decay
+
+    def _weight_at(self, when: float) -> float:
+        if self.half_life_s <= 0:
+            return 1.0
+        exponent = (when - self._landmark) / self.half_life_s
+        if exponent > _MAX_EXPONENT:
+            self._renormalize(when)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _renormalize(self, when: float) -> None:
+        scale = 2.0 ** (-(when - self._landmark) / self.half_life_s)
+        self._weights = [w * scale for w in self._weights]
+        self._buffer = [(v, w * scale) for v, w in self._buffer]
+        self._total *= scale
+        self._landmark = when
+
+    def effective_count(self, now: Optional[float] = None) -> float:
+        """Decayed number of samples as seen at `now`."""
+        total = self._total + sum(w for _, w in self._buffer)
+        if self.half_life_s <= 0:
+            return total
+        now = time.time() if now is None else now
+        return total * 2.0 ** (-(now - self._landmark) / self.half_life_s)
+
+    # ---------------------------------------------------------------- updates
+
+    def add(self, value: float, when: Optional[float] = None) -> None:
+        value = float(value)
+        if math.isnan(value) or math.isinf(value):
+            return
+        weight = self._weight_at(time.time() if when is None else when)
+        self._buffer.append((value, weight))
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._dirty = True
+        if len(self._buffer) >= self._buffer_cap:
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch into this one (decay aligned to this landmark)."""
+        other._compress()
+        scale = 1.0
+        if self.half_life_s > 0:
+            scale = 2.0 ** ((other._landmark - self._landmark) / self.half_life_s)
+        self._buffer.extend((m, w * scale) for m, w in zip(other._means, other._weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._dirty = True
+        self._compress()
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total = sum(w for _, w in points)
+        if total <= 0:
+            self._means, self._weights, self._total = [], [], 0.0
+            return
+
+        # Greedy merge bounded by the k1-style size limit 4*W*q*(1-q)/delta:
+        # small centroids at the tails (where p95/p99 live), large ones mid-range.
+        means: List[float] = []
+        weights: List[float] = []
+        cur_mean, cur_weight = points[0]
+        cumulative = 0.0
+        for mean, weight in points[1:]:
+            q = (cumulative + (cur_weight + weight) / 2.0) / total
+            limit = 4.0 * total * q * (1.0 - q) / self.compression
+            if cur_weight + weight <= limit:
+                cur_mean += (mean - cur_mean) * weight / (cur_weight + weight)
+                cur_weight += weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                cumulative += cur_weight
+                cur_mean, cur_weight = mean, weight
+        means.append(cur_mean)
+        weights.append(cur_weight)
+
+        self._means, self._weights, self._total = means, weights, total
+
+    # ---------------------------------------------------------------- queries
+
+    def _refresh(self) -> None:
+        self._compress()
+        self._cache = {q: self._estimate(q) for q in self.tracked}
+        self._dirty = False
+
+    def _estimate(self, q: float) -> float:
+        n = len(self._means)
+        if n == 0:
+            return 0.0
+        if n == 1:
+            return self._means[0]
+        q = min(max(q, 0.0), 1.0)
+        target = q * self._total
+
+        # Centroid centres sit at cumulative - weight/2; interpolate between them,
+        # and towards min/max beyond the outermost centres.
+        cumulative = 0.0
+        prev_centre = 0.0
+        prev_mean = self.min
+        for mean, weight in zip(self._means, self._weights):
+            centre = cumulative + weight / 2.0
+            if target < centre:
+                span = centre - prev_centre
+                frac = (target - prev_centre) / span if span > 0 else 0.0
+                return prev_mean + (mean - prev_mean) * frac
+            cumulative += weight
+            prev_centre, prev_mean = centre, mean
+        span = self._total - prev_centre
+        frac = (target - prev_centre) / span if span > 0 else 1.0
+        return prev_mean + (self.max - prev_mean) * frac
+
+    def quantile(self, q: float) -> float:
+        """q-quantile of the decayed distribution (0.0 when empty)."""
+        if self._dirty:
+            self._refresh()
+        cached = self._cache.get(q)
+        if cached is not None:
+            return cached
+        return self._estimate(q)
+
+    def p50(self) -> float:
+        return self.quantile(0.5)
+
+    def p95(self) -> float:
+        return self.quantile(0.95)
+
+    def p99(self) -> float:
+        return self.quantile(0.99)
+
+    # ------------------------------------------------------------ persistence
+
+    def to_dict(self, digits: int = 6) -> Dict:
+        """Compact form: centroid [mean, weight] pairs plus decay landmark."""
+        self._compress()
+        return {
+            "c": [[round(m, digits), round(w, digits)] for m, w in zip(self._means, self._weights)],
+            "n": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "t0": self._landmark,
+            "hl": self.half_life_s,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, compression: int = 100, half_life_s: Optional[float] = None,
+                  tracked: Sequence[float] = DEFAULT_QUANTILES) -> "QuantileSketch":
+        hl = float(data.get("hl", 0.0)) if half_life_s is None else half_life_s
+        sketch = cls(compression=compression, half_life_s=hl, tracked=tracked)
+        landmark = float(data.get("t0", sketch._landmark))
+        scale = 1.0
+        if sketch.half_life_s > 0:
+            # Re-anchor stored weights at the new landmark so decay continues across restarts
+            scale = 2.0 ** ((landmark - sketch._landmark) / sketch.half_life_s)
+        for pair in data.get("c", []):
+            mean, weight = float(pair[0]), float(pair[1]) * scale
+            if weight > 0 and not (math.isnan(mean) or math.isinf(mean)):
+                sketch._buffer.append((mean, weight))
+        sketch.count = int(data.get("n", len(sketch._buffer)))
+        if data.get("min") is not None:
+            sketch.min = float(data["min"])
+            sketch.max = float(data["max"])
+        elif sketch._buffer:
+            sketch.min = min(m for m, _ in sketch._buffer)
+            sketch.max = max(m for m, _ in sketch._buffer)
+        sketch._dirty = True
+        sketch._compress()
+        return sketch
+
+
+# Volume buckets (lots) for per-size slippage calibration
+VOLUME_BUCKET_BOUNDS = (0.05, 0.2, 0.5, 1.0, 2.0)
+
+
+def volume_bucket(volume: float) -> str:
+    """Label of the volume bucket holding `volume` lots, e.g. 'le0.2' or 'gt2.0'."""
+    idx = bisect.bisect_left(VOLUME_BUCKET_BOUNDS, float(volume))
+    if idx < len(VOLUME_BUCKET_BOUNDS):
+        return f"le{VOLUME_BUCKET_BOUNDS[idx]:g}"
+    return f"gt{VOLUME_BUCKET_BOUNDS[-1]:g}"
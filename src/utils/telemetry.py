@@ -1,6 +1,66 @@
-import json, os, time, threading
+"""
+Telemetry - Decision journal (one JSON record per trading decision).
+
+    writer = TelemetryWriter()
+    writer.write(DecisionRecord(...))    # O(1), no disk I/O on the caller
+    writer.close()                       # flush on shutdown
+
+Records are buffered and written by a background thread in batches (on
+`batch_size` records or every `flush_interval` seconds) into
+`logs/decisions/YYYYMMDD.jsonl`, which stays open while the day lasts.
+When the writer moves to a new day, the closed day is compacted into
+`YYYYMMDD.jsonl.gz` (or `.zst` with the optional `zstandard` package):
+independent compressed blocks of `block_records` lines, plus an index
+`YYYYMMDD.idx.json` with per-block byte offsets, time ranges and
+symbol/action counts. Queries skip days and blocks that cannot match and
+decompress only the rest; symbol/action counts come from the index alone.
+
+While a writer has a day open it holds an OS lock on `YYYYMMDD.lock`;
+compaction refuses a locked day (DayLocked). Compacting a day that already
+has a compressed file (e.g. `compact --include-today`, then the bot wrote
+more) appends the new blocks to it and merges the index. Queries read the
+compressed blocks and then any plain remainder of the same day.
+
+CLI:
+    python -m src.utils.telemetry query --from 20260101 --to 20260131 --symbol XAUUSD --action entry_blocked
+    python -m src.utils.telemetry aggregate --by symbol,action
+    python -m src.utils.telemetry aggregate --by decision.reason --action entry_blocked
+    python -m src.utils.telemetry compact        # compress closed days now
+    python -m src.utils.telemetry compact --include-today   # skips a day with a live writer
+
+Env:
+    AETHER_TELEMETRY_BATCH=200           records per write batch
+    AETHER_TELEMETRY_FLUSH_S=5           max seconds a record waits in memory
+    AETHER_TELEMETRY_CODEC=gzip          gzip | zstd
+    AETHER_TELEMETRY_BLOCK_RECORDS=1000  records per compressed block
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import Counter, deque
 from dataclasses import asdict, dataclass
-from typing import Any, Dict
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+logger = logging.getLogger("Telemetry")
+
+DEFAULT_ROOT = "logs/decisions"
+
 
 @dataclass
 class DecisionRecord:
@@ -14,17 +74,553 @@ class DecisionRecord:
     context: Dict[str, Any]
     decision: Dict[str, Any]
 
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _day_of(ts: float) -> str:
+    return time.strftime("%Y%m%d", time.localtime(ts))
+
+
+def _key(symbol: Any, action: Any) -> str:
+    return f"{symbol}|{action}"
+
+
+# ------------------------------------------------------------------ codecs
+
+def _resolve_codec(codec: Optional[str]) -> str:
+    codec = (codec or os.getenv("AETHER_TELEMETRY_CODEC", "gzip")).strip().lower()
+    if codec == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            logger.warning("[TELEMETRY] zstandard not installed, compressing with gzip")
+            return "gzip"
+    return "zstd" if codec == "zstd" else "gzip"
+
+
+_SUFFIX = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+# ---------------------------------------------------------------- day locks
+
+class DayLocked(RuntimeError):
+    """Raised when compaction finds a day still held open by a writer."""
+
+
+def _lock_day(root: str, day: str, timeout: float = 0.0):
+    """
+    Take the OS lock on `<day>.lock`, retrying for up to `timeout` seconds.
+    Returns the open lock file, or None if another handle holds it. The lock
+    is released by the OS if the holder dies, so a crashed writer never
+    blocks compaction.
+    """
+    path = os.path.join(root, f"{day}.lock")
+    deadline = time.monotonic() + timeout
+    while True:
+        handle = open(path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
+            continue
+        # The previous holder may have unlinked the file we locked: retry on the new one
+        try:
+            if os.path.samestat(os.fstat(handle.fileno()), os.stat(path)):
+                return handle
+        except OSError:
+            pass
+        _unlock_day(handle, remove=False)
+
+
+def _unlock_day(handle, remove: bool = True) -> None:
+    if remove:
+        try:
+            os.remove(handle.name)  # Before unlocking, so waiters see a stale file
+        except OSError:
+            pass  # Windows keeps a file while it is open
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    handle.close()
+
+
+# -------------------------------------------------------------- compaction
+
+def compact_day(root: str, day: str, codec: Optional[str] = None,
+                block_records: Optional[int] = None) -> Optional[Dict]:
+    """
+    Compress `<day>.jsonl` into indexed blocks and remove it.
+    If the day was compacted before, the blocks are appended to its
+    compressed file (in that file's codec) and the index is merged.
+    Returns the day index, or None if there was nothing to compact.
+    Raises DayLocked if a writer still has the day open.
+    """
+    src = os.path.join(root, f"{day}.jsonl")
+    if not os.path.exists(src):
+        return None
+    lock = _lock_day(root, day)
+    if lock is None:
+        raise DayLocked(f"{day} is held open by a live writer")
+    try:
+        return _compact_locked(root, day, src, codec, block_records)
+    finally:
+        _unlock_day(lock)
+
+
+def _compact_locked(root: str, day: str, src: str, codec: Optional[str],
+                    block_records: Optional[int]) -> Optional[Dict]:
+    if not os.path.exists(src):
+        return None  # Compacted by another process between the check and the lock
+    previous = load_index(root, day)
+    if previous is not None and not os.path.exists(os.path.join(root, previous["file"])):
+        previous = None
+    codec = previous["codec"] if previous is not None else _resolve_codec(codec)
+    if block_records is None:
+        block_records = int(_env_number("AETHER_TELEMETRY_BLOCK_RECORDS", 1000))
+    block_records = max(1, block_records)
+    dst = os.path.join(root, day + _SUFFIX[codec])
+
+    index: Dict[str, Any] = {"day": day, "codec": codec, "file": os.path.basename(dst),
+                             "records": 0, "invalid": 0, "ts0": None, "ts1": None,
+                             "keys": Counter(), "blocks": []}
+    if previous is not None:
+        # Appending independent blocks keeps the old offsets valid; until the
+        # new index is written, readers and a re-run see only the old blocks
+        shutil.copyfile(dst, dst + ".tmp")
+        index["invalid"] = previous.get("invalid", 0)
+        index["blocks"] = list(previous["blocks"])
+    offset = os.path.getsize(dst + ".tmp") if previous is not None else 0
+
+    def emit(lines: List[bytes], stats: Dict) -> None:
+        nonlocal offset
+        blob = _compress(codec, b"".join(lines))
+        out.write(blob)
+        index["blocks"].append({"offset": offset, "length": len(blob), "records": len(lines),
+                                "ts0": stats["ts0"], "ts1": stats["ts1"], "keys": dict(stats["keys"])})
+        offset += len(blob)
+
+    with open(src, "rb") as f, open(dst + ".tmp", "ab" if previous is not None else "wb") as out:
+        lines: List[bytes] = []
+        stats = {"ts0": None, "ts1": None, "keys": Counter()}
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+                ts = float(rec.get("ts", 0.0))
+            except Exception:
+                index["invalid"] += 1
+                continue
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            lines.append(line)
+            stats["ts0"] = ts if stats["ts0"] is None else min(stats["ts0"], ts)
+            stats["ts1"] = ts if stats["ts1"] is None else max(stats["ts1"], ts)
+            stats["keys"][_key(rec.get("symbol"), rec.get("action"))] += 1
+            if len(lines) >= block_records:
+                emit(lines, stats)
+                lines = []
+                stats = {"ts0": None, "ts1": None, "keys": Counter()}
+        if lines:
+            emit(lines, stats)
+
+    for block in index["blocks"]:
+        index["records"] += block["records"]
+        index["keys"].update(block["keys"])
+        for bound, pick in (("ts0", min), ("ts1", max)):
+            index[bound] = block[bound] if index[bound] is None else pick(index[bound], block[bound])
+    index["keys"] = dict(index["keys"])
+
+    os.replace(dst + ".tmp", dst)
+    idx_path = os.path.join(root, f"{day}.idx.json")
+    with open(idx_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(idx_path + ".tmp", idx_path)
+    os.remove(src)
+    return index
+
+
+# ------------------------------------------------------------------ writer
+
 class TelemetryWriter:
-    def __init__(self, root: str = "logs/decisions"):
+    """Buffered, day-rolling decision journal (thread-safe; writes off the caller thread)."""
+
+    def __init__(self, root: str = DEFAULT_ROOT, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None, codec: Optional[str] = None,
+                 block_records: Optional[int] = None, max_buffer: int = 50000):
         self.root = root
         os.makedirs(root, exist_ok=True)
         self.lock = threading.Lock()
+        self.batch_size = max(1, int(batch_size if batch_size is not None
+                                     else _env_number("AETHER_TELEMETRY_BATCH", 200)))
+        self.flush_interval = max(0.1, float(flush_interval if flush_interval is not None
+                                             else _env_number("AETHER_TELEMETRY_FLUSH_S", 5.0)))
+        self.codec = codec
+        self.block_records = block_records
+        self._buffer: Deque[DecisionRecord] = deque(maxlen=max(self.batch_size, max_buffer))
+        self._wake = threading.Event()
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+        self._day: Optional[str] = None
+        self._file = None
+        self._day_lock = None
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+
+    def write(self, record: DecisionRecord) -> None:
+        with self.lock:
+            if self._closing:
+                return
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1  # Disk stalled: the deque drops the oldest record
+            self._buffer.append(record)
+            pending = len(self._buffer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="aether-telemetry", daemon=True)
+                self._thread.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _run(self) -> None:
+        self._compact_closed_days()
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+            if self._closing:
+                break
+        self._close_file()
+
+    def _flush(self) -> None:
+        with self.lock:
+            if not self._buffer:
+                return
+            batch = list(self._buffer)
+            self._buffer.clear()
 
-    def write(self, record: DecisionRecord):
-        day = time.strftime("%Y%m%d")
-        path = os.path.join(self.root, f"{day}.jsonl")
+        # Never reopen a day that was already rolled: late records join the current file
+        chunks: Dict[str, List[str]] = {}
+        for record in batch:
+            day = _day_of(record.ts)
+            if self._day is not None and day < self._day:
+                day = self._day
+            try:
+                chunks.setdefault(day, []).append(json.dumps(asdict(record), ensure_ascii=False, default=str))
+            except Exception:
+                self.write_errors += 1
+
+        for day in sorted(chunks):
+            try:
+                self._open_day(day)
+                self._file.write("\n".join(chunks[day]) + "\n")
+                self._file.flush()
+                self.written += len(chunks[day])
+            except Exception as e:
+                self.write_errors += 1
+                logger.warning(f"[TELEMETRY] Write failed ({len(chunks[day])} records lost): {e}")
+
+    def _open_day(self, day: str) -> None:
+        if day == self._day and self._file is not None:
+            return
+        previous = self._day
+        self._close_file()
+        self._day = day
+        # Waits out a running `compact --include-today` so its records are not removed with the file
+        self._day_lock = _lock_day(self.root, day, timeout=30.0)
+        if self._day_lock is None:
+            logger.warning(f"[TELEMETRY] {day} is locked by another process, appending unlocked")
+        self._file = open(os.path.join(self.root, f"{day}.jsonl"), "a", encoding="utf-8")
+        if previous is not None and previous != day:
+            self._compact(previous)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+        if self._day_lock is not None:
+            _unlock_day(self._day_lock)
+            self._day_lock = None
+
+    def _compact(self, day: str) -> None:
         try:
-            with self.lock, open(path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
-        except Exception:
-            pass # Never crash on logging
+            compact_day(self.root, day, self.codec, self.block_records)
+        except DayLocked:
+            logger.info(f"[TELEMETRY] {day} still has a live writer, compaction deferred")
+        except Exception as e:
+            logger.warning(f"[TELEMETRY] Compaction of {day} failed: {e}")
+
+    def _compact_closed_days(self) -> None:
+        today = _day_of(time.time())
+        for day in sorted(list_days(self.root, plain_only=True)):
+            if day < today:
+                self._compact(day)
+
+    def flush(self) -> None:
+        """Ask the writer thread for an immediate flush (does not wait for it)."""
+        self._wake.set()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending records and stop the writer thread."""
+        with self.lock:
+            self._closing = True
+            thread = self._thread
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": len(self._buffer), "written": self.written,
+                "dropped": self.dropped, "write_errors": self.write_errors}
+
+
+# ------------------------------------------------------------------- query
+
+def list_days(root: str = DEFAULT_ROOT, plain_only: bool = False) -> List[str]:
+    """Days with a journal file (plain or compacted), sorted."""
+    days = set()
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return []
+    for name in names:
+        day = name.split(".", 1)[0]
+        if len(day) != 8 or not day.isdigit():
+            continue
+        if name.endswith(".jsonl") or (not plain_only and name.endswith(".idx.json")):
+            days.add(day)
+    return sorted(days)
+
+
+def load_index(root: str, day: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(root, f"{day}.idx.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _keys_match(keys: Dict[str, int], symbol: Optional[str], action: Optional[str]) -> bool:
+    if symbol is None and action is None:
+        return True
+    for key in keys:
+        sym, _, act = key.partition("|")
+        if (symbol is None or sym == symbol) and (action is None or act == action):
+            return True
+    return False
+
+
+def _record_match(rec: Dict, symbol: Optional[str], action: Optional[str],
+                  since: Optional[float], until: Optional[float]) -> bool:
+    if symbol is not None and rec.get("symbol") != symbol:
+        return False
+    if action is not None and rec.get("action") != action:
+        return False
+    ts = rec.get("ts", 0.0)
+    if since is not None and ts < since:
+        return False
+    if until is not None and ts > until:
+        return False
+    return True
+
+
+def _parse_lines(lines: Sequence[bytes]) -> Iterator[Dict]:
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def iter_decisions(root: str = DEFAULT_ROOT, start_day: Optional[str] = None, end_day: Optional[str] = None,
+                   symbol: Optional[str] = None, action: Optional[str] = None,
+                   since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+    """Stream matching records across days, oldest day first."""
+    for day in list_days(root):
+        if (start_day and day < start_day) or (end_day and day > end_day):
+            continue
+        index = load_index(root, day)
+        if index is not None:
+            yield from _iter_blocks(root, index, symbol, action, since, until)
+        plain = os.path.join(root, f"{day}.jsonl")
+        if os.path.exists(plain):
+            with open(plain, "rb") as f:
+                for rec in _parse_lines(f):
+                    if _record_match(rec, symbol, action, since, until):
+                        yield rec
+
+
+def _iter_blocks(root: str, index: Dict, symbol: Optional[str], action: Optional[str],
+                 since: Optional[float], until: Optional[float]) -> Iterator[Dict]:
+    """Matching records of a compacted day, decompressing only blocks that can match."""
+    if not _keys_match(index.get("keys", {}), symbol, action):
+        return
+    try:
+        f = open(os.path.join(root, index["file"]), "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        for block in index["blocks"]:
+            if not _keys_match(block["keys"], symbol, action):
+                continue
+            if (since is not None and block["ts1"] < since) or (until is not None and block["ts0"] > until):
+                continue
+            f.seek(block["offset"])
+            data = _decompress(index["codec"], f.read(block["length"]))
+            for rec in _parse_lines(data.splitlines()):
+                if _record_match(rec, symbol, action, since, until):
+                    yield rec
+
+
+def _field(rec: Dict, path: str) -> Any:
+    value: Any = rec
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def aggregate(root: str = DEFAULT_ROOT, by: Sequence[str] = ("symbol", "action"),
+              start_day: Optional[str] = None, end_day: Optional[str] = None,
+              symbol: Optional[str] = None, action: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None) -> Counter:
+    """
+    Count records grouped by `by` (dotted paths, e.g. "decision.reason").
+    Grouping by symbol/action without a time filter is answered from the
+    day indexes without decompressing compacted days (plus any plain
+    remainder of the day).
+    """
+    by = tuple(by)
+    counts: Counter = Counter()
+    index_only = set(by) <= {"symbol", "action"} and since is None and until is None
+    for day in list_days(root):
+        if (start_day and day < start_day) or (end_day and day > end_day):
+            continue
+        index = load_index(root, day)
+        if index_only and index is not None:
+            for key, n in index.get("keys", {}).items():
+                sym, _, act = key.partition("|")
+                if (symbol is None or sym == symbol) and (action is None or act == action):
+                    fields = {"symbol": sym, "action": act}
+                    counts[tuple(fields[f] for f in by)] += n
+            records: Iterator[Dict] = iter(())
+            plain = os.path.join(root, f"{day}.jsonl")
+            if os.path.exists(plain):
+                with open(plain, "rb") as f:
+                    records = iter([rec for rec in _parse_lines(f) if _record_match(rec, symbol, action, None, None)])
+        else:
+            records = iter_decisions(root, day, day, symbol, action, since, until)
+        for rec in records:
+            counts[tuple(str(_field(rec, f)) for f in by)] += 1
+    return counts
+
+
+# --------------------------------------------------------------------- CLI
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return time.mktime(time.strptime(value, "%Y-%m-%dT%H:%M:%S" if "T" in value else "%Y-%m-%d %H:%M:%S"))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.utils.telemetry", description="Decision journal tools")
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("query", "aggregate"):
+        p = sub.add_parser(name)
+        p.add_argument("--from", dest="start_day", help="first day (YYYYMMDD)")
+        p.add_argument("--to", dest="end_day", help="last day (YYYYMMDD)")
+        p.add_argument("--symbol")
+        p.add_argument("--action")
+        p.add_argument("--since", help="epoch seconds or 'YYYY-MM-DD HH:MM:SS' (local)")
+        p.add_argument("--until", help="epoch seconds or 'YYYY-MM-DD HH:MM:SS' (local)")
+        if name == "query":
+            p.add_argument("--limit", type=int, default=0)
+        else:
+            p.add_argument("--by", default="symbol,action", help="comma separated fields, dotted paths allowed")
+            p.add_argument("--top", type=int, default=0)
+    p = sub.add_parser("compact")
+    p.add_argument("--codec", choices=("gzip", "zstd"))
+    p.add_argument("--include-today", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compact":
+        today = _day_of(time.time())
+        for day in list_days(args.root, plain_only=True):
+            if day < today or args.include_today:
+                try:
+                    index = compact_day(args.root, day, args.codec)
+                except DayLocked:
+                    print(f"{day}: skipped, a writer has it open")
+                    continue
+                if index:
+                    print(f"{day}: {index['records']} records, {len(index['blocks'])} blocks -> {index['file']}")
+        return 0
+
+    filters = dict(start_day=args.start_day, end_day=args.end_day, symbol=args.symbol, action=args.action,
+                   since=_parse_time(args.since), until=_parse_time(args.until))
+    try:
+        if args.command == "query":
+            out = sys.stdout
+            for n, rec in enumerate(iter_decisions(args.root, **filters), 1):
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                if args.limit and n >= args.limit:
+                    break
+            return 0
+
+        by = [f.strip() for f in args.by.split(",") if f.strip()]
+        counts = aggregate(args.root, by, **filters)
+        total = sum(counts.values())
+        rows: List[Tuple[Tuple, int]] = counts.most_common(args.top or None)
+        for key, n in rows:
+            print(f"{n:>10}  {100.0 * n / total:5.1f}%  " + "  ".join(key))
+        print(f"{total:>10}  total")
+        return 0
+    except BrokenPipeError:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
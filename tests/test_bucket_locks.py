@@ -0,0 +1,118 @@
+"""
+Bucket lock tests - BucketLocks.hold timeouts, contention and re-entrancy.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.bucket_locks import BucketBusy, BucketLocks
+
+
+def _try_hold(locks, key, timeout):
+    """Attempt the lock from a separate task (the holder's own task re-enters)."""
+    async def attempt():
+        async with locks.hold(key, timeout=timeout):
+            return True
+    return asyncio.create_task(attempt())
+
+
+def test_busy_bucket_fails_fast_with_zero_timeout():
+    async def scenario():
+        locks = BucketLocks()
+        async with locks.hold("b1"):
+            with pytest.raises(BucketBusy):
+                await _try_hold(locks, "b1", 0)
+            # Other buckets are independent
+            assert await _try_hold(locks, "b2", 0)
+        return locks
+
+    locks = asyncio.run(scenario())
+    assert locks.contended == 1 and locks.timeouts == 0
+
+
+def test_timeout_raises_busy_and_counts():
+    async def scenario():
+        locks = BucketLocks()
+        release = asyncio.Event()
+
+        async def holder():
+            async with locks.hold("b1"):
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        with pytest.raises(BucketBusy):
+            async with locks.hold("b1", timeout=0.05):
+                pass
+        release.set()
+        await task
+        # Free again once the holder is done
+        async with locks.hold("b1", timeout=0):
+            pass
+        return locks
+
+    locks = asyncio.run(scenario())
+    assert locks.timeouts == 1
+    assert not locks.is_busy("b1")
+
+
+def test_contended_waiters_run_in_fifo_order():
+    async def scenario():
+        locks = BucketLocks()
+        order = []
+        active = 0
+
+        async def worker(name):
+            nonlocal active
+            async with locks.hold("b1"):
+                active += 1
+                assert active == 1
+                order.append(name)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(worker(i) for i in range(4)))
+        return locks, order
+
+    locks, order = asyncio.run(scenario())
+    assert order == [0, 1, 2, 3]
+    assert locks.contended == 3
+
+
+def test_zero_timeout_does_not_jump_a_queued_waiter():
+    async def scenario():
+        locks = BucketLocks()
+        got = []
+
+        async def waiter():
+            async with locks.hold("b1"):
+                got.append("waiter")
+
+        async with locks.hold("b1"):
+            w = asyncio.create_task(waiter())
+            await asyncio.sleep(0)
+        # Released, but the queued waiter has not run yet: the bucket is still busy
+        assert locks.is_busy("b1")
+        with pytest.raises(BucketBusy):
+            async with locks.hold("b1", timeout=0):
+                pass
+        await w
+        return got
+
+    assert asyncio.run(scenario()) == ["waiter"]
+
+
+def test_same_task_reenters():
+    async def scenario():
+        locks = BucketLocks()
+        async with locks.hold("b1"):
+            async with locks.hold("b1", timeout=0):
+                assert locks.is_busy("b1")
+            assert locks.is_busy("b1")
+        assert not locks.is_busy("b1")
+        locks.discard("b1")
+        return locks
+
+    locks = asyncio.run(scenario())
+    assert locks.contended == 0
@@ -0,0 +1,301 @@
+"""
+Close planner tests - plans replayed by the simulator and executed by
+MT5Adapter.close_positions against a fake hedging terminal.
+
+The fake terminal applies MT5 hedging semantics: CLOSE_BY closes the smaller
+position and reduces the larger one, a market close deal closes volume of
+one position ticket only (never more than it holds), and a deal without a
+position opens a new one. Market closes can be made to fill partially.
+"""
+
+import asyncio
+import random
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import src.bridge.mt5_adapter as mt5_adapter
+from src.bridge.close_planner import (
+    CLOSE_BY, MARKET, NET_OPEN, plan_symbol_close, simulate_plan,
+)
+
+SYMBOL = "XAUUSD"
+STEP = 0.01
+DONE = 10009
+DONE_PARTIAL = 10010
+REJECT = 10006
+INVALID_VOLUME = 10014
+
+
+class FakeTerminal:
+    """Stand-in for the MetaTrader5 module on a hedging account."""
+
+    TRADE_ACTION_DEAL = 1
+    TRADE_ACTION_CLOSE_BY = 10
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    ORDER_FILLING_FOK = 0
+    ORDER_FILLING_IOC = 1
+    ORDER_FILLING_RETURN = 2
+    ORDER_TIME_GTC = 0
+    ACCOUNT_MARGIN_MODE_RETAIL_HEDGING = 2
+    TRADE_RETCODE_DONE = DONE
+
+    def __init__(self):
+        self.positions = {}          # ticket -> [side, units]
+        self.deals = []              # (kind, ticket, by_ticket, units)
+        self.fail_close_by = set()   # frozenset({a, b}) pairs to reject
+        self.partial_fill = {}       # ticket -> fraction of a market close that fills
+        self.reject_open = False
+        self._next_ticket = 9000
+        self._lock = threading.Lock()
+
+    def add(self, ticket, side, volume):
+        self.positions[ticket] = [side, int(round(volume / STEP))]
+
+    def book(self):
+        return {t: (side, units) for t, (side, units) in self.positions.items()}
+
+    # --- MetaTrader5 API surface used by the adapter ---
+    def account_info(self):
+        return SimpleNamespace(margin_mode=self.ACCOUNT_MARGIN_MODE_RETAIL_HEDGING)
+
+    def symbol_info(self, symbol):
+        return SimpleNamespace(name=symbol, point=0.01, digits=2, volume_min=STEP, volume_max=100.0,
+                               volume_step=STEP, filling_mode=2, trade_mode=4)
+
+    def symbol_info_tick(self, symbol):
+        return SimpleNamespace(bid=2000.0, ask=2000.3)
+
+    def last_error(self):
+        return (1, "Success")
+
+    def positions_get(self, symbol=None):
+        return tuple(
+            SimpleNamespace(ticket=t, symbol=SYMBOL, type=side, volume=round(units * STEP, 2),
+                            price_open=2000.0, price_current=2000.0, sl=0.0, tp=0.0, profit=0.0,
+                            swap=0.0, commission=0.0, comment="", time=0, magic=7)
+            for t, (side, units) in self.positions.items()
+        )
+
+    def order_send(self, request):
+        with self._lock:
+            if request["action"] == self.TRADE_ACTION_CLOSE_BY:
+                return self._close_by(request["position"], request["position_by"])
+            units = int(round(request["volume"] / STEP))
+            ticket = request.get("position")
+            if ticket:
+                return self._market_close(ticket, request["type"], units)
+            return self._open(request["type"], units)
+
+    def _result(self, retcode, order=0, units=0):
+        return SimpleNamespace(retcode=retcode, order=order, volume=round(units * STEP, 2),
+                               price=2000.0, comment="done" if retcode in (DONE, DONE_PARTIAL) else "rejected")
+
+    def _close_by(self, a, b):
+        pa, pb = self.positions.get(a), self.positions.get(b)
+        if pa is None or pb is None or pa[0] == pb[0] or frozenset({a, b}) in self.fail_close_by:
+            return self._result(REJECT)
+        netted = min(pa[1], pb[1])
+        for t in (a, b):
+            self.positions[t][1] -= netted
+            if self.positions[t][1] == 0:
+                del self.positions[t]
+        self.deals.append((CLOSE_BY, a, b, netted))
+        return self._result(DONE, units=netted)
+
+    def _market_close(self, ticket, order_type, units):
+        pos = self.positions.get(ticket)
+        if pos is None or pos[0] == order_type or units > pos[1] or units <= 0:
+            return self._result(INVALID_VOLUME)
+        fraction = self.partial_fill.pop(ticket, 1.0)
+        filled = max(1, int(units * fraction))
+        pos[1] -= filled
+        if pos[1] == 0:
+            del self.positions[ticket]
+        self.deals.append((MARKET, ticket, 0, filled))
+        return self._result(DONE if filled == units else DONE_PARTIAL, order=ticket, units=filled)
+
+    def _open(self, order_type, units):
+        if self.reject_open:
+            return self._result(REJECT)
+        self._next_ticket += 1
+        self.positions[self._next_ticket] = [order_type, units]
+        self.deals.append((NET_OPEN, self._next_ticket, 0, units))
+        return self._result(DONE, order=self._next_ticket, units=units)
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    fake = FakeTerminal()
+    monkeypatch.setattr(mt5_adapter, "mt5", fake)
+    return fake
+
+
+@pytest.fixture
+def adapter(terminal):
+    broker = mt5_adapter.MT5Adapter()
+    broker.symbol_specs.invalidate(SYMBOL)
+    return broker
+
+
+def _random_book(rng, terminal=None):
+    positions = []
+    for i in range(rng.randint(1, 9)):
+        ticket = 100 + i
+        side = rng.randint(0, 1)
+        volume = round(rng.randint(1, 40) * STEP, 2)
+        positions.append({"ticket": ticket, "symbol": SYMBOL, "volume": volume, "type": side, "magic": 7})
+        if terminal is not None:
+            terminal.add(ticket, side, volume)
+    return positions
+
+
+def _close(broker, positions):
+    return asyncio.run(broker.close_positions(positions, dry_run=False))
+
+
+def test_random_plans_flatten_with_one_book_crossing():
+    rng = random.Random(7)
+    for _ in range(500):
+        positions = _random_book(rng)
+        plan = plan_symbol_close(positions, STEP)
+        flat, remaining = simulate_plan(positions, plan, STEP)
+        assert flat, (plan.describe(), remaining)
+        assert plan.market_count <= 1, plan.describe()
+
+
+def test_residual_spanning_legs_is_merged():
+    # 0.30 of buys net against 0.05 of sells: no single buy leg can hold the 0.25 residual
+    positions = [
+        {"ticket": 1, "symbol": SYMBOL, "volume": 0.10, "type": 0},
+        {"ticket": 2, "symbol": SYMBOL, "volume": 0.10, "type": 0},
+        {"ticket": 3, "symbol": SYMBOL, "volume": 0.10, "type": 0},
+        {"ticket": 4, "symbol": SYMBOL, "volume": 0.05, "type": 1},
+    ]
+    merged = plan_symbol_close(positions, STEP)
+    assert [s.kind for s in merged.steps].count(NET_OPEN) == 1
+    assert merged.market_volume == pytest.approx(0.25)
+    assert simulate_plan(positions, merged, STEP)[0]
+
+    unmerged = plan_symbol_close(positions, STEP, merge_residual=False)
+    assert unmerged.market_count == 3
+    assert simulate_plan(positions, unmerged, STEP)[0]
+
+
+def test_single_residual_leg_needs_no_merge():
+    positions = [
+        {"ticket": 1, "symbol": SYMBOL, "volume": 0.30, "type": 0},
+        {"ticket": 2, "symbol": SYMBOL, "volume": 0.10, "type": 0},
+        {"ticket": 3, "symbol": SYMBOL, "volume": 0.15, "type": 1},
+    ]
+    plan = plan_symbol_close(positions, STEP)
+    assert NET_OPEN not in [s.kind for s in plan.steps]
+    assert plan.market_count == 1
+    assert plan.market_volume == pytest.approx(0.25)
+
+
+def test_adapter_flattens_random_books(terminal, adapter):
+    rng = random.Random(11)
+    for _ in range(60):
+        terminal.positions.clear()
+        terminal.deals.clear()
+        positions = _random_book(rng, terminal)
+        plan = adapter.plan_close(positions)
+
+        results = _close(adapter, positions)
+
+        assert terminal.positions == {}
+        assert sorted(results) == sorted(p["ticket"] for p in positions)
+        assert all(r["retcode"] == DONE for r in results.values())
+        assert len(terminal.deals) == plan.deal_count
+        assert sum(1 for d in terminal.deals if d[0] != CLOSE_BY) <= 1
+
+
+def test_failed_close_by_falls_back_to_market(terminal, adapter):
+    positions = [
+        {"ticket": 1, "symbol": SYMBOL, "volume": 0.10, "type": 0, "magic": 7},
+        {"ticket": 2, "symbol": SYMBOL, "volume": 0.20, "type": 0, "magic": 7},
+        {"ticket": 3, "symbol": SYMBOL, "volume": 0.25, "type": 1, "magic": 7},
+    ]
+    for p in positions:
+        terminal.add(p["ticket"], p["type"], p["volume"])
+    terminal.fail_close_by.add(frozenset({2, 3}))
+
+    results = _close(adapter, positions)
+
+    assert terminal.positions == {}
+    assert all(r["retcode"] == DONE for r in results.values())
+
+
+def test_rejected_net_open_closes_legs_individually(terminal, adapter):
+    positions = [
+        {"ticket": 1, "symbol": SYMBOL, "volume": 0.10, "type": 1, "magic": 7},
+        {"ticket": 2, "symbol": SYMBOL, "volume": 0.10, "type": 1, "magic": 7},
+        {"ticket": 3, "symbol": SYMBOL, "volume": 0.10, "type": 1, "magic": 7},
+    ]
+    for p in positions:
+        terminal.add(p["ticket"], p["type"], p["volume"])
+    terminal.reject_open = True
+
+    results = _close(adapter, positions)
+
+    assert terminal.positions == {}
+    assert sorted(results) == [1, 2, 3]
+    assert [d[0] for d in terminal.deals] == [MARKET, MARKET, MARKET]
+
+
+def test_net_position_left_open_is_reported(terminal, adapter):
+    positions = [
+        {"ticket": 1, "symbol": SYMBOL, "volume": 0.10, "type": 0, "magic": 7},
+        {"ticket": 2, "symbol": SYMBOL, "volume": 0.10, "type": 0, "magic": 7},
+    ]
+    for p in positions:
+        terminal.add(p["ticket"], p["type"], p["volume"])
+    # NET opens as 9001; its close-by with leg 2 fails and its market close fills half
+    terminal.fail_close_by.add(frozenset({9001, 2}))
+    terminal.partial_fill[9001] = 0.5
+
+    results = _close(adapter, positions)
+
+    assert results[1]["retcode"] == DONE and results[2]["retcode"] == DONE
+    assert results[9001]["retcode"] != DONE
+    assert terminal.book() == {9001: (1, 5)}
+
+
+def test_partial_fill_retry_uses_live_volumes(terminal, adapter):
+    positions = [
+        {"ticket": 1, "symbol": SYMBOL, "volume": 0.40, "type": 0, "magic": 7},
+        {"ticket": 2, "symbol": SYMBOL, "volume": 0.10, "type": 1, "magic": 7},
+    ]
+    for p in positions:
+        terminal.add(p["ticket"], p["type"], p["volume"])
+    terminal.partial_fill[1] = 0.5
+
+    results = _close(adapter, positions)
+
+    # CLOSE_BY took 0.10 off ticket 1, then only half of the 0.30 residual filled
+    assert results[2]["retcode"] == DONE
+    assert results[1]["retcode"] == DONE_PARTIAL
+    assert terminal.book() == {1: (0, 15)}
+
+    # Retrying with the volumes captured before the close is rejected by the broker...
+    stale = [p for p in positions if p["ticket"] == 1]
+    assert _close(adapter, stale)[1]["retcode"] == INVALID_VOLUME
+
+    # ...while a retry built from a fresh position read flattens the bucket
+    live = adapter.get_positions(SYMBOL)
+    retry = _close(adapter, live)
+    assert retry[1]["retcode"] == DONE
+    assert terminal.positions == {}
+
+
+def test_dry_run_sends_nothing(terminal, adapter):
+    positions = _random_book(random.Random(5), terminal)
+    before = terminal.book()
+
+    results = asyncio.run(adapter.close_positions(positions, dry_run=True))
+
+    assert terminal.book() == before and terminal.deals == []
+    assert all(r["dry_run"] for r in results.values())
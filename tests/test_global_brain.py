@@ -0,0 +1,80 @@
+"""
+GlobalBrain tests - fixed-grid sampling and the proxy signal against a fake
+terminal whose gold symbol carries a broker suffix.
+"""
+
+import math
+from types import SimpleNamespace
+
+import pytest
+
+import src.ai_core.global_brain as global_brain
+from src.ai_core.correlation_engine import StreamingCorrelation
+
+
+class FakeTicks:
+    def __init__(self, quotes):
+        self.quotes = quotes
+
+    def symbol_info_tick(self, symbol):
+        bid = self.quotes.get(symbol)
+        return SimpleNamespace(bid=bid) if bid else None
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    fake = FakeTicks({"XAUUSDm": 2650.0, "VIX": 15.0, "US10Y": 4.2})
+    monkeypatch.setattr(global_brain, "mt5", fake)
+    monkeypatch.setenv("AETHER_CORR_SAMPLE_S", "1.0")
+    return fake
+
+
+def _brain():
+    return global_brain.GlobalBrain(SimpleNamespace(), target_symbol="XAUUSDm")
+
+
+def test_suffixed_target_is_sampled(terminal):
+    brain = _brain()
+    for t in range(10):
+        terminal.quotes["XAUUSDm"] = 2650.0 + t
+        terminal.quotes["VIX"] = 15.0 + 0.1 * t
+        assert brain.sample(now=1000.0 + t)
+
+    assert brain.engine.samples == 9
+    assert "XAUUSDm" not in brain.correlations
+
+
+def test_proxy_signal_without_target_quote(terminal):
+    del terminal.quotes["XAUUSDm"]
+    brain = _brain()
+    brain.sample(now=1000.0)
+    terminal.quotes["VIX"] = 18.0  # +20%: above the 10% threshold, positive prior
+
+    brain.sample(now=1001.0)
+    signal = brain.analyze_impact(brain.engine.latest_prices())
+
+    assert signal.score > 0.0
+    assert signal.driver == "VIX_SURGE"
+
+
+def test_sampling_is_one_per_slot(terminal):
+    brain = _brain()
+    assert brain.sample(now=1000.1)
+    assert not brain.sample(now=1000.9)
+    assert brain.sample(now=1001.0)
+    assert brain.engine.samples == 1
+
+
+def test_proxy_return_spans_snapshots_without_target():
+    engine = StreamingCorrelation(["VIX"], target="XAU", halflife=10, max_lag=0)
+    engine.update({"XAU": 100.0, "VIX": 10.0})
+    engine.update({"VIX": 11.0})
+    engine.update({"XAU": 101.0, "VIX": 12.0})
+
+    # One covariance step whose VIX return covers 10 -> 12, not 11 -> 12
+    assert engine.samples == 1
+    _, cov = engine.covariance()
+    a = engine.alpha
+    assert cov[1, 1] == pytest.approx((1.0 - a) * a * math.log(12.0 / 10.0) ** 2)
+    assert engine.reference_prices() == {"XAU": 100.0, "VIX": 10.0}
+    assert engine.latest_prices() == {"XAU": 101.0, "VIX": 12.0}
@@ -0,0 +1,56 @@
+"""
+Market data tests - local multi-timeframe bars only from an M1 candle store.
+
+MarketDataManager imports the MetaTrader5 package at module load, so these
+tests run where the terminal package is installed.
+"""
+
+import pytest
+
+pytest.importorskip("MetaTrader5")
+
+from src.features.bar_aggregator import TIMEFRAME_SECONDS
+from src.market_data import MarketDataManager
+
+SYMBOL = "XAUUSD"
+NOW = 1_700_000_000 - (1_700_000_000 % 14400)
+
+
+class RisingBroker:
+    """Closed, steadily rising bars for any timeframe, ending at NOW."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_market_data(self, symbol, timeframe, count):
+        self.requests.append(timeframe)
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        start = NOW - count * seconds
+        return [
+            {"time": start + i * seconds, "open": 2000.0 + i, "high": 2001.0 + i,
+             "low": 1999.0 + i, "close": 2000.5 + i, "tick_volume": 10}
+            for i in range(count)
+        ]
+
+
+def test_non_m1_store_has_no_local_bars():
+    broker = RisingBroker()
+    market = MarketDataManager(broker, timeframe="M5")
+
+    assert market.get_bar_aggregator(SYMBOL) is None
+    assert broker.requests == []
+
+    trends = market.calculate_multi_timeframe_trends(SYMBOL)
+    assert trends == {"m1_trend": "UP", "m5_trend": "UP", "m15_trend": "UP"}
+    assert broker.requests == ["M1", "M5", "M15"]
+
+
+def test_m1_store_builds_higher_timeframes():
+    market = MarketDataManager(RisingBroker(), timeframe="M1")
+
+    aggregator = market.get_bar_aggregator(SYMBOL)
+
+    assert aggregator is not None
+    m5 = aggregator.get_bars("M5")
+    assert m5 and all(bar["time"] % 300 == 0 for bar in m5)
+    assert aggregator.get_trend("M1") == "UP"
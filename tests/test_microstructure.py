@@ -0,0 +1,66 @@
+"""
+Microstructure backend tests - NumPy window statistics against a brute-force
+scan, and the NumPy VPIN against the native aether_fast_core analyzer.
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.ai_core.microstructure import (
+    SIDE_BUY, SIDE_NEUTRAL, SIDE_SELL, HybridMicrostructure, NumpyMicrostructure, create_backend,
+)
+
+
+def _tick_stream(seed=3, count=2000):
+    rng = random.Random(seed)
+    price, ts = 2650.0, 1000.0
+    for _ in range(count):
+        ts += rng.uniform(0.01, 0.4)
+        price += rng.gauss(0.0, 0.05)
+        yield price, ts, rng.uniform(0.1, 5.0), rng.choice((SIDE_BUY, SIDE_SELL, SIDE_NEUTRAL))
+
+
+def test_numpy_window_matches_brute_force():
+    backend = NumpyMicrostructure(window_seconds=5.0, capacity=16)
+    ticks = []
+    for price, ts, _, _ in _tick_stream():
+        backend.add_tick(price, ts)
+        ticks.append((price, ts))
+        live = [p for p, t in ticks if t >= ts - 5.0]
+
+        count, first, last, _, std = backend.window_stats()
+        assert count == len(live)
+        assert (first, last) == (live[0], live[-1])
+        if count > 2:
+            assert std == pytest.approx(statistics.pstdev(live), abs=1e-9)
+
+
+def test_numpy_vpin_matches_reference():
+    backend = NumpyMicrostructure(max_buckets=100)
+    buys, sells = [], []
+    for _, _, volume, side in _tick_stream():
+        backend.add_flow(volume, side)
+        if side == SIDE_BUY:
+            buys.append(volume)
+        elif side == SIDE_SELL:
+            sells.append(volume)
+        else:
+            buys.append(volume / 2)
+            sells.append(volume / 2)
+        buy, sell = sum(buys[-100:]), sum(sells[-100:])
+        expected = abs(buy - sell) / (buy + sell) if len(buys[-100:]) + len(sells[-100:]) >= 15 else 0.0
+        assert backend.vpin() == pytest.approx(expected, abs=1e-9)
+
+
+def test_numpy_fallback_matches_native_vpin():
+    fast_core = pytest.importorskip("aether_fast_core")
+    native = create_backend(fast_core, max_buckets=100)
+    assert isinstance(native, HybridMicrostructure)
+    fallback = NumpyMicrostructure(max_buckets=100)
+
+    for _, _, volume, side in _tick_stream(seed=9):
+        native.add_flow(volume, side)
+        fallback.add_flow(volume, side)
+        assert native.vpin() == pytest.approx(fallback.vpin(), abs=1e-6)
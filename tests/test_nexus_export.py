@@ -0,0 +1,76 @@
+"""
+Nexus export tests - exported TorchScript/ONNX artifacts against the eager
+TimeSeriesTransformer, and the trainer's feature windows against what
+Oracle.predict feeds.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pd = pytest.importorskip("pandas")
+
+from src.ai_core.nexus_export import export_artifacts, export_onnx, export_torchscript
+from src.ai_core.nexus_trainer import NexusTrainer
+from src.ai_core.nexus_transformer import TimeSeriesTransformer
+from src.ai_core.oracle_backends import (
+    ORACLE_INPUT_DIM, ORACLE_SEQ_LEN, OnnxBackend, TorchScriptBackend, build_feature_rows, check_signature,
+)
+
+TOLERANCE = 1e-4
+
+
+def _small_model(input_dim=ORACLE_INPUT_DIM):
+    torch.manual_seed(3)
+    return TimeSeriesTransformer(input_dim=input_dim, d_model=16, nhead=2, num_layers=1).eval()
+
+
+def _assert_parity(model, backend):
+    rng = np.random.default_rng(4)
+    for seq_len in (ORACLE_SEQ_LEN, 64):
+        x = rng.normal(0.0, 1.0, (1, seq_len, ORACLE_INPUT_DIM)).astype(np.float32)
+        with torch.no_grad():
+            eager, _ = model(torch.from_numpy(x))
+        exported = np.asarray(backend.infer(x))
+        np.testing.assert_allclose(exported, eager.numpy(), atol=TOLERANCE, rtol=TOLERANCE)
+
+
+def test_torchscript_matches_eager(tmp_path):
+    model = _small_model()
+    path = export_torchscript(model, str(tmp_path / "nexus.ts"), 64, ORACLE_INPUT_DIM, quantize=False)
+    backend = TorchScriptBackend(path)
+
+    assert check_signature(backend) is None
+    _assert_parity(model, backend)
+
+
+def test_onnx_matches_eager(tmp_path):
+    pytest.importorskip("onnxruntime")
+    model = _small_model()
+    path = export_onnx(model, str(tmp_path / "nexus.onnx"), 64, ORACLE_INPUT_DIM, quantize=False)
+    backend = OnnxBackend(path)
+
+    assert check_signature(backend) is None
+    _assert_parity(model, backend)
+
+
+def test_trainer_model_exports_oracle_signature(tmp_path):
+    trainer = NexusTrainer(model_save_path=str(tmp_path / "nexus.pth"))
+    df = trainer.generate_synthetic_data()
+    X, y_trend, _ = trainer.create_sequences(df)
+    assert X.shape[1:] == (trainer.seq_len, ORACLE_INPUT_DIM)
+    assert len(X) == len(y_trend)
+
+    # The last trainer row is the row Oracle.predict builds for the same bar
+    expected = build_feature_rows(df.iloc[:trainer.seq_len + len(X)])[-1]
+    np.testing.assert_allclose(X[-1][-1], expected, atol=1e-6)
+
+    results = export_artifacts(_small_model(), trainer.model_save_path, trainer.seq_len,
+                               formats=("torchscript",), quantize=False)
+    assert results["torchscript"] is not None
+
+
+def test_export_skips_mismatched_input_dim(tmp_path):
+    results = export_artifacts(_small_model(input_dim=5), str(tmp_path / "nexus.pth"), 64,
+                               formats=("torchscript",), quantize=False)
+    assert results == {"torchscript": None}
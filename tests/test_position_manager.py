@@ -0,0 +1,134 @@
+"""
+PositionManager tests - lock scope around broker I/O and the secondary
+bucket index kept consistent through add, remove, rebucket and reconcile.
+
+PositionManager imports the MetaTrader5 package at module load, so these
+tests run where the terminal package is installed.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("MetaTrader5")
+
+from src.position_manager import PositionManager, PositionState
+
+SYMBOL = "XAUUSD"
+
+
+def _broker_position(ticket, side, volume, symbol=SYMBOL, profit=0.0):
+    return {
+        "ticket": ticket, "symbol": symbol, "type": side, "volume": volume,
+        "price_open": 2000.0, "price_current": 2000.0, "profit": profit,
+        "sl": 0.0, "tp": 0.0, "swap": 0.0, "commission": 0.0, "time": 0, "magic": 7,
+    }
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return PositionManager(state_file=str(tmp_path / "position_state.json"))
+
+
+class LockProbeBroker:
+    """Broker whose order call checks that PositionManager._lock is free meanwhile."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.lock_free_during_order = None
+        self.orders = []
+
+    def _lock_free_from_other_thread(self):
+        result = {}
+
+        def probe():
+            acquired = self.manager._lock.acquire(blocking=False)
+            if acquired:
+                self.manager._lock.release()
+            result["free"] = acquired
+
+        worker = threading.Thread(target=probe)
+        worker.start()
+        worker.join()
+        return result["free"]
+
+    async def execute_order_async(self, **request):
+        self.lock_free_during_order = self._lock_free_from_other_thread()
+        self.orders.append(request)
+        await asyncio.sleep(0)
+        return {"ticket": 9001}
+
+
+def test_perfect_hedge_releases_thread_lock_during_order(manager):
+    manager.update_positions([_broker_position(1, 0, 0.30), _broker_position(2, 1, 0.10)])
+    manager.create_bucket([manager.active_positions[1], manager.active_positions[2]])
+    broker = LockProbeBroker(manager)
+
+    frozen = asyncio.run(manager.execute_perfect_hedge(broker, SYMBOL, {"bid": 2000.0, "ask": 2000.3}))
+
+    assert frozen
+    assert broker.lock_free_during_order is True
+    assert broker.orders[0]["order_type"] == "SELL" and broker.orders[0]["volume"] == pytest.approx(0.20)
+    assert manager.bucket_stats[SYMBOL].state == PositionState.BUCKET_FROZEN
+
+
+def _consistent(manager):
+    """Assert the index matches a full scan (lookups first, so the index is built)."""
+    manager.find_bucket_by_symbol(SYMBOL)
+    assert manager.check_index_consistency() == []
+
+
+def test_index_consistent_through_add_remove_rebucket_reconcile(manager):
+    # Reconcile: new tickets from a broker snapshot, adopted into the symbol bucket
+    manager.update_positions([_broker_position(1, 0, 0.10), _broker_position(2, 1, 0.10)])
+    bucket = manager.create_bucket([manager.active_positions[1]])
+    _consistent(manager)
+    manager.update_positions([_broker_position(1, 0, 0.10), _broker_position(2, 1, 0.10)])
+    assert manager.find_bucket_by_tickets([2]) == bucket
+    _consistent(manager)
+
+    # Add: a hedge leg joins explicitly, plus a second symbol
+    manager.update_positions([_broker_position(1, 0, 0.10), _broker_position(2, 1, 0.10),
+                              _broker_position(3, 1, 0.20), _broker_position(10, 0, 1.0, symbol="EURUSD")])
+    manager.add_position_to_bucket(bucket, 3)
+    manager.create_bucket([manager.active_positions[10]])
+    assert sorted(p.ticket for p in manager.get_positions_in_bucket(bucket)) == [1, 2, 3]
+    _consistent(manager)
+
+    # Reconcile: a modified leg and a leg closed at the broker
+    manager.update_positions([_broker_position(1, 0, 0.05), _broker_position(3, 1, 0.20),
+                              _broker_position(10, 0, 1.0, symbol="EURUSD")])
+    assert [p.ticket for p in manager.get_positions_for_symbol(SYMBOL)] == [1, 3]
+    _consistent(manager)
+
+    # Remove: ghost ticket and stale cleanup close the bucket
+    manager.mark_position_as_ghost(3)
+    _consistent(manager)
+    manager.cleanup_stale_positions([_broker_position(10, 0, 1.0, symbol="EURUSD")])
+    assert manager.bucket_stats[bucket].closed
+    assert manager.find_bucket_by_symbol(SYMBOL) is None
+    _consistent(manager)
+
+    # Rebucket: the symbol reopens under the same bucket id
+    manager.update_positions([_broker_position(20, 0, 0.10), _broker_position(10, 0, 1.0, symbol="EURUSD")])
+    reopened = manager.create_bucket([manager.active_positions[20]])
+    assert reopened == bucket and not manager.bucket_stats[bucket].closed
+    assert manager.find_bucket_by_tickets([20]) == bucket
+    _consistent(manager)
+
+    # Reconcile: everything closes at the broker
+    manager.update_positions([])
+    assert manager.get_positions_for_symbol(SYMBOL) == []
+    _consistent(manager)
+
+
+def test_index_consistency_reports_unmarked_mutation(manager):
+    manager.update_positions([_broker_position(1, 0, 0.10), _broker_position(2, 1, 0.10)])
+    bucket = manager.create_bucket([manager.active_positions[1]])
+    _consistent(manager)
+
+    # A membership change that skips _mark_structure_changed leaves the index stale
+    manager.bucket_stats[bucket].positions.append(2)
+    assert manager.check_index_consistency() != []
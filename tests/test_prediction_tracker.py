@@ -0,0 +1,52 @@
+"""
+Prediction tracker tests - due-bar scoring on the broker bar clock.
+"""
+
+import time
+
+import pytest
+
+from src.monitoring.prediction_tracker import PredictionTracker
+
+BROKER_OFFSET = 3 * 3600  # UTC+3 server
+
+
+def _bars(start_minute, count, close=2650.0, step=1.0):
+    return [{"time": (start_minute + i) * 60, "close": close + i * step} for i in range(count)]
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return PredictionTracker(log_dir=str(tmp_path))
+
+
+def test_prediction_before_first_bar_waits_for_broker_clock(tracker):
+    tracker.record_prediction("XAUUSD", "UP", 0.8, 2650.0, horizon_candles=5)
+
+    # Broker bars run 3h ahead of the local UTC clock
+    now_minute = int((time.time() + BROKER_OFFSET) // 60)
+    tracker.validate_predictions("XAUUSD", _bars(now_minute - 100, 100))
+
+    assert tracker.total_predictions == 0
+    assert tracker.get_accuracy_report()["pending_validations"] == 1
+
+    tracker.validate_predictions("XAUUSD", _bars(now_minute, 4, close=2700.0))
+    assert tracker.total_predictions == 0
+
+    tracker.validate_predictions("XAUUSD", _bars(now_minute + 4, 1, close=2704.0))
+    assert tracker.total_predictions == 1
+    assert tracker.correct_predictions == 1
+
+
+def test_prediction_scored_against_due_bar_close(tracker):
+    tracker.validate_predictions("XAUUSD", _bars(1000, 10))
+    tracker.record_prediction("XAUUSD", "DOWN", 0.7, 2659.0, horizon_candles=2)
+
+    # Due at minute 1011; the forming bar 1012 is not passed yet
+    tracker.validate_predictions("XAUUSD", _bars(1010, 1, close=2640.0))
+    assert tracker.total_predictions == 0
+
+    tracker.validate_predictions("XAUUSD", [{"time": 1011 * 60, "close": 2630.0},
+                                            {"time": 1012 * 60, "close": 2700.0}])
+    assert tracker.total_predictions == 1
+    assert tracker.correct_predictions == 1
@@ -0,0 +1,45 @@
+"""
+Runtime settings tests - SettingsRegistry startup and reload with broken config files.
+"""
+
+from src.config.runtime_settings import RuntimeSettings, SettingsRegistry
+
+
+def _registry(tmp_path, monkeypatch, settings_text):
+    monkeypatch.setenv("AETHER_SETTINGS_POLL_S", "0")
+    (tmp_path / "settings.yaml").write_text(settings_text)
+    return SettingsRegistry(config_dir=str(tmp_path))
+
+
+def test_malformed_yaml_at_startup_uses_defaults_and_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("AETHER_CLOSE_MERGE_RESIDUAL", "0")
+    registry = _registry(tmp_path, monkeypatch, "runtime: [unclosed\n  - : :\n")
+
+    current = registry.current
+    assert isinstance(current, RuntimeSettings)
+    assert current.version == 0
+    assert current.close_merge_residual is False
+
+
+def test_non_mapping_yaml_at_startup_uses_defaults(tmp_path, monkeypatch):
+    registry = _registry(tmp_path, monkeypatch, "- just\n- a list\n")
+
+    assert isinstance(registry.current, RuntimeSettings)
+
+
+def test_broken_reload_keeps_last_good_snapshot(tmp_path, monkeypatch):
+    registry = _registry(tmp_path, monkeypatch, "runtime:\n  close_merge_residual: false\n")
+    assert registry.current.close_merge_residual is False
+
+    (tmp_path / "settings.yaml").write_text("runtime: [unclosed\n")
+    assert registry.reload() is False
+    assert registry.rejected == 1
+    assert registry.current.close_merge_residual is False
+
+
+def test_liquidity_walls_are_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("AETHER_ENABLE_LIQUIDITY_WALLS", raising=False)
+    assert _registry(tmp_path, monkeypatch, "{}\n").current.enable_liquidity_walls is False
+
+    monkeypatch.setenv("AETHER_ENABLE_LIQUIDITY_WALLS", "1")
+    assert _registry(tmp_path, monkeypatch, "{}\n").current.enable_liquidity_walls is True
@@ -0,0 +1,75 @@
+"""
+Telemetry tests - compaction against a live writer and into an already
+compacted day.
+"""
+
+import json
+import time
+
+import pytest
+
+from src.utils.telemetry import (
+    DayLocked, DecisionRecord, TelemetryWriter, aggregate, compact_day, iter_decisions, load_index, main,
+)
+
+TS = time.mktime((2026, 3, 2, 12, 0, 0, 0, 0, -1))
+DAY = "20260302"
+
+
+def _record(i, action="entry"):
+    return {"ts": TS + i, "symbol": "XAUUSD", "action": action, "side": "BUY", "price": 2000.0 + i,
+            "lots": 0.01, "features": {}, "context": {}, "decision": {"n": i}}
+
+
+def _append_plain(root, records):
+    with open(root / f"{DAY}.jsonl", "a", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec) + "\n")
+
+
+def _wait_written(writer, n, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while writer.written < n and time.monotonic() < deadline:
+        writer.flush()
+        time.sleep(0.01)
+    assert writer.written == n
+
+
+def test_compaction_refuses_day_with_live_writer(tmp_path, capsys):
+    writer = TelemetryWriter(root=str(tmp_path), batch_size=1, flush_interval=0.1)
+    rec = _record(0)
+    writer.write(DecisionRecord(**rec))
+    _wait_written(writer, 1)
+
+    with pytest.raises(DayLocked):
+        compact_day(str(tmp_path), DAY)
+    assert main(["--root", str(tmp_path), "compact", "--include-today"]) == 0
+    assert "skipped" in capsys.readouterr().out
+    assert (tmp_path / f"{DAY}.jsonl").exists() and load_index(str(tmp_path), DAY) is None
+
+    writer.close()
+    assert compact_day(str(tmp_path), DAY)["records"] == 1
+    assert not (tmp_path / f"{DAY}.lock").exists()
+
+
+def test_recompaction_merges_into_existing_day(tmp_path):
+    root = str(tmp_path)
+    _append_plain(tmp_path, [_record(i) for i in range(3)])
+    first = compact_day(root, DAY, codec="gzip", block_records=2)
+    assert first["records"] == 3 and len(first["blocks"]) == 2
+
+    # More records for the same day arrive after an --include-today compaction
+    _append_plain(tmp_path, [_record(i, action="exit") for i in range(3, 5)])
+    assert [r["decision"]["n"] for r in iter_decisions(root)] == [0, 1, 2, 3, 4]
+    assert aggregate(root) == {("XAUUSD", "entry"): 3, ("XAUUSD", "exit"): 2}
+
+    merged = compact_day(root, DAY, codec="gzip", block_records=2)
+    assert merged["records"] == 5 and len(merged["blocks"]) == 3
+    assert merged["blocks"][:2] == first["blocks"]
+    assert merged["keys"] == {"XAUUSD|entry": 3, "XAUUSD|exit": 2}
+    assert merged["ts0"] == TS and merged["ts1"] == TS + 4
+    assert not (tmp_path / f"{DAY}.jsonl").exists()
+
+    assert [r["decision"]["n"] for r in iter_decisions(root)] == [0, 1, 2, 3, 4]
+    assert [r["decision"]["n"] for r in iter_decisions(root, action="exit")] == [3, 4]
+    assert aggregate(root) == {("XAUUSD", "entry"): 3, ("XAUUSD", "exit"): 2}